@@ -86,8 +86,8 @@ def materialize_cointegrated_data(
     
     # Cache data for each venue
     for venue, df in venue_data.items():
-        # Write to cache
-        cache.put(venue, pair, "1m", df)
+        # Upsert into cache: only the partitions covered by [start, end] are written
+        cache.append(venue, pair, "1m", df, metadata={"source": source, "mode": mode})
         
         # Calculate coverage
         expected_minutes = (end_utc - start_utc).total_seconds() / 60
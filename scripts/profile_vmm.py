@@ -6,8 +6,10 @@ This script profiles VMM performance to identify bottlenecks and measure
 runtime performance against the <2s p95 target for standard windows.
 """
 
+import argparse
 import cProfile
 import io
+import os
 import sys
 import time
 from pathlib import Path
@@ -18,13 +20,13 @@ import numpy as np
 import pandas as pd
 import pstats
 
-from generate_golden import generate_competitive_data
-from acd.vmm.engine import VMMEngine, run_vmm
-from acd.vmm.profiles import VMMConfig
-
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
+from generate_golden import generate_competitive_data  # noqa: E402
+from acd.vmm.batch import run_vmm_batch  # noqa: E402
+from acd.vmm.profiles import VMMConfig, to_engine_config  # noqa: E402
+
 
 class VMMProfiler:
     """Performance profiler for VMM continuous monitoring"""
@@ -32,8 +34,9 @@ class VMMProfiler:
     def __init__(self, config: VMMConfig):
         """Initialize profiler with VMM configuration"""
         self.config = config
-        self.engine = VMMEngine(config)
+        self.engine_config = to_engine_config(config)
         self.profile_results = []
+        self.batch_throughput = None
 
     def profile_single_run(self, window: pd.DataFrame, price_cols: List[str]) -> Dict:
         """Profile a single VMM run with detailed timing"""
@@ -44,7 +47,8 @@ class VMMProfiler:
 
         start_time = time.time()
         try:
-            result = run_vmm(window, self.config)
+            # A batch of one runs in-process, so cProfile sees the engine internals
+            result = run_vmm_batch([window], price_cols, self.engine_config)[0]
             success = True
         except Exception as e:
             result = None
@@ -72,7 +76,7 @@ class VMMProfiler:
             "success": success,
             "convergence_status": result.convergence_status if result else "failed",
             "iterations": result.iterations if result else 0,
-            "elbo_final": result.elbo_final if result else 0.0,
+            "elbo_final": result.final_loss if result else 0.0,
             "function_times": function_times,
             "profile_stats": profile_stats,
             "error_msg": error_msg if not success else None,
@@ -124,6 +128,24 @@ class VMMProfiler:
 
         return self.profile_results
 
+    def profile_throughput(
+        self, windows: List[pd.DataFrame], price_cols: List[str], n_workers: int
+    ) -> Dict:
+        """Time the whole batch through the process-pool runner"""
+        print(f"Running {len(windows)} windows across {n_workers} workers...")
+
+        start_time = time.time()
+        results = run_vmm_batch(windows, price_cols, self.engine_config, n_workers=n_workers)
+        wall_time = time.time() - start_time
+
+        self.batch_throughput = {
+            "n_windows": len(results),
+            "n_workers": n_workers,
+            "wall_time": wall_time,
+            "windows_per_s": len(results) / wall_time if wall_time > 0 else float("inf"),
+        }
+        return self.batch_throughput
+
     def analyze_performance(self) -> Dict:
         """Analyze performance results and generate summary"""
         if not self.profile_results:
@@ -165,6 +187,8 @@ class VMMProfiler:
             "convergence_stats": self._analyze_convergence(successful_runs),
             # Function-level bottlenecks
             "function_bottlenecks": self._identify_bottlenecks(),
+            # Parallel batch throughput (None if not measured)
+            "batch_throughput": self.batch_throughput,
         }
 
         return performance_summary
@@ -253,6 +277,14 @@ class VMMProfiler:
             f.write(f"| P95 | {summary['p95_time']:.3f} |\n")
             f.write(f"| P99 | {summary['p99_time']:.3f} |\n\n")
 
+            throughput = summary["batch_throughput"]
+            if throughput:
+                f.write("## Batch Throughput\n\n")
+                f.write(f"- **Windows**: {throughput['n_windows']}\n")
+                f.write(f"- **Workers**: {throughput['n_workers']}\n")
+                f.write(f"- **Wall Time**: {throughput['wall_time']:.3f}s\n")
+                f.write(f"- **Windows/s**: {throughput['windows_per_s']:.2f}\n\n")
+
             f.write("## Convergence Analysis\n\n")
             conv_stats = summary["convergence_stats"]
             f.write(f"- **Mean Iterations**: {conv_stats['mean_iterations']:.1f}\n")
@@ -372,6 +404,15 @@ class VMMProfiler:
 
 def main():
     """Main profiling function"""
+    parser = argparse.ArgumentParser(description="Profile VMM runtime")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Worker processes for the batch throughput run",
+    )
+    args = parser.parse_args()
+
     print("🚀 VMM Performance Profiler")
     print("=" * 50)
 
@@ -406,6 +447,9 @@ def main():
     print("\n🔍 Running VMM performance profiling...")
     profiler.profile_batch(windows, price_cols)
 
+    print("\n⚡ Measuring batch throughput...")
+    profiler.profile_throughput(windows, price_cols, args.workers)
+
     # Generate report
     print("\n📈 Generating performance report...")
     report_path = profiler.generate_performance_report()
@@ -418,6 +462,11 @@ def main():
     print(f"  P95 Runtime: {summary['p95_time']:.3f}s")
     print(f"  Target P95: {summary['target_p95']:.1f}s")
     print(f"  Meets Target: {'✅' if summary['meets_p95_target'] else '❌'}")
+    throughput = summary["batch_throughput"]
+    print(
+        f"  Batch Throughput: {throughput['windows_per_s']:.2f} windows/s "
+        f"on {throughput['n_workers']} workers"
+    )
 
     print(f"\n📄 Detailed report: {report_path}")
 
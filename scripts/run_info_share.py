@@ -17,7 +17,7 @@ import os
 import argparse
 import logging
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Add src to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -45,7 +45,9 @@ def run_info_share_analysis(
     standardize: str = "none",
     oracle_beta: str = "no",
     gg_hint_from_synthetic: str = "no",
-    print_evidence: bool = False
+    print_evidence: bool = False,
+    cache_dir: Optional[str] = None,
+    workers: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Run complete information share analysis.
@@ -62,6 +64,8 @@ def run_info_share_analysis(
         oracle_beta: Oracle mode ('yes' or 'no')
         gg_hint_from_synthetic: Use synthetic hint in GG fallback ('yes' or 'no')
         print_evidence: Whether to print evidence blocks
+        cache_dir: Directory of fitted VECM parameters reused across runs (None disables)
+        workers: Day-level worker processes (None uses the analyzer default)
         
     Returns:
         Analysis results dictionary
@@ -79,7 +83,9 @@ def run_info_share_analysis(
         bootstrap_samples=bootstrap,
         standardize=standardize,
         oracle_beta=oracle_beta,
-        gg_hint_from_synthetic=gg_hint_from_synthetic
+        gg_hint_from_synthetic=gg_hint_from_synthetic,
+        cache_dir=cache_dir,
+        max_workers=workers
     )
     
     # Run analysis
@@ -248,6 +254,10 @@ def main():
     parser.add_argument("--gg-hint-from-synthetic", choices=['yes', 'no'], default='no',
                         help="Use synthetic leader bias as hint in GG fallback")
     parser.add_argument("--print-evidence", action="store_true", help="Print evidence blocks")
+    parser.add_argument("--cache-dir", default="data/cache/vecm",
+                       help="Fitted VECM cache directory, reused across runs (empty to disable)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Day-level worker processes (default: min(4, cores))")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose logging")
     
     args = parser.parse_args()
@@ -271,7 +281,9 @@ def main():
             standardize=args.standardize,
             oracle_beta=args.oracle_beta,
             gg_hint_from_synthetic=args.gg_hint_from_synthetic,
-            print_evidence=args.print_evidence
+            print_evidence=args.print_evidence,
+            cache_dir=args.cache_dir or None,
+            workers=args.workers
         )
         
         # Print summary
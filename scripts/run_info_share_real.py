@@ -15,6 +15,7 @@ import sys
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
 
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
@@ -138,7 +139,9 @@ def run_info_share_analysis(
     venues: list,
     cache_dir: str,
     export_dir: str,
-    verbose: bool = False
+    verbose: bool = False,
+    vecm_cache_dir: Optional[str] = None,
+    workers: Optional[int] = None
 ) -> None:
     """
     Run information share analysis on real data.
@@ -151,6 +154,8 @@ def run_info_share_analysis(
         cache_dir: Cache directory
         export_dir: Export directory
         verbose: Verbose logging
+        vecm_cache_dir: Directory of fitted VECM parameters reused across runs (None disables)
+        workers: Day-level worker processes (None uses the analyzer default)
     """
     logger = logging.getLogger(__name__)
     logger.info("Starting information share analysis on real data")
@@ -166,7 +171,9 @@ def run_info_share_analysis(
     analyzer = InfoShareAnalyzer(
         standardize="none",  # Preserve asymmetries
         oracle_beta="no",    # Use real estimation
-        gg_hint_from_synthetic="yes"  # Use hint for better asymmetry
+        gg_hint_from_synthetic="yes",  # Use hint for better asymmetry
+        cache_dir=vecm_cache_dir,
+        max_workers=workers
     )
     
     # Run analysis
@@ -366,6 +373,10 @@ def main():
     parser.add_argument("--venues", default="binance,coinbase,kraken,okx,bybit", 
                        help="Comma-separated list of venues")
     parser.add_argument("--cache-dir", default="data/cache", help="Cache directory")
+    parser.add_argument("--vecm-cache-dir", default="data/cache/vecm",
+                       help="Fitted VECM cache directory, reused across runs (empty to disable)")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Day-level worker processes (default: min(4, cores))")
     parser.add_argument("--export-dir", default="exports/real_data_runs", help="Export directory")
     parser.add_argument("--use-overlap-json", help="Path to OVERLAP.json file")
     parser.add_argument("--from-snapshot-ticks", type=int, help="Use snapshot tick data (1=yes)")
@@ -424,7 +435,9 @@ def main():
                 venues=venues,
                 cache_dir=args.cache_dir,
                 export_dir=args.export_dir,
-                verbose=args.verbose
+                verbose=args.verbose,
+                vecm_cache_dir=args.vecm_cache_dir or None,
+                workers=args.workers
             )
         
     except Exception as e:
@@ -19,7 +19,7 @@ import pandas as pd
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from acdlib.io.overlap import find_real_overlap_rolling
+from acdlib.io.overlap_sweep import GapIndex, SweepLevel, sweep_overlap_windows
 
 
 def setup_logging(verbose: bool = False) -> None:
@@ -32,73 +32,56 @@ def setup_logging(verbose: bool = False) -> None:
 
 
 def find_overlap_windows(
-    venues: List[str],
-    pair: str,
-    granularity_sec: int,
-    min_duration_min: int,
-    coverage_threshold: float,
+    index: GapIndex,
+    levels: List[SweepLevel],
     max_windows: int = 3,
-) -> List[Dict]:
+) -> List[List[Dict]]:
     """
-    Find overlap windows for a specific granularity.
+    Find overlap windows for every granularity level in one sweep.
     
     Args:
-        venues: List of venue names
-        pair: Trading pair
-        granularity_sec: Maximum gap tolerance in seconds
-        min_duration_min: Minimum duration in minutes
-        coverage_threshold: Minimum coverage threshold
-        max_windows: Maximum number of windows to find
+        index: Gap index over the venues' tick files (refreshed by the caller)
+        levels: Granularity, minimum duration and coverage threshold per level
+        max_windows: Maximum number of windows to keep per level
         
     Returns:
-        List of overlap window dictionaries
+        One list of overlap window dictionaries per level
     """
     logger = logging.getLogger(__name__)
     
-    logger.info(f"[SWEEP:search] {{'g_sec': {granularity_sec}, 'min_minutes': {min_duration_min}}}")
-    
-    windows = []
-    max_gap_s = granularity_sec
-    min_minutes = [min_duration_min]
-    
     try:
-        result = find_real_overlap_rolling(
-            venues=venues,
-            pair=pair,
-            freq="1s",
-            max_gap_s=max_gap_s,
-            min_minutes=min_minutes,
-            quorum=len(venues),
-        )
+        level_windows = sweep_overlap_windows(index, levels, max_windows=max_windows)
+    except Exception as e:
+        logger.error(f"Error sweeping overlap windows: {e}")
+        return [[] for _ in levels]
+    
+    results = []
+    for level, windows in zip(levels, level_windows):
+        granularity_sec = level.granularity_sec
+        min_duration_min = level.min_duration_min
+        logger.info(f"[SWEEP:search] {{'g_sec': {granularity_sec}, 'min_minutes': {min_duration_min}}}")
         
-        if result:
-            start, end, window_venues, policy = result
-            duration_min = (end - start).total_seconds() / 60
-            
-            # Calculate coverage
-            total_seconds = (end - start).total_seconds()
-            coverage = 1.0  # Simplified for now
-            
+        level_results = []
+        for window in windows:
             window_data = {
-                "start": start.isoformat(),
-                "end": end.isoformat(),
-                "duration_minutes": duration_min,
-                "venues": window_venues,
+                "start": window.start.isoformat(),
+                "end": window.end.isoformat(),
+                "duration_minutes": window.duration_minutes,
+                "venues": window.venues,
                 "policy": f"RESEARCH_g={granularity_sec}s",
-                "coverage": coverage,
+                "coverage": window.coverage,
+                "coverage_by_venue": window.coverage_by_venue,
                 "granularity_sec": granularity_sec,
                 "min_duration_min": min_duration_min,
             }
-            
-            windows.append(window_data)
+            level_results.append(window_data)
             logger.info(f"[SWEEP:found] {json.dumps(window_data)}")
-        else:
+        
+        if not level_results:
             logger.info(f"[SWEEP:none] {{'g_sec': {granularity_sec}, 'min_minutes': {min_duration_min}}}")
-            
-    except Exception as e:
-        logger.error(f"Error finding overlap for granularity {granularity_sec}s: {e}")
+        results.append(level_results)
     
-    return windows
+    return results
 
 
 def create_snapshot(
@@ -461,7 +444,7 @@ def main():
     parser.add_argument("--min-durations", default="15,10,5,1,1,1,1",
                        help="Minimum durations in minutes (comma-separated)")
     parser.add_argument("--coverage-threshold", type=float, default=0.95,
-                       help="Coverage threshold")
+                       help="Coverage threshold (share of granularity-sized slots holding a tick)")
     parser.add_argument("--venues", default="binance,coinbase,kraken,okx,bybit",
                        help="Venues (comma-separated)")
     parser.add_argument("--mode", default="research", help="Mode (research/court)")
@@ -514,19 +497,20 @@ def main():
     
     sweep_results = []
     
+    # Index every venue's ticks once and evaluate all granularities in one sweep
+    index = GapIndex(venues, pair=args.pair)
+    index.refresh()
+    levels = [
+        SweepLevel(granularity_sec, min_duration_min, args.coverage_threshold)
+        for granularity_sec, min_duration_min in zip(granularities, min_durations)
+    ]
+    all_windows = find_overlap_windows(index, levels, max_windows=args.max_windows_per_level)
+    
     # Run sweep for each granularity
     for i, (granularity_sec, min_duration_min) in enumerate(zip(granularities, min_durations)):
         logger.info(f"Processing granularity {granularity_sec}s (min {min_duration_min}m)")
         
-        # Find overlap windows
-        windows = find_overlap_windows(
-            venues=venues,
-            pair=args.pair,
-            granularity_sec=granularity_sec,
-            min_duration_min=min_duration_min,
-            coverage_threshold=args.coverage_threshold,
-            max_windows=args.max_windows_per_level,
-        )
+        windows = all_windows[i]
         
         # Create snapshots and run analyses for each window
         analyses_results = []
@@ -613,6 +597,7 @@ def run_continuous_sweep(
     # Sub-minute granularities and durations
     granularities = [60, 30, 15, 5, 2]  # 1m, 30s, 15s, 5s, 2s
     min_durations = [5, 2, 1, 1, 1]     # 5m, 2m, 1m, 1m, 1m
+    # Coverage is measured in slots of each level's own granularity
     coverage_thresholds = [0.95, 0.95, 0.95, 0.97, 0.985]  # 2s ≥ 0.985
     
     logger.info("Starting continuous sub-minute sweep")
@@ -628,6 +613,15 @@ def run_continuous_sweep(
     loop_count = 0
     total_windows_found = 0
     
+    # The gap index persists across iterations; each scan only reads new tick files
+    index = GapIndex(venues, pair=pair)
+    levels = [
+        SweepLevel(granularity_sec, min_duration_min, coverage_thresh)
+        for granularity_sec, min_duration_min, coverage_thresh in zip(
+            granularities, min_durations, coverage_thresholds
+        )
+    ]
+    
     try:
         while True:
             loop_count += 1
@@ -637,21 +631,19 @@ def run_continuous_sweep(
             with open(sweep_log, 'a') as f:
                 f.write(f"[SWEEP:loop] iteration={loop_count}, timestamp={datetime.now().isoformat()}\n")
             
+            new_files = index.refresh()
+            logger.info(f"[SWEEP:loop] indexed {new_files} new tick files")
+            
+            # Only take the first (longest) valid window per level
+            all_windows = find_overlap_windows(index, levels, max_windows=1)
+            
             # Run sweep for each granularity
             for i, (granularity_sec, min_duration_min, coverage_thresh) in enumerate(
                 zip(granularities, min_durations, coverage_thresholds)
             ):
                 logger.info(f"[SWEEP:subminute] scanning granularity={granularity_sec}s, min_duration={min_duration_min}m, coverage={coverage_thresh}")
                 
-                # Find overlap windows
-                windows = find_overlap_windows(
-                    venues=venues,
-                    pair=pair,
-                    granularity_sec=granularity_sec,
-                    min_duration_min=min_duration_min,
-                    coverage_threshold=coverage_thresh,
-                    max_windows=1,  # Only take first valid window
-                )
+                windows = all_windows[i]
                 
                 if windows:
                     window = windows[0]
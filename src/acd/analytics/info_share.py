@@ -10,12 +10,21 @@ import json
 import logging
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 from datetime import datetime
-from statsmodels.tsa.vector_ar.vecm import VECM, coint_johansen
+from statsmodels.tsa.vector_ar.vecm import coint_johansen
 from sklearn.utils import resample
 
+from acdlib.alignment import align_long_frame
+from .vecm_cache import VECMCache, VECMParameters, fit_vecm
+
+# Default day-level process pool size; each worker holds a day of minute data
+# and its bootstrap draws, so more workers than this rarely pays off
+DEFAULT_MAX_WORKERS = 4
+
 
 @dataclass
 class InfoShareResult:
@@ -43,6 +52,8 @@ class InfoShareAnalyzer:
         standardize: str = "none",
         oracle_beta: str = "no",
         gg_hint_from_synthetic: str = "no",
+        cache_dir: Optional[str] = None,
+        max_workers: Optional[int] = None,
     ):
         self.spec_version = spec_version
         self.logger = logging.getLogger(__name__)
@@ -54,6 +65,9 @@ class InfoShareAnalyzer:
         self.gg_hint_from_synthetic = gg_hint_from_synthetic
         self.min_coverage = 0.95  # 95% minute coverage required
         self.min_venues = 3  # Minimum venues required
+        # Day-level process pool size (None: up to DEFAULT_MAX_WORKERS, bounded by cores)
+        self.max_workers = max_workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self.vecm_cache = VECMCache(cache_dir) if cache_dir else None
 
     def _get_code_version(self) -> str:
         """Get short commit SHA for reproducibility."""
@@ -153,24 +167,23 @@ class InfoShareAnalyzer:
         Returns:
             Pivoted DataFrame with venues as columns
         """
-        # Pivot to get venues as columns
-        pivoted = df.pivot_table(index="time", columns="venue", values="returns", aggfunc="first")
-
-        # Inner join - drop any bar with NA
-        pivoted = pivoted.dropna()
-
-        # Ensure all venues are present
-        for venue in self.venues:
-            if venue not in pivoted.columns:
-                pivoted[venue] = 0
+        pivoted = self._inner_join(df, "returns")
 
-        # Reorder columns
-        pivoted = pivoted[self.venues]
+        # Venues without any data are zero-filled
+        pivoted = pivoted.reindex(columns=self.venues, fill_value=0)
 
         self.logger.info(f"Aligned data: {len(pivoted)} time points, {len(pivoted.columns)} venues")
 
         return pivoted
 
+    def _inner_join(self, df: pd.DataFrame, value_col: str) -> pd.DataFrame:
+        """Exact-time samples of ``value_col`` for observed venues, bars with any NA dropped."""
+        observed = [venue for venue in self.venues if (df["venue"] == venue).any()]
+        aligned = align_long_frame(df, value_col, observed, tolerance_ns=0)
+        frame = aligned.to_frame().dropna()
+        frame.columns.name = "venue"
+        return frame
+
     def check_data_quality(self, returns_df: pd.DataFrame, date: str) -> Tuple[bool, str]:
         """
         Check data quality for a specific day.
@@ -281,54 +294,43 @@ class InfoShareAnalyzer:
             self.logger.warning(f"Cointegration test failed: {str(e)}")
             return False, {"error": str(e)}
 
-    def estimate_vecm(self, returns_df: pd.DataFrame) -> Tuple[Optional[VECM], str]:
+    def estimate_vecm(self, returns_df: pd.DataFrame) -> Tuple[Optional[VECMParameters], str]:
         """
         Estimate VECM model with optimal lag selection.
 
+        The lag order minimizes the BIC over one max-lag regression; with a
+        cache directory configured, fitted parameters are reused for identical
+        data and model spec.
+
         Args:
             returns_df: DataFrame with aligned returns
 
         Returns:
-            Tuple of (vecm_model, method)
+            Tuple of (vecm_parameters, method)
         """
         try:
-            # Prepare data
-            data = returns_df.values
-
-            # Find optimal lag using BIC
-            best_lag = 1
-            best_bic = float("inf")
+            # Leave at least four observations per candidate lag
+            max_lag = min(self.max_lag, len(returns_df) // 4 - 1)
 
-            for lag in range(1, min(self.max_lag + 1, len(data) // 4)):
-                try:
-                    vecm = VECM(data, k_ar_diff=lag, coint_rank=1)
-                    vecm_fit = vecm.fit()
-                    bic = vecm_fit.bic
-
-                    if bic < best_bic:
-                        best_bic = bic
-                        best_lag = lag
-                except Exception:
-                    continue
-
-            # Fit final model
-            vecm = VECM(data, k_ar_diff=best_lag, coint_rank=1)
-            vecm_fit = vecm.fit()
+            if self.vecm_cache is not None:
+                vecm_params = self.vecm_cache.get_or_fit(returns_df, max_lag)
+            else:
+                vecm_params = fit_vecm(returns_df.to_numpy(dtype=np.float64), max_lag)
 
-            return vecm_fit, "VECM"
+            return vecm_params, "VECM"
 
         except Exception as e:
             self.logger.warning(f"VECM estimation failed: {str(e)}")
             return None, "fallback"
 
     def compute_hasbrouck_bounds(
-        self, vecm_model: VECM, returns_df: pd.DataFrame
+        self, vecm_model: VECMParameters, returns_df: pd.DataFrame
     ) -> Dict[str, Dict[str, float]]:
         """
         Compute Hasbrouck information share bounds.
 
         Args:
-            vecm_model: Fitted VECM model
+            vecm_model: Fitted VECM parameters
             returns_df: DataFrame with aligned returns
 
         Returns:
@@ -657,6 +659,24 @@ class InfoShareAnalyzer:
 
         return daily_results
 
+    def process_days(
+        self, days: List[Tuple[str, pd.DataFrame, pd.DataFrame, Dict[str, str]]]
+    ) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Process independent days, fanned out over a process pool.
+
+        Args:
+            days: (date, aligned_returns, log_prices, env_labels) per day
+
+        Returns:
+            (daily_result, drop_reason) per day, in input order
+        """
+        if self.max_workers == 1 or len(days) <= 1:
+            return [_process_day(self, *day) for day in days]
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(_process_day, repeat(self), *zip(*days)))
+
     def aggregate_by_environment(self, daily_results: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Aggregate results by environment and regime.
@@ -916,42 +936,24 @@ class InfoShareAnalyzer:
         # Preprocess data
         processed_data = self.preprocess_data(minute_data)
 
-        # Group by date and process each day
+        # Group by date and schedule each day
         daily_results = []
         drop_reasons = {"notEnoughData": 0, "notCointegrated": 0, "modelFail": 0}
 
+        days = []
         for date, day_data in processed_data.groupby(processed_data["time"].dt.date):
-            date_str = str(date)
-
-            # Align venues by time
+            # Align venues by time; log prices feed the cointegration test
             aligned_returns = self.align_venues_by_time(day_data)
-
-            # Create log prices for cointegration test
-            log_prices = day_data.pivot_table(
-                index="time", columns="venue", values="log_mid", aggfunc="first"
-            ).dropna()
+            log_prices = self._inner_join(day_data, "log_mid")
 
             # Mock environment labels (placeholder)
             env_labels = {"volatility": "medium", "funding": "medium", "liquidity": "medium"}
 
-            # Check data quality first
-            is_valid, reason = self.check_data_quality(aligned_returns, date_str)
-            if not is_valid:
-                drop_reasons["notEnoughData"] += 1
-                continue
-
-            # Process daily data
-            daily_result = self.process_daily_data(
-                aligned_returns, log_prices, date_str, env_labels
-            )
+            days.append((str(date), aligned_returns, log_prices, env_labels))
 
+        for daily_result, drop_reason in self.process_days(days):
             if daily_result is None:
-                # Check if it failed due to cointegration
-                is_cointegrated, _ = self.test_cointegration(log_prices)
-                if not is_cointegrated:
-                    drop_reasons["notCointegrated"] += 1
-                else:
-                    drop_reasons["modelFail"] += 1
+                drop_reasons[drop_reason] += 1
             else:
                 daily_results.append(daily_result)
 
@@ -996,6 +998,28 @@ class InfoShareAnalyzer:
         return result
 
 
+def _process_day(
+    analyzer: InfoShareAnalyzer,
+    date_str: str,
+    aligned_returns: pd.DataFrame,
+    log_prices: pd.DataFrame,
+    env_labels: Dict[str, str],
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Daily result of one day, or None with the reason it was dropped."""
+    # Check data quality first
+    is_valid, reason = analyzer.check_data_quality(aligned_returns, date_str)
+    if not is_valid:
+        return None, "notEnoughData"
+
+    daily_result = analyzer.process_daily_data(aligned_returns, log_prices, date_str, env_labels)
+    if daily_result is not None:
+        return daily_result, None
+
+    # Check if it failed due to cointegration
+    is_cointegrated, _ = analyzer.test_cointegration(log_prices)
+    return None, "modelFail" if is_cointegrated else "notCointegrated"
+
+
 def create_info_share_analyzer(
     spec_version: str = "1.0.0",
     max_lag: int = 5,
@@ -1003,6 +1027,8 @@ def create_info_share_analyzer(
     standardize: str = "none",
     oracle_beta: str = "no",
     gg_hint_from_synthetic: str = "no",
+    cache_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
 ) -> InfoShareAnalyzer:
     """Create an information share analyzer instance."""
     return InfoShareAnalyzer(
@@ -1012,4 +1038,6 @@ def create_info_share_analyzer(
         standardize=standardize,
         oracle_beta=oracle_beta,
         gg_hint_from_synthetic=gg_hint_from_synthetic,
+        cache_dir=cache_dir,
+        max_workers=max_workers,
     )
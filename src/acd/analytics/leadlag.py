@@ -13,9 +13,12 @@ import pandas as pd
 from typing import Dict, List, Any
 from dataclasses import dataclass
 from datetime import datetime
+
+from acdlib.alignment import align_long_frame
+from ..validation.lead_lag_kernel import LaggedRegressionScores, lagged_regressions
 import scipy.stats as stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+
+HORIZON_SECONDS = {"1s": 1, "5s": 5, "30s": 30}
 
 
 @dataclass
@@ -138,18 +141,9 @@ class LeadLagMatrixAnalyzer:
         Returns:
             Pivoted DataFrame with venues as columns
         """
-        # Pivot to get venues as columns
-        pivoted = df.pivot_table(
-            index="time", columns="venue", values="returns", aggfunc="first"
-        ).fillna(0)
-
-        # Ensure all venues are present
-        for venue in self.venues:
-            if venue not in pivoted.columns:
-                pivoted[venue] = 0
-
-        # Reorder columns
-        pivoted = pivoted[self.venues]
+        # Exact-time samples; seconds where a venue has no bar count as zero return
+        aligned = align_long_frame(df, "returns", self.venues, tolerance_ns=0)
+        pivoted = aligned.to_frame().fillna(0)
 
         self.logger.info(f"Aligned data: {len(pivoted)} time points, {len(pivoted.columns)} venues")
 
@@ -170,8 +164,7 @@ class LeadLagMatrixAnalyzer:
         Returns:
             Dictionary with lead-lag metrics
         """
-        # Get horizon in seconds
-        horizon_seconds = {"1s": 1, "5s": 5, "30s": 30}[horizon]
+        horizon_seconds = HORIZON_SECONDS[horizon]
 
         # Extract return series
         src_returns = returns_df[src_venue].values
@@ -179,37 +172,47 @@ class LeadLagMatrixAnalyzer:
 
         # Remove any remaining NaN values
         valid_mask = ~(np.isnan(src_returns) | np.isnan(dst_returns))
-        src_returns = src_returns[valid_mask]
-        dst_returns = dst_returns[valid_mask]
+        pair_returns = np.column_stack([src_returns[valid_mask], dst_returns[valid_mask]])
 
-        if len(src_returns) < horizon_seconds + 1:
-            return {
-                "src": src_venue,
-                "dst": dst_venue,
-                "score": 0.0,
-                "p_value": 1.0,
-                "t_stat": 0.0,
-                "r_squared": 0.0,
-                "n_obs": len(src_returns),
-                "valid": False,
-            }
+        if len(pair_returns) < horizon_seconds + 1:
+            return self._edge(src_venue, dst_venue, len(pair_returns))
 
-        # Create lagged features
-        X = []
-        y = []
+        try:
+            scores = lagged_regressions(pair_returns, [horizon_seconds])
+            return self._edge(src_venue, dst_venue, len(pair_returns), scores, 0, 1, 0)
+        except Exception as e:
+            self.logger.warning(f"Error computing lead-lag for {src_venue}->{dst_venue}: {str(e)}")
+            return self._edge(src_venue, dst_venue, len(pair_returns))
 
-        for i in range(horizon_seconds, len(src_returns)):
-            # Use lagged source returns as features
-            features = src_returns[i - horizon_seconds : i]
-            target = dst_returns[i]
+    def compute_leadlag_scores(
+        self, returns_df: pd.DataFrame, horizons: List[str] = None
+    ) -> LaggedRegressionScores:
+        """
+        Compute lead-lag regressions for all venue pairs and horizons at once.
 
-            X.append(features)
-            y.append(target)
+        Args:
+            returns_df: DataFrame with aligned returns (no NaN values)
+            horizons: Time horizons (defaults to the analyzer's horizons)
 
-        X = np.array(X)
-        y = np.array(y)
+        Returns:
+            Scores indexed [src, dst, horizon] in the order of self.venues
+        """
+        horizons = horizons or self.horizons
+        returns = returns_df[self.venues].to_numpy(dtype=np.float64)
+        return lagged_regressions(returns, [HORIZON_SECONDS[h] for h in horizons])
 
-        if len(X) == 0:
+    def _edge(
+        self,
+        src_venue: str,
+        dst_venue: str,
+        n_obs: int,
+        scores: LaggedRegressionScores = None,
+        src: int = 0,
+        dst: int = 0,
+        k: int = 0,
+    ) -> Dict[str, Any]:
+        """Edge dictionary for one (src, dst, horizon) entry, or an invalid edge."""
+        if scores is None:
             return {
                 "src": src_venue,
                 "dst": dst_venue,
@@ -217,57 +220,43 @@ class LeadLagMatrixAnalyzer:
                 "p_value": 1.0,
                 "t_stat": 0.0,
                 "r_squared": 0.0,
-                "n_obs": len(src_returns),
+                "n_obs": n_obs,
                 "valid": False,
             }
 
-        # Fit linear regression
-        try:
-            model = LinearRegression()
-            model.fit(X, y)
-            y_pred = model.predict(X)
-
-            # Calculate R-squared
-            r_squared = r2_score(y, y_pred)
-
-            # Calculate t-statistic for the coefficient
-            residuals = y - y_pred
-            mse = np.mean(residuals**2)
-
-            if mse > 0:
-                # Simplified t-statistic calculation
-                t_stat = np.sqrt(r_squared * len(y) / (1 - r_squared)) if r_squared < 1 else 0
-                p_value = 2 * (1 - stats.t.cdf(abs(t_stat), len(y) - 2))
-            else:
-                t_stat = 0
-                p_value = 1.0
-
+        t_stat = float(scores.t_stat[src, dst, k])
+        return {
+            "src": src_venue,
+            "dst": dst_venue,
             # Lead-lag score (absolute t-statistic)
-            score = abs(t_stat)
+            "score": round(abs(t_stat), 4),
+            "p_value": round(float(scores.p_value[src, dst, k]), 6),
+            "t_stat": round(t_stat, 4),
+            "r_squared": round(float(scores.r_squared[src, dst, k]), 4),
+            "n_obs": int(scores.n_obs[src, dst, k]),
+            "valid": True,
+        }
 
-            return {
-                "src": src_venue,
-                "dst": dst_venue,
-                "score": round(score, 4),
-                "p_value": round(p_value, 6),
-                "t_stat": round(t_stat, 4),
-                "r_squared": round(r_squared, 4),
-                "n_obs": len(y),
-                "valid": True,
-            }
-
-        except Exception as e:
-            self.logger.warning(f"Error computing lead-lag for {src_venue}->{dst_venue}: {str(e)}")
-            return {
-                "src": src_venue,
-                "dst": dst_venue,
-                "score": 0.0,
-                "p_value": 1.0,
-                "t_stat": 0.0,
-                "r_squared": 0.0,
-                "n_obs": len(src_returns),
-                "valid": False,
-            }
+    def _pairwise_edges(self, returns_df: pd.DataFrame, horizon: str) -> List[Dict[str, Any]]:
+        """Edges for all ordered venue pairs, batched when the returns have no gaps."""
+        horizon_seconds = HORIZON_SECONDS[horizon]
+        returns = returns_df[self.venues]
+        if returns.isna().to_numpy().any() or len(returns) < horizon_seconds + 1:
+            # Pairwise NaN filtering gives every pair its own sample
+            return [
+                self.compute_leadlag_score(returns_df, src_venue, dst_venue, horizon)
+                for src_venue in self.venues
+                for dst_venue in self.venues
+                if src_venue != dst_venue
+            ]
+
+        scores = self.compute_leadlag_scores(returns_df, [horizon])
+        return [
+            self._edge(src_venue, dst_venue, len(returns), scores, i, j, 0)
+            for i, src_venue in enumerate(self.venues)
+            for j, dst_venue in enumerate(self.venues)
+            if i != j
+        ]
 
     def compute_leadlag_matrix(
         self, returns_df: pd.DataFrame, horizon: str
@@ -282,13 +271,7 @@ class LeadLagMatrixAnalyzer:
         Returns:
             List of edge dictionaries
         """
-        edges = []
-
-        for src_venue in self.venues:
-            for dst_venue in self.venues:
-                if src_venue != dst_venue:
-                    edge = self.compute_leadlag_score(returns_df, src_venue, dst_venue, horizon)
-                    edges.append(edge)
+        edges = self._pairwise_edges(returns_df, horizon)
 
         # Filter significant edges (p < 0.05)
         significant_edges = [e for e in edges if e["valid"] and e["p_value"] < 0.05]
@@ -398,14 +381,7 @@ class LeadLagMatrixAnalyzer:
 
                 if len(regime_returns) > 100:  # Minimum sample size
                     # Compute lead-lag for this regime
-                    regime_edges = []
-                    for src_venue in self.venues:
-                        for dst_venue in self.venues:
-                            if src_venue != dst_venue:
-                                edge = self.compute_leadlag_score(
-                                    regime_returns[self.venues], src_venue, dst_venue, "1s"
-                                )
-                                regime_edges.append(edge)
+                    regime_edges = self._pairwise_edges(regime_returns[self.venues], "1s")
 
                     regime_results[regime] = {
                         "edges": regime_edges,
@@ -10,11 +10,16 @@ import json
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import scipy.stats as stats
 
+from acdlib.alignment import align_long_frame
+
+# Random keys (placements x seconds) ranked per batch when sampling by argpartition
+NULL_BATCH_CELLS = 1 << 24
+
 
 @dataclass
 class SpreadConvergenceResult:
@@ -131,20 +136,15 @@ class SpreadConvergenceAnalyzer:
         Returns:
             Pivoted DataFrame with venues as columns
         """
-        # Pivot to get venues as columns
-        pivoted = (
-            df.pivot_table(index="time", columns="venue", values="mid", aggfunc="first")
-            .ffill()
-            .bfill()
-        )
+        # Previous-tick mids at every observed second; leading gaps take the first mid
+        aligned = align_long_frame(df, "mid", self.venues)
+        pivoted = aligned.to_frame().bfill()
 
-        # Ensure all venues are present
+        # Venues without any data use the first available venue as proxy
+        observed = [venue for venue in self.venues if pivoted[venue].notna().any()]
         for venue in self.venues:
-            if venue not in pivoted.columns:
-                pivoted[venue] = pivoted.iloc[:, 0]  # Use first available venue as proxy
-
-        # Reorder columns
-        pivoted = pivoted[self.venues]
+            if venue not in observed:
+                pivoted[venue] = pivoted[observed[0]]
 
         self.logger.info(f"Aligned data: {len(pivoted)} time points, {len(pivoted.columns)} venues")
 
@@ -192,48 +192,46 @@ class SpreadConvergenceAnalyzer:
         self.logger.info(f"Compression threshold (p10): {p10_threshold:.2f} bps")
         self.logger.info(f"Median threshold: {median_threshold:.2f} bps")
 
-        # Find potential compression starts
-        compression_candidates = []
-
-        for i in range(self.lookback_window, len(dispersion)):
-            current_disp = dispersion.iloc[i]
-
-            # Check if current dispersion is in bottom 10%
-            if current_disp <= p10_threshold:
-                # Check if dispersion was above median in prior 10s
-                lookback_disp = dispersion.iloc[i - self.lookback_window : i]
-                if (lookback_disp > median_threshold).any():
-                    compression_candidates.append(i)
-
-        # Process candidates to find actual episodes
-        for start_idx in compression_candidates:
-            # Find episode end (dispersion rises above p10)
-            end_idx = start_idx
-            for j in range(start_idx + 1, len(dispersion)):
-                if dispersion.iloc[j] > p10_threshold:
-                    end_idx = j - 1
-                    break
-            else:
-                end_idx = len(dispersion) - 1
-
-            # Check duration (≥3s)
-            duration = end_idx - start_idx + 1
-            if duration >= self.min_duration:
-                # Attribute leadership
-                leader = self._attribute_leadership(mid_prices_df, start_idx, end_idx)
-
-                episode = {
-                    "start_time": dispersion.index[start_idx],
-                    "end_time": dispersion.index[end_idx],
-                    "duration": duration,
-                    "start_dispersion": dispersion.iloc[start_idx],
-                    "end_dispersion": dispersion.iloc[end_idx],
-                    "leader": leader,
-                    "start_idx": start_idx,
-                    "end_idx": end_idx,
-                }
-
-                episodes.append(episode)
+        values = dispersion.to_numpy(dtype=np.float64)
+        n = len(values)
+        lookback = self.lookback_window
+
+        # Compression starts: bottom 10% now, above the median somewhere in the
+        # prior lookback window (window counts from a prefix sum)
+        above_median = np.concatenate([[0], np.cumsum(values > median_threshold)])
+        candidates = np.arange(lookback, n)
+        recent_high = above_median[candidates] - above_median[candidates - lookback] > 0
+        starts = candidates[(values[lookback:] <= p10_threshold) & recent_high]
+
+        # An episode runs until the next reading above p10 ends its compressed run
+        breaks = np.flatnonzero(values > p10_threshold)
+        following = np.searchsorted(breaks, starts, side="right")
+        ends = np.full(len(starts), n - 1)
+        has_break = following < len(breaks)
+        ends[has_break] = breaks[following[has_break]] - 1
+
+        # Check duration (≥3s)
+        durations = ends - starts + 1
+        keep = durations >= self.min_duration
+
+        for start_idx, end_idx, duration in zip(
+            starts[keep].tolist(), ends[keep].tolist(), durations[keep].tolist()
+        ):
+            # Attribute leadership
+            leader = self._attribute_leadership(mid_prices_df, start_idx, end_idx)
+
+            episode = {
+                "start_time": dispersion.index[start_idx],
+                "end_time": dispersion.index[end_idx],
+                "duration": duration,
+                "start_dispersion": values[start_idx],
+                "end_dispersion": values[end_idx],
+                "leader": leader,
+                "start_idx": start_idx,
+                "end_idx": end_idx,
+            }
+
+            episodes.append(episode)
 
         self.logger.info(f"Detected {len(episodes)} compression episodes")
 
@@ -403,12 +401,26 @@ class SpreadConvergenceAnalyzer:
 
         return {"overall": overall_shares, "by_environment": env_leadership}
 
-    def compute_statistical_tests(self, episodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def compute_statistical_tests(
+        self,
+        episodes: List[Dict[str, Any]],
+        timeline: Optional[pd.Index] = None,
+        n_permutations: int = 1000,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
         """
         Compute statistical tests for compression episodes.
 
+        The clustering permutation test places the episode starts at random,
+        distinct seconds of the sample. The p-value is the share of placements
+        whose mean gap between consecutive episodes is at most the observed one.
+
         Args:
             episodes: List of compression episodes
+            timeline: Timestamps episodes can start at (defaults to the
+                one-second grid of the episodes' start_idx positions)
+            n_permutations: Number of random placements
+            seed: Random seed for the placements
 
         Returns:
             Statistical test results
@@ -420,19 +432,13 @@ class SpreadConvergenceAnalyzer:
             }
 
         # Permutation test for episode clustering
-        n_permutations = 1000
         observed_clustering = self._compute_clustering_metric(episodes)
+        null_clustering = self._null_clustering(episodes, timeline, n_permutations, seed)
 
-        # Generate null distribution
-        null_clustering = []
-        for _ in range(n_permutations):
-            # Shuffle episode times
-            shuffled_episodes = episodes.copy()
-            np.random.shuffle([ep["start_time"] for ep in shuffled_episodes])
-            null_clustering.append(self._compute_clustering_metric(shuffled_episodes))
-
-        # Calculate p-value
-        p_value = np.mean(np.array(null_clustering) >= observed_clustering)
+        # Calculate p-value (no placement is possible if the timeline is too short)
+        p_value = (
+            np.mean(null_clustering <= observed_clustering) if len(null_clustering) > 0 else 1.0
+        )
 
         # Chi-square test for leadership distribution
         leader_counts = pd.Series([ep["leader"] for ep in episodes]).value_counts()
@@ -458,6 +464,37 @@ class SpreadConvergenceAnalyzer:
             },
         }
 
+    def _null_clustering(
+        self,
+        episodes: List[Dict[str, Any]],
+        timeline: Optional[pd.Index],
+        n_permutations: int,
+        seed: Optional[int],
+    ) -> np.ndarray:
+        """
+        Clustering metric of every random placement, from one (B x n) start matrix.
+
+        The mean gap between n sorted starts telescopes to (max - min) / (n - 1),
+        so the null only compares the span of the start times. Starts are drawn
+        from the seconds the detector can report, after the first lookback
+        window. Returns an empty array if those cannot hold every episode.
+        """
+        if timeline is not None:
+            stamps = pd.DatetimeIndex(timeline)
+            seconds = (stamps - stamps[0]).total_seconds().to_numpy()
+        else:
+            seconds = np.arange(max(ep["end_idx"] for ep in episodes) + 1, dtype=np.float64)
+        seconds = seconds[self.lookback_window :]
+
+        n_episodes = len(episodes)
+        if len(seconds) < n_episodes or n_permutations <= 0:
+            return np.empty(0)
+
+        rng = np.random.default_rng(seed)
+        positions = _distinct_positions(rng, len(seconds), n_episodes, n_permutations)
+        starts = np.sort(seconds[positions], axis=1)
+        return np.diff(starts, axis=1).mean(axis=1)
+
     def _compute_clustering_metric(self, episodes: List[Dict[str, Any]]) -> float:
         """Compute clustering metric for episodes."""
         if len(episodes) < 2:
@@ -583,7 +620,7 @@ class SpreadConvergenceAnalyzer:
         leadership_shares = self.compute_leadership_shares(episodes, cross_env_results)
 
         # Compute statistical tests
-        stats_results = self.compute_statistical_tests(episodes)
+        stats_results = self.compute_statistical_tests(episodes, timeline=dispersion.index)
 
         # Create episodes DataFrame
         episodes_df = pd.DataFrame(episodes)
@@ -620,6 +657,31 @@ class SpreadConvergenceAnalyzer:
         return result
 
 
+def _distinct_positions(rng: np.random.Generator, population: int, k: int, size: int) -> np.ndarray:
+    """
+    ``size`` rows of ``k`` distinct positions in range(population), uniformly drawn.
+
+    Rows are drawn with replacement and only rows holding a repeat are redrawn,
+    which is exact and touches (size x k) cells. When repeats are likely
+    (k^2 comparable to the population), the k smallest of random keys are
+    taken with argpartition instead, in batches of NULL_BATCH_CELLS keys.
+    """
+    if k * (k - 1) > population:
+        positions = np.empty((size, k), dtype=np.int64)
+        rows = max(1, NULL_BATCH_CELLS // population)
+        for lo in range(0, size, rows):
+            keys = rng.random((min(rows, size - lo), population))
+            positions[lo : lo + len(keys)] = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        return positions
+
+    positions = rng.integers(0, population, (size, k))
+    while True:
+        repeated = (np.diff(np.sort(positions, axis=1), axis=1) == 0).any(axis=1)
+        if not repeated.any():
+            return positions
+        positions[repeated] = rng.integers(0, population, (int(repeated.sum()), k))
+
+
 def create_spread_convergence_analyzer(spec_version: str = "1.0.0") -> SpreadConvergenceAnalyzer:
     """Create a spread convergence analyzer instance."""
     return SpreadConvergenceAnalyzer(spec_version=spec_version)
@@ -10,9 +10,125 @@ import json
 import logging
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
+from numpy.lib.stride_tricks import sliding_window_view
+
+from acdlib.alignment import align_long_frame
+
+# Same-sign jumps needed in one second for a coincidence event
+MIN_SYNC_VENUES = 3
+
+# Cells (shifts x seconds) evaluated per batch of the circular-shift null
+NULL_BATCH_CELLS = 1 << 24
+
+
+def signed_jump_matrix(jump_df: pd.DataFrame, venues: List[str]) -> np.ndarray:
+    """
+    Jump indicators of all venues as one (T x V) matrix.
+
+    Args:
+        jump_df: DataFrame with jump flags and signs
+        venues: Venue names
+
+    Returns:
+        int8 array holding each jump's sign (+1/-1) and 0 where a venue did not jump
+    """
+    signed = np.zeros((len(jump_df), len(venues)), dtype=np.int8)
+    for k, venue in enumerate(venues):
+        jumps = jump_df[f"{venue}_jump"].to_numpy(dtype=bool)
+        signs = np.sign(jump_df[f"{venue}_sign"].to_numpy(dtype=np.float64))
+        signed[jumps, k] = signs[jumps]
+    return signed
+
+
+def _coincident(n_up: np.ndarray, n_down: np.ndarray, min_venues: int) -> np.ndarray:
+    """Seconds where at least min_venues venues jump, all in the same direction."""
+    return ((n_up >= min_venues) & (n_down == 0)) | ((n_down >= min_venues) & (n_up == 0))
+
+
+def coincidence_rows(signed: np.ndarray, min_venues: int = MIN_SYNC_VENUES) -> np.ndarray:
+    """
+    Boolean mask of the seconds that start a coincidence event.
+
+    Args:
+        signed: Signed jump matrix of shape (T, V)
+        min_venues: Same-sign jumps required in the second
+
+    Returns:
+        Boolean array of shape (T,)
+    """
+    return _coincident((signed > 0).sum(axis=1), (signed < 0).sum(axis=1), min_venues)
+
+
+def window_venues(signed: np.ndarray, rows: np.ndarray, dt_window: int) -> np.ndarray:
+    """
+    Venues taking part in each event: those jumping in the event's second plus
+    those jumping the same way within the following dt_window seconds.
+
+    Args:
+        signed: Signed jump matrix of shape (T, V)
+        rows: Row indices of the events
+        dt_window: Look-ahead window in seconds
+
+    Returns:
+        Boolean array of shape (len(rows), V)
+    """
+    T, V = signed.shape
+    event_signs = np.sign(signed[rows].sum(axis=1))
+    # Rows (i, i + dt_window] through prefix sums of same-sign jumps
+    stop = np.minimum(rows + dt_window, T - 1) + 1
+    members = signed[rows] != 0
+    for sign in (1, -1):
+        counts = np.zeros((T + 1, V), dtype=np.int64)
+        np.cumsum(signed == sign, axis=0, out=counts[1:])
+        later = counts[stop] - counts[rows + 1] > 0
+        members |= later & (event_signs == sign)[:, None]
+    return members
+
+
+def circular_shift_null(
+    signed: np.ndarray,
+    n_shifts: int,
+    rng: np.random.Generator,
+    min_venues: int = MIN_SYNC_VENUES,
+) -> np.ndarray:
+    """
+    Coincidence counts after independently rotating each venue's jump series.
+
+    Rotations keep every venue's jump rate, sign mix and clustering while
+    breaking cross-venue timing. Each batch of shifts is evaluated as one
+    (shifts x T) array per venue, gathered from a doubled copy of the column.
+
+    Args:
+        signed: Signed jump matrix of shape (T, V)
+        n_shifts: Number of random rotations
+        rng: Random generator for the offsets
+        min_venues: Same-sign jumps required in a second
+
+    Returns:
+        int64 array of shape (n_shifts,) with the event count of each rotation
+    """
+    T, V = signed.shape
+    counts = np.zeros(n_shifts, dtype=np.int64)
+    if T == 0 or n_shifts == 0:
+        return counts
+
+    offsets = rng.integers(0, T, size=(n_shifts, V))
+    # Row v, window k of the view is venue v rotated by k seconds
+    rotations = [sliding_window_view(column, T) for column in np.tile(signed.T, 2)]
+    batch = max(1, NULL_BATCH_CELLS // T)
+    for start in range(0, n_shifts, batch):
+        stop = min(start + batch, n_shifts)
+        n_up = np.zeros((stop - start, T), dtype=np.int8)
+        n_down = np.zeros((stop - start, T), dtype=np.int8)
+        for v in range(V):
+            shifted = rotations[v][offsets[start:stop, v]]
+            n_up += shifted > 0
+            n_down += shifted < 0
+        counts[start:stop] = _coincident(n_up, n_down, min_venues).sum(axis=1)
+    return counts
 
 
 @dataclass
@@ -135,18 +251,9 @@ class SynchronousMoveDetector:
         Returns:
             Pivoted DataFrame with venues as columns
         """
-        # Pivot to get venues as columns
-        pivoted = df.pivot_table(
-            index="time", columns="venue", values="returns", aggfunc="first"
-        ).fillna(0)
-
-        # Ensure all venues are present
-        for venue in self.venues:
-            if venue not in pivoted.columns:
-                pivoted[venue] = 0
-
-        # Reorder columns
-        pivoted = pivoted[self.venues]
+        # Exact-time samples; seconds where a venue has no bar count as zero return
+        aligned = align_long_frame(df, "returns", self.venues, tolerance_ns=0)
+        pivoted = aligned.to_frame().fillna(0)
 
         self.logger.info(f"Aligned data: {len(pivoted)} time points, {len(pivoted.columns)} venues")
 
@@ -219,115 +326,65 @@ class SynchronousMoveDetector:
         Returns:
             List of coincidence events
         """
-        events = []
+        signed = signed_jump_matrix(jump_df, self.venues)
+        rows = np.flatnonzero(coincidence_rows(signed))
+        members = window_venues(signed, rows, dt_window)
+        event_signs = np.sign(signed[rows].sum(axis=1)).astype(np.float64)
 
-        for i, (timestamp, row) in enumerate(jump_df.iterrows()):
-            # Get venues that jumped at this time
-            jumping_venues = []
-            for venue in self.venues:
-                if row[f"{venue}_jump"]:
-                    jumping_venues.append(
-                        {"venue": venue, "sign": row[f"{venue}_sign"], "return": row[venue]}
-                    )
-
-            if len(jumping_venues) >= 3:
-                # Check for same sign
-                signs = [v["sign"] for v in jumping_venues]
-                if len(set(signs)) == 1:  # All same sign
-                    # Look for additional venues within dt_window
-                    window_venues = set(v["venue"] for v in jumping_venues)
-
-                    # Check future timestamps within window
-                    for j in range(i + 1, min(i + dt_window + 1, len(jump_df))):
-                        if j < len(jump_df):
-                            future_row = jump_df.iloc[j]
-                            for venue in self.venues:
-                                if (
-                                    future_row[f"{venue}_jump"]
-                                    and future_row[f"{venue}_sign"] == signs[0]
-                                    and venue not in window_venues
-                                ):
-                                    window_venues.add(venue)
-
-                    if len(window_venues) >= 3:
-                        events.append(
-                            {
-                                "time": timestamp,
-                                "venues": list(window_venues),
-                                "sign": signs[0],
-                                "n_venues": len(window_venues),
-                                "dt_window": dt_window,
-                                "returns": {
-                                    venue: jump_df.loc[timestamp, venue] for venue in window_venues
-                                },
-                            }
-                        )
+        returns = {v: jump_df[v].to_numpy() for v in self.venues if v in jump_df.columns}
+
+        events = []
+        for row, event_venues, sign in zip(rows, members, event_signs):
+            venues = [venue for venue, member in zip(self.venues, event_venues) if member]
+            events.append(
+                {
+                    "time": jump_df.index[row],
+                    "venues": venues,
+                    "sign": sign,
+                    "n_venues": len(venues),
+                    "dt_window": dt_window,
+                    "returns": {venue: returns[venue][row] for venue in venues},
+                }
+            )
 
         self.logger.info(f"Detected {len(events)} coincidence events for dt={dt_window}s")
 
         return events
 
     def compute_expected_coincidences(
-        self, jump_df: pd.DataFrame, dt_window: int, n_bootstrap: int = 1000
+        self,
+        jump_df: pd.DataFrame,
+        dt_window: int,
+        n_bootstrap: int = 1000,
+        seed: Optional[int] = None,
     ) -> Tuple[float, float]:
         """
         Compute expected coincidences under independence.
 
+        The null rotates each venue's jump series by an independent random
+        offset, which preserves per-venue jump rates and clustering but
+        destroys synchronisation between venues.
+
         Args:
             jump_df: DataFrame with jump flags
             dt_window: Time window in seconds
-            n_bootstrap: Number of bootstrap samples
+            n_bootstrap: Number of circular-shift permutations
+            seed: Random seed for the permutations
 
         Returns:
             Tuple of (expected_coincidences, p_value)
         """
-        # Extract jump probabilities for each venue
-        jump_probs = {}
-        for venue in self.venues:
-            if f"{venue}_jump" in jump_df.columns:
-                jump_probs[venue] = jump_df[f"{venue}_jump"].mean()
-            else:
-                jump_probs[venue] = 0.0
-
-        # Bootstrap simulation
-        bootstrap_coincidences = []
-
-        for _ in range(n_bootstrap):
-            # Simulate independent jumps
-            simulated_jumps = {}
-            for venue in self.venues:
-                prob = jump_probs[venue]
-                simulated_jumps[venue] = np.random.binomial(1, prob, len(jump_df))
-
-            # Count coincidences in simulation
-            sim_coincidences = 0
-            for i in range(len(jump_df)):
-                # Count venues jumping at this time
-                jumping_venues = [v for v in self.venues if simulated_jumps[v][i]]
-
-                if len(jumping_venues) >= 3:
-                    # Check for same sign (simplified - assume random signs)
-                    signs = np.random.choice([-1, 1], len(jumping_venues))
-                    if len(set(signs)) == 1:  # All same sign
-                        # Check window
-                        window_venues = set(jumping_venues)
-                        for j in range(i + 1, min(i + dt_window + 1, len(jump_df))):
-                            if j < len(jump_df):
-                                future_jumping = [v for v in self.venues if simulated_jumps[v][j]]
-                                for venue in future_jumping:
-                                    if venue not in window_venues:
-                                        window_venues.add(venue)
-
-                        if len(window_venues) >= 3:
-                            sim_coincidences += 1
-
-            bootstrap_coincidences.append(sim_coincidences)
-
-        expected_coincidences = np.mean(bootstrap_coincidences)
-        p_value = np.mean(
-            np.array(bootstrap_coincidences)
-            >= len(self.detect_coincidence_events(jump_df, dt_window))
-        )
+        signed = signed_jump_matrix(jump_df, self.venues)
+        observed = int(coincidence_rows(signed).sum())
+
+        # Events start at seconds with enough same-sign jumps, so the look-ahead
+        # window (dt_window) never changes the event count
+        null_counts = circular_shift_null(signed, n_bootstrap, np.random.default_rng(seed))
+        if len(null_counts) == 0:
+            return 0.0, 1.0
+
+        expected_coincidences = float(np.mean(null_counts))
+        p_value = float(np.mean(null_counts >= observed))
 
         return expected_coincidences, p_value
 
@@ -20,6 +20,17 @@ import sys
 from pathlib import Path
 import csv
 
+try:
+    from .tick_sink import BufferedTickSink
+except ImportError:  # run as a script: python src/acd/capture/overlap_orchestrator.py
+    from tick_sink import BufferedTickSink
+
+try:
+    from acdlib.io.overlap_tracker import OverlapTracker
+except ImportError:  # acdlib lives next to acd under src/
+    sys.path.append(str(Path(__file__).resolve().parents[2]))
+    from acdlib.io.overlap_tracker import OverlapTracker
+
 logger = logging.getLogger(__name__)
 
 
@@ -91,6 +102,14 @@ class OverlapOrchestrator:
         # Initialize heartbeat CSV
         self._init_heartbeat_csv()
 
+        # Buffered tick writer: data/ticks/<exchange>/<pair>/1s/<YYYY-MM-DD>/<HH>/ticks_<MM>.parquet
+        self.tick_sink = BufferedTickSink(root="data/ticks")
+
+        # Coverage intervals fed from persisted ticks; overlap checks never touch disk
+        self.overlap_tracker = OverlapTracker(
+            self.venues, max_gap_s=max_gap_s, retention_s=self.capture_duration.total_seconds()
+        )
+
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
@@ -178,6 +197,8 @@ class OverlapOrchestrator:
     def _cleanup(self):
         """Clean up resources on shutdown."""
         try:
+            # Write out buffered ticks and close open minute files
+            self.tick_sink.close()
             # Flush final status
             self._write_status()
             # Remove PID file
@@ -216,6 +237,7 @@ class OverlapOrchestrator:
                 "last_check_utc": datetime.now().isoformat(),
                 "capture_uptime_sec": (datetime.now() - self.capture_start).total_seconds(),
                 "micro_gap_stitch": self.micro_gap_stitch,
+                "tick_sink": self.tick_sink.metrics(),
             }
 
             with open(self.status_file, "w") as f:
@@ -823,41 +845,21 @@ class OverlapOrchestrator:
         last_trade_qty: float,
         event_type: str,
     ):
-        """Persist normalized tick data to parquet partitions."""
+        """Persist normalized tick data to parquet partitions (buffered per minute)."""
         try:
-            # Create directory structure: data/ticks/<exchange>/<pair>/1s/<YYYY-MM-DD>/<HH>/
-            dt = datetime.fromtimestamp(ts_local / 1000)
-            date_str = dt.strftime("%Y-%m-%d")
-            hour_str = dt.strftime("%H")
-
-            base_dir = Path("data/ticks") / exchange / pair / "1s" / date_str / hour_str
-            base_dir.mkdir(parents=True, exist_ok=True)
-
-            # Create tick row
-            tick_data = {
-                "exchange": exchange,
-                "pair": pair,
-                "ts_exchange": ts_exchange,
-                "ts_local": ts_local,
-                "best_bid": best_bid,
-                "best_ask": best_ask,
-                "mid": mid,
-                "last_trade_px": last_trade_px,
-                "last_trade_qty": last_trade_qty,
-                "event_type": event_type,
-            }
-
-            # Append to parquet file (create new file every minute for efficiency)
-            minute_str = dt.strftime("%M")
-            file_path = base_dir / f"ticks_{minute_str}.parquet"
-
-            df = pd.DataFrame([tick_data])
-            if file_path.exists():
-                existing_df = pd.read_parquet(file_path)
-                df = pd.concat([existing_df, df], ignore_index=True)
-
-            df.to_parquet(file_path, index=False)
-
+            self.overlap_tracker.add(exchange, int(ts_local))
+            await self.tick_sink.put(
+                exchange,
+                pair,
+                ts_exchange,
+                ts_local,
+                best_bid,
+                best_ask,
+                mid,
+                last_trade_px,
+                last_trade_qty,
+                event_type,
+            )
         except Exception as e:
             logger.error(f"Error persisting tick for {exchange}: {e}")
 
@@ -888,25 +890,20 @@ class OverlapOrchestrator:
                 # Write status
                 self._write_status()
 
+            # Finalize minutes of venues that have gone quiet so readers can see them
+            self.tick_sink.close_stale()
+
+            # Writer health: flush latency and queue depth
+            print(f"[CAPTURE:sink] {json.dumps(self.tick_sink.metrics())}")
+
     async def _overlap_monitor(self):
         """Monitor for strict overlap windows."""
         while datetime.now() < self.capture_end:
             await asyncio.sleep(self.check_interval)
 
             try:
-                # Import overlap finder
-                sys.path.append("src")
-                from acdlib.io.overlap import find_real_overlap_rolling
-
-                # Check for overlap
-                result = find_real_overlap_rolling(
-                    self.venues,
-                    self.pair,
-                    freq=self.freq,
-                    max_gap_s=self.max_gap_s,
-                    min_minutes=self.min_minutes,
-                    quorum=self.quorum,
-                )
+                # Check for overlap against the tracked coverage (no partition rescans)
+                result = self.overlap_tracker.find_overlap(self.min_minutes, self.quorum)
 
                 if result:
                     start, end, venues_used, policy = result
@@ -1004,6 +1001,9 @@ class OverlapOrchestrator:
             # Wait for overlap or timeout
             overlap_found = await asyncio.gather(*tasks, return_exceptions=True)
 
+            # Write out buffered ticks before reporting
+            await self.tick_sink.aclose()
+
             # Check if overlap was found
             if any(isinstance(result, bool) and result for result in overlap_found):
                 logger.info("Overlap found - stopping capture")
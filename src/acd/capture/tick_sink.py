@@ -0,0 +1,318 @@
+"""
+Buffered columnar tick sink for the capture orchestrator.
+
+Ticks are appended to per-(venue, minute) column buffers and handed to a single
+background writer thread on minute rollover or once a buffer reaches
+``flush_rows``. Each flush becomes one parquet row group; a minute file is
+written as ``ticks_MM.parquet.partial`` and renamed to ``ticks_MM.parquet``
+when the minute is closed (on rollover, or by ``close_stale`` once a quiet
+stream's minute has passed), so readers globbing ``*.parquet`` only see
+complete files.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+TICK_SCHEMA = pa.schema(
+    [
+        ("exchange", pa.string()),
+        ("pair", pa.string()),
+        ("ts_exchange", pa.int64()),
+        ("ts_local", pa.int64()),
+        ("best_bid", pa.float64()),
+        ("best_ask", pa.float64()),
+        ("mid", pa.float64()),
+        ("last_trade_px", pa.float64()),
+        ("last_trade_qty", pa.float64()),
+        ("event_type", pa.string()),
+    ]
+)
+
+# (exchange, pair, "YYYY-MM-DD", "HH", "MM")
+MinuteKey = Tuple[str, str, str, str, str]
+
+
+@dataclass
+class TickSinkMetrics:
+    """Counters exposed by BufferedTickSink.metrics()."""
+
+    ticks_received: int = 0
+    ticks_written: int = 0
+    flushes: int = 0
+    files_closed: int = 0
+    write_errors: int = 0
+    stale_closes: int = 0
+    max_queue_depth: int = 0
+    last_flush_ms: float = 0.0
+    max_flush_ms: float = 0.0
+    total_flush_ms: float = 0.0
+
+
+class BufferedTickSink:
+    """Async-friendly tick writer with per-minute column buffers."""
+
+    def __init__(
+        self,
+        root: str = "data/ticks",
+        freq_dir: str = "1s",
+        flush_rows: int = 2000,
+        max_pending_flushes: int = 64,
+        compression: str = "snappy",
+    ):
+        self.root = Path(root)
+        self.freq_dir = freq_dir
+        self.flush_rows = flush_rows
+        self.max_pending_flushes = max_pending_flushes
+        self.compression = compression
+
+        self._buffers: Dict[MinuteKey, Dict[str, list]] = {}
+        self._current_minute: Dict[Tuple[str, str], MinuteKey] = {}
+        self._pending: Deque[Future] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._metrics = TickSinkMetrics()
+        self._metrics_lock = threading.Lock()
+
+        # Writer-thread state: open parquet writers per minute file
+        self._writers: Dict[MinuteKey, Tuple[pq.ParquetWriter, Path, Path]] = {}
+
+    async def put(
+        self,
+        exchange: str,
+        pair: str,
+        ts_exchange: int,
+        ts_local: int,
+        best_bid: float,
+        best_ask: float,
+        mid: float,
+        last_trade_px: float,
+        last_trade_qty: float,
+        event_type: str,
+    ) -> None:
+        """Buffer one tick; waits only when the writer thread falls behind."""
+        self.add(
+            exchange,
+            pair,
+            ts_exchange,
+            ts_local,
+            best_bid,
+            best_ask,
+            mid,
+            last_trade_px,
+            last_trade_qty,
+            event_type,
+        )
+        # Backpressure instead of dropping: wait for the oldest flush to finish
+        while len(self._pending) > self.max_pending_flushes:
+            await asyncio.wrap_future(self._pending[0])
+            self._prune_pending()
+
+    def add(
+        self,
+        exchange: str,
+        pair: str,
+        ts_exchange: int,
+        ts_local: int,
+        best_bid: float,
+        best_ask: float,
+        mid: float,
+        last_trade_px: float,
+        last_trade_qty: float,
+        event_type: str,
+    ) -> None:
+        """Append one tick to its minute buffer (never blocks on I/O)."""
+        dt = datetime.fromtimestamp(ts_local / 1000)
+        key = (exchange, pair, dt.strftime("%Y-%m-%d"), dt.strftime("%H"), dt.strftime("%M"))
+
+        stream = (exchange, pair)
+        previous = self._current_minute.get(stream)
+        if previous != key:
+            if previous is not None:
+                # Minute rollover: hand off what is left and close the file
+                self._flush(previous, close=True)
+            self._current_minute[stream] = key
+
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = {name: [] for name in TICK_SCHEMA.names}
+        buffer["exchange"].append(exchange)
+        buffer["pair"].append(pair)
+        buffer["ts_exchange"].append(int(ts_exchange))
+        buffer["ts_local"].append(int(ts_local))
+        buffer["best_bid"].append(float(best_bid))
+        buffer["best_ask"].append(float(best_ask))
+        buffer["mid"].append(float(mid))
+        buffer["last_trade_px"].append(float(last_trade_px))
+        buffer["last_trade_qty"].append(float(last_trade_qty))
+        buffer["event_type"].append(event_type)
+        with self._metrics_lock:
+            self._metrics.ticks_received += 1
+
+        if len(buffer["ts_local"]) >= self.flush_rows:
+            self._flush(key, close=False)
+
+    def flush(self) -> None:
+        """Hand every non-empty buffer to the writer without closing files."""
+        for key in list(self._buffers):
+            self._flush(key, close=False)
+
+    def close_stale(self, now_ms: Optional[int] = None) -> int:
+        """
+        Close the open minute of every stream whose last tick is before the current minute.
+
+        Rollover only happens when a stream's next tick arrives, so a venue that goes
+        quiet would otherwise leave its last minute as ``.partial`` indefinitely.
+        Call this periodically (the orchestrator does so on every heartbeat).
+
+        Args:
+            now_ms: Local wall-clock time in ms (defaults to now)
+
+        Returns:
+            Number of minute files handed to the writer for closing
+        """
+        now = datetime.now() if now_ms is None else datetime.fromtimestamp(now_ms / 1000)
+        current = (now.strftime("%Y-%m-%d"), now.strftime("%H"), now.strftime("%M"))
+
+        closed = 0
+        for stream, key in list(self._current_minute.items()):
+            # Zero-padded date/hour/minute strings compare chronologically
+            if key[2:] < current:
+                self._flush(key, close=True)
+                del self._current_minute[stream]
+                closed += 1
+        if closed:
+            with self._metrics_lock:
+                self._metrics.stale_closes += closed
+        return closed
+
+    def close(self) -> None:
+        """Flush everything, close all minute files and stop the writer thread."""
+        for key in set(self._buffers) | set(self._current_minute.values()):
+            self._flush(key, close=True)
+        self._current_minute.clear()
+
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def wait(self) -> None:
+        """Block until every submitted flush has been written."""
+        for future in list(self._pending):
+            future.result()
+        self._prune_pending()
+
+    async def aclose(self) -> None:
+        """Async wrapper around ``close`` that keeps the event loop responsive."""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    @property
+    def queue_depth(self) -> int:
+        """Flushes submitted to the writer thread but not yet finished."""
+        self._prune_pending()
+        return len(self._pending)
+
+    def metrics(self) -> Dict[str, float]:
+        """Snapshot of throughput, flush latency and queue depth."""
+        m = self._metrics
+        with self._metrics_lock:
+            return {
+                "ticks_received": m.ticks_received,
+                "ticks_written": m.ticks_written,
+                "ticks_buffered": sum(len(b["ts_local"]) for b in self._buffers.values()),
+                "flushes": m.flushes,
+                "files_closed": m.files_closed,
+                "write_errors": m.write_errors,
+                "stale_closes": m.stale_closes,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": m.max_queue_depth,
+                "last_flush_ms": round(m.last_flush_ms, 3),
+                "max_flush_ms": round(m.max_flush_ms, 3),
+                "mean_flush_ms": round(m.total_flush_ms / m.flushes, 3) if m.flushes else 0.0,
+            }
+
+    def _flush(self, key: MinuteKey, close: bool) -> None:
+        buffer = self._buffers.pop(key, None)
+        if buffer is None and not close:
+            return
+        self._submit(key, buffer, close)
+
+    def _submit(self, key: MinuteKey, buffer: Optional[Dict[str, list]], close: bool) -> None:
+        if self._executor is None:
+            # One writer thread keeps row groups of a file in submission order
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tick-sink")
+        self._pending.append(self._executor.submit(self._write, key, buffer, close))
+        self._prune_pending()
+        with self._metrics_lock:
+            self._metrics.max_queue_depth = max(self._metrics.max_queue_depth, len(self._pending))
+
+    def _prune_pending(self) -> None:
+        while self._pending and self._pending[0].done():
+            self._pending.popleft()
+
+    def _write(self, key: MinuteKey, buffer: Optional[Dict[str, list]], close: bool) -> None:
+        """Writer-thread job: append one row group and optionally close the file."""
+        start = time.perf_counter()
+        rows = 0
+        try:
+            if buffer:
+                table = pa.table(
+                    {
+                        name: pa.array(buffer[name], type=TICK_SCHEMA.field(name).type)
+                        for name in TICK_SCHEMA.names
+                    },
+                    schema=TICK_SCHEMA,
+                )
+                self._writer_for(key).write_table(table)
+                rows = table.num_rows
+            if close and key in self._writers:
+                writer, partial_path, final_path = self._writers.pop(key)
+                writer.close()
+                partial_path.replace(final_path)
+                with self._metrics_lock:
+                    self._metrics.files_closed += 1
+        except Exception as e:
+            with self._metrics_lock:
+                self._metrics.write_errors += 1
+            logger.error(f"Error writing ticks for {key[0]} {key[2]} {key[3]}:{key[4]}: {e}")
+            return
+
+        if rows:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self._metrics_lock:
+                m = self._metrics
+                m.ticks_written += rows
+                m.flushes += 1
+                m.last_flush_ms = elapsed_ms
+                m.max_flush_ms = max(m.max_flush_ms, elapsed_ms)
+                m.total_flush_ms += elapsed_ms
+
+    def _writer_for(self, key: MinuteKey) -> pq.ParquetWriter:
+        if key not in self._writers:
+            exchange, pair, date_str, hour_str, minute_str = key
+            base_dir = self.root / exchange / pair / self.freq_dir / date_str / hour_str
+            base_dir.mkdir(parents=True, exist_ok=True)
+
+            # Never overwrite a closed file for the same minute (e.g. after a restart)
+            final_path = base_dir / f"ticks_{minute_str}.parquet"
+            suffix = 1
+            while final_path.exists():
+                final_path = base_dir / f"ticks_{minute_str}_{suffix}.parquet"
+                suffix += 1
+
+            partial_path = final_path.with_name(final_path.name + ".partial")
+            writer = pq.ParquetWriter(partial_path, TICK_SCHEMA, compression=self.compression)
+            self._writers[key] = (writer, partial_path, final_path)
+        return self._writers[key][0]
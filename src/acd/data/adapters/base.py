@@ -5,9 +5,16 @@ Base adapter interface for market data access.
 from abc import ABC, abstractmethod
 
 # from typing import Dict, Any, Optional  # Unused for now
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+BAR_COLUMNS = ["time", "open", "high", "low", "close", "volume"]
+
+# Random streams of the synthetic generators; the minute stream keeps the plain day seed
+MINUTE_STREAM = 0
+SECOND_STREAM = 1
+
 
 class BaseBarsAdapter(ABC):
     """
@@ -17,6 +24,9 @@ class BaseBarsAdapter(ABC):
     OHLCV data with consistent schema.
     """
 
+    # Seed of the synthetic bar generators
+    seed = 42
+
     @abstractmethod
     def get(
         self, pair: str, venue: str, start_utc: datetime, end_utc: datetime, tz: str = "UTC"
@@ -36,6 +46,20 @@ class BaseBarsAdapter(ABC):
         """
         pass
 
+    def _day_rng(self, day: pd.Timestamp, stream: int = MINUTE_STREAM) -> np.random.Generator:
+        """
+        Random generator for one UTC day of synthetic bars.
+
+        Seeding per day (from the adapter seed and the day) makes a day's bars
+        the same whether a range is generated at once or streamed day by day.
+        Each generator draws from its own stream, so second-bar noise is not a
+        replay of the minute returns it is derived from.
+        """
+        entropy = [self.seed, int(day.value // 10**9)]
+        if stream != MINUTE_STREAM:
+            entropy.append(stream)
+        return np.random.default_rng(entropy)
+
     def _standardize_schema(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Standardize DataFrame schema to [time, open, high, low, close, volume].
@@ -5,11 +5,13 @@ Minute-level bars adapter for market data access.
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from typing import Iterator, Tuple
 
-# from typing import Dict, Any, Optional  # Unused for now
 import logging
 
-from .base import BaseBarsAdapter
+from .base import BAR_COLUMNS, BaseBarsAdapter
+
+BASE_PRICE = 45000.0  # Base BTC price
 
 
 class MinuteBarsAdapter(BaseBarsAdapter):
@@ -19,8 +21,9 @@ class MinuteBarsAdapter(BaseBarsAdapter):
     Provides standardized access to minute bars with caching support.
     """
 
-    def __init__(self, cache_enabled: bool = True):
+    def __init__(self, cache_enabled: bool = True, seed: int = 42):
         self.cache_enabled = cache_enabled
+        self.seed = seed
         self.logger = logging.getLogger(__name__)
 
     def get(
@@ -59,6 +62,28 @@ class MinuteBarsAdapter(BaseBarsAdapter):
 
         return df
 
+    def iter_chunks(
+        self, pair: str, venue: str, start_utc: datetime, end_utc: datetime, tz: str = "UTC"
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream minute bars one UTC day at a time (same bars as ``get``).
+
+        Args:
+            pair: Trading pair (e.g., 'BTC-USD')
+            venue: Exchange venue (e.g., 'binance')
+            start_utc: Start datetime in UTC
+            end_utc: End datetime in UTC
+            tz: Timezone for output (default: 'UTC')
+
+        Yields:
+            DataFrame per day with columns: [time, open, high, low, close, volume]
+        """
+        for df in self._iter_minute_data(pair, venue, start_utc, end_utc):
+            df = self._validate_data(self._standardize_schema(df))
+            if tz != "UTC":
+                df["time"] = df["time"].dt.tz_convert(tz)
+            yield df
+
     def _fetch_minute_data(
         self, pair: str, venue: str, start_utc: datetime, end_utc: datetime
     ) -> pd.DataFrame:
@@ -74,61 +99,79 @@ class MinuteBarsAdapter(BaseBarsAdapter):
         Returns:
             DataFrame with minute bars
         """
+        days = list(self._iter_minute_data(pair, venue, start_utc, end_utc))
+        if not days:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        df = pd.concat(days, ignore_index=True) if len(days) > 1 else days[0]
+
+        self.logger.info(
+            f"[DATA:minute:generated] {len(df)} synthetic minute bars for {venue}:{pair}"
+        )
+
+        return df
+
+    def _iter_minute_data(
+        self, pair: str, venue: str, start_utc: datetime, end_utc: datetime
+    ) -> Iterator[pd.DataFrame]:
+        """Synthetic minute bars per UTC day; the price path continues across days."""
         # Generate synthetic minute data for now
         # In production, this would connect to real data feeds
-
-        # Create minute timestamps
         start = start_utc.replace(second=0, microsecond=0)
         end = end_utc.replace(second=0, microsecond=0)
-
         timestamps = pd.date_range(start=start, end=end, freq="1min", tz="UTC")
 
-        # Generate synthetic OHLCV data
-        np.random.seed(42)  # Deterministic for reproducibility
+        log_price = np.log(BASE_PRICE)
+        for day_times in _split_days(timestamps):
+            df, log_price = self._synthetic_minutes(day_times, venue, log_price)
+            yield df
+
+    def _synthetic_minutes(
+        self, timestamps: pd.DatetimeIndex, venue: str, log_price: float
+    ) -> Tuple[pd.DataFrame, float]:
+        """
+        Synthetic OHLCV bars for one day of minute timestamps.
+
+        Args:
+            timestamps: Minute timestamps within one UTC day
+            venue: Exchange venue
+            log_price: Log price before the first bar
 
+        Returns:
+            (bars, log price after the last bar)
+        """
+        rng = self._day_rng(timestamps[0].floor("1D"))
         n_bars = len(timestamps)
-        base_price = 45000.0  # Base BTC price
-
-        # Generate price series with some trend and volatility
-        returns = np.random.normal(0, 0.001, n_bars)  # 0.1% volatility per minute
-        prices = base_price * np.exp(np.cumsum(returns))
-
-        # Create OHLCV bars
-        data = []
-        for i, (ts, price) in enumerate(zip(timestamps, prices)):
-            # Add some intraday variation
-            volatility = 0.0005  # 0.05% intraday volatility
-
-            open_price = price * (1 + np.random.normal(0, volatility))
-            close_price = price * (1 + np.random.normal(0, volatility))
-            high_price = max(open_price, close_price) * (
-                1 + abs(np.random.normal(0, volatility / 2))
-            )
-            low_price = min(open_price, close_price) * (
-                1 - abs(np.random.normal(0, volatility / 2))
-            )
-
-            # Ensure OHLC relationships
-            high_price = max(high_price, open_price, close_price)
-            low_price = min(low_price, open_price, close_price)
-
-            # Generate volume (correlated with price movement)
-            price_change = abs(close_price - open_price) / open_price
-            base_volume = 1000.0  # Base volume
-            volume = base_volume * (1 + price_change * 10) * (1 + np.random.exponential(0.5))
-
-            data.append(
-                {
-                    "time": ts,
-                    "open": round(open_price, 2),
-                    "high": round(high_price, 2),
-                    "low": round(low_price, 2),
-                    "close": round(close_price, 2),
-                    "volume": round(volume, 2),
-                }
-            )
-
-        df = pd.DataFrame(data)
+
+        # Price path with some trend and volatility (0.1% per minute)
+        log_prices = log_price + np.cumsum(rng.normal(0, 0.001, n_bars))
+        prices = np.exp(log_prices)
+
+        # Intraday variation (0.05%); high/low extend beyond open and close
+        volatility = 0.0005
+        open_price = prices * (1 + rng.normal(0, volatility, n_bars))
+        close_price = prices * (1 + rng.normal(0, volatility, n_bars))
+        high_price = np.maximum(open_price, close_price) * (
+            1 + np.abs(rng.normal(0, volatility / 2, n_bars))
+        )
+        low_price = np.minimum(open_price, close_price) * (
+            1 - np.abs(rng.normal(0, volatility / 2, n_bars))
+        )
+
+        # Volume correlated with price movement
+        price_change = np.abs(close_price - open_price) / open_price
+        base_volume = 1000.0
+        volume = base_volume * (1 + price_change * 10) * (1 + rng.exponential(0.5, n_bars))
+
+        df = pd.DataFrame(
+            {
+                "time": timestamps,
+                "open": np.round(open_price, 2),
+                "high": np.round(high_price, 2),
+                "low": np.round(low_price, 2),
+                "close": np.round(close_price, 2),
+                "volume": np.round(volume, 2),
+            }
+        )
 
         # Add venue-specific characteristics
         if venue == "binance":
@@ -140,8 +183,14 @@ class MinuteBarsAdapter(BaseBarsAdapter):
             df["high"] = df["open"] + (df["high"] - df["open"]) * spread_factor
             df["low"] = df["open"] - (df["open"] - df["low"]) * spread_factor
 
-        self.logger.info(
-            f"[DATA:minute:generated] {len(df)} synthetic minute bars for {venue}:{pair}"
-        )
+        return df, float(log_prices[-1])
 
-        return df
+
+def _split_days(timestamps: pd.DatetimeIndex) -> Iterator[pd.DatetimeIndex]:
+    """Consecutive runs of a sorted DatetimeIndex that fall on the same UTC day."""
+    if len(timestamps) == 0:
+        return
+    days = timestamps.floor("1D").asi8
+    bounds = np.flatnonzero(days[1:] != days[:-1]) + 1
+    for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(timestamps)]):
+        yield timestamps[start:stop]
@@ -8,26 +8,43 @@ This module provides adapters for fetching real tick/trade data from:
 - OKX
 - Bybit
 
-Each adapter standardizes data to schema: [timestamp, price, volume, venue]
+Each adapter standardizes data to schema: [timestamp, price, volume, trade_id, venue]
+
+Adapters page through a venue's trade history with a trade-id or time cursor
+(``_page_params``/``_next_cursor``), so a range holding more than one page of
+trades is fetched completely; see ``trade_backfill`` for the concurrent,
+checkpointed multi-venue backfill built on the same hooks.
 """
 
 import logging
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 import requests
 from abc import ABC, abstractmethod
 
 logger = logging.getLogger(__name__)
 
+TRADE_COLUMNS = ["timestamp", "price", "volume", "trade_id"]
+
+# Safety stop for cursors that never reach the end of the range
+MAX_PAGES = 10_000
+
 
 class RealTickAdapter(ABC):
     """Abstract base class for real tick data adapters."""
 
-    def __init__(self, venue: str, pair: str = "BTC-USD"):
+    # Largest page the venue serves and its public REST request budget
+    max_page_size = 1000
+    rate_limit_per_s = 5.0
+
+    # Whether the first page is always the venue's newest trades, whatever the range
+    pages_from_newest = False
+
+    def __init__(self, venue: str, pair: str = "BTC-USD", base_url: Optional[str] = None):
         self.venue = venue
         self.pair = pair
-        self.base_url = self._get_base_url()
+        self.base_url = base_url or self._get_base_url()
 
     @abstractmethod
     def _get_base_url(self) -> str:
@@ -48,46 +65,119 @@ class RealTickAdapter(ABC):
         self, start_time: datetime, end_time: datetime, limit: int = 1000
     ) -> pd.DataFrame:
         """
-        Fetch trades for the specified time range.
+        Fetch all trades for the specified time range, page by page.
 
         Args:
-            start_time: Start datetime (UTC)
-            end_time: End datetime (UTC)
+            start_time: Start datetime (UTC; naive values are taken as UTC)
+            end_time: End datetime (UTC, inclusive)
             limit: Maximum number of trades per request
 
         Returns:
-            DataFrame with columns: [timestamp, price, volume, venue]
+            DataFrame with columns: [timestamp, price, volume, trade_id, venue]
         """
         try:
             # Convert to venue-specific timestamp format
-            start_ts = int(start_time.timestamp() * 1000)  # milliseconds
-            end_ts = int(end_time.timestamp() * 1000)
-
-            # Fetch data from venue API
-            raw_data = self._fetch_raw_trades(start_ts, end_ts, limit)
-
-            if not raw_data:
+            start_ts = _epoch_ms(start_time)
+            end_ts = _epoch_ms(end_time)
+
+            pages = []
+            cursor = None
+            with requests.Session() as session:
+                for _ in range(MAX_PAGES):
+                    raw_data = self._fetch_raw_trades(start_ts, end_ts, limit, cursor, session)
+                    page = self._parse_page(raw_data)
+                    if page.empty:
+                        break
+                    pages.append(page)
+                    next_cursor = self._next_cursor(raw_data, page, start_ts, end_ts, limit)
+                    if next_cursor is None or next_cursor == cursor:
+                        break
+                    cursor = next_cursor
+
+            df = self._combine_pages(pages, start_ts, end_ts)
+            if df.empty:
                 logger.warning(f"No trade data found for {self.venue} {self.pair}")
-                return pd.DataFrame(columns=["timestamp", "price", "volume", "venue"])
-
-            # Parse and standardize
-            df = self._parse_trade_data(raw_data)
-            df["venue"] = self.venue
+                return df
 
-            logger.info(f"Fetched {len(df)} trades for {self.venue} {self.pair}")
+            logger.info(
+                f"Fetched {len(df)} trades for {self.venue} {self.pair} in {len(pages)} pages"
+            )
             return df
 
         except Exception as e:
             logger.error(f"Error fetching trades from {self.venue}: {e}")
-            return pd.DataFrame(columns=["timestamp", "price", "volume", "venue"])
+            return pd.DataFrame(columns=TRADE_COLUMNS + ["venue"])
+
+    async def fetch_trades_async(
+        self,
+        get_json: Callable[[str, Dict], Awaitable[Any]],
+        start_ts: int,
+        end_ts: int,
+        limit: int = 1000,
+        max_pages: int = MAX_PAGES,
+    ) -> pd.DataFrame:
+        """
+        Page through the trades in [start_ts, end_ts] with an async transport.
 
-    def _fetch_raw_trades(self, start_ts: int, end_ts: int, limit: int) -> List[Dict]:
-        """Fetch raw trade data from venue API."""
+        Errors from ``get_json`` propagate, so a failed page never yields a
+        silently truncated result.
+
+        Args:
+            get_json: Coroutine function (url, params) -> decoded JSON response
+            start_ts: Range start in epoch milliseconds
+            end_ts: Range end in epoch milliseconds (inclusive)
+            limit: Maximum number of trades per request
+            max_pages: Stop after this many pages
+
+        Returns:
+            DataFrame with columns: [timestamp, price, volume, trade_id, venue]
+        """
+        pages = [
+            page
+            async for page in self.iter_pages_async(get_json, start_ts, end_ts, limit, max_pages)
+        ]
+        return self._combine_pages(pages, start_ts, end_ts)
+
+    async def iter_pages_async(
+        self,
+        get_json: Callable[[str, Dict], Awaitable[Any]],
+        start_ts: int,
+        end_ts: int,
+        limit: int = 1000,
+        max_pages: int = MAX_PAGES,
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Yield the parsed pages covering [start_ts, end_ts] in the venue's paging order.
+
+        Pages are not trimmed to the range; see ``fetch_trades_async``.
+        """
+        url = self._get_trades_endpoint()
+        cursor = None
+        for _ in range(max_pages):
+            raw_data = await get_json(url, self._page_params(start_ts, end_ts, limit, cursor))
+            page = self._parse_page(raw_data)
+            if page.empty:
+                return
+            yield page
+            next_cursor = self._next_cursor(raw_data, page, start_ts, end_ts, limit)
+            if next_cursor is None or next_cursor == cursor:
+                return
+            cursor = next_cursor
+
+    def _fetch_raw_trades(
+        self,
+        start_ts: int,
+        end_ts: int,
+        limit: int,
+        cursor: Any = None,
+        session: Optional[requests.Session] = None,
+    ) -> List[Dict]:
+        """Fetch one page of raw trade data from venue API."""
         try:
             url = self._get_trades_endpoint()
-            params = self._get_trades_params(start_ts, end_ts, limit)
+            params = self._page_params(start_ts, end_ts, limit, cursor)
 
-            response = requests.get(url, params=params, timeout=30)
+            response = (session or requests).get(url, params=params, timeout=30)
             response.raise_for_status()
 
             return response.json()
@@ -101,9 +191,42 @@ class RealTickAdapter(ABC):
         """Get API parameters for trades request."""
         pass
 
+    def _page_params(self, start_ts: int, end_ts: int, limit: int, cursor: Any) -> Dict:
+        """API parameters for the page at ``cursor`` (None: first page)."""
+        return self._get_trades_params(start_ts, end_ts, limit)
+
+    def _next_cursor(
+        self, raw_data: Any, page: pd.DataFrame, start_ts: int, end_ts: int, limit: int
+    ) -> Any:
+        """Cursor of the page after ``page``, or None when the range is exhausted."""
+        return None
+
+    def _parse_page(self, raw_data: Any) -> pd.DataFrame:
+        """Parsed page with the standard columns (empty frame if no trades)."""
+        df = self._parse_trade_data(raw_data) if raw_data else pd.DataFrame()
+        if df.empty:
+            return pd.DataFrame(columns=TRADE_COLUMNS)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+        df["trade_id"] = df["trade_id"].astype(str)
+        return df[TRADE_COLUMNS]
+
+    def _combine_pages(self, pages: List[pd.DataFrame], start_ts: int, end_ts: int) -> pd.DataFrame:
+        """Concatenate pages, trim to the range and drop trades seen on two pages."""
+        if not pages:
+            return pd.DataFrame(columns=TRADE_COLUMNS + ["venue"])
+        df = pd.concat(pages, ignore_index=True)
+        ts = _timestamps_ms(df["timestamp"])
+        df = df[(ts >= start_ts) & (ts <= end_ts)]
+        df = df.drop_duplicates(subset="trade_id").sort_values("timestamp", kind="stable")
+        df = df.reset_index(drop=True)
+        df["venue"] = self.venue
+        return df
+
 
 class BinanceTickAdapter(RealTickAdapter):
-    """Binance tick data adapter."""
+    """Binance tick data adapter (pages forward by aggregate trade id)."""
+
+    rate_limit_per_s = 10.0
 
     def _get_base_url(self) -> str:
         return "https://api.binance.com"
@@ -119,6 +242,20 @@ class BinanceTickAdapter(RealTickAdapter):
             "limit": min(limit, 1000),
         }
 
+    def _page_params(self, start_ts: int, end_ts: int, limit: int, cursor: Any) -> Dict:
+        if cursor is None:
+            return self._get_trades_params(start_ts, end_ts, limit)
+        return {"symbol": "BTCUSDT", "fromId": cursor, "limit": min(limit, 1000)}
+
+    def _next_cursor(
+        self, raw_data: Any, page: pd.DataFrame, start_ts: int, end_ts: int, limit: int
+    ) -> Any:
+        if len(page) < min(limit, self.max_page_size):
+            return None
+        if _timestamps_ms(page["timestamp"]).max() >= end_ts:
+            return None
+        return int(page["trade_id"].astype("int64").max()) + 1
+
     def _parse_trade_data(self, raw_data: List[Dict]) -> pd.DataFrame:
         """Parse Binance aggregate trades data."""
         trades = []
@@ -128,6 +265,7 @@ class BinanceTickAdapter(RealTickAdapter):
                     "timestamp": pd.to_datetime(trade["T"], unit="ms"),
                     "price": float(trade["p"]),
                     "volume": float(trade["q"]),
+                    "trade_id": trade["a"],
                 }
             )
 
@@ -135,7 +273,10 @@ class BinanceTickAdapter(RealTickAdapter):
 
 
 class CoinbaseTickAdapter(RealTickAdapter):
-    """Coinbase tick data adapter."""
+    """Coinbase tick data adapter (pages backward from the newest trade by trade id)."""
+
+    rate_limit_per_s = 8.0
+    pages_from_newest = True
 
     def _get_base_url(self) -> str:
         return "https://api.exchange.coinbase.com"
@@ -144,7 +285,23 @@ class CoinbaseTickAdapter(RealTickAdapter):
         return f"{self.base_url}/products/BTC-USD/trades"
 
     def _get_trades_params(self, start_ts: int, end_ts: int, limit: int) -> Dict:
-        return {"start": str(start_ts), "end": str(end_ts), "limit": min(limit, 1000)}
+        # The endpoint has no time bounds: the first page holds the newest trades
+        return {"limit": min(limit, 1000)}
+
+    def _page_params(self, start_ts: int, end_ts: int, limit: int, cursor: Any) -> Dict:
+        if cursor is None:
+            return self._get_trades_params(start_ts, end_ts, limit)
+        # "after" returns trades older than the given trade id
+        return {"after": str(cursor), "limit": min(limit, 1000)}
+
+    def _next_cursor(
+        self, raw_data: Any, page: pd.DataFrame, start_ts: int, end_ts: int, limit: int
+    ) -> Any:
+        if len(page) < min(limit, self.max_page_size):
+            return None
+        if _timestamps_ms(page["timestamp"]).min() <= start_ts:
+            return None
+        return int(page["trade_id"].astype("int64").min())
 
     def _parse_trade_data(self, raw_data: List[Dict]) -> pd.DataFrame:
         """Parse Coinbase trades data."""
@@ -152,17 +309,23 @@ class CoinbaseTickAdapter(RealTickAdapter):
         for trade in raw_data:
             trades.append(
                 {
-                    "timestamp": pd.to_datetime(trade["time"]),
+                    "timestamp": trade["time"],
                     "price": float(trade["price"]),
                     "volume": float(trade["size"]),
+                    "trade_id": trade["trade_id"],
                 }
             )
 
-        return pd.DataFrame(trades)
+        df = pd.DataFrame(trades)
+        # One vectorized parse per page (times may or may not carry fractional seconds)
+        df["timestamp"] = pd.to_datetime(df["timestamp"], format="ISO8601", utc=True)
+        return df
 
 
 class KrakenTickAdapter(RealTickAdapter):
-    """Kraken tick data adapter."""
+    """Kraken tick data adapter (pages forward with the response's "last" cursor)."""
+
+    rate_limit_per_s = 1.0
 
     def _get_base_url(self) -> str:
         return "https://api.kraken.com"
@@ -177,6 +340,20 @@ class KrakenTickAdapter(RealTickAdapter):
             "count": min(limit, 1000),
         }
 
+    def _page_params(self, start_ts: int, end_ts: int, limit: int, cursor: Any) -> Dict:
+        if cursor is None:
+            return self._get_trades_params(start_ts, end_ts, limit)
+        return {"pair": "XXBTZUSD", "since": cursor, "count": min(limit, 1000)}
+
+    def _next_cursor(
+        self, raw_data: Any, page: pd.DataFrame, start_ts: int, end_ts: int, limit: int
+    ) -> Any:
+        if len(page) < min(limit, self.max_page_size):
+            return None
+        if _timestamps_ms(page["timestamp"]).max() >= end_ts:
+            return None
+        return raw_data.get("result", {}).get("last")
+
     def _parse_trade_data(self, raw_data: List[Dict]) -> pd.DataFrame:
         """Parse Kraken trades data."""
         trades = []
@@ -188,6 +365,8 @@ class KrakenTickAdapter(RealTickAdapter):
                         "timestamp": pd.to_datetime(trade[2], unit="s"),
                         "price": float(trade[0]),
                         "volume": float(trade[1]),
+                        # Older responses have no trade id: fall back to time/price/volume
+                        "trade_id": trade[6] if len(trade) > 6 else "/".join(map(str, trade[:3])),
                     }
                 )
 
@@ -195,7 +374,10 @@ class KrakenTickAdapter(RealTickAdapter):
 
 
 class OKXTickAdapter(RealTickAdapter):
-    """OKX tick data adapter."""
+    """OKX tick data adapter (pages backward from the range end by timestamp)."""
+
+    max_page_size = 100
+    rate_limit_per_s = 10.0
 
     def _get_base_url(self) -> str:
         return "https://www.okx.com"
@@ -204,13 +386,29 @@ class OKXTickAdapter(RealTickAdapter):
         return f"{self.base_url}/api/v5/market/history-trades"
 
     def _get_trades_params(self, start_ts: int, end_ts: int, limit: int) -> Dict:
+        # type=2 paginates by timestamp; "after" returns trades older than it
         return {
             "instId": "BTC-USDT",
-            "before": str(end_ts),
-            "after": str(start_ts),
-            "limit": min(limit, 1000),
+            "type": "2",
+            "after": str(end_ts + 1),
+            "limit": min(limit, self.max_page_size),
         }
 
+    def _page_params(self, start_ts: int, end_ts: int, limit: int, cursor: Any) -> Dict:
+        params = self._get_trades_params(start_ts, end_ts, limit)
+        if cursor is not None:
+            params["after"] = str(cursor)
+        return params
+
+    def _next_cursor(
+        self, raw_data: Any, page: pd.DataFrame, start_ts: int, end_ts: int, limit: int
+    ) -> Any:
+        oldest = int(_timestamps_ms(page["timestamp"]).min())
+        if len(page) < min(limit, self.max_page_size) or oldest <= start_ts:
+            return None
+        # Trades sharing the oldest millisecond are fetched again and deduplicated
+        return oldest + 1
+
     def _parse_trade_data(self, raw_data: List[Dict]) -> pd.DataFrame:
         """Parse OKX trades data."""
         trades = []
@@ -218,9 +416,10 @@ class OKXTickAdapter(RealTickAdapter):
             for trade in raw_data["data"]:
                 trades.append(
                     {
-                        "timestamp": pd.to_datetime(trade["ts"], unit="ms"),
+                        "timestamp": pd.to_datetime(int(trade["ts"]), unit="ms"),
                         "price": float(trade["px"]),
                         "volume": float(trade["sz"]),
+                        "trade_id": trade["tradeId"],
                     }
                 )
 
@@ -228,7 +427,11 @@ class OKXTickAdapter(RealTickAdapter):
 
 
 class BybitTickAdapter(RealTickAdapter):
-    """Bybit tick data adapter."""
+    """Bybit tick data adapter (recent trades only: the endpoint has no history cursor)."""
+
+    rate_limit_per_s = 10.0
+    # The one page the endpoint serves holds the newest trades
+    pages_from_newest = True
 
     def _get_base_url(self) -> str:
         return "https://api.bybit.com"
@@ -246,17 +449,20 @@ class BybitTickAdapter(RealTickAdapter):
             for trade in raw_data["result"]["list"]:
                 trades.append(
                     {
-                        "timestamp": pd.to_datetime(trade["time"], unit="ms"),
+                        "timestamp": pd.to_datetime(int(trade["time"]), unit="ms"),
                         "price": float(trade["price"]),
                         "volume": float(trade["size"]),
+                        "trade_id": trade["execId"],
                     }
                 )
 
         return pd.DataFrame(trades)
 
 
-def create_tick_adapter(venue: str, pair: str = "BTC-USD") -> RealTickAdapter:
-    """Factory function to create tick adapters."""
+def create_tick_adapter(
+    venue: str, pair: str = "BTC-USD", base_url: Optional[str] = None
+) -> RealTickAdapter:
+    """Factory function to create tick adapters (base_url overrides the venue API host)."""
     adapters = {
         "binance": BinanceTickAdapter,
         "coinbase": CoinbaseTickAdapter,
@@ -268,7 +474,7 @@ def create_tick_adapter(venue: str, pair: str = "BTC-USD") -> RealTickAdapter:
     if venue.lower() not in adapters:
         raise ValueError(f"Unsupported venue: {venue}")
 
-    return adapters[venue.lower()](venue, pair)
+    return adapters[venue.lower()](venue, pair, base_url)
 
 
 def fetch_real_tick_data(
@@ -281,6 +487,10 @@ def fetch_real_tick_data(
     """
     Fetch real tick data for multiple venues.
 
+    Venues are backfilled concurrently and each completed hour is checkpointed
+    into the cache, so re-running after an interruption only fetches the hours
+    that are still missing.
+
     Args:
         venues: List of venue names
         pair: Trading pair (e.g., "BTC-USD")
@@ -292,42 +502,39 @@ def fetch_real_tick_data(
         Dictionary mapping venue names to DataFrames
     """
     from acd.data.cache import DataCache
+    from acd.data.adapters.trade_backfill import BACKFILL_FREQUENCY, run_backfill
 
     cache = DataCache(cache_dir)
-    venue_data = {}
+    results = run_backfill(venues, pair, start_time, end_time, cache)
 
+    venue_data = {}
     for venue in venues:
-        try:
-            logger.info(f"Fetching real tick data for {venue} {pair}")
-
-            # Create adapter
-            adapter = create_tick_adapter(venue, pair)
-
-            # Fetch data
-            df = adapter.fetch_trades(start_time, end_time)
-
-            if len(df) > 0:
-                # Cache the data
-                cache.put(
-                    venue=venue,
-                    pair=pair,
-                    frequency="1s",
-                    df=df,
-                    metadata={"source": "real_tick_data", "venue": venue},
-                )
+        result = results.get(venue)
+        if result is not None and result.errors:
+            logger.error(f"Failed to fetch data for {venue}: {result.errors[0]}")
 
-                venue_data[venue] = df
-                logger.info(f"Successfully cached {len(df)} ticks for {venue}")
-            else:
-                logger.warning(f"No data retrieved for {venue}")
-
-        except Exception as e:
-            logger.error(f"Failed to fetch data for {venue}: {e}")
-            continue
+        df = cache.get(venue, pair, BACKFILL_FREQUENCY, start_time, end_time)
+        if df is not None and len(df) > 0:
+            venue_data[venue] = df
+            logger.info(f"Successfully cached {len(df)} ticks for {venue}")
+        else:
+            logger.warning(f"No data retrieved for {venue}")
 
     return venue_data
 
 
+def _epoch_ms(value: datetime) -> int:
+    """Epoch milliseconds of a datetime (naive values are taken as UTC)."""
+    ts = pd.Timestamp(value)
+    ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts.value // 1_000_000
+
+
+def _timestamps_ms(values: pd.Series) -> pd.Series:
+    """Epoch milliseconds of a tz-aware timestamp column."""
+    return values.dt.tz_convert("UTC").dt.as_unit("ms").astype("int64")
+
+
 if __name__ == "__main__":
     # Example usage
     venues = ["binance", "coinbase", "kraken", "okx", "bybit"]
@@ -4,12 +4,12 @@ Second-level bars adapter for market data access.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
+from typing import Iterator
 
-# from typing import Dict, Any, Optional  # Unused for now
 import logging
 
-from .base import BaseBarsAdapter
+from .base import BAR_COLUMNS, SECOND_STREAM, BaseBarsAdapter
 
 
 class SecondBarsAdapter(BaseBarsAdapter):
@@ -20,9 +20,10 @@ class SecondBarsAdapter(BaseBarsAdapter):
     when native second data is unavailable.
     """
 
-    def __init__(self, cache_enabled: bool = True, synthetic: bool = True):
+    def __init__(self, cache_enabled: bool = True, synthetic: bool = True, seed: int = 42):
         self.cache_enabled = cache_enabled
         self.synthetic = synthetic
+        self.seed = seed
         self.logger = logging.getLogger(__name__)
 
     def get(
@@ -66,6 +67,31 @@ class SecondBarsAdapter(BaseBarsAdapter):
 
         return df
 
+    def iter_chunks(
+        self, pair: str, venue: str, start_utc: datetime, end_utc: datetime, tz: str = "UTC"
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Stream synthetic second bars one UTC day at a time (same bars as ``get``).
+
+        Only one day of bars is held in memory, so long ranges can be written
+        to the cache day by day (e.g. with ``DataCache.append``).
+
+        Args:
+            pair: Trading pair (e.g., 'BTC-USD')
+            venue: Exchange venue (e.g., 'binance')
+            start_utc: Start datetime in UTC
+            end_utc: End datetime in UTC
+            tz: Timezone for output (default: 'UTC')
+
+        Yields:
+            DataFrame per day with columns: [time, open, high, low, close, volume]
+        """
+        for df in self._iter_synthetic_seconds(pair, venue, start_utc, end_utc):
+            df = self._validate_data(self._standardize_schema(df))
+            if tz != "UTC":
+                df["time"] = df["time"].dt.tz_convert(tz)
+            yield df
+
     def _generate_synthetic_seconds(
         self, pair: str, venue: str, start_utc: datetime, end_utc: datetime
     ) -> pd.DataFrame:
@@ -81,66 +107,73 @@ class SecondBarsAdapter(BaseBarsAdapter):
         Returns:
             DataFrame with second bars
         """
-        # First get minute data
-        from .minute_bars import MinuteBarsAdapter
+        days = list(self._iter_synthetic_seconds(pair, venue, start_utc, end_utc))
+        if not days:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        df = pd.concat(days, ignore_index=True) if len(days) > 1 else days[0]
 
-        minute_adapter = MinuteBarsAdapter()
-        minute_df = minute_adapter.get(pair, venue, start_utc, end_utc)
+        self.logger.info(f"[DATA:second:synthetic] Generated {len(df)} synthetic second bars")
 
-        if minute_df.empty:
-            return pd.DataFrame(columns=["time", "open", "high", "low", "close", "volume"])
+        return df
 
-        # Generate second bars by distributing minute moves
-        second_data = []
+    def _iter_synthetic_seconds(
+        self, pair: str, venue: str, start_utc: datetime, end_utc: datetime
+    ) -> Iterator[pd.DataFrame]:
+        """Synthetic second bars per UTC day, derived from that day's minute bars."""
+        from .minute_bars import MinuteBarsAdapter
 
-        for _, minute_row in minute_df.iterrows():
-            minute_start = minute_row["time"]
-            minute_end = minute_start + timedelta(minutes=1)
+        minute_adapter = MinuteBarsAdapter(seed=self.seed)
+        for minute_df in minute_adapter.iter_chunks(pair, venue, start_utc, end_utc):
+            if not minute_df.empty:
+                yield self._seconds_from_minutes(minute_df)
 
-            # Create 60 second timestamps within this minute
-            second_timestamps = pd.date_range(
-                start=minute_start, end=minute_end - timedelta(seconds=1), freq="1s", tz="UTC"
-            )
+    def _seconds_from_minutes(self, minute_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Expand one day of minute bars into 60 second bars each.
 
-            # Distribute the minute move across 60 seconds
-            total_move = minute_row["close"] - minute_row["open"]
-            volume_per_second = minute_row["volume"] / 60
-
-            # Generate second-by-second prices
-            for i, second_ts in enumerate(second_timestamps):
-                # Linear interpolation of price within the minute
-                progress = i / 59.0  # 0 to 1
-                price = minute_row["open"] + total_move * progress
-
-                # Add small random variation for realism
-                variation = np.random.normal(0, abs(total_move) * 0.01)
-                price += variation
-
-                # Generate OHLC for this second
-                # Most seconds will have OHLC = same price, but some will have small ranges
-                if np.random.random() < 0.1:  # 10% chance of intra-second range
-                    range_size = abs(total_move) * 0.1
-                    high = price + range_size * np.random.random()
-                    low = price - range_size * np.random.random()
-                else:
-                    high = low = price
-
-                second_data.append(
-                    {
-                        "time": second_ts,
-                        "open": round(price, 2),
-                        "high": round(high, 2),
-                        "low": round(low, 2),
-                        "close": round(price, 2),
-                        "volume": round(volume_per_second, 2),
-                    }
-                )
-
-        df = pd.DataFrame(second_data)
+        Prices interpolate linearly from open to close across the minute, plus
+        noise of 1% of the minute move; 10% of seconds get an intra-second range
+        of up to 10% of the move. Volume is split evenly.
 
-        self.logger.info(f"[DATA:second:synthetic] Generated {len(df)} synthetic second bars")
+        Args:
+            minute_df: Minute bars within one UTC day
 
-        return df
+        Returns:
+            DataFrame with second bars
+        """
+        rng = self._day_rng(minute_df["time"].iloc[0].floor("1D"), SECOND_STREAM)
+        n_minutes = len(minute_df)
+        shape = (n_minutes, 60)
+
+        # (n_minutes, 1) columns broadcast against the 60 seconds of each minute
+        open_price = minute_df["open"].to_numpy(dtype=np.float64)[:, None]
+        total_move = minute_df["close"].to_numpy(dtype=np.float64)[:, None] - open_price
+        abs_move = np.abs(total_move)
+        progress = np.arange(60) / 59.0
+
+        price = open_price + total_move * progress + rng.normal(0.0, 1.0, shape) * abs_move * 0.01
+
+        # Most seconds have OHLC = same price, some have a small range
+        ranged = rng.random(shape) < 0.1
+        range_size = abs_move * 0.1
+        high = np.where(ranged, price + range_size * rng.random(shape), price)
+        low = np.where(ranged, price - range_size * rng.random(shape), price)
+
+        minute_ns = minute_df["time"].dt.tz_convert("UTC").dt.as_unit("ns").astype("int64")
+        second_ns = minute_ns.to_numpy()[:, None] + np.arange(60, dtype=np.int64) * 1_000_000_000
+        volume_per_second = np.round(minute_df["volume"].to_numpy(dtype=np.float64) / 60, 2)
+
+        price = np.round(price, 2).ravel()
+        return pd.DataFrame(
+            {
+                "time": pd.to_datetime(second_ns.ravel(), unit="ns", utc=True),
+                "open": price,
+                "high": np.round(high, 2).ravel(),
+                "low": np.round(low, 2).ravel(),
+                "close": price,
+                "volume": np.repeat(volume_per_second, 60),
+            }
+        )
 
     def _fetch_native_seconds(
         self, pair: str, venue: str, start_utc: datetime, end_utc: datetime
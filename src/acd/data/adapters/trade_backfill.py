@@ -0,0 +1,334 @@
+"""
+Asynchronous historical trade backfill.
+
+Backfills trades for several venues at once. Each venue gets its own aiohttp
+connection pool and token-bucket rate limiter, splits the requested range
+into hourly chunks (the cache's partitions for tick data) and pages through
+every chunk with its adapter's trade-id or time cursor. Venues that only page
+backward from their newest trade (Coinbase) are walked once over the whole
+range instead, newest chunk first. A chunk is appended to the DataCache only
+once all of its pages have arrived, and its id is recorded in the dataset
+metadata, so an interrupted backfill resumes with the chunks that are still
+missing.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+import pandas as pd
+
+from ..cache import DataCache
+from .real_tick_adapters import RealTickAdapter, create_tick_adapter
+
+logger = logging.getLogger(__name__)
+
+# Tick datasets live under the 1s cache frequency (hourly partitions)
+BACKFILL_FREQUENCY = "1s"
+
+# Dataset metadata key listing the chunks that were fetched completely
+CHECKPOINT_KEY = "backfill_chunks"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Trades are unique per (timestamp, trade id); several may share a timestamp
+TRADE_KEY = ["timestamp", "trade_id"]
+
+
+class TokenBucket:
+    """Asyncio token bucket: ``rate`` tokens per second, bursts of up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until ``tokens`` are available and take them."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+
+@dataclass
+class BackfillConfig:
+    """Backfill settings; per-venue overrides are keyed by lower-case venue name."""
+
+    chunk: str = "1h"
+    limit: int = 1000
+    max_connections: int = 4
+    rate_limits: Dict[str, float] = field(default_factory=dict)
+    base_urls: Dict[str, str] = field(default_factory=dict)
+    timeout_s: float = 30.0
+    max_retries: int = 3
+    backoff_s: float = 0.5
+    max_pages: int = 10_000
+
+
+@dataclass
+class BackfillResult:
+    """Outcome of one venue's backfill."""
+
+    venue: str
+    chunks: int = 0
+    chunks_skipped: int = 0
+    trades: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def chunk_windows(
+    start_time: datetime, end_time: datetime, chunk: str = "1h"
+) -> List[Tuple[int, int]]:
+    """
+    Split [start, end) into chunk-aligned windows.
+
+    Args:
+        start_time: Range start (naive values are taken as UTC)
+        end_time: Range end, exclusive
+        chunk: Chunk length, e.g. "1h"
+
+    Returns:
+        (start_ms, end_ms) pairs with inclusive end_ms
+    """
+    step = pd.Timedelta(chunk)
+    start, end = _to_utc(start_time), _to_utc(end_time)
+    windows = []
+    cursor = start
+    while cursor < end:
+        following = min(cursor.floor(step) + step, end)
+        windows.append((cursor.value // 1_000_000, following.value // 1_000_000 - 1))
+        cursor = following
+    return windows
+
+
+def completed_chunks(cache: DataCache, venue: str, pair: str) -> Set[str]:
+    """Ids of the chunks a previous backfill stored completely."""
+    metadata = cache.get_metadata(venue, pair, BACKFILL_FREQUENCY)
+    return set(metadata.get(CHECKPOINT_KEY, []))
+
+
+async def backfill_trades(
+    venues: List[str],
+    pair: str,
+    start_time: datetime,
+    end_time: datetime,
+    cache: DataCache,
+    config: Optional[BackfillConfig] = None,
+) -> Dict[str, BackfillResult]:
+    """
+    Backfill trades for all venues concurrently into the cache.
+
+    Args:
+        venues: Venue names
+        pair: Trading pair (e.g., "BTC-USD")
+        start_time: Range start (UTC)
+        end_time: Range end (UTC, exclusive)
+        cache: Cache receiving the trades and the checkpoints
+        config: Backfill settings
+
+    Returns:
+        Dictionary mapping venue names to their BackfillResult
+    """
+    config = config or BackfillConfig()
+    windows = chunk_windows(start_time, end_time, config.chunk)
+
+    adapters = [
+        create_tick_adapter(venue, pair, config.base_urls.get(venue.lower())) for venue in venues
+    ]
+    results = await asyncio.gather(
+        *(_backfill_venue(adapter, cache, windows, config) for adapter in adapters)
+    )
+    return {result.venue: result for result in results}
+
+
+def run_backfill(
+    venues: List[str],
+    pair: str,
+    start_time: datetime,
+    end_time: datetime,
+    cache: DataCache,
+    config: Optional[BackfillConfig] = None,
+) -> Dict[str, BackfillResult]:
+    """Synchronous entry point for ``backfill_trades``."""
+    return asyncio.run(backfill_trades(venues, pair, start_time, end_time, cache, config))
+
+
+async def _backfill_venue(
+    adapter: RealTickAdapter,
+    cache: DataCache,
+    windows: List[Tuple[int, int]],
+    config: BackfillConfig,
+) -> BackfillResult:
+    """Fetch and checkpoint every missing chunk of one venue."""
+    venue = adapter.venue
+    result = BackfillResult(venue=venue)
+    loop = asyncio.get_running_loop()
+
+    done = await loop.run_in_executor(None, completed_chunks, cache, venue, adapter.pair)
+    pending = [window for window in windows if _chunk_id(window) not in done]
+    result.chunks_skipped = len(windows) - len(pending)
+    if not pending:
+        logger.info(f"[DATA:backfill:skip] {venue} - all {len(windows)} chunks cached")
+        return result
+
+    bucket = TokenBucket(config.rate_limits.get(venue.lower(), adapter.rate_limit_per_s))
+    semaphore = asyncio.Semaphore(config.max_connections)
+    checkpoint_lock = asyncio.Lock()
+    connector = aiohttp.TCPConnector(limit=config.max_connections)
+    timeout = aiohttp.ClientTimeout(total=config.timeout_s)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+        async def get_json(url: str, params: Dict) -> Any:
+            return await _get_json(session, bucket, url, params, config)
+
+        async def store(window: Tuple[int, int], trades: pd.DataFrame) -> None:
+            # Checkpoint writes are serialized: the chunk list is read-modify-write
+            async with checkpoint_lock:
+                await loop.run_in_executor(None, _checkpoint, cache, adapter, window, trades)
+            result.chunks += 1
+            result.trades += len(trades)
+
+        async def run(window: Tuple[int, int]) -> None:
+            async with semaphore:
+                trades = await adapter.fetch_trades_async(
+                    get_json, window[0], window[1], config.limit, config.max_pages
+                )
+            await store(window, trades)
+
+        if adapter.pages_from_newest:
+            # Every chunk would re-page from the newest trade: walk back once instead
+            outcomes = await _walk_back(adapter, get_json, pending, config, store)
+        else:
+            outcomes = await asyncio.gather(
+                *(run(window) for window in pending), return_exceptions=True
+            )
+
+    for window, outcome in zip(pending, outcomes):
+        if isinstance(outcome, BaseException):
+            result.errors.append(f"{_chunk_id(window)}: {outcome}")
+
+    logger.info(
+        f"[DATA:backfill] {venue} - {result.trades} trades in {result.chunks} chunks "
+        f"({result.chunks_skipped} cached, {len(result.errors)} failed)"
+    )
+    return result
+
+
+async def _walk_back(
+    adapter: RealTickAdapter,
+    get_json: Callable[[str, Dict], Awaitable[Any]],
+    windows: List[Tuple[int, int]],
+    config: BackfillConfig,
+    store: Callable[[Tuple[int, int], pd.DataFrame], Awaitable[None]],
+) -> List[Optional[BaseException]]:
+    """
+    Fetch the chunks of a venue that pages backward from its newest trade in one walk.
+
+    A chunk is stored as soon as the walk has passed its start, so a failure
+    keeps every newer chunk. Returns the error of each window (None if stored).
+    """
+    remaining = sorted(windows, reverse=True)
+    pages: List[pd.DataFrame] = []
+    n_pages = 0
+    error: Optional[BaseException] = None
+    try:
+        async for page in adapter.iter_pages_async(
+            get_json, remaining[-1][0], remaining[0][1], config.limit, config.max_pages
+        ):
+            n_pages += 1
+            # Pages newer than every pending chunk are only walked through, never kept
+            if _oldest_ms(page) > remaining[0][1]:
+                continue
+            pages.append(page)
+            # Pages hold ever older trades: every chunk starting after this page is complete
+            while remaining and _oldest_ms(page) < remaining[0][0]:
+                window = remaining[0]
+                await store(window, adapter._combine_pages(pages, *window))
+                remaining.pop(0)
+                pages = [kept for kept in pages if _oldest_ms(kept) < window[0]]
+
+        if remaining and n_pages >= config.max_pages:
+            raise RuntimeError(f"page limit of {config.max_pages} reached")
+        # The walk reached the range start (or the venue's first trade)
+        while remaining:
+            await store(remaining[0], adapter._combine_pages(pages, *remaining[0]))
+            remaining.pop(0)
+    except Exception as e:
+        error = e
+
+    return [error if window in remaining else None for window in windows]
+
+
+async def _get_json(
+    session: aiohttp.ClientSession,
+    bucket: TokenBucket,
+    url: str,
+    params: Dict,
+    config: BackfillConfig,
+) -> Any:
+    """GET one page, retrying throttled, failed and timed-out requests with backoff."""
+    params = {name: str(value) for name, value in params.items()}
+    for attempt in range(config.max_retries + 1):
+        await bucket.acquire()
+        last_attempt = attempt == config.max_retries
+        delay = config.backoff_s * 2**attempt
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status in RETRY_STATUSES and not last_attempt:
+                    retry_after = response.headers.get("Retry-After")
+                    if retry_after is not None and retry_after.isdigit():
+                        delay = float(retry_after)
+                else:
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last_attempt:
+                raise
+        await asyncio.sleep(delay)
+    raise RuntimeError(f"no response from {url}")
+
+
+def _checkpoint(
+    cache: DataCache, adapter: RealTickAdapter, window: Tuple[int, int], trades: pd.DataFrame
+) -> None:
+    """Append a complete chunk and record it as done."""
+    if trades.empty:
+        # Nothing to store; an empty chunk is cheap to re-check on resume
+        return
+    done = completed_chunks(cache, adapter.venue, adapter.pair) | {_chunk_id(window)}
+    cache.append(
+        adapter.venue,
+        adapter.pair,
+        BACKFILL_FREQUENCY,
+        trades,
+        metadata={"source": "real_tick_data", "venue": adapter.venue, CHECKPOINT_KEY: sorted(done)},
+        key=TRADE_KEY,
+    )
+
+
+def _oldest_ms(page: pd.DataFrame) -> int:
+    return page["timestamp"].min().value // 1_000_000
+
+
+def _chunk_id(window: Tuple[int, int]) -> str:
+    return f"{window[0]}-{window[1]}"
+
+
+def _to_utc(value: datetime) -> pd.Timestamp:
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
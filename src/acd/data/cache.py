@@ -2,30 +2,73 @@
 Data cache system for market data storage and retrieval.
 """
 
+import hashlib
+import json
 import os
-import pandas as pd
+import re
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 
-# import pyarrow as pa  # Unused for now
-# import pyarrow.parquet as pq  # Unused for now
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from datetime import datetime
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import logging
 
-# import hashlib  # Unused for now
+# Name of the per-dataset manifest; the leading underscore keeps parquet readers from
+# treating it as data when the dataset directory is read as a whole
+CATALOG_FILE = "_catalog.json"
+
+# Rows per parquet row group inside a partition (granularity of timestamp pushdown)
+ROW_GROUP_SIZE = 10_000
+
+TIME_COLUMNS = ("time", "timestamp")
+
+UNDATED_PARTITION = "undated.parquet"
+
+# Parquet key-value metadata key holding the dataset metadata passed to put/append
+METADATA_KEY = b"acd_cache_metadata"
+
+# A partition with this many files is compacted in the background after an append
+COMPACT_FILE_THRESHOLD = 8
+
+CATALOG_VERSION = 2
+
+# Partition files are named "<partition stem>.<sequence>.parquet" with a zero-padded
+# sequence, so listing a partition lexically returns its segments in write order
+SEGMENT_DIGITS = 6
+_SEGMENT_SUFFIX = re.compile(r"\.\d+(?=\.parquet$)")
 
 
 class DataCache:
     """
     Parquet-based cache system for market data.
 
-    Provides deterministic partitioning by day with cache hit/miss logging.
+    Each venue/pair/frequency is a dataset directory (``<frequency>.parquet/``)
+    partitioned by day, or by hour for sub-minute frequencies. A JSON catalog
+    records per-partition row counts, time bounds and checksums so that
+    metadata queries never open data files, and ``get`` only reads the
+    partitions (and row groups) that overlap the requested window.
+
+    ``append`` writes new rows as extra segment files of the partitions they
+    fall in, rewriting only segments whose time range overlaps the new rows;
+    partitions that accumulate many segments are compacted in the background.
     """
 
     def __init__(self, cache_dir: str = "data/cache"):
         self.cache_dir = cache_dir
         self.logger = logging.getLogger(__name__)
 
+        # One lock per dataset serializes catalog updates from appends and compaction
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._compactor: Optional[ThreadPoolExecutor] = None
+        self._compactions: Dict[str, Future] = {}
+
         # Ensure cache directory exists
         os.makedirs(cache_dir, exist_ok=True)
 
@@ -33,13 +76,16 @@ class DataCache:
         """
         Generate deterministic cache path for data.
 
+        The path is a dataset directory; ``pd.read_parquet`` on it still returns
+        the full cached frame.
+
         Args:
             venue: Exchange venue
             pair: Trading pair
             frequency: Data frequency ('1min', '1s', etc.)
 
         Returns:
-            Cache file path
+            Cache dataset path
         """
         # Normalize pair name for filesystem
         normalized_pair = pair.replace("-", "_").replace("/", "_").lower()
@@ -72,48 +118,52 @@ class DataCache:
             return None
 
         try:
-            # Read parquet file
-            df = pd.read_parquet(cache_path)
+            self._migrate_legacy_file(cache_path, frequency)
+            catalog = self._load_catalog(cache_path)
 
-            if df.empty:
+            if not catalog["partitions"]:
                 self.logger.info(f"[DATA:cache:miss] {venue}:{pair}:{frequency} - empty file")
                 return None
 
-            # Filter by date range - handle both 'time' and 'timestamp' columns
-            if "time" in df.columns:
-                time_col = "time"
-            elif "timestamp" in df.columns:
-                time_col = "timestamp"
-            else:
+            time_col = catalog.get("time_column")
+            if time_col is None:
                 self.logger.warning(
                     f"[DATA:cache:error] {venue}:{pair}:{frequency} - no time column found"
                 )
                 return None
 
-            df[time_col] = pd.to_datetime(df[time_col])
-            # Ensure timezone-aware comparison
-            if df[time_col].dt.tz is None:
-                df[time_col] = df[time_col].dt.tz_localize("UTC")
-            else:
-                df[time_col] = df[time_col].dt.tz_convert("UTC")
+            start_utc = _to_utc(start_utc)
+            end_utc = _to_utc(end_utc)
+
+            try:
+                files, table = self._read_window(cache_path, catalog, start_utc, end_utc)
+            except FileNotFoundError:
+                # A background compaction replaced segments after the catalog was read
+                catalog = self._load_catalog(cache_path)
+                files, table = self._read_window(cache_path, catalog, start_utc, end_utc)
 
-            # Convert start/end to UTC timezone-aware
-            if start_utc.tzinfo is None:
-                start_utc = start_utc.replace(tzinfo=None)
-                start_utc = pd.Timestamp(start_utc, tz="UTC")
-            if end_utc.tzinfo is None:
-                end_utc = end_utc.replace(tzinfo=None)
-                end_utc = pd.Timestamp(end_utc, tz="UTC")
+            if table is None:
+                self.logger.info(f"[DATA:cache:miss] {venue}:{pair}:{frequency} - no data in range")
+                return None
+            filtered_df = table.to_pandas()
+
+            # Ensure timezone-aware output
+            filtered_df[time_col] = pd.to_datetime(filtered_df[time_col])
+            if filtered_df[time_col].dt.tz is None:
+                filtered_df[time_col] = filtered_df[time_col].dt.tz_localize("UTC")
+            else:
+                filtered_df[time_col] = filtered_df[time_col].dt.tz_convert("UTC")
 
-            mask = (df[time_col] >= start_utc) & (df[time_col] <= end_utc)
-            filtered_df = df[mask].copy()
+            mask = (filtered_df[time_col] >= start_utc) & (filtered_df[time_col] <= end_utc)
+            filtered_df = filtered_df[mask].reset_index(drop=True)
 
             if filtered_df.empty:
                 self.logger.info(f"[DATA:cache:miss] {venue}:{pair}:{frequency} - no data in range")
                 return None
 
             self.logger.info(
-                f"[DATA:cache:hit] {venue}:{pair}:{frequency} - {len(filtered_df)} bars"
+                f"[DATA:cache:hit] {venue}:{pair}:{frequency} - {len(filtered_df)} bars "
+                f"from {len(files)}/{len(catalog['partitions'])} partitions"
             )
             return filtered_df
 
@@ -145,9 +195,6 @@ class DataCache:
 
         cache_path = self.get_cache_path(venue, pair, frequency)
 
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-
         try:
             # Prepare DataFrame for caching
             cache_df = df.copy()
@@ -156,22 +203,131 @@ class DataCache:
             if "time" in cache_df.columns:
                 cache_df["time"] = pd.to_datetime(cache_df["time"])
 
-            # Add metadata if provided
-            if metadata:
-                for key, value in metadata.items():
-                    cache_df[f"_meta_{key}"] = value
+            with self._dataset_lock(cache_path):
+                # Replace any previous dataset (or legacy single file)
+                if os.path.isdir(cache_path):
+                    shutil.rmtree(cache_path)
+                elif os.path.exists(cache_path):
+                    os.remove(cache_path)
+                os.makedirs(cache_path, exist_ok=True)
 
-            # Write to parquet
-            cache_df.to_parquet(cache_path, index=False, engine="pyarrow")
+                catalog = self._write_partitions(cache_path, frequency, cache_df, metadata or {})
+                self._save_catalog(cache_path, catalog)
 
             self.logger.info(
-                f"[DATA:cache:write] {venue}:{pair}:{frequency} - {len(cache_df)} bars"
+                f"[DATA:cache:write] {venue}:{pair}:{frequency} - {len(cache_df)} bars "
+                f"in {len(catalog['partitions'])} partitions"
             )
 
         except Exception as e:
             self.logger.error(f"[DATA:cache:error] {venue}:{pair}:{frequency} - {str(e)}")
             raise
 
+    def append(
+        self,
+        venue: str,
+        pair: str,
+        frequency: str,
+        df: pd.DataFrame,
+        metadata: Optional[Dict[str, Any]] = None,
+        key: Optional[List[str]] = None,
+    ) -> Dict[str, int]:
+        """
+        Upsert rows into the cache, touching only the partitions they fall in.
+
+        Rows whose timestamps do not overlap a partition's existing segments are
+        written as a new segment without reading any cached data. Segments that
+        do overlap are merged with the new rows, keeping the new row for
+        duplicate keys. Appending one hour to a year-long cache therefore
+        writes about one hour of data.
+
+        Args:
+            venue: Exchange venue
+            pair: Trading pair
+            frequency: Data frequency
+            df: DataFrame to upsert (same columns as the cached data)
+            metadata: Optional metadata merged into the dataset metadata
+            key: Columns identifying a row (default: the time column); use e.g.
+                ["timestamp", "trade_id"] for data with several rows per timestamp
+
+        Returns:
+            Dictionary with rows written, segments written and segments merged
+        """
+        stats = {"rows": 0, "segments_written": 0, "segments_merged": 0}
+        if df.empty:
+            self.logger.warning(f"[DATA:cache:skip] {venue}:{pair}:{frequency} - empty DataFrame")
+            return stats
+
+        cache_path = self.get_cache_path(venue, pair, frequency)
+        if not os.path.exists(cache_path):
+            self.put(venue, pair, frequency, df, metadata)
+            catalog = self._load_catalog(cache_path)
+            stats["rows"] = len(df)
+            stats["segments_written"] = len(catalog["partitions"])
+            return stats
+
+        try:
+            with self._dataset_lock(cache_path):
+                self._migrate_legacy_file(cache_path, frequency)
+                catalog = self._load_catalog(cache_path)
+                stats = self._append_partitions(
+                    cache_path, catalog, frequency, df, metadata or {}, key
+                )
+                self._save_catalog(cache_path, catalog)
+
+            self.logger.info(
+                f"[DATA:cache:append] {venue}:{pair}:{frequency} - {stats['rows']} bars "
+                f"in {stats['segments_written']} segments ({stats['segments_merged']} merged)"
+            )
+        except Exception as e:
+            self.logger.error(f"[DATA:cache:error] {venue}:{pair}:{frequency} - {str(e)}")
+            raise
+
+        if _fragmented_partitions(catalog, COMPACT_FILE_THRESHOLD):
+            self._schedule_compaction(cache_path)
+        return stats
+
+    def compact(self, venue: str, pair: str, frequency: str, min_files: int = 2) -> int:
+        """
+        Merge the segments of each fragmented partition into a single file.
+
+        Args:
+            venue: Exchange venue
+            pair: Trading pair
+            frequency: Data frequency
+            min_files: Compact partitions made of at least this many files
+
+        Returns:
+            Number of partitions compacted
+        """
+        cache_path = self.get_cache_path(venue, pair, frequency)
+        if not os.path.isdir(cache_path):
+            return 0
+        return self._compact_dataset(cache_path, min_files)
+
+    def wait_for_compaction(self) -> None:
+        """Block until all scheduled background compactions have finished."""
+        for future in list(self._compactions.values()):
+            future.result()
+
+    def get_metadata(self, venue: str, pair: str, frequency: str) -> Dict[str, Any]:
+        """
+        Dataset metadata stored by put/append (read from the catalog only).
+
+        Args:
+            venue: Exchange venue
+            pair: Trading pair
+            frequency: Data frequency
+
+        Returns:
+            Metadata dictionary (empty if none was stored)
+        """
+        cache_path = self.get_cache_path(venue, pair, frequency)
+        if not os.path.exists(cache_path):
+            return {}
+        self._migrate_legacy_file(cache_path, frequency)
+        return dict(self._load_catalog(cache_path).get("metadata", {}))
+
     def exists(self, venue: str, pair: str, frequency: str) -> bool:
         """
         Check if cached data exists.
@@ -190,9 +346,11 @@ class DataCache:
             return False
 
         try:
-            # Check if file has data
-            df = pd.read_parquet(cache_path)
-            return not df.empty
+            if os.path.isfile(cache_path):
+                # Legacy single file: the footer holds the row count
+                return pq.ParquetFile(cache_path).metadata.num_rows > 0
+            catalog = self._load_catalog(cache_path)
+            return any(entry["rows"] > 0 for entry in catalog["partitions"].values())
         except Exception:
             return False
 
@@ -217,21 +375,23 @@ class DataCache:
             "rows": 0,
             "start_time": None,
             "end_time": None,
+            "partitions": 0,
         }
 
         if info["exists"]:
             try:
-                # Get file size
-                info["size_bytes"] = os.path.getsize(cache_path)
+                self._migrate_legacy_file(cache_path, frequency)
+                partitions = self._load_catalog(cache_path)["partitions"].values()
 
-                # Get data info
-                df = pd.read_parquet(cache_path)
-                info["rows"] = len(df)
+                info["size_bytes"] = sum(entry["size_bytes"] for entry in partitions)
+                info["rows"] = sum(entry["rows"] for entry in partitions)
+                info["partitions"] = len(partitions)
 
-                if "time" in df.columns and not df.empty:
-                    df["time"] = pd.to_datetime(df["time"])
-                    info["start_time"] = df["time"].min()
-                    info["end_time"] = df["time"].max()
+                starts = [pd.Timestamp(e["start"]) for e in partitions if e["start"] is not None]
+                ends = [pd.Timestamp(e["end"]) for e in partitions if e["end"] is not None]
+                if starts:
+                    info["start_time"] = min(starts)
+                    info["end_time"] = max(ends)
 
             except Exception as e:
                 self.logger.warning(
@@ -240,6 +400,29 @@ class DataCache:
 
         return info
 
+    def verify(self, venue: str, pair: str, frequency: str) -> List[str]:
+        """
+        Check partition files against their catalog checksums.
+
+        Args:
+            venue: Exchange venue
+            pair: Trading pair
+            frequency: Data frequency
+
+        Returns:
+            Relative paths of partitions that are missing or corrupted
+        """
+        cache_path = self.get_cache_path(venue, pair, frequency)
+        if not os.path.isdir(cache_path):
+            return []
+
+        bad = []
+        for rel_path, entry in self._load_catalog(cache_path)["partitions"].items():
+            file_path = os.path.join(cache_path, rel_path)
+            if not os.path.exists(file_path) or _file_checksum(file_path) != entry["checksum"]:
+                bad.append(rel_path)
+        return bad
+
     def clear_cache(
         self,
         venue: Optional[str] = None,
@@ -263,42 +446,471 @@ class DataCache:
             # Clear specific cache file
             cache_path = self.get_cache_path(venue, pair, frequency)
             if os.path.exists(cache_path):
-                os.remove(cache_path)
+                _remove_path(cache_path)
                 removed_count = 1
                 self.logger.info(f"[DATA:cache:clear] {venue}:{pair}:{frequency}")
         else:
-            # Clear matching cache files
-            for root, dirs, files in os.walk(self.cache_dir):
-                for file in files:
-                    if file.endswith(".parquet"):
-                        file_path = os.path.join(root, file)
-
-                        # Parse path to extract venue/pair/frequency
-                        rel_path = os.path.relpath(file_path, self.cache_dir)
-                        path_parts = rel_path.split(os.sep)
-
-                        if len(path_parts) >= 3:
-                            file_venue = path_parts[0]
-                            file_pair = path_parts[1]
-                            file_freq = file.replace(".parquet", "")
-
-                            # Check if matches criteria
-                            match = True
-                            if venue and file_venue != venue.lower():
-                                match = False
-                            if (
-                                pair
-                                and file_pair != pair.replace("-", "_").replace("/", "_").lower()
-                            ):
-                                match = False
-                            if frequency and file_freq != frequency:
-                                match = False
-
-                            if match:
-                                os.remove(file_path)
-                                removed_count += 1
-                                self.logger.info(
-                                    f"[DATA:cache:clear] {file_venue}:{file_pair}:{file_freq}"
-                                )
+            # Clear matching caches: <cache_dir>/<venue>/<pair>/<frequency>.parquet
+            for file_venue in _list_dirs(self.cache_dir):
+                if venue and file_venue != venue.lower():
+                    continue
+                venue_dir = os.path.join(self.cache_dir, file_venue)
+                for file_pair in _list_dirs(venue_dir):
+                    if pair and file_pair != pair.replace("-", "_").replace("/", "_").lower():
+                        continue
+                    pair_dir = os.path.join(venue_dir, file_pair)
+                    for entry in sorted(os.listdir(pair_dir)):
+                        if not entry.endswith(".parquet"):
+                            continue
+                        file_freq = entry[: -len(".parquet")]
+                        if frequency and file_freq != frequency:
+                            continue
+
+                        _remove_path(os.path.join(pair_dir, entry))
+                        removed_count += 1
+                        self.logger.info(f"[DATA:cache:clear] {file_venue}:{file_pair}:{file_freq}")
 
         return removed_count
+
+    def _write_partitions(
+        self, cache_path: str, frequency: str, df: pd.DataFrame, metadata: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Write one parquet file per time partition and return the new catalog."""
+        time_col = _find_time_column(df)
+        catalog = {
+            "version": CATALOG_VERSION,
+            "frequency": frequency,
+            "time_column": time_col,
+            "partitioning": _partition_granularity(frequency),
+            "metadata": metadata,
+            "sequence": 0,
+            "partitions": {},
+        }
+
+        if time_col is None:
+            # Nothing to partition on: keep a single partition without time bounds
+            rel_path = _segment_path("all.parquet", 0)
+            catalog["partitions"][rel_path] = self._write_partition(
+                cache_path, rel_path, df, None, metadata
+            )
+            return catalog
+
+        times_utc = _utc_times(df[time_col])
+        order = times_utc.argsort(kind="stable")
+        df = df.iloc[order]
+        times_utc = times_utc.iloc[order]
+
+        # Rows without a timestamp go to a partition without time bounds
+        keys = _partition_keys(times_utc, catalog["partitioning"]).fillna(UNDATED_PARTITION)
+        for partition, rows in df.groupby(keys.to_numpy(), sort=True).indices.items():
+            rel_path = _segment_path(partition, 0)
+            bounds = times_utc.iloc[rows] if partition != UNDATED_PARTITION else None
+            catalog["partitions"][rel_path] = self._write_partition(
+                cache_path, rel_path, df.iloc[rows], bounds, metadata
+            )
+        return catalog
+
+    def _append_partitions(
+        self,
+        cache_path: str,
+        catalog: Dict[str, Any],
+        frequency: str,
+        df: pd.DataFrame,
+        metadata: Dict[str, Any],
+        key: Optional[List[str]] = None,
+    ) -> Dict[str, int]:
+        """Upsert rows into an existing dataset, updating ``catalog`` in place."""
+        time_col = catalog.get("time_column")
+        if time_col is None or time_col not in df.columns:
+            raise ValueError("append requires the cached time column in both cache and data")
+        key = list(key) if key else [time_col]
+        if any(col not in df.columns for col in key):
+            raise ValueError(f"key columns {key} missing from data")
+
+        catalog["metadata"] = {**catalog.get("metadata", {}), **metadata}
+        schema = self._dataset_schema(cache_path, catalog)
+        if schema is not None and set(df.columns) != set(schema.names):
+            raise ValueError(
+                f"columns {sorted(df.columns)} do not match cached columns {sorted(schema.names)}"
+            )
+
+        # Newest row wins for duplicate keys within the new data as well
+        new_df = df.copy()
+        new_df[time_col] = _utc_times(new_df[time_col])
+        new_df = new_df.drop_duplicates(subset=key, keep="last")
+        new_df = new_df.sort_values(time_col, kind="stable")
+        if schema is not None:
+            new_df = new_df[schema.names]
+
+        granularity = catalog.get("partitioning") or _partition_granularity(frequency)
+        keys = _partition_keys(new_df[time_col], granularity).fillna(UNDATED_PARTITION)
+        segments = _segments_by_partition(catalog)
+
+        stats = {"rows": 0, "segments_written": 0, "segments_merged": 0}
+        for partition, rows in new_df.groupby(keys.to_numpy(), sort=True).indices.items():
+            part_df = new_df.iloc[rows]
+            existing = segments.get(partition, [])
+
+            if partition == UNDATED_PARTITION:
+                overlapping = []
+            else:
+                start, end = part_df[time_col].min(), part_df[time_col].max()
+                overlapping = [
+                    rel_path
+                    for rel_path in existing
+                    if _overlaps(catalog["partitions"][rel_path], start, end)
+                ]
+
+            if overlapping:
+                # Dedupe at the boundary: only the overlapping segments are read
+                merged = [
+                    _read_segment(os.path.join(cache_path, rel_path), time_col)
+                    for rel_path in overlapping
+                ]
+                part_df = pd.concat(merged + [part_df], ignore_index=True)
+                part_df = part_df.drop_duplicates(subset=key, keep="last")
+                part_df = part_df.sort_values(time_col, kind="stable")
+                stats["segments_merged"] += len(overlapping)
+
+            rel_path = self._next_segment(catalog, partition)
+            bounds = part_df[time_col] if partition != UNDATED_PARTITION else None
+            catalog["partitions"][rel_path] = self._write_partition(
+                cache_path, rel_path, part_df, bounds, catalog["metadata"], schema
+            )
+            for old_path in overlapping:
+                del catalog["partitions"][old_path]
+                os.remove(os.path.join(cache_path, old_path))
+
+            stats["rows"] += len(rows)
+            stats["segments_written"] += 1
+        return stats
+
+    def _compact_dataset(self, cache_path: str, min_files: int) -> int:
+        """Rewrite every partition with at least ``min_files`` segments as one file."""
+        with self._dataset_lock(cache_path):
+            catalog = self._load_catalog(cache_path)
+            time_col = catalog.get("time_column")
+            schema = self._dataset_schema(cache_path, catalog)
+
+            fragmented = _fragmented_partitions(catalog, min_files)
+            for partition, rel_paths in fragmented.items():
+                frames = [
+                    _read_segment(os.path.join(cache_path, rel_path), time_col)
+                    for rel_path in rel_paths
+                ]
+                part_df = pd.concat(frames, ignore_index=True)
+                bounds = None
+                if time_col is not None and partition != UNDATED_PARTITION:
+                    part_df = part_df.sort_values(time_col, kind="stable")
+                    bounds = part_df[time_col]
+
+                # New name first, catalog swap, then removal: readers never see duplicates
+                rel_path = self._next_segment(catalog, partition)
+                catalog["partitions"][rel_path] = self._write_partition(
+                    cache_path, rel_path, part_df, bounds, catalog.get("metadata", {}), schema
+                )
+                for old_path in rel_paths:
+                    del catalog["partitions"][old_path]
+                self._save_catalog(cache_path, catalog)
+                for old_path in rel_paths:
+                    os.remove(os.path.join(cache_path, old_path))
+
+            if fragmented:
+                self.logger.info(
+                    f"[DATA:cache:compact] {cache_path} - {len(fragmented)} partitions"
+                )
+            return len(fragmented)
+
+    def _schedule_compaction(self, cache_path: str) -> None:
+        """Compact a dataset on the background thread unless one is already queued."""
+        with self._locks_guard:
+            pending = self._compactions.get(cache_path)
+            if pending is not None and not pending.done():
+                return
+            if self._compactor is None:
+                self._compactor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="cache-compact"
+                )
+            self._compactions[cache_path] = self._compactor.submit(
+                self._compact_dataset, cache_path, COMPACT_FILE_THRESHOLD
+            )
+
+    def _dataset_lock(self, cache_path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(cache_path, threading.Lock())
+
+    def _dataset_schema(self, cache_path: str, catalog: Dict[str, Any]) -> Optional[pa.Schema]:
+        """Arrow schema of the cached data from one partition footer."""
+        for rel_path in sorted(catalog["partitions"]):
+            schema = pq.read_schema(os.path.join(cache_path, rel_path))
+            return pa.schema([schema.field(name) for name in schema.names])
+        return None
+
+    def _next_segment(self, catalog: Dict[str, Any], partition: str) -> str:
+        """Unused segment file name for a partition."""
+        while True:
+            catalog["sequence"] = catalog.get("sequence", 0) + 1
+            rel_path = _segment_path(partition, catalog["sequence"])
+            if rel_path not in catalog["partitions"]:
+                return rel_path
+
+    def _read_window(
+        self,
+        cache_path: str,
+        catalog: Dict[str, Any],
+        start_utc: pd.Timestamp,
+        end_utc: pd.Timestamp,
+    ) -> Tuple[List[str], Optional[pa.Table]]:
+        """Read the rows in [start, end] from the segments the catalog says overlap it."""
+        # Partition pruning from the catalog, row-group pruning from parquet statistics.
+        # Segments of a partition never overlap, so ordering by start keeps time order.
+        entries = sorted(
+            (
+                (pd.Timestamp(entry["start"]), rel_path)
+                for rel_path, entry in catalog["partitions"].items()
+                if entry["start"] is not None and _overlaps(entry, start_utc, end_utc)
+            )
+        )
+        files = [os.path.join(cache_path, rel_path) for _, rel_path in entries]
+        if not files:
+            return files, None
+
+        dataset = ds.dataset(files, format="parquet")
+        time_field = dataset.schema.field(catalog["time_column"])
+        return files, dataset.to_table(filter=_time_filter(time_field, start_utc, end_utc))
+
+    def _write_partition(
+        self,
+        cache_path: str,
+        rel_path: str,
+        df: pd.DataFrame,
+        times_utc: Optional[pd.Series],
+        metadata: Dict[str, Any],
+        schema: Optional[pa.Schema] = None,
+    ) -> Dict[str, Any]:
+        """Write a single partition file and return its catalog entry."""
+        file_path = os.path.join(cache_path, rel_path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        # Appended rows take the cached column types (e.g. naive vs UTC timestamps)
+        table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        if metadata:
+            table = table.replace_schema_metadata(
+                {**(table.schema.metadata or {}), METADATA_KEY: json.dumps(metadata, default=str)}
+            )
+        tmp_path = file_path + ".tmp"
+        pq.write_table(table, tmp_path, row_group_size=ROW_GROUP_SIZE)
+        os.replace(tmp_path, file_path)
+
+        return {
+            "rows": len(df),
+            "start": times_utc.min().isoformat() if times_utc is not None else None,
+            "end": times_utc.max().isoformat() if times_utc is not None else None,
+            "size_bytes": os.path.getsize(file_path),
+            "checksum": _file_checksum(file_path),
+        }
+
+    def _load_catalog(self, cache_path: str) -> Dict[str, Any]:
+        """Read the dataset catalog, rebuilding it from parquet footers if missing."""
+        catalog_path = os.path.join(cache_path, CATALOG_FILE)
+        if os.path.exists(catalog_path):
+            with open(catalog_path, "r") as f:
+                return json.load(f)
+
+        self.logger.info(f"[DATA:cache:catalog:rebuild] {cache_path}")
+        catalog = self._rebuild_catalog(cache_path)
+        self._save_catalog(cache_path, catalog)
+        return catalog
+
+    def _save_catalog(self, cache_path: str, catalog: Dict[str, Any]) -> None:
+        catalog_path = os.path.join(cache_path, CATALOG_FILE)
+        tmp_path = catalog_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(catalog, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, catalog_path)
+
+    def _rebuild_catalog(self, cache_path: str) -> Dict[str, Any]:
+        """Recreate catalog entries from parquet footers (no data pages are read)."""
+        # Dataset directories are named "<frequency>.parquet"
+        frequency = os.path.basename(cache_path)[: -len(".parquet")]
+        catalog = {
+            "version": CATALOG_VERSION,
+            "frequency": frequency,
+            "time_column": None,
+            "partitioning": _partition_granularity(frequency),
+            "metadata": {},
+            "sequence": 0,
+            "partitions": {},
+        }
+
+        for root, _, files in os.walk(cache_path):
+            for file in sorted(files):
+                if not file.endswith(".parquet"):
+                    continue
+                file_path = os.path.join(root, file)
+                rel_path = os.path.relpath(file_path, cache_path)
+                metadata = pq.ParquetFile(file_path).metadata
+
+                time_col = next((c for c in TIME_COLUMNS if c in metadata.schema.names), None)
+                catalog["time_column"] = catalog["time_column"] or time_col
+                stored = (metadata.metadata or {}).get(METADATA_KEY)
+                if stored:
+                    catalog["metadata"].update(json.loads(stored))
+                start, end = _footer_time_bounds(metadata, time_col)
+                catalog["partitions"][rel_path] = {
+                    "rows": metadata.num_rows,
+                    "start": start,
+                    "end": end,
+                    "size_bytes": os.path.getsize(file_path),
+                    "checksum": _file_checksum(file_path),
+                }
+                catalog["sequence"] = max(catalog["sequence"], _segment_number(rel_path))
+        return catalog
+
+    def _migrate_legacy_file(self, cache_path: str, frequency: str) -> None:
+        """Convert a monolithic ``<frequency>.parquet`` file into a partitioned dataset."""
+        if not os.path.isfile(cache_path):
+            return
+
+        self.logger.info(f"[DATA:cache:migrate] {cache_path}")
+        df = pd.read_parquet(cache_path)
+        legacy_path = cache_path + ".legacy"
+        os.replace(cache_path, legacy_path)
+
+        # Older caches broadcast metadata as "_meta_<key>" columns on every row
+        meta_columns = [col for col in df.columns if col.startswith("_meta_")]
+        metadata = {col[len("_meta_") :]: _json_value(df[col].iloc[0]) for col in meta_columns}
+        df = df.drop(columns=meta_columns)
+
+        os.makedirs(cache_path, exist_ok=True)
+        catalog = self._write_partitions(cache_path, frequency, df, metadata if len(df) else {})
+        self._save_catalog(cache_path, catalog)
+        os.remove(legacy_path)
+
+
+def _find_time_column(df: pd.DataFrame) -> Optional[str]:
+    return next((col for col in TIME_COLUMNS if col in df.columns), None)
+
+
+def _to_utc(value: datetime) -> pd.Timestamp:
+    """Timezone-aware UTC timestamp (naive values are taken as UTC)."""
+    value = pd.Timestamp(value)
+    return value.tz_localize("UTC") if value.tzinfo is None else value.tz_convert("UTC")
+
+
+def _utc_times(values: pd.Series) -> pd.Series:
+    """Timestamps as tz-aware UTC (naive values are taken as UTC)."""
+    times = pd.to_datetime(values)
+    return times.dt.tz_localize("UTC") if times.dt.tz is None else times.dt.tz_convert("UTC")
+
+
+def _read_segment(file_path: str, time_col: Optional[str]) -> pd.DataFrame:
+    df = pd.read_parquet(file_path)
+    if time_col is not None and time_col in df.columns:
+        df[time_col] = _utc_times(df[time_col])
+    return df
+
+
+def _segments_by_partition(catalog: Dict[str, Any]) -> Dict[str, List[str]]:
+    """Segment files of each partition, keyed by the partition's base file name."""
+    segments: Dict[str, List[str]] = {}
+    for rel_path in sorted(catalog["partitions"]):
+        segments.setdefault(_SEGMENT_SUFFIX.sub("", rel_path), []).append(rel_path)
+    return segments
+
+
+def _segment_path(partition: str, sequence: int) -> str:
+    """File name of a partition segment, e.g. ``2025-01-01.000003.parquet``."""
+    return f"{partition[: -len('.parquet')]}.{sequence:0{SEGMENT_DIGITS}d}.parquet"
+
+
+def _segment_number(rel_path: str) -> int:
+    """Sequence number of a segment (0 for files written before segments were numbered)."""
+    match = _SEGMENT_SUFFIX.search(rel_path)
+    return int(match.group()[1:]) if match else 0
+
+
+def _fragmented_partitions(catalog: Dict[str, Any], min_files: int) -> Dict[str, List[str]]:
+    return {
+        partition: rel_paths
+        for partition, rel_paths in _segments_by_partition(catalog).items()
+        if len(rel_paths) >= max(min_files, 2)
+    }
+
+
+def _json_value(value: Any) -> Any:
+    return value.item() if hasattr(value, "item") else value
+
+
+def _overlaps(entry: Dict[str, Any], start_utc: pd.Timestamp, end_utc: pd.Timestamp) -> bool:
+    """Whether a catalog entry may hold rows in [start, end] (unknown bounds always may)."""
+    if entry["start"] is None or entry["end"] is None:
+        return True
+    return pd.Timestamp(entry["start"]) <= end_utc and pd.Timestamp(entry["end"]) >= start_utc
+
+
+def _partition_granularity(frequency: str) -> str:
+    """Hourly partitions for sub-minute data, daily partitions otherwise."""
+    try:
+        return "hour" if pd.to_timedelta(frequency) < pd.Timedelta(minutes=1) else "day"
+    except ValueError:
+        return "day"
+
+
+def _partition_keys(times_utc: pd.Series, granularity: str) -> pd.Series:
+    """Relative partition file path for each timestamp."""
+    if granularity == "hour":
+        return times_utc.dt.strftime("%Y-%m-%d/%H.parquet")
+    return times_utc.dt.strftime("%Y-%m-%d.parquet")
+
+
+def _time_filter(field: pa.Field, start_utc: pd.Timestamp, end_utc: pd.Timestamp):
+    """Dataset filter expression for start <= time <= end in the column's own type."""
+    column = ds.field(field.name)
+    if not pa.types.is_timestamp(field.type):
+        return None
+    if field.type.tz is None:
+        # Naive timestamps are stored as UTC wall-clock values
+        start_utc, end_utc = start_utc.tz_localize(None), end_utc.tz_localize(None)
+    start = pa.scalar(start_utc, type=field.type)
+    end = pa.scalar(end_utc, type=field.type)
+    return (column >= start) & (column <= end)
+
+
+def _footer_time_bounds(
+    metadata: pq.FileMetaData, time_col: Optional[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """Min/max of the time column from row-group statistics."""
+    if time_col is None or metadata.num_rows == 0:
+        return None, None
+
+    index = metadata.schema.names.index(time_col)
+    lows, highs = [], []
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(index).statistics
+        if stats is None or not stats.has_min_max:
+            return None, None
+        lows.append(stats.min)
+        highs.append(stats.max)
+    return _to_utc(min(lows)).isoformat(), _to_utc(max(highs)).isoformat()
+
+
+def _file_checksum(file_path: str) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _remove_path(path: str) -> None:
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def _list_dirs(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return []
+    return sorted(entry for entry in os.listdir(path) if os.path.isdir(os.path.join(path, entry)))
@@ -8,12 +8,15 @@ Implements feature engineering and windowing for ACD analysis:
 """
 
 import logging
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -31,26 +34,104 @@ class WindowConfig:
     seed: Optional[int] = None  # Random seed for deterministic behavior
 
 
+class _LazyWindows(Sequence):
+    """List-like access to windows that materializes each DataFrame on demand"""
+
+    def __init__(self, windowed_data: "WindowedData"):
+        self._windowed_data = windowed_data
+
+    def __len__(self) -> int:
+        return len(self._windowed_data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._windowed_data.get_window(i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        return self._windowed_data.get_window(index)
+
+
 @dataclass
 class WindowedData:
-    """Container for windowed data"""
+    """
+    Container for windowed data
+
+    Stores the source frame once plus (start, end) row offsets per window.
+    Price columns are kept as one contiguous read-only array so vectorized
+    consumers can take zero-copy views; DataFrames are only built by
+    ``get_window`` (or when iterating ``windows``).
+    """
 
-    windows: List[pd.DataFrame]
+    source: pd.DataFrame
+    offsets: np.ndarray  # (n_windows, 2) array of [start, end) row offsets
+    window_indices: np.ndarray  # Window index labels (position in the unfiltered sweep)
+    price_columns: List[str]
     window_config: WindowConfig
     metadata: Dict[str, Any]
+    window_builder: Optional[Callable[[pd.DataFrame, int, int, int], pd.DataFrame]] = None
+    values: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self):
+        values = np.ascontiguousarray(self.source[self.price_columns].to_numpy(dtype=np.float64))
+        values.flags.writeable = False
+        self.values = values
 
     def __len__(self) -> int:
-        return len(self.windows)
+        return len(self.offsets)
+
+    @property
+    def windows(self) -> Sequence:
+        """Windows as a lazily materialized sequence of DataFrames"""
+        return _LazyWindows(self)
+
+    @property
+    def window_lengths(self) -> np.ndarray:
+        """Number of rows in each window"""
+        return self.offsets[:, 1] - self.offsets[:, 0]
 
     def get_window(self, index: int) -> pd.DataFrame:
-        """Get window by index"""
-        if 0 <= index < len(self.windows):
-            return self.windows[index]
-        raise IndexError(f"Window index {index} out of range")
+        """Get window by index (materializes a new DataFrame)"""
+        if not 0 <= index < len(self.offsets):
+            raise IndexError(f"Window index {index} out of range")
+
+        start, end = (int(x) for x in self.offsets[index])
+        window_data = self.source.iloc[start:end].copy()
+        if self.window_builder is not None:
+            window_data = self.window_builder(
+                window_data, int(self.window_indices[index]), start, end
+            )
+        return window_data
+
+    def window_values(self, index: int) -> np.ndarray:
+        """Read-only zero-copy view of the price columns for one window"""
+        if not 0 <= index < len(self.offsets):
+            raise IndexError(f"Window index {index} out of range")
+
+        start, end = self.offsets[index]
+        return self.values[start:end]
+
+    def sliding_values(self) -> np.ndarray:
+        """
+        Zero-copy (n_windows, window_size, n_prices) view over all windows
+
+        Requires evenly spaced, equal-length windows (the default layout).
+        """
+        if len(self.offsets) == 0:
+            return np.empty((0, self.window_config.window_size, len(self.price_columns)))
+
+        lengths = self.window_lengths
+        starts = self.offsets[:, 0]
+        step = self.window_config.step_size
+        if np.any(lengths != lengths[0]) or np.any(np.diff(starts) != step):
+            raise ValueError("sliding_values requires equal-length, evenly spaced windows")
+
+        view = sliding_window_view(self.values, int(lengths[0]), axis=0)
+        # (n_positions, n_prices, window) -> (n_windows, window, n_prices)
+        return view[starts[0] :: step][: len(starts)].transpose(0, 2, 1)
 
     def get_window_metadata(self, index: int) -> Dict[str, Any]:
         """Get metadata for specific window"""
-        if 0 <= index < len(self.windows):
+        if 0 <= index < len(self.offsets):
             return self.metadata.get(f"window_{index}", {})
         raise IndexError(f"Window index {index} out of range")
 
@@ -86,80 +167,81 @@ class DataWindowing:
             )
 
         if self.config.window_type == "fixed":
-            windows = self._create_fixed_windows(data, price_columns)
+            offsets, window_indices = self._create_fixed_windows(data, price_columns)
+            builder = self._build_fixed_window
         elif self.config.window_type == "rolling":
-            windows = self._create_rolling_windows(data, price_columns)
+            offsets, window_indices = self._create_rolling_windows(data, price_columns)
+            builder = partial(
+                self._build_rolling_window,
+                price_columns=[col for col in price_columns if col in data.columns],
+            )
         else:
             raise ValueError(f"Unknown window type: {self.config.window_type}")
 
-        # Create metadata for each window
-        metadata = self._create_window_metadata(windows, data)
+        # A private copy, so later edits to ``data`` reach neither the frames nor the arrays
+        windowed_data = WindowedData(
+            source=data.copy(),
+            offsets=offsets,
+            window_indices=window_indices,
+            price_columns=[col for col in price_columns if col in data.columns],
+            window_config=self.config,
+            metadata={},
+            window_builder=builder,
+        )
 
-        return WindowedData(windows=windows, window_config=self.config, metadata=metadata)
+        # Create metadata for each window
+        windowed_data.metadata = self._create_window_metadata(windowed_data, data)
 
-    def _create_fixed_windows(
-        self, data: pd.DataFrame, price_columns: List[str]
-    ) -> List[pd.DataFrame]:
-        """Create fixed-size windows for VMM analysis"""
-        windows = []
-        total_points = len(data)
+        return windowed_data
 
-        # Calculate number of windows
+    def _window_offsets(self, total_points: int):
+        """Row offsets [start, end) and index labels of all qualifying windows"""
         n_windows = max(1, (total_points - self.config.window_size) // self.config.step_size + 1)
 
-        for i in range(n_windows):
-            start_idx = i * self.config.step_size
-            end_idx = start_idx + self.config.window_size
-
-            if end_idx > total_points:
-                break
+        starts = np.arange(n_windows, dtype=np.int64) * self.config.step_size
+        ends = starts + self.config.window_size
+        indices = np.arange(n_windows, dtype=np.int64)
 
-            # Extract window data
-            window_data = data.iloc[start_idx:end_idx].copy()
-
-            # Ensure window has required data points
-            if len(window_data) >= self.config.min_data_points:
-                # Add window index for tracking
-                window_data["window_index"] = i
-                windows.append(window_data)
-
-        logger.info(f"Created {len(windows)} fixed windows of size {self.config.window_size}")
-        return windows
-
-    def _create_rolling_windows(
-        self, data: pd.DataFrame, price_columns: List[str]
-    ) -> List[pd.DataFrame]:
-        """Create rolling windows for ICP analysis"""
-        windows = []
-        total_points = len(data)
-
-        # Calculate number of rolling windows
-        n_windows = max(1, (total_points - self.config.window_size) // self.config.step_size + 1)
+        # Windows must fit in the data and have the required data points
+        keep = (ends <= total_points) & ((ends - starts) >= self.config.min_data_points)
 
-        for i in range(n_windows):
-            start_idx = i * self.config.step_size
-            end_idx = start_idx + self.config.window_size
+        offsets = np.column_stack([starts[keep], ends[keep]])
+        return offsets, indices[keep]
 
-            if end_idx > total_points:
-                break
+    def _create_fixed_windows(self, data: pd.DataFrame, price_columns: List[str]):
+        """Create fixed-size window offsets for VMM analysis"""
+        offsets, window_indices = self._window_offsets(len(data))
+        logger.info(f"Created {len(offsets)} fixed windows of size {self.config.window_size}")
+        return offsets, window_indices
 
-            # Extract window data
-            window_data = data.iloc[start_idx:end_idx].copy()
+    def _create_rolling_windows(self, data: pd.DataFrame, price_columns: List[str]):
+        """Create rolling window offsets for ICP analysis"""
+        offsets, window_indices = self._window_offsets(len(data))
+        logger.info(f"Created {len(offsets)} rolling windows of size {self.config.window_size}")
+        return offsets, window_indices
 
-            # Ensure window has required data points
-            if len(window_data) >= self.config.min_data_points:
-                # Add window index and rolling features
-                window_data["window_index"] = i
-                window_data["rolling_start"] = start_idx
-                window_data["rolling_end"] = end_idx
-
-                # Add rolling environment labels for ICP
-                window_data = self._add_rolling_environment_labels(window_data, price_columns)
+    def _build_fixed_window(
+        self, window_data: pd.DataFrame, window_index: int, start: int, end: int
+    ) -> pd.DataFrame:
+        """Materialize a fixed window: add window index for tracking"""
+        window_data["window_index"] = window_index
+        return window_data
 
-                windows.append(window_data)
+    def _build_rolling_window(
+        self,
+        window_data: pd.DataFrame,
+        window_index: int,
+        start: int,
+        end: int,
+        price_columns: List[str],
+    ) -> pd.DataFrame:
+        """Materialize a rolling window: add window index and rolling features"""
+        window_data["window_index"] = window_index
+        window_data["rolling_start"] = start
+        window_data["rolling_end"] = end
 
-        logger.info(f"Created {len(windows)} rolling windows of size {self.config.window_size}")
-        return windows
+        # Add rolling environment labels for ICP
+        return self._add_rolling_environment_labels(window_data, price_columns)
 
     def _add_rolling_environment_labels(
         self, window_data: pd.DataFrame, price_columns: List[str]
@@ -213,11 +295,11 @@ class DataWindowing:
         return window_data
 
     def _create_window_metadata(
-        self, windows: List[pd.DataFrame], original_data: pd.DataFrame
+        self, windowed_data: WindowedData, original_data: pd.DataFrame
     ) -> Dict[str, Any]:
         """Create metadata for each window"""
         metadata = {
-            "total_windows": len(windows),
+            "total_windows": len(windowed_data),
             "window_size": self.config.window_size,
             "step_size": self.config.step_size,
             "window_type": self.config.window_type,
@@ -226,19 +308,26 @@ class DataWindowing:
             "created_at": datetime.now().isoformat(),
         }
 
+        if len(windowed_data) == 0:
+            return metadata
+
+        # Every window shares the same columns, so derive them from the first one only
+        columns = list(windowed_data.get_window(0).columns)
+        price_columns = [col for col in columns if "price" in col.lower()]
+        feature_columns = [
+            col for col in columns if "rolling" in col or "corr" in col or "spread" in col
+        ]
+
         # Add metadata for each individual window
-        for i, window in enumerate(windows):
+        index = original_data.index
+        for i, (start, end) in enumerate(windowed_data.offsets):
             window_meta = {
                 "window_index": i,
-                "data_points": len(window),
-                "start_timestamp": window.index[0] if len(window) > 0 else None,
-                "end_timestamp": window.index[-1] if len(window) > 0 else None,
-                "price_columns": [col for col in window.columns if "price" in col.lower()],
-                "feature_columns": [
-                    col
-                    for col in window.columns
-                    if "rolling" in col or "corr" in col or "spread" in col
-                ],
+                "data_points": int(end - start),
+                "start_timestamp": index[start] if end > start else None,
+                "end_timestamp": index[end - 1] if end > start else None,
+                "price_columns": price_columns,
+                "feature_columns": feature_columns,
             }
 
             metadata[f"window_{i}"] = window_meta
@@ -247,44 +336,45 @@ class DataWindowing:
 
     def validate_windows(self, windowed_data: WindowedData) -> bool:
         """Validate that all windows meet quality requirements"""
-        if not windowed_data.windows:
+        if len(windowed_data) == 0:
             return False
 
-        for i, window in enumerate(windowed_data.windows):
+        lengths = windowed_data.window_lengths
+        for i in np.flatnonzero(lengths < self.config.min_data_points):
             # Check minimum data points
-            if len(window) < self.config.min_data_points:
-                logger.warning(
-                    f"Window {i} has insufficient data: "
-                    f"{len(window)} < {self.config.min_data_points}"
-                )
-                return False
+            logger.warning(
+                f"Window {i} has insufficient data: "
+                f"{lengths[i]} < {self.config.min_data_points}"
+            )
+            return False
 
-            # Check for required columns
-            required_cols = ["window_index"]
-            missing_cols = [col for col in required_cols if col not in window.columns]
-            if missing_cols:
-                logger.warning(f"Window {i} missing required columns: {missing_cols}")
-                return False
+        # Check for required columns (identical across windows)
+        required_cols = ["window_index"]
+        columns = windowed_data.get_window(0).columns
+        missing_cols = [col for col in required_cols if col not in columns]
+        if missing_cols:
+            logger.warning(f"Windows missing required columns: {missing_cols}")
+            return False
 
         return True
 
     def get_window_statistics(self, windowed_data: WindowedData) -> Dict[str, Any]:
         """Get statistics about the created windows"""
-        if not windowed_data.windows:
+        if len(windowed_data) == 0:
             return {}
 
-        window_sizes = [len(window) for window in windowed_data.windows]
+        window_sizes = windowed_data.window_lengths
 
         stats = {
-            "total_windows": len(windowed_data.windows),
+            "total_windows": len(windowed_data),
             "mean_window_size": np.mean(window_sizes),
             "std_window_size": np.std(window_sizes),
-            "min_window_size": min(window_sizes),
-            "max_window_size": max(window_sizes),
+            "min_window_size": int(window_sizes.min()),
+            "max_window_size": int(window_sizes.max()),
             "window_size_consistency": np.std(window_sizes)
             < 1.0,  # All windows should be same size
-            "total_data_points": sum(window_sizes),
-            "data_coverage": sum(window_sizes) / windowed_data.metadata["original_data_size"],
+            "total_data_points": int(window_sizes.sum()),
+            "data_coverage": window_sizes.sum() / windowed_data.metadata["original_data_size"],
         }
 
         return stats
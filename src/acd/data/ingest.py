@@ -9,11 +9,21 @@ Handles ingestion of market data from multiple sources:
 """
 
 import logging
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .quality import QualityProfile
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -41,12 +51,17 @@ class DataIngestionConfig:
         strict_quality_thresholds: bool = True,
         analyst_feed_validation: bool = True,
         regulatory_compliance_check: bool = True,
+        # Streaming ingestion
+        chunk_rows: int = 100_000,
+        max_workers: Optional[int] = None,
     ):
         # Validate parameters
         if max_file_size_mb <= 0:
             raise ValueError("max_file_size_mb must be positive")
         if cache_ttl_hours <= 0:
             raise ValueError("cache_ttl_hours must be positive")
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
 
         self.max_file_size_mb = max_file_size_mb
         self.supported_formats = supported_formats or ["csv", "parquet", "json", "xlsx"]
@@ -62,6 +77,10 @@ class DataIngestionConfig:
         self.analyst_feed_validation = analyst_feed_validation
         self.regulatory_compliance_check = regulatory_compliance_check
 
+        # Streaming ingestion: rows per chunk and file-level worker pool size
+        self.chunk_rows = chunk_rows
+        self.max_workers = max_workers
+
 
 class AnalystFeedValidator:
     """Validator for independent analyst feeds"""
@@ -421,6 +440,9 @@ class DataIngestion:
             "market_data_feeds": 0,
         }
 
+        # Files may be ingested from a worker pool
+        self._stats_lock = threading.Lock()
+
         # Initialize validators
         self.analyst_validator = AnalystFeedValidator()
         self.regulatory_validator = RegulatoryFeedValidator()
@@ -471,8 +493,8 @@ class DataIngestion:
             logger.error(f"Failed to ingest {file_path}: {e}")
             raise DataIngestionError(f"Ingestion failed: {e}")
 
-    def _validate_file(self, file_path: Path) -> None:
-        """Validate file before ingestion"""
+    def _validate_file(self, file_path: Path, check_size: bool = True) -> None:
+        """Validate file before ingestion (streamed files are exempt from the size limit)"""
         if not file_path.exists():
             raise DataIngestionError(f"File not found: {file_path}")
 
@@ -481,7 +503,7 @@ class DataIngestion:
 
         # Check file size
         file_size_mb = file_path.stat().st_size / (1024 * 1024)
-        if file_size_mb > self.config.max_file_size_mb:
+        if check_size and file_size_mb > self.config.max_file_size_mb:
             raise DataIngestionError(
                 f"File size {file_size_mb:.1f}MB exceeds limit {self.config.max_file_size_mb}MB"
             )
@@ -527,12 +549,8 @@ class DataIngestion:
         """Read file based on detected format"""
         try:
             if file_format == "csv":
-                # Try different CSV dialects
-                try:
-                    return pd.read_csv(file_path)
-                except Exception:
-                    # Try with different separators
-                    return pd.read_csv(file_path, sep=";")
+                # Pick the separator from the header instead of parsing the file twice
+                return pd.read_csv(file_path, sep=_sniff_separator(file_path))
 
             elif file_format == "parquet":
                 return pd.read_parquet(file_path)
@@ -731,12 +749,15 @@ class DataIngestion:
         self, file_path: Path, data: Optional[pd.DataFrame], success: bool, source_type: str
     ) -> None:
         """Update ingestion statistics"""
+        with self._stats_lock:
+            self._record_stats(len(data) if data is not None else 0, success, source_type)
+
+    def _record_stats(self, records: int, success: bool, source_type: str) -> None:
         self.ingestion_stats["total_files"] += 1
 
         if success:
             self.ingestion_stats["successful_ingestions"] += 1
-            if data is not None:
-                self.ingestion_stats["total_records"] += len(data)
+            self.ingestion_stats["total_records"] += records
 
             # Update source-specific stats
             if source_type == "analyst":
@@ -763,43 +784,369 @@ class DataIngestion:
         return stats
 
     def ingest_directory(
-        self, directory_path: Union[str, Path], source_type: str, file_pattern: str = "*.*"
+        self,
+        directory_path: Union[str, Path],
+        source_type: str,
+        file_pattern: str = "*.*",
+        max_workers: Optional[int] = None,
     ) -> List[pd.DataFrame]:
         """
         Ingest all files in a directory matching the pattern
 
+        Files are read concurrently; the result keeps the sorted file order.
+
         Args:
             directory_path: Directory containing data files
             source_type: Type of data source
             file_pattern: File pattern to match (e.g., "*.csv")
+            max_workers: Worker pool size (default: config.max_workers)
 
         Returns:
             List of ingested DataFrames
         """
+        matching_files = self._matching_files(directory_path, file_pattern)
+        if not matching_files:
+            return []
+
+        def ingest(file_path: Path) -> Optional[pd.DataFrame]:
+            try:
+                return self.ingest_file(file_path, source_type)
+            except Exception as e:
+                logger.error(f"Failed to ingest {file_path}: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.config.max_workers) as pool:
+            results = list(pool.map(ingest, matching_files))
+        ingested_data = [data for data in results if data is not None]
+
+        logger.info(f"Ingested {len(ingested_data)} files from {directory_path}")
+        return ingested_data
+
+    def stream_directory(
+        self,
+        directory_path: Union[str, Path],
+        source_type: str,
+        output_dir: Union[str, Path],
+        file_pattern: str = "*.*",
+        max_workers: Optional[int] = None,
+        schema_override: Optional[Dict] = None,
+        source_metadata: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Stream every matching file into partitioned parquet, files in parallel
+
+        Args:
+            directory_path: Directory containing data files
+            source_type: Type of data source
+            output_dir: Root directory for the parquet datasets
+            file_pattern: File pattern to match (e.g., "*.csv")
+            max_workers: Worker pool size (default: config.max_workers)
+            schema_override: Optional schema override for validation
+            source_metadata: Metadata about the data source
+
+        Returns:
+            Per-file reports (see ``ingest_file_streaming``), in sorted file order
+
+        Raises:
+            DataIngestionError: If two matching files share a stem (e.g. ``f.csv``
+                and ``f.json``) and would write the same dataset directory
+        """
+        matching_files = self._matching_files(directory_path, file_pattern)
+        if not matching_files:
+            return []
+
+        by_stem: Dict[str, List[str]] = {}
+        for file_path in matching_files:
+            by_stem.setdefault(file_path.stem, []).append(file_path.name)
+        clashes = sorted(names for names in by_stem.values() if len(names) > 1)
+        if clashes:
+            raise DataIngestionError(
+                f"Files map to the same dataset directory under {output_dir}: {clashes}"
+            )
+
+        def stream(file_path: Path) -> Dict[str, Any]:
+            try:
+                return self.ingest_file_streaming(
+                    file_path, source_type, output_dir, schema_override, source_metadata
+                )
+            except DataIngestionError as e:
+                return {"file": str(file_path), "success": False, "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.config.max_workers) as pool:
+            reports = list(pool.map(stream, matching_files))
+
+        succeeded = [report for report in reports if report["success"]]
+        logger.info(
+            f"Streamed {len(succeeded)}/{len(reports)} files from {directory_path} "
+            f"({sum(report['rows'] for report in succeeded)} records)"
+        )
+        return reports
+
+    def ingest_file_streaming(
+        self,
+        file_path: Union[str, Path],
+        source_type: str,
+        output_dir: Union[str, Path],
+        schema_override: Optional[Dict] = None,
+        source_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ingest a file chunk by chunk into partitioned parquet
+
+        Each chunk of ``config.chunk_rows`` rows is validated like a whole file
+        in ``ingest_file`` and written under ``<output_dir>/<file stem>/``,
+        partitioned by ``date=YYYY-MM-DD`` when a timestamp column is present.
+        Only one chunk is held in memory, so the size limit does not apply.
+        The dataset appears only once every chunk was written.
+
+        Args:
+            file_path: Path to data file (CSV, JSON lines or parquet)
+            source_type: Type of data source
+            output_dir: Root directory for the parquet dataset
+            schema_override: Optional schema override; its "dtypes" are used
+                while parsing
+            source_metadata: Metadata about the data source
+
+        Returns:
+            Report with file, output, rows, chunks, files, bytes, seconds,
+            rows_per_sec, mb_per_sec, quality_profile (a mergeable
+            QualityProfile of the written rows) and success
+        """
+        file_path = Path(file_path)
+        dataset_dir = Path(output_dir) / file_path.stem
+        partial_dir = dataset_dir.with_name(dataset_dir.name + ".partial")
+        started = time.perf_counter()
+
+        try:
+            self._validate_file(file_path, check_size=False)
+            file_format = self._detect_format(file_path)
+            dtypes = (schema_override or {}).get("dtypes")
+
+            if partial_dir.exists():
+                shutil.rmtree(partial_dir)
+            rows, chunks, files = 0, 0, 0
+            schema = None
+            profile = QualityProfile()
+            for chunk in self._iter_chunks(file_path, file_format, dtypes):
+                validated = self._validate_data_by_source(
+                    chunk, source_type, schema_override, source_metadata or {}
+                )
+                # The first chunk fixes the dataset schema for the rest
+                if schema is None:
+                    table = pa.Table.from_pandas(validated, preserve_index=False)
+                    schema = _widen_null_fields(table.schema)
+                    table = table.cast(schema)
+                else:
+                    table = pa.Table.from_pandas(validated, schema=schema, preserve_index=False)
+                files += _write_partitioned(partial_dir, table, validated, chunks)
+                profile.update(validated)
+                rows += len(validated)
+                chunks += 1
+
+            if chunks == 0:
+                raise DataIngestionError("Data file is empty")
+            if dataset_dir.exists():
+                shutil.rmtree(dataset_dir)
+            os.replace(partial_dir, dataset_dir)
+
+        except Exception as e:
+            shutil.rmtree(partial_dir, ignore_errors=True)
+            with self._stats_lock:
+                self._record_stats(0, False, source_type)
+            logger.error(f"Failed to stream {file_path}: {e}")
+            raise DataIngestionError(f"Streaming ingestion failed: {e}")
+
+        with self._stats_lock:
+            self._record_stats(rows, True, source_type)
+
+        seconds = time.perf_counter() - started
+        size = file_path.stat().st_size
+        report = {
+            "file": str(file_path),
+            "output": str(dataset_dir),
+            "rows": rows,
+            "chunks": chunks,
+            "files": files,
+            "bytes": size,
+            "seconds": seconds,
+            "rows_per_sec": rows / seconds if seconds > 0 else 0.0,
+            "mb_per_sec": size / (1024 * 1024) / seconds if seconds > 0 else 0.0,
+            "quality_profile": profile,
+            "success": True,
+        }
+        logger.info(
+            f"Streamed {file_path} ({rows} records, {chunks} chunks) in {seconds:.2f}s "
+            f"[{report['rows_per_sec']:.0f} rows/s, {report['mb_per_sec']:.1f} MB/s]"
+        )
+        return report
+
+    def _iter_chunks(
+        self, file_path: Path, file_format: str, dtypes: Optional[Dict[str, Any]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Read a file as DataFrames of at most ``config.chunk_rows`` rows
+
+        The first chunk pins the dtypes of every later one, so a column whose
+        values look different further into the file keeps one type throughout.
+        """
+        pinned = None
+        for chunk in self._read_chunks(file_path, file_format, dtypes):
+            if pinned is None:
+                pinned = _pinned_dtypes(chunk)
+            else:
+                chunk = _conform_chunk(chunk, pinned, file_path)
+            yield chunk
+
+    def _read_chunks(
+        self, file_path: Path, file_format: str, dtypes: Optional[Dict[str, Any]] = None
+    ) -> Iterator[pd.DataFrame]:
+        """Parse a file chunk by chunk"""
+        chunk_rows = self.config.chunk_rows
+
+        if file_format == "csv":
+            sep = _sniff_separator(file_path)
+            # Columns that are text (or empty) at the head are read as text to the end
+            head = pd.read_csv(file_path, sep=sep, dtype=dtypes, nrows=chunk_rows)
+            text = {
+                col: str for col in head.columns if _is_text(head[col]) or head[col].isna().all()
+            }
+            yield from pd.read_csv(
+                file_path, sep=sep, dtype={**text, **(dtypes or {})}, chunksize=chunk_rows
+            )
+
+        elif file_format == "json":
+            if _is_json_array(file_path):
+                # A JSON array cannot be parsed incrementally; only JSON lines stream
+                self._validate_file(file_path)
+                data = pd.read_json(file_path, dtype=dtypes)
+                for start in range(0, len(data), chunk_rows):
+                    yield data.iloc[start : start + chunk_rows].reset_index(drop=True)
+            else:
+                with pd.read_json(
+                    file_path, lines=True, dtype=dtypes, chunksize=chunk_rows
+                ) as reader:
+                    yield from reader
+
+        elif file_format == "parquet":
+            for batch in pq.ParquetFile(file_path).iter_batches(batch_size=chunk_rows):
+                yield batch.to_pandas()
+
+        else:
+            raise DataIngestionError(f"Unsupported format for streaming: {file_format}")
+
+    def _matching_files(self, directory_path: Union[str, Path], file_pattern: str) -> List[Path]:
+        """Files in a directory matching a glob pattern, sorted"""
         directory_path = Path(directory_path)
 
         if not directory_path.exists() or not directory_path.is_dir():
             raise DataIngestionError(f"Directory not found: {directory_path}")
 
         # Find matching files
-        matching_files = list(directory_path.glob(file_pattern))
+        matching_files = sorted(
+            path for path in directory_path.glob(file_pattern) if path.is_file()
+        )
 
         if not matching_files:
             logger.warning(f"No files found matching pattern '{file_pattern}' in {directory_path}")
-            return []
+        return matching_files
+
+
+def _sniff_separator(file_path: Path) -> str:
+    """CSV separator (',' or ';') judged from the header line"""
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        header = f.readline()
+    return ";" if header.count(";") > header.count(",") else ","
+
+
+def _is_json_array(file_path: Path) -> bool:
+    """Whether a JSON file holds one array (as opposed to JSON lines)"""
+    with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+        while True:
+            char = f.read(1)
+            if not char or not char.isspace():
+                return char == "["
+
+
+def _pinned_dtypes(chunk: pd.DataFrame) -> Dict[str, Any]:
+    """Dtypes of a file's first chunk, with all-null columns widened to text"""
+    return {
+        col: object if chunk[col].isna().all() and not _is_text(chunk[col]) else chunk[col].dtype
+        for col in chunk.columns
+    }
+
+
+def _is_text(values: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(values.dtype) or pd.api.types.is_string_dtype(values.dtype)
+
+
+def _conform_chunk(chunk: pd.DataFrame, pinned: Dict[str, Any], file_path: Path) -> pd.DataFrame:
+    """Cast a chunk to the pinned dtypes; values that do not fit become missing"""
+    for col, dtype in pinned.items():
+        if col not in chunk.columns or chunk[col].dtype == dtype:
+            continue
+        values = chunk[col]
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            converted = values.map(str, na_action="ignore").astype(dtype)
+        elif pd.api.types.is_bool_dtype(dtype):
+            converted = values.map(_as_bool, na_action="ignore").astype("boolean")
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            tz = getattr(dtype, "tz", None)
+            converted = pd.to_datetime(values, errors="coerce", utc=tz is not None)
+            converted = converted.dt.tz_convert(tz) if tz is not None else converted
+        elif pd.api.types.is_numeric_dtype(dtype):
+            converted = pd.to_numeric(values, errors="coerce")
+            if pd.api.types.is_integer_dtype(dtype):
+                converted = converted.where(converted % 1 == 0).astype("Int64")
+            else:
+                converted = converted.astype(dtype)
+        else:
+            converted = values.astype(dtype)
 
-        # Ingest each file
-        ingested_data = []
-        for file_path in matching_files:
-            try:
-                data = self.ingest_file(file_path, source_type)
-                ingested_data.append(data)
-            except Exception as e:
-                logger.error(f"Failed to ingest {file_path}: {e}")
-                continue
+        lost = int((converted.isna() & values.notna()).sum())
+        if lost:
+            logger.warning(
+                f"{file_path}: {lost} values of column '{col}' do not fit its dtype {dtype} "
+                f"and were set to missing"
+            )
+        chunk[col] = converted
+    return chunk
 
-        logger.info(f"Ingested {len(ingested_data)} files from {directory_path}")
-        return ingested_data
+
+def _as_bool(value: Any) -> Any:
+    """Boolean reading of a parsed value (None if it is not one)"""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    return {"true": True, "false": False}.get(str(value).strip().lower())
+
+
+def _widen_null_fields(schema: pa.Schema) -> pa.Schema:
+    """Schema with all-null (untyped) fields stored as strings"""
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, field.with_type(pa.string()))
+    return schema
+
+
+def _write_partitioned(
+    dataset_dir: Path, table: pa.Table, data: pd.DataFrame, chunk_index: int
+) -> int:
+    """Write one chunk, split by timestamp date when present; returns files written"""
+    name = f"part-{chunk_index:05d}.parquet"
+    if "timestamp" not in data.columns or not pd.api.types.is_datetime64_any_dtype(
+        data["timestamp"]
+    ):
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table, dataset_dir / name)
+        return 1
+
+    dates = data["timestamp"].dt.strftime("%Y-%m-%d").fillna("unknown").to_numpy()
+    written = 0
+    for date, rows in pd.Series(range(len(dates))).groupby(dates).groups.items():
+        partition_dir = dataset_dir / f"date={date}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(table.take(pa.array(rows.to_numpy())), partition_dir / name)
+        written += 1
+    return written
 
 
 def create_ingestion_config(
@@ -6,12 +6,17 @@ Implements comprehensive data quality metrics and validation:
 - Accuracy: Data validation and outlier detection
 - Timeliness: Data freshness and staleness detection (Week 4: Hardened)
 - Consistency: Cross-field validation and data integrity (Week 4: Hardened)
+
+Assessment runs on a QualityProfile: mergeable per-column sketches built chunk
+by chunk, so datasets larger than memory can be profiled during ingestion and
+profiles from parallel workers combined before a single assessment.
 """
 
+import copy
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -71,6 +76,378 @@ class DataQualityError(Exception):
     """Custom exception for data quality errors"""
 
 
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with relative accuracy (DDSketch-style).
+
+    Values are counted in logarithmic buckets whose bounds differ by a factor
+    of (1 + alpha) / (1 - alpha), so any quantile is estimated within a
+    relative error of ``alpha``. Merging two sketches adds their bucket counts.
+    """
+
+    # Magnitudes below this are counted as zero
+    min_value = 1e-12
+
+    def __init__(self, alpha: float = 0.001):
+        if not 0.0 < alpha < 1.0:
+            raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero + sum(self.positive.values()) + sum(self.negative.values())
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """Add an array of values; non-finite values are ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        magnitude = np.abs(values)
+        small = magnitude <= self.min_value
+        self.zero += int(small.sum())
+        _add_counts(self.positive, self._keys(values[(values > 0) & ~small]))
+        _add_counts(self.negative, self._keys(-values[(values < 0) & ~small]))
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Add another sketch's counts to this one."""
+        if other.alpha != self.alpha:
+            raise ValueError(f"Cannot merge sketches with alpha {self.alpha} and {other.alpha}")
+        _add_counts(self.positive, other.positive)
+        _add_counts(self.negative, other.negative)
+        self.zero += other.zero
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1); NaN for an empty sketch."""
+        if not 0.0 <= q <= 1.0:
+            raise ValueError(f"q must be between 0 and 1, got {q}")
+        total = self.count
+        if total == 0:
+            return float("nan")
+        rank = q * (total - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zero
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+    def count_below(self, value: float) -> float:
+        """Estimated number of values below ``value``."""
+        return self._count_below(value, self.positive, self.negative)
+
+    def count_above(self, value: float) -> float:
+        """Estimated number of values above ``value``."""
+        # Mirrored: x > value exactly when -x < -value
+        return self._count_below(-value, self.negative, self.positive)
+
+    def _count_below(self, value: float, same: Dict[int, int], opposite: Dict[int, int]) -> float:
+        # ``same`` holds magnitudes of values with the sign of a positive ``value``
+        if abs(value) <= self.min_value:
+            return float(sum(opposite.values()))
+        position = np.log(abs(value)) / np.log(self.gamma)
+        key = int(np.ceil(position))
+        # Values are spread log-uniformly over the bucket holding ``value``
+        fraction = position - (key - 1)
+        if value > 0:
+            inside = sum(count for k, count in same.items() if k < key)
+            return sum(opposite.values()) + self.zero + inside + fraction * same.get(key, 0)
+        beyond = sum(count for k, count in opposite.items() if k > key)
+        return beyond + (1 - fraction) * opposite.get(key, 0)
+
+    def _keys(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / np.log(self.gamma)).astype(np.int64)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+
+@dataclass
+class ColumnProfile:
+    """Mergeable summary of one column: counts, Welford moments, range and quantiles"""
+
+    name: str
+    dtype: Any = None
+    count: int = 0
+    nulls: int = 0
+    # Moments and range over the non-null values of numeric columns
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: Optional[float] = None
+    max: Optional[float] = None
+    sketch: Optional[QuantileSketch] = None
+
+    @property
+    def numeric(self) -> bool:
+        return self.dtype is not None and pd.api.types.is_numeric_dtype(self.dtype)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), as pandas computes it"""
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @classmethod
+    def from_series(
+        cls, series: pd.Series, nulls: int, sketch_alpha: Optional[float] = None
+    ) -> "ColumnProfile":
+        """Profile one chunk of a column"""
+        profile = cls(name=series.name, dtype=series.dtype, count=len(series), nulls=nulls)
+        if not profile.numeric:
+            return profile
+
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if len(values):
+            profile.n = len(values)
+            profile.mean = float(values.mean())
+            profile.m2 = float(np.square(values - profile.mean).sum())
+            profile.min = float(values.min())
+            profile.max = float(values.max())
+        if sketch_alpha is not None:
+            profile.sketch = QuantileSketch(sketch_alpha).update(values)
+        return profile
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        """Combine with the profile of other rows of the same column"""
+        self.dtype = _common_dtype(self.dtype, other.dtype)
+        self.count += other.count
+        self.nulls += other.nulls
+        if not self.numeric:
+            # Moments are meaningless once a column stops being numeric
+            self.n, self.mean, self.m2 = 0, 0.0, 0.0
+            self.min, self.max, self.sketch = None, None, None
+            return self
+
+        # Chan et al. pairwise update of the Welford moments
+        n = self.n + other.n
+        if other.n:
+            delta = other.mean - self.mean
+            self.mean += delta * other.n / n
+            self.m2 += other.m2 + delta**2 * self.n * other.n / n
+            self.n = n
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        if self.sketch is None:
+            self.sketch = copy.deepcopy(other.sketch)
+        elif other.sketch is not None:
+            self.sketch.merge(other.sketch)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile of the non-null values"""
+        if self.sketch is None:
+            raise ValueError(f"Column {self.name} has no quantile sketch")
+        if self.n == 0:
+            return float("nan")
+        return float(np.clip(self.sketch.quantile(q), self.min, self.max))
+
+    def outlier_count(self, threshold_std: float) -> int:
+        """Values more than ``threshold_std`` sample deviations from the mean"""
+        std = self.std
+        if self.n < 2 or not np.isfinite(std) or std == 0:
+            return 0
+        low, high = self.mean - threshold_std * std, self.mean + threshold_std * std
+        if self.min >= low and self.max <= high:
+            return 0
+        if self.sketch is None:
+            raise ValueError(f"Column {self.name} has no quantile sketch")
+        return int(round(self.sketch.count_below(low) + self.sketch.count_above(high)))
+
+
+@dataclass
+class QualityProfile:
+    """
+    Mergeable single-pass profile of a dataset for quality assessment.
+
+    ``update`` consumes one chunk at a time and ``merge`` combines profiles
+    built by parallel workers; ``DataQualityAssessment.assess_profile`` turns
+    the result into DataQualityMetrics. Everything except the outlier count is
+    exact. Outliers are estimated from the quantile sketches, which is only
+    uncertain for values within ``sketch_alpha`` (relative) of a z-score cut-off.
+    """
+
+    sketch_alpha: Optional[float] = 0.001
+    total_records: int = 0
+    complete_records: int = 0
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+    cross_field_counts: Dict[Tuple[str, ...], int] = field(default_factory=dict)
+    timestamp_column: Optional[str] = None
+    last_update: Optional[pd.Timestamp] = None
+    timestamp_error: Optional[str] = None
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, sketch_alpha: Optional[float] = 0.001):
+        """Profile a single in-memory chunk"""
+        profile = cls(sketch_alpha=sketch_alpha, total_records=len(data))
+        missing = data.isna().to_numpy()
+        profile.complete_records = len(data) - int(missing.any(axis=1).sum())
+        null_counts = missing.sum(axis=0)
+        for i, column in enumerate(data.columns):
+            profile.columns[column] = ColumnProfile.from_series(
+                data[column], int(null_counts[i]), sketch_alpha
+            )
+        profile.cross_field_counts = _cross_field_counts(data)
+
+        profile.timestamp_column = _timestamp_column(data.columns)
+        if profile.timestamp_column is not None:
+            try:
+                last_update = pd.to_datetime(data[profile.timestamp_column]).max()
+                profile.last_update = None if pd.isna(last_update) else last_update
+            except Exception as e:
+                profile.timestamp_error = str(e)
+        return profile
+
+    def update(self, chunk: pd.DataFrame) -> "QualityProfile":
+        """Add a chunk of rows"""
+        return self.merge(QualityProfile.from_frame(chunk, self.sketch_alpha))
+
+    def merge(self, other: "QualityProfile") -> "QualityProfile":
+        """
+        Combine with a profile of other rows of the same dataset.
+
+        Columns missing from one side count as null for its rows, as if the
+        chunks had been concatenated.
+        """
+        if other.sketch_alpha != self.sketch_alpha:
+            raise ValueError(
+                f"Cannot merge profiles with sketch_alpha {self.sketch_alpha} "
+                f"and {other.sketch_alpha}"
+            )
+        own, others = set(self.columns), set(other.columns)
+        self.complete_records = (self.complete_records if others <= own else 0) + (
+            other.complete_records if own <= others else 0
+        )
+
+        columns = {}
+        for name in list(self.columns) + [name for name in other.columns if name not in own]:
+            left = self.columns.get(name) or _missing_column(name, self.total_records)
+            right = other.columns.get(name) or _missing_column(name, other.total_records)
+            columns[name] = left.merge(right)
+        self.columns = columns
+        self.total_records += other.total_records
+
+        for key, count in other.cross_field_counts.items():
+            self.cross_field_counts[key] = self.cross_field_counts.get(key, 0) + count
+
+        self.timestamp_column = self.timestamp_column or other.timestamp_column
+        self.timestamp_error = self.timestamp_error or other.timestamp_error
+        if self.last_update is None or other.last_update is None:
+            self.last_update = self.last_update if other.last_update is None else other.last_update
+        else:
+            try:
+                self.last_update = max(self.last_update, other.last_update)
+            except TypeError as e:
+                self.timestamp_error = self.timestamp_error or str(e)
+        return self
+
+    def outlier_count(self, threshold_std: float) -> int:
+        """Approximate z-score outliers over all numeric columns"""
+        return sum(
+            column.outlier_count(threshold_std)
+            for column in self.columns.values()
+            if column.numeric
+        )
+
+
+def profile_chunks(
+    chunks: Iterable[pd.DataFrame], sketch_alpha: Optional[float] = 0.001
+) -> QualityProfile:
+    """
+    Build a QualityProfile from an iterable of DataFrame chunks
+
+    Args:
+        chunks: DataFrame chunks, e.g. from ``pd.read_csv(..., chunksize=...)``
+        sketch_alpha: Relative accuracy of the quantile sketches
+
+    Returns:
+        QualityProfile of all chunks
+    """
+    profile = QualityProfile(sketch_alpha=sketch_alpha)
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile
+
+
+def _timestamp_column(columns: Iterable[Any]) -> Optional[str]:
+    """First column whose name mentions a timestamp or date"""
+    for column in columns:
+        name = str(column).lower()
+        if "timestamp" in name or "date" in name:
+            return column
+    return None
+
+
+def _cross_field_counts(data: pd.DataFrame) -> Dict[Tuple[str, ...], int]:
+    """Violation counts of the cross-field rules, keyed by (rule, *columns)"""
+    numeric = [col for col in data.columns if pd.api.types.is_numeric_dtype(data[col])]
+    price_cols = [col for col in numeric if "price" in str(col).lower()]
+    bid_cols = [col for col in numeric if "bid" in str(col).lower()]
+    ask_cols = [col for col in numeric if "ask" in str(col).lower()]
+
+    counts = {}
+    # Bid-ask spread validation
+    for bid_col, ask_col in zip(bid_cols, ask_cols):
+        counts[("spread", bid_col, ask_col)] = int((data[bid_col] >= data[ask_col]).sum())
+
+    # Extreme price differences (>50%) across related fields
+    for i, col1 in enumerate(price_cols[:-1]):
+        for col2 in price_cols[i + 1 :]:
+            price_diff = abs(data[col1] - data[col2]) / data[col1]
+            counts[("price_diff", col1, col2)] = int((price_diff > 0.5).sum())
+
+    # Negative values in price and volume columns
+    for col in numeric:
+        if "price" in str(col).lower() or "volume" in str(col).lower():
+            counts[("negative", col)] = int((data[col] < 0).sum())
+    return counts
+
+
+_CROSS_FIELD_MESSAGES = {
+    "spread": "Invalid bid-ask spread: {0} >= {1} in {count} records",
+    "price_diff": "Extreme price difference between {0} and {1}: {count} records",
+    "negative": "Negative values found in {0}: {count} records",
+}
+
+
+def _missing_column(name: str, rows: int) -> ColumnProfile:
+    return ColumnProfile(name=name, count=rows, nulls=rows)
+
+
+def _common_dtype(left: Any, right: Any) -> Any:
+    if left is None or right is None or left == right:
+        return right if left is None else left
+    try:
+        return np.promote_types(left, right)
+    except TypeError:
+        return np.dtype(object)
+
+
+def _add_counts(target: Dict[int, int], source: Any) -> None:
+    if isinstance(source, dict):
+        items = source.items()
+    else:
+        keys, counts = np.unique(source, return_counts=True)
+        items = zip(keys.tolist(), counts.tolist())
+    for key, count in items:
+        target[key] = target.get(key, 0) + count
+
+
 class DataQualityConfig:
     """Configuration for data quality assessment (Week 4: Hardened thresholds)"""
 
@@ -151,15 +528,53 @@ class DataQualityAssessment:
         if data.empty:
             raise DataQualityError("Cannot assess quality of empty DataFrame")
 
+        # The whole frame is at hand, so outliers are counted exactly
+        profile = QualityProfile.from_frame(data, sketch_alpha=None)
+        outlier_count = self._detect_outliers(data) if self.config.enable_outlier_detection else 0
+        return self._assess(profile, outlier_count, expected_schema, reference_data)
+
+    def assess_profile(
+        self,
+        profile: QualityProfile,
+        expected_schema: Optional[Dict[str, Any]] = None,
+        reference_data: Optional[pd.DataFrame] = None,
+    ) -> DataQualityMetrics:
+        """
+        Assess data quality from a streamed or merged QualityProfile
+
+        Args:
+            profile: Profile of the dataset (see ``QualityProfile``)
+            expected_schema: Expected schema for validation
+            reference_data: Reference data for consistency checks
+
+        Returns:
+            Comprehensive quality metrics, with a sketch-based outlier count
+        """
+        if profile.total_records == 0:
+            raise DataQualityError("Cannot assess quality of empty profile")
+
+        outlier_count = 0
+        if self.config.enable_outlier_detection:
+            outlier_count = profile.outlier_count(self.config.outlier_threshold_std)
+        return self._assess(profile, outlier_count, expected_schema, reference_data)
+
+    def _assess(
+        self,
+        profile: QualityProfile,
+        outlier_count: int,
+        expected_schema: Optional[Dict[str, Any]],
+        reference_data: Optional[pd.DataFrame],
+    ) -> DataQualityMetrics:
+        """Build, score and record the metrics of a profile"""
         # Week 4: Enhanced timeliness assessment
-        timeliness_metrics = self._assess_timeliness(data)
+        timeliness_metrics = self._assess_timeliness(profile)
 
         # Week 4: Enhanced consistency assessment
-        consistency_metrics = self._assess_consistency(data, expected_schema, reference_data)
+        consistency_metrics = self._assess_consistency(profile, expected_schema, reference_data)
 
         # Standard assessments
-        completeness_metrics = self._assess_completeness(data)
-        accuracy_metrics = self._assess_accuracy(data)
+        completeness_metrics = self._assess_completeness(profile)
+        accuracy_metrics = self._assess_accuracy(profile, outlier_count)
 
         # Week 4: Calculate enhanced quality scores
         timeliness_score = self._calculate_timeliness_score(timeliness_metrics)
@@ -172,7 +587,7 @@ class DataQualityAssessment:
 
         # Create metrics object
         metrics = DataQualityMetrics(
-            total_records=len(data),
+            total_records=profile.total_records,
             complete_records=completeness_metrics["complete_records"],
             completeness_rate=completeness_metrics["completeness_rate"],
             missing_values_by_column=completeness_metrics["missing_values_by_column"],
@@ -201,23 +616,23 @@ class DataQualityAssessment:
 
         return metrics
 
-    def _assess_completeness(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _assess_completeness(self, profile: QualityProfile) -> Dict[str, Any]:
         """Assess data completeness and missing values"""
-        total_records = len(data)
+        total_records = profile.total_records
 
         # Count missing values by column
         missing_values_by_column = {}
         missing_rate_by_column = {}
 
-        for column in data.columns:
-            missing_count = data[column].isna().sum()
+        for column, column_profile in profile.columns.items():
+            missing_count = column_profile.nulls
             missing_values_by_column[column] = missing_count
             missing_rate_by_column[column] = (
                 missing_count / total_records if total_records > 0 else 0.0
             )
 
         # Count complete records (no missing values)
-        complete_records = total_records - data.isna().any(axis=1).sum()
+        complete_records = profile.complete_records
         completeness_rate = complete_records / total_records if total_records > 0 else 0.0
 
         return {
@@ -228,34 +643,30 @@ class DataQualityAssessment:
             "missing_rate_by_column": missing_rate_by_column,
         }
 
-    def _assess_accuracy(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _assess_accuracy(self, profile: QualityProfile, outlier_count: int) -> Dict[str, Any]:
         """Assess data accuracy and validation"""
         validation_errors = []
         data_type_errors = []
-        outlier_count = 0
 
         # Check data types and validation
-        for column in data.columns:
+        for column, column_profile in profile.columns.items():
+            dtype = column_profile.dtype
+            if dtype is None:
+                continue
+
             # Check for numeric columns that should be numeric
-            if "price" in column.lower() or "volume" in column.lower():
-                if not pd.api.types.is_numeric_dtype(data[column]):
-                    data_type_errors.append(
-                        f"Column {column} should be numeric but is {data[column].dtype}"
-                    )
+            if "price" in str(column).lower() or "volume" in str(column).lower():
+                if not pd.api.types.is_numeric_dtype(dtype):
+                    data_type_errors.append(f"Column {column} should be numeric but is {dtype}")
 
             # Check for timestamp columns
-            if "timestamp" in column.lower() or "time" in column.lower():
-                if not pd.api.types.is_datetime64_any_dtype(data[column]):
-                    data_type_errors.append(
-                        f"Column {column} should be datetime but is {data[column].dtype}"
-                    )
-
-        # Outlier detection for numeric columns
-        if self.config.enable_outlier_detection:
-            outlier_count = self._detect_outliers(data)
+            if "timestamp" in str(column).lower() or "time" in str(column).lower():
+                if not pd.api.types.is_datetime64_any_dtype(dtype):
+                    data_type_errors.append(f"Column {column} should be datetime but is {dtype}")
 
         # Calculate outlier rate
-        outlier_rate = outlier_count / len(data) if len(data) > 0 else 0.0
+        total_records = profile.total_records
+        outlier_rate = outlier_count / total_records if total_records > 0 else 0.0
 
         return {
             "validation_errors": validation_errors,
@@ -281,7 +692,7 @@ class DataQualityAssessment:
 
         return outlier_count
 
-    def _assess_timeliness(self, data: pd.DataFrame) -> Dict[str, Any]:
+    def _assess_timeliness(self, profile: QualityProfile) -> Dict[str, Any]:
         """Week 4: Enhanced timeliness assessment with hardened thresholds"""
         timeliness_metrics = {
             "data_age_hours": 0.0,
@@ -291,19 +702,14 @@ class DataQualityAssessment:
             "freshness_score": 0.0,
         }
 
-        # Check for timestamp column
-        timestamp_cols = [
-            col for col in data.columns if "timestamp" in col.lower() or "date" in col.lower()
-        ]
-
-        if timestamp_cols:
-            # Use first timestamp column found
-            timestamp_col = timestamp_cols[0]
-
+        # Latest value of the first timestamp column found
+        if profile.timestamp_column is not None:
             try:
-                # Convert to datetime
-                timestamps = pd.to_datetime(data[timestamp_col])
-                last_update = timestamps.max()
+                if profile.timestamp_error is not None:
+                    raise ValueError(profile.timestamp_error)
+                if profile.last_update is None:
+                    raise ValueError(f"no timestamps in {profile.timestamp_column}")
+                last_update = profile.last_update
                 timeliness_metrics["last_update"] = last_update
 
                 # Calculate data age
@@ -335,7 +741,7 @@ class DataQualityAssessment:
 
     def _assess_consistency(
         self,
-        data: pd.DataFrame,
+        profile: QualityProfile,
         expected_schema: Optional[Dict[str, Any]],
         reference_data: Optional[pd.DataFrame],
     ) -> Dict[str, Any]:
@@ -350,20 +756,20 @@ class DataQualityAssessment:
 
         # Week 4: Enhanced schema validation
         if expected_schema and self.config.schema_validation_strict:
-            schema_errors = self._validate_schema_strict(data, expected_schema)
+            schema_errors = self._validate_schema_strict(profile, expected_schema)
             consistency_metrics["consistency_errors"].extend(schema_errors)
             consistency_metrics["schema_compliance"] = len(schema_errors) == 0
 
         # Week 4: Enhanced cross-field validation
         if self.config.cross_field_validation_required:
-            cross_field_errors = self._validate_cross_field_relationships(data)
+            cross_field_errors = self._validate_cross_field_relationships(profile)
             consistency_metrics["consistency_errors"].extend(cross_field_errors)
             consistency_metrics["cross_field_validation_passed"] = len(cross_field_errors) == 0
             consistency_metrics["field_relationships_valid"] = len(cross_field_errors) == 0
 
         # Week 4: Reference data consistency check
         if reference_data is not None:
-            reference_errors = self._validate_against_reference(data, reference_data)
+            reference_errors = self._validate_against_reference(profile, reference_data)
             consistency_metrics["consistency_errors"].extend(reference_errors)
 
         # Week 4: Calculate data integrity score
@@ -374,93 +780,75 @@ class DataQualityAssessment:
         return consistency_metrics
 
     def _validate_schema_strict(
-        self, data: pd.DataFrame, expected_schema: Dict[str, Any]
+        self, profile: QualityProfile, expected_schema: Dict[str, Any]
     ) -> List[str]:
         """Week 4: Strict schema validation with hardened requirements"""
         errors = []
 
         for column, expected_type in expected_schema.items():
-            if column not in data.columns:
+            if column not in profile.columns:
                 errors.append(f"Missing required column: {column}")
                 continue
 
             # Check data type
-            actual_type = str(data[column].dtype)
+            actual_type = str(profile.columns[column].dtype)
             if not self._is_compatible_type(actual_type, expected_type):
                 errors.append(f"Column {column}: expected {expected_type}, got {actual_type}")
 
             # Check for null values in required fields
             if expected_schema.get(f"{column}_required", False):
-                null_count = data[column].isnull().sum()
+                null_count = profile.columns[column].nulls
                 if null_count > 0:
                     errors.append(f"Column {column}: {null_count} null values in required field")
 
         return errors
 
-    def _validate_cross_field_relationships(self, data: pd.DataFrame) -> List[str]:
+    def _is_compatible_type(self, actual_type: str, expected_type: Any) -> bool:
+        """Whether a column dtype matches the expected dtype or dtype name"""
+        try:
+            return pd.api.types.pandas_dtype(actual_type) == pd.api.types.pandas_dtype(
+                expected_type
+            )
+        except TypeError:
+            return actual_type == str(expected_type)
+
+    def _validate_cross_field_relationships(self, profile: QualityProfile) -> List[str]:
         """Week 4: Enhanced cross-field validation with hardened logic"""
         errors = []
 
-        # Validate price relationships
-        price_cols = [col for col in data.columns if "price" in col.lower()]
-        bid_cols = [col for col in data.columns if "bid" in col.lower()]
-        ask_cols = [col for col in data.columns if "ask" in col.lower()]
-
-        # Bid-ask spread validation
-        for i, bid_col in enumerate(bid_cols):
-            if i < len(ask_cols):
-                ask_col = ask_cols[i]
-                invalid_spreads = data[data[bid_col] >= data[ask_col]]
-                if len(invalid_spreads) > 0:
-                    errors.append(
-                        f"Invalid bid-ask spread: {bid_col} >= {ask_col} "
-                        f"in {len(invalid_spreads)} records"
-                    )
-
-        # Price consistency across related fields
-        if len(price_cols) > 1:
-            for i, col1 in enumerate(price_cols[:-1]):
-                for col2 in price_cols[i + 1 :]:
-                    # Check for extreme price differences (>50%)
-                    price_diff = abs(data[col1] - data[col2]) / data[col1]
-                    extreme_diffs = price_diff > 0.5
-                    if extreme_diffs.sum() > 0:
-                        errors.append(
-                            f"Extreme price difference between {col1} and {col2}: "
-                            f"{extreme_diffs.sum()} records"
-                        )
-
-        # Week 4: Validate negative values in price and volume columns
-        for col in data.columns:
-            if "price" in col.lower() or "volume" in col.lower():
-                negative_values = data[data[col] < 0]
-                if len(negative_values) > 0:
-                    errors.append(f"Negative values found in {col}: {len(negative_values)} records")
+        # Bid-ask spreads, extreme price differences and negative values, in rule order
+        for (rule, *columns), count in profile.cross_field_counts.items():
+            if count > 0:
+                errors.append(_CROSS_FIELD_MESSAGES[rule].format(*columns, count=count))
 
         return errors
 
     def _validate_against_reference(
-        self, data: pd.DataFrame, reference_data: pd.DataFrame
+        self, profile: QualityProfile, reference_data: pd.DataFrame
     ) -> List[str]:
         """Week 4: Validate data against reference dataset"""
         errors = []
 
         # Check for significant deviations from reference
-        common_cols = set(data.columns) & set(reference_data.columns)
-
-        for col in common_cols:
-            if col in data.columns and col in reference_data.columns:
-                # Calculate statistical differences
-                data_mean = data[col].mean()
-                ref_mean = reference_data[col].mean()
-
-                if ref_mean != 0:
-                    relative_diff = abs(data_mean - ref_mean) / abs(ref_mean)
-                    if relative_diff > 0.2:  # 20% threshold
-                        errors.append(
-                            f"Column {col}: significant deviation from reference "
-                            f"(diff: {relative_diff:.2%})"
-                        )
+        for col, column_profile in profile.columns.items():
+            if not column_profile.numeric or column_profile.n == 0:
+                continue
+            if col not in reference_data.columns:
+                continue
+            if not pd.api.types.is_numeric_dtype(reference_data[col]):
+                continue
+
+            # Calculate statistical differences
+            data_mean = column_profile.mean
+            ref_mean = reference_data[col].mean()
+
+            if ref_mean != 0:
+                relative_diff = abs(data_mean - ref_mean) / abs(ref_mean)
+                if relative_diff > 0.2:  # 20% threshold
+                    errors.append(
+                        f"Column {col}: significant deviation from reference "
+                        f"(diff: {relative_diff:.2%})"
+                    )
 
         return errors
 
@@ -1,16 +1,28 @@
 """Feature engineering for ACD Monitor demo pipeline."""
 
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
-from ..vmm import VMMConfig, VMMOutput, run_vmm
+from ..vmm import VMMOutput, run_vmm_batch
+from ..vmm.profiles import VMMConfig, to_engine_config
 
 logger = logging.getLogger(__name__)
 
 
+def run_vmm(firm_data: np.ndarray, config: VMMConfig) -> VMMOutput:
+    """Run VMM on one (firms x time) price matrix."""
+    columns = _firm_columns(len(firm_data))
+    frame = pd.DataFrame(firm_data.T, columns=columns)
+    return run_vmm_batch([frame], columns, to_engine_config(config))[0]
+
+
+def _firm_columns(n_firms: int) -> List[str]:
+    return [f"firm_{i}_price" for i in range(n_firms)]
+
+
 class DemoFeatureEngineering:
     """Feature engineering for demo pipeline VMM analysis."""
 
@@ -146,15 +158,71 @@ class DemoFeatureEngineering:
             logger.warning(f"VMM analysis failed for window: {e}")
             return self._create_dummy_vmm_result(window_data)
 
+    def run_vmm_batch_analysis(
+        self, windows: List[pd.DataFrame], n_workers: Optional[int] = None
+    ) -> List[VMMOutput]:
+        """Run VMM analysis on many windows at once, across worker processes.
+
+        Args:
+            windows: Windowed market data
+            n_workers: Number of worker processes (None or 1 runs in-process)
+
+        Returns:
+            VMM analysis results in window order (dummy results for windows
+            without firm prices or whose analysis fails)
+        """
+        # One price column per firm seen in any window, so every window shares a layout
+        firms = sorted(
+            {
+                firm
+                for window in windows
+                if "firm_id" in window.columns
+                for firm in window["firm_id"]
+            }
+        )
+        columns = _firm_columns(len(firms))
+
+        frames, positions = [], []
+        for i, window in enumerate(windows):
+            features = self.extract_vmm_features(window)
+            if "price" in features and "firm_id" in window.columns:
+                firm_matrix = self._reshape_for_vmm(window, features, firms)
+                frames.append(pd.DataFrame(firm_matrix.T, columns=columns))
+                positions.append(i)
+
+        outputs = run_vmm_batch(
+            frames,
+            columns,
+            to_engine_config(self.vmm_config),
+            n_workers,
+            return_exceptions=True,
+        )
+
+        results = {}
+        for i, output in zip(positions, outputs):
+            if isinstance(output, Exception):
+                logger.warning(f"VMM analysis failed for window {i}: {output}")
+            else:
+                results[i] = output
+
+        return [
+            results[i] if i in results else self._create_dummy_vmm_result(window)
+            for i, window in enumerate(windows)
+        ]
+
     def _reshape_for_vmm(
-        self, window_data: pd.DataFrame, features: Dict[str, np.ndarray]
+        self,
+        window_data: pd.DataFrame,
+        features: Dict[str, np.ndarray],
+        firms: Optional[List[str]] = None,
     ) -> np.ndarray:
-        """Reshape data for VMM analysis (firms x time)."""
+        """Reshape data for VMM analysis (firms x time, rows in ``firms`` order)."""
         if "firm_id" not in window_data.columns or "price" not in features:
             raise ValueError("Missing required columns for VMM analysis")
 
         # Get unique firms and sort
-        firms = sorted(window_data["firm_id"].unique())
+        if firms is None:
+            firms = sorted(window_data["firm_id"].unique())
         time_points = len(window_data)
 
         # Create firm x time matrix
@@ -176,15 +244,18 @@ class DemoFeatureEngineering:
         """Create a dummy VMM result when analysis fails."""
 
         # Create dummy result
+        beta_dim = to_engine_config(self.vmm_config).beta_dim
         dummy_result = VMMOutput(
-            regime_confidence=0.5,
-            structural_stability=0.5,
-            environment_quality=0.5,
-            dynamic_validation_score=0.5,
-            window_size=len(window_data),
             convergence_status="failed",
             iterations=0,
-            elbo_final=0.0,
+            final_loss=0.0,
+            beta_estimates=np.zeros(beta_dim),
+            sigma_estimates=np.eye(beta_dim),
+            rho_estimates=np.eye(beta_dim),
+            structural_stability=0.5,
+            regime_confidence=0.5,
+            over_identification_stat=0.0,
+            over_identification_p_value=1.0,
         )
 
         return dummy_result
@@ -221,7 +292,7 @@ class DemoFeatureEngineering:
             "vmm_outputs": {
                 "regime_confidence": vmm_result.regime_confidence,
                 "structural_stability": vmm_result.structural_stability,
-                "dynamic_validation_score": vmm_result.dynamic_validation_score,
+                "dynamic_validation_score": getattr(vmm_result, "dynamic_validation_score", 0.5),
             },
             # Calibration artifacts (placeholder for demo)
             "calibration_artifacts": [
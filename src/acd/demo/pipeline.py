@@ -2,6 +2,7 @@
 
 import json
 import logging
+import os
 import time
 from pathlib import Path
 from typing import Dict
@@ -37,6 +38,7 @@ class DemoPipeline:
         # Pipeline configuration
         self.config = {
             "window_size": 50,
+            "vmm_workers": min(4, os.cpu_count() or 1),
             "num_mock_windows": 3,
             "enable_timestamping": True,
             "enable_checksums": True,
@@ -216,19 +218,19 @@ class DemoPipeline:
                     market_data, self.config["window_size"]
                 )
 
-                for j, window in enumerate(windows):
-                    window_id = f"demo_window_{i}_{j}"
-                    # Create a copy of the window to avoid modifying the original
-                    window_copy = window.copy()
-                    window_copy["window_id"] = window_id
+                # Copies keep the original windows unmodified
+                window_copies = [
+                    window.assign(window_id=f"demo_window_{i}_{j}")
+                    for j, window in enumerate(windows)
+                ]
 
-                    # Debug: check data type
-                    logger.debug(
-                        f"Window {window_id}: type={type(window_copy)}, shape={window_copy.shape if hasattr(window_copy, 'shape') else 'no shape'}"
-                    )
+                # Run VMM analysis on all windows at once, across worker processes
+                vmm_batch = self.feature_engineering.run_vmm_batch_analysis(
+                    window_copies, self.config["vmm_workers"]
+                )
 
-                    # Run VMM analysis
-                    vmm_result = self.feature_engineering.run_vmm_analysis(window_copy)
+                for window_copy, vmm_result in zip(window_copies, vmm_batch):
+                    window_id = window_copy["window_id"].iloc[0]
 
                     # Get quality metrics
                     quality_metrics = self.ingestion.validate_mock_data(window_copy, "market_style")
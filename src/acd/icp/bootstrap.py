@@ -0,0 +1,320 @@
+"""
+Vectorized Bootstrap Engine for ICP
+
+Environment labels are encoded as integer codes once, and every resample in a
+chunk is drawn as one (B × N) index matrix. Resamples are then represented by
+per-row multiplicity counts, so per-environment correlations and OLS fits for
+all B resamples reduce to a few matrix products. Chunks of resamples can be
+spread across worker processes with deterministic per-chunk seeds.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Resamples evaluated per batched call (bounds the (B × N) count matrix)
+DEFAULT_CHUNK_SIZE = 100
+
+# Bootstrap statistic for a chunk: (counts of shape (B, N)) -> statistics of shape (B,)
+Statistic = Callable[[np.ndarray], np.ndarray]
+
+
+def resample_indices(
+    rng: np.random.Generator, n_resamples: int, strata_sizes: Sequence[int]
+) -> np.ndarray:
+    """
+    Draw bootstrap row indices for a batch of resamples
+
+    Rows are assumed to be ordered by stratum; each stratum is resampled with
+    replacement to its own size. A single stratum gives the ordinary bootstrap.
+
+    Args:
+        rng: Random generator
+        n_resamples: Number of resamples B
+        strata_sizes: Row count of each consecutive stratum
+
+    Returns:
+        Integer index matrix of shape (B, N)
+    """
+    sizes = np.asarray(strata_sizes, dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    # Uniform draw in [0, 1) scaled per stratum keeps this a single (B × N) draw
+    stratum_of_row = np.repeat(np.arange(len(sizes)), sizes)
+    uniform = rng.random((n_resamples, int(sizes.sum())))
+    return starts[stratum_of_row] + (uniform * sizes[stratum_of_row]).astype(np.int64)
+
+
+def resample_counts(indices: np.ndarray, n_obs: int) -> np.ndarray:
+    """
+    Convert a (B × N) index matrix into per-row multiplicities
+
+    Args:
+        indices: Index matrix of shape (B, n_draws)
+        n_obs: Number of original rows N
+
+    Returns:
+        Float array of shape (B, N) with how often each row was drawn
+    """
+    n_resamples = len(indices)
+    offsets = (np.arange(n_resamples) * n_obs)[:, None]
+    flat = np.bincount((indices + offsets).ravel(), minlength=n_resamples * n_obs)
+    return flat.reshape(n_resamples, n_obs).astype(np.float64)
+
+
+def _sorted_by_code(codes: np.ndarray, n_envs: int) -> List[np.ndarray]:
+    """Row indices of each environment code"""
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_envs + 1))
+    return [order[bounds[e] : bounds[e + 1]] for e in range(n_envs)]
+
+
+def _ks_statistics(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Two-sample KS statistics for equally weighted samples, batched
+
+    Args:
+        a, b: Arrays of shape (..., m) and (..., n)
+
+    Returns:
+        sup |F_a - F_b| of shape (...)
+    """
+    points = np.concatenate([a, b], axis=-1)[..., :, None]
+    cdf_a = (a[..., None, :] <= points).mean(axis=-1)
+    cdf_b = (b[..., None, :] <= points).mean(axis=-1)
+    return np.abs(cdf_a - cdf_b).max(axis=-1)
+
+
+def _weighted_ks_statistics(
+    values_a: np.ndarray, weights_a: np.ndarray, values_b: np.ndarray, weights_b: np.ndarray
+) -> np.ndarray:
+    """
+    Two-sample KS statistics between weighted empirical distributions
+
+    Args:
+        values_a, values_b: Sample values of shape (B, n_a) and (B, n_b)
+        weights_a, weights_b: Non-negative weights with the same shapes
+
+    Returns:
+        KS statistics of shape (B,)
+    """
+    values = np.concatenate([values_a, values_b], axis=1)
+    signed = np.concatenate(
+        [
+            weights_a / weights_a.sum(axis=1, keepdims=True),
+            -weights_b / weights_b.sum(axis=1, keepdims=True),
+        ],
+        axis=1,
+    )
+    order = np.argsort(values, axis=1, kind="stable")
+    values = np.take_along_axis(values, order, axis=1)
+    gap = np.abs(np.cumsum(np.take_along_axis(signed, order, axis=1), axis=1))
+    # The ECDF difference is only defined after the last of a run of tied values
+    gap[:, :-1][values[:, :-1] == values[:, 1:]] = 0.0
+    return gap.max(axis=1)
+
+
+def correlation_invariance_statistics(
+    counts: np.ndarray,
+    prices: np.ndarray,
+    codes: np.ndarray,
+    n_envs: int,
+    min_samples_per_env: int = 1,
+) -> np.ndarray:
+    """
+    Max pairwise KS statistic between environment correlation patterns
+
+    Batched version of ``ICPEngine._test_invariance``: for every resample the
+    upper-triangular price correlations of each environment are compared
+    with a two-sample KS test and the largest statistic is kept.
+
+    Args:
+        counts: Resample multiplicities of shape (B, N)
+        prices: Price matrix of shape (N, k)
+        codes: Environment code per row, shape (N,)
+        n_envs: Number of environment codes
+        min_samples_per_env: Environments with fewer resampled rows are dropped
+
+    Returns:
+        Statistics of shape (B,); NaN where fewer than two environments qualify
+    """
+    n_resamples = len(counts)
+    k = prices.shape[1]
+    full_i, full_j = np.triu_indices(k)
+    upper = full_i != full_j
+    diag_pos = np.cumsum(np.r_[0, k - np.arange(k - 1)])  # position of (i, i) in triu order
+
+    correlations = np.empty((n_resamples, n_envs, int(upper.sum())))
+    sizes = np.empty((n_resamples, n_envs))
+    for env, rows in enumerate(_sorted_by_code(codes, n_envs)):
+        centered = prices[rows] - prices[rows].mean(axis=0)
+        products = centered[:, full_i] * centered[:, full_j]
+        weights = counts[:, rows]
+
+        n = weights.sum(axis=1)
+        safe_n = np.where(n > 0, n, 1.0)[:, None]
+        means = weights @ centered / safe_n
+        moments = weights @ products / safe_n
+        cov = moments - means[:, full_i] * means[:, full_j]
+
+        variances = cov[:, diag_pos]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            denom = np.sqrt(variances[:, full_i[upper]] * variances[:, full_j[upper]])
+            correlations[:, env] = cov[:, upper] / denom
+        sizes[:, env] = n
+
+    valid = sizes >= min_samples_per_env
+    result = np.full(n_resamples, np.nan)
+    if n_envs < 2:
+        return result
+
+    pair_a, pair_b = np.triu_indices(n_envs, 1)
+    ks = _ks_statistics(correlations[:, pair_a], correlations[:, pair_b])
+    ks = np.where(valid[:, pair_a] & valid[:, pair_b], ks, -np.inf)
+
+    enough = valid.sum(axis=1) >= 2
+    result[enough] = ks[enough].max(axis=1)
+    return result
+
+
+def residual_invariance_statistics(
+    counts: np.ndarray,
+    features: np.ndarray,
+    target: np.ndarray,
+    codes: np.ndarray,
+    n_envs: int,
+) -> np.ndarray:
+    """
+    Max pairwise KS statistic between per-environment OLS residuals
+
+    Batched version of ``EnhancedStatistics._test_invariance_ks``. Each
+    resample's weighted normal equations are solved for all resamples at once,
+    and residual distributions carry the resample multiplicities as weights.
+
+    Args:
+        counts: Resample multiplicities of shape (B, N)
+        features: Regressor matrix of shape (N, p)
+        target: Target vector of shape (N,)
+        codes: Environment code per row, shape (N,)
+        n_envs: Number of environment codes
+
+    Returns:
+        Statistics of shape (B,)
+    """
+    residuals, weights = [], []
+    for rows in _sorted_by_code(codes, n_envs):
+        # Centering per environment keeps the normal equations well conditioned
+        X = features[rows] - features[rows].mean(axis=0)
+        y = target[rows] - target[rows].mean()
+        design = np.column_stack([np.ones(len(rows)), X])
+        w = counts[:, rows]
+
+        gram = np.einsum("bn,ni,nj->bij", w, design, design, optimize=True)
+        moment = w @ (design * y[:, None])
+        try:
+            beta = np.linalg.solve(gram, moment[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError:
+            beta = (np.linalg.pinv(gram) @ moment[:, :, None])[:, :, 0]
+
+        residuals.append(y[None, :] - beta @ design.T)
+        weights.append(w)
+
+    statistics = np.zeros(len(counts))
+    for a in range(n_envs):
+        for b in range(a + 1, n_envs):
+            pair = _weighted_ks_statistics(residuals[a], weights[a], residuals[b], weights[b])
+            statistics = np.maximum(statistics, pair)
+    return statistics
+
+
+_worker_statistic: Optional[Statistic] = None
+
+
+def _init_worker(statistic: Statistic) -> None:
+    """Install the chunk statistic once per worker process"""
+    global _worker_statistic
+    _worker_statistic = statistic
+
+
+def _run_chunk(
+    statistic: Statistic, strata_sizes: Sequence[int], n_resamples: int, seed: int
+) -> np.ndarray:
+    """Draw one chunk of resamples and evaluate the statistic on it"""
+    rng = np.random.default_rng(seed)
+    indices = resample_indices(rng, n_resamples, strata_sizes)
+    return statistic(resample_counts(indices, int(np.sum(strata_sizes))))
+
+
+def _run_worker_chunk(strata_sizes: Sequence[int], n_resamples: int, seed: int) -> np.ndarray:
+    """Worker entry point using the statistic installed by ``_init_worker``"""
+    return _run_chunk(_worker_statistic, strata_sizes, n_resamples, seed)
+
+
+def bootstrap_statistics(
+    statistic: Statistic,
+    strata_sizes: Sequence[int],
+    n_bootstrap: int,
+    seed: Optional[int] = None,
+    n_workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> np.ndarray:
+    """
+    Evaluate a batched statistic over ``n_bootstrap`` resamples
+
+    Resamples are drawn in chunks of ``chunk_size``; chunk c always uses the
+    same derived seed, so results do not depend on ``n_workers``.
+
+    Args:
+        statistic: Picklable callable mapping (B, N) counts to (B,) statistics
+        strata_sizes: Row count of each consecutive stratum (one entry for iid)
+        n_bootstrap: Total number of resamples
+        seed: Root seed (None draws one from the global NumPy RNG)
+        n_workers: Worker processes (None or 1 runs in-process)
+        chunk_size: Resamples per chunk
+
+    Returns:
+        Array of shape (n_bootstrap,)
+    """
+    if n_bootstrap <= 0:
+        return np.empty(0)
+    if seed is None:
+        seed = int(np.random.randint(0, 2**31 - 1))
+
+    sizes = [chunk_size] * (n_bootstrap // chunk_size)
+    if n_bootstrap % chunk_size:
+        sizes.append(n_bootstrap % chunk_size)
+    seeds = [
+        int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(sizes))
+    ]
+    strata = [int(s) for s in strata_sizes]
+
+    if n_workers is None or n_workers <= 1 or len(sizes) == 1:
+        chunks = [_run_chunk(statistic, strata, n, s) for n, s in zip(sizes, seeds)]
+    else:
+        logger.info(f"Running {n_bootstrap} bootstrap resamples across {n_workers} workers")
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(statistic,)
+        ) as executor:
+            chunks = list(executor.map(_run_worker_chunk, [strata] * len(sizes), sizes, seeds))
+
+    return np.concatenate(chunks)
+
+
+def percentile_interval(statistics: np.ndarray, confidence_level: float) -> Tuple[float, float]:
+    """
+    Percentile bootstrap interval over the finite statistics
+
+    Falls back to (0.0, 1.0) when no resample produced a statistic.
+    """
+    statistics = np.asarray(statistics, dtype=float)
+    statistics = statistics[np.isfinite(statistics)]
+    if len(statistics) == 0:
+        return (0.0, 1.0)
+
+    alpha = 1 - confidence_level
+    lower = np.percentile(statistics, 100 * alpha / 2)
+    upper = np.percentile(statistics, 100 * (1 - alpha / 2))
+    return (float(lower), float(upper))
@@ -7,13 +7,25 @@ vs. environment-sensitive pricing relationships in crypto markets.
 
 import logging
 from dataclasses import dataclass
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from scipy import stats
-from sklearn.linear_model import LinearRegression
 
+from .bootstrap import (
+    bootstrap_statistics,
+    correlation_invariance_statistics,
+    percentile_interval,
+)
+from .partition import (
+    EnvironmentPartition,
+    PartitionCache,
+    environment_arrays,
+    environment_sizes,
+)
+from .regression import environment_fits
 from .statistics import EnhancedStatistics, FDRConfig, PowerAnalysisConfig, StatisticalResults
 
 logger = logging.getLogger(__name__)
@@ -32,6 +44,8 @@ class ICPConfig:
     # Bootstrap parameters
     n_bootstrap: int = 1000
     bootstrap_confidence: float = 0.95
+    bootstrap_seed: Optional[int] = None  # None draws from the global NumPy RNG
+    bootstrap_workers: Optional[int] = None  # Worker processes for resample chunks
 
     # Environment partitioning
     environment_columns: List[str] = None  # Will be set based on data
@@ -81,12 +95,17 @@ class ICPEngine:
             min_samples_per_env=config.min_samples_per_env,
             n_bootstrap=config.n_bootstrap,
             confidence_level=config.bootstrap_confidence,
+            bootstrap_seed=config.bootstrap_seed,
+            bootstrap_workers=config.bootstrap_workers,
         )
 
         fdr_config = FDRConfig(fdr_level=0.1, method="bh")  # 10% FDR control
 
         self.enhanced_stats = EnhancedStatistics(power_config, fdr_config)
 
+        # Environment partitions shared by every stage that analyzes the same DataFrame
+        self._partitions = PartitionCache()
+
     def analyze_invariance(
         self,
         data: pd.DataFrame,
@@ -138,7 +157,7 @@ class ICPEngine:
             effect_size=effect_size,
             power=power,
             n_environments=len(environment_data),
-            environment_sizes={env: len(df) for env, df in environment_data.items()},
+            environment_sizes=environment_sizes(environment_data),
             confidence_interval=test_result["confidence_interval"],
             bootstrap_ci=bootstrap_ci,
             r_squared=diagnostics["r_squared"],
@@ -223,27 +242,19 @@ class ICPEngine:
 
     def _partition_by_environments(
         self, data: pd.DataFrame, environment_columns: List[str]
-    ) -> Dict[str, pd.DataFrame]:
-        """Partition data by environment combinations"""
+    ) -> EnvironmentPartition:
+        """Partition data by environment combinations (cached per DataFrame)"""
 
-        # Create environment labels
-        env_labels = data[environment_columns].apply(
-            lambda row: "_".join([str(val) for val in row]), axis=1
-        )
+        partition = self._partitions.get(data, environment_columns, self.config.min_samples_per_env)
 
-        # Group by environment
-        environment_data = {}
-        for env_label, group in data.groupby(env_labels):
-            if len(group) >= self.config.min_samples_per_env:
-                environment_data[env_label] = group.copy()
-            else:
-                logger.warning(f"Environment {env_label} has insufficient data: {len(group)}")
+        for env_label, size in partition.dropped.items():
+            logger.warning(f"Environment {env_label} has insufficient data: {size}")
 
-        if len(environment_data) < 2:
+        if len(partition) < 2:
             raise ValueError("Need at least 2 environments with sufficient data")
 
-        logger.info(f"Partitioned data into {len(environment_data)} environments")
-        return environment_data
+        logger.info(f"Partitioned data into {len(partition)} environments")
+        return partition
 
     def _test_invariance(
         self, environment_data: Dict[str, pd.DataFrame], price_columns: List[str]
@@ -258,9 +269,8 @@ class ICPEngine:
         # Calculate correlation matrices for each environment
         environment_correlations = {}
 
-        for env_label, env_data in environment_data.items():
+        for env_label, price_data in environment_arrays(environment_data, price_columns).items():
             # Calculate correlation matrix between all price columns
-            price_data = env_data[price_columns].values
             corr_matrix = np.corrcoef(price_data.T)
 
             # Store upper triangular part (excluding diagonal)
@@ -315,20 +325,8 @@ class ICPEngine:
         """Calculate effect size (Cohen's d) for environment differences"""
 
         # Calculate mean residuals for each environment
-        env_means = []
-        for env_data in environment_data.values():
-            target_col = price_columns[0]
-            feature_cols = price_columns[1:]
-
-            X = env_data[feature_cols].values
-            y = env_data[target_col].values
-
-            model = LinearRegression()
-            model.fit(X, y)
-            y_pred = model.predict(X)
-            residuals = y - y_pred
-
-            env_means.append(np.mean(residuals))
+        fits = environment_fits(environment_data, price_columns)
+        env_means = [np.mean(fit.residuals) for fit in fits.values()]
 
         # Calculate effect size
         if len(env_means) < 2:
@@ -348,8 +346,7 @@ class ICPEngine:
 
         # Simplified power calculation
         # In practice, this would use more sophisticated methods
-        len(environment_data)
-        avg_sample_size = np.mean([len(df) for df in environment_data.values()])
+        avg_sample_size = np.mean(list(environment_sizes(environment_data).values()))
 
         # Approximate power calculation
         if effect_size >= self.config.effect_size_threshold:
@@ -364,31 +361,24 @@ class ICPEngine:
     ) -> Tuple[float, float]:
         """Calculate bootstrap confidence interval for the test statistic"""
 
-        bootstrap_stats = []
-
-        for _ in range(self.config.n_bootstrap):
-            # Bootstrap sample
-            bootstrap_data = data.sample(n=len(data), replace=True)
-
-            # Re-run analysis on bootstrap sample
-            try:
-                env_data = self._partition_by_environments(bootstrap_data, environment_columns)
-                if len(env_data) >= 2:
-                    test_result = self._test_invariance(env_data, price_columns)
-                    bootstrap_stats.append(test_result["test_statistic"])
-            except (ValueError, KeyError):
-                # Skip if bootstrap sample doesn't meet requirements
-                continue
+        partition = self._partitions.get(data, environment_columns, self.config.min_samples_per_env)
+        statistic = partial(
+            correlation_invariance_statistics,
+            prices=data[price_columns].to_numpy(dtype=np.float64),
+            codes=partition.codes,
+            n_envs=partition.n_codes,
+            min_samples_per_env=self.config.min_samples_per_env,
+        )
 
-        if not bootstrap_stats:
-            return (0.0, 1.0)
+        bootstrap_stats = bootstrap_statistics(
+            statistic,
+            [len(data)],
+            self.config.n_bootstrap,
+            seed=self.config.bootstrap_seed,
+            n_workers=self.config.bootstrap_workers,
+        )
 
-        # Calculate confidence interval
-        alpha = 1 - self.config.bootstrap_confidence
-        lower = np.percentile(bootstrap_stats, 100 * alpha / 2)
-        upper = np.percentile(bootstrap_stats, 100 * (1 - alpha / 2))
-
-        return (lower, upper)
+        return percentile_interval(bootstrap_stats, self.config.bootstrap_confidence)
 
     def _calculate_confidence_interval(
         self, test_statistic: float, n_environments: int
@@ -409,41 +399,16 @@ class ICPEngine:
     ) -> Dict[str, float]:
         """Calculate model diagnostics"""
 
-        # Calculate R-squared across all environments
-        total_ss = 0
-        residual_ss = 0
-
-        for env_data in environment_data.values():
-            target_col = price_columns[0]
-            feature_cols = price_columns[1:]
-
-            X = env_data[feature_cols].values
-            y = env_data[target_col].values
-
-            model = LinearRegression()
-            model.fit(X, y)
-            y_pred = model.predict(X)
+        fits = environment_fits(environment_data, price_columns)
 
-            total_ss += np.sum((y - np.mean(y)) ** 2)
-            residual_ss += np.sum((y - y_pred) ** 2)
+        # Calculate R-squared across all environments
+        total_ss = sum(fit.total_ss for fit in fits.values())
+        residual_ss = sum(fit.residual_ss for fit in fits.values())
 
         r_squared = 1 - (residual_ss / total_ss) if total_ss > 0 else 0
 
         # Test residual normality (simplified)
-        all_residuals = []
-        for env_data in environment_data.values():
-            target_col = price_columns[0]
-            feature_cols = price_columns[1:]
-
-            X = env_data[feature_cols].values
-            y = env_data[target_col].values
-
-            model = LinearRegression()
-            model.fit(X, y)
-            y_pred = model.predict(X)
-            residuals = y - y_pred
-
-            all_residuals.extend(residuals)
+        all_residuals = np.concatenate([fit.residuals for fit in fits.values()])
 
         # Normality test
         if len(all_residuals) > 3:
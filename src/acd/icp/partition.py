@@ -0,0 +1,183 @@
+"""
+Environment Partitioning for ICP
+
+Environment column combinations are factorized into a single integer code
+with one ``groupby().ngroup()`` call. Partitions hold row-index arrays into
+the source DataFrame instead of copied groups; frames and value arrays are
+materialized lazily and shared by every ICP stage.
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def encode_environments(
+    data: pd.DataFrame, environment_columns: List[str]
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode environment combinations as integer codes
+
+    Args:
+        data: DataFrame with environment columns
+        environment_columns: Columns whose value combination defines an environment
+
+    Returns:
+        Tuple of (codes of shape (N,), labels) where labels[c] is the
+        "_"-joined label of environment c
+    """
+    columns = list(environment_columns)
+    codes = data.groupby(columns, sort=True, dropna=False).ngroup().to_numpy(dtype=np.int64)
+    # Label each code from its first row rather than from the group keys, so missing
+    # values keep their own environment
+    _, first_rows = np.unique(codes, return_index=True)
+    keys = data[columns].iloc[first_rows].itertuples(index=False, name=None)
+    labels = ["_".join(str(value) for value in key) for key in keys]
+    return codes, labels
+
+
+class EnvironmentPartition(Mapping):
+    """
+    Index-based partition of a DataFrame by environment
+
+    Behaves as a read-only ``{label: DataFrame}`` mapping over the
+    environments that met the minimum size, so it can be passed wherever a
+    dict of environment frames is expected. Frames are only built on access;
+    ``arrays`` returns per-environment NumPy values without building frames.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        codes: np.ndarray,
+        all_labels: List[str],
+        min_samples_per_env: int = 1,
+    ):
+        self.data = data
+        self.codes = codes
+        self.all_labels = all_labels
+
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(all_labels) + 1))
+        self.indices: Dict[str, np.ndarray] = {}
+        self.dropped: Dict[str, int] = {}
+        for code, label in enumerate(all_labels):
+            rows = order[bounds[code] : bounds[code + 1]]
+            if len(rows) >= min_samples_per_env:
+                self.indices[label] = rows
+            else:
+                self.dropped[label] = len(rows)
+
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._arrays: Dict[Tuple[str, ...], Dict[str, np.ndarray]] = {}
+        self._derived: Dict[Hashable, Any] = {}
+
+    @property
+    def n_codes(self) -> int:
+        """Number of environment codes, including dropped environments"""
+        return len(self.all_labels)
+
+    @property
+    def sizes(self) -> Dict[str, int]:
+        """Row count of each retained environment"""
+        return {label: len(rows) for label, rows in self.indices.items()}
+
+    def __getitem__(self, label: str) -> pd.DataFrame:
+        if label not in self._frames:
+            self._frames[label] = self.data.iloc[self.indices[label]]
+        return self._frames[label]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.indices)
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def arrays(self, columns: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Per-environment float64 values of the given columns
+
+        Args:
+            columns: Column names
+
+        Returns:
+            Dictionary mapping environment label to an array of shape (n_env, len(columns))
+        """
+        key = tuple(columns)
+        if key not in self._arrays:
+            values = self.data[list(columns)].to_numpy(dtype=np.float64)
+            self._arrays[key] = {label: values[rows] for label, rows in self.indices.items()}
+        return self._arrays[key]
+
+    def cached(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Memoize a derived per-partition result (e.g. per-environment fits) under ``key``"""
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+
+
+def environment_arrays(
+    environment_data: Union[EnvironmentPartition, Mapping[str, pd.DataFrame]],
+    columns: Sequence[str],
+) -> Dict[str, np.ndarray]:
+    """Per-environment values for a partition or a plain dict of frames"""
+    if isinstance(environment_data, EnvironmentPartition):
+        return environment_data.arrays(columns)
+    return {
+        label: frame[list(columns)].to_numpy(dtype=np.float64)
+        for label, frame in environment_data.items()
+    }
+
+
+def environment_sizes(
+    environment_data: Union[EnvironmentPartition, Mapping[str, pd.DataFrame]]
+) -> Dict[str, int]:
+    """Row count of each environment for a partition or a plain dict of frames"""
+    if isinstance(environment_data, EnvironmentPartition):
+        return environment_data.sizes
+    return {label: len(frame) for label, frame in environment_data.items()}
+
+
+class PartitionCache:
+    """
+    Per-DataFrame cache of environment partitions
+
+    Entries are keyed by DataFrame identity plus the partition settings, and
+    only the most recently used ``max_entries`` are kept. A DataFrame that is
+    mutated in place keeps its cached partition; call ``clear`` after
+    changing environment columns.
+    """
+
+    def __init__(self, max_entries: int = 8):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, EnvironmentPartition]" = OrderedDict()
+
+    def get(
+        self, data: pd.DataFrame, environment_columns: List[str], min_samples_per_env: int
+    ) -> EnvironmentPartition:
+        """Return the cached partition of ``data``, building it on first use"""
+        key = (id(data), tuple(environment_columns), min_samples_per_env)
+        partition = self._entries.get(key)
+        # The entry keeps its DataFrame alive, so a matching id is the same object
+        if partition is not None and partition.data is data:
+            self._entries.move_to_end(key)
+            return partition
+
+        codes, labels = encode_environments(data, environment_columns)
+        partition = EnvironmentPartition(data, codes, labels, min_samples_per_env)
+        self._entries[key] = partition
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return partition
+
+    def clear(self) -> None:
+        """Drop every cached partition"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
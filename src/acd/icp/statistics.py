@@ -7,6 +7,7 @@ for court/regulator-ready coordination risk analytics.
 
 import logging
 from dataclasses import dataclass
+from functools import partial
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
@@ -14,6 +15,10 @@ import pandas as pd
 from scipy import stats
 from scipy.stats import norm
 
+from .bootstrap import bootstrap_statistics, percentile_interval, residual_invariance_statistics
+from .partition import environment_arrays, environment_sizes
+from .regression import environment_fits
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +38,8 @@ class PowerAnalysisConfig:
     # Bootstrap parameters
     n_bootstrap: int = 1000  # Number of bootstrap samples
     confidence_level: float = 0.95  # Confidence level for intervals
+    bootstrap_seed: Optional[int] = None  # None draws from the global NumPy RNG
+    bootstrap_workers: Optional[int] = None  # Worker processes for resample chunks
 
 
 @dataclass
@@ -142,27 +149,11 @@ class EnhancedStatistics:
         Returns:
             Tuple of (test_statistic, p_value)
         """
-        # Fit models for each environment
-        environment_residuals = {}
-
-        for env_label, env_data in environment_data.items():
-            # Prepare features and target
-            target_col = price_columns[0]
-            feature_cols = price_columns[1:]
-
-            X = env_data[feature_cols].values
-            y = env_data[target_col].values
-
-            # Fit linear model
-            from sklearn.linear_model import LinearRegression
-
-            model = LinearRegression()
-            model.fit(X, y)
-
-            # Calculate residuals
-            y_pred = model.predict(X)
-            residuals = y - y_pred
-            environment_residuals[env_label] = residuals
+        # Fit models for each environment (shared with the effect size calculation)
+        environment_residuals = {
+            env_label: fit.residuals
+            for env_label, fit in environment_fits(environment_data, price_columns).items()
+        }
 
         # Test for differences in residual distributions
         env_labels = list(environment_residuals.keys())
@@ -196,22 +187,8 @@ class EnhancedStatistics:
         """Calculate Cohen's d effect size for environment differences"""
 
         # Calculate mean residuals for each environment
-        env_means = []
-        for env_data in environment_data.values():
-            target_col = price_columns[0]
-            feature_cols = price_columns[1:]
-
-            X = env_data[feature_cols].values
-            y = env_data[target_col].values
-
-            from sklearn.linear_model import LinearRegression
-
-            model = LinearRegression()
-            model.fit(X, y)
-            y_pred = model.predict(X)
-            residuals = y - y_pred
-
-            env_means.append(np.mean(residuals))
+        fits = environment_fits(environment_data, price_columns)
+        env_means = [np.mean(fit.residuals) for fit in fits.values()]
 
         if len(env_means) < 2:
             return 0.0
@@ -233,7 +210,7 @@ class EnhancedStatistics:
         Uses Cohen's power analysis for two-sample t-test
         """
         n_environments = len(environment_data)
-        avg_sample_size = np.mean([len(df) for df in environment_data.values()])
+        avg_sample_size = np.mean(list(environment_sizes(environment_data).values()))
 
         # Calculate power using normal approximation
         # For two-sample t-test with equal sample sizes
@@ -278,31 +255,27 @@ class EnhancedStatistics:
     ) -> Tuple[float, float]:
         """Calculate bootstrap confidence interval for the test statistic"""
 
-        bootstrap_stats = []
-
-        for _ in range(self.power_config.n_bootstrap):
-            # Bootstrap sample
-            bootstrap_data = {}
-            for env_label, env_data in environment_data.items():
-                bootstrap_sample = env_data.sample(n=len(env_data), replace=True)
-                bootstrap_data[env_label] = bootstrap_sample
-
-            # Re-run analysis on bootstrap sample
-            try:
-                test_stat, _ = self._test_invariance_ks(bootstrap_data, price_columns)
-                bootstrap_stats.append(test_stat)
-            except (ValueError, KeyError):
-                continue
-
-        if not bootstrap_stats:
-            return (0.0, 1.0)
+        # Stack environments contiguously so each one is resampled within itself
+        env_values = list(environment_arrays(environment_data, price_columns).values())
+        stacked = np.concatenate(env_values)
+        sizes = [len(values) for values in env_values]
+        statistic = partial(
+            residual_invariance_statistics,
+            features=stacked[:, 1:],
+            target=stacked[:, 0],
+            codes=np.repeat(np.arange(len(env_values)), sizes),
+            n_envs=len(env_values),
+        )
 
-        # Calculate confidence interval
-        alpha = 1 - self.power_config.confidence_level
-        lower = np.percentile(bootstrap_stats, 100 * alpha / 2)
-        upper = np.percentile(bootstrap_stats, 100 * (1 - alpha / 2))
+        bootstrap_stats = bootstrap_statistics(
+            statistic,
+            sizes,
+            self.power_config.n_bootstrap,
+            seed=self.power_config.bootstrap_seed,
+            n_workers=self.power_config.bootstrap_workers,
+        )
 
-        return (lower, upper)
+        return percentile_interval(bootstrap_stats, self.power_config.confidence_level)
 
     def _calculate_confidence_interval(self, test_statistic: float) -> Tuple[float, float]:
         """Calculate confidence interval for the test statistic"""
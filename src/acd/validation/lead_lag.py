@@ -11,7 +11,8 @@ from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from statsmodels.tsa.stattools import grangercausalitytests
+
+from .lead_lag_kernel import granger_f_tests, rolling_lagged_betas
 
 warnings.filterwarnings("ignore")
 
@@ -140,6 +141,13 @@ class LeadLagValidator:
         """Calculate rolling lead-lag betas between all exchange pairs"""
         betas = {}
         n_obs, n_exchanges = returns.shape
+        window = self.config.window_size
+
+        if np.isfinite(returns).all() and window >= self.config.min_observations:
+            # All pairs and windows at once from cumulative cross-moments
+            rolling = rolling_lagged_betas(returns, [0], window, min_std=1e-8).betas[:, :, 0]
+        else:
+            rolling = None
 
         for i in range(n_exchanges):
             for j in range(n_exchanges):
@@ -148,10 +156,10 @@ class LeadLagValidator:
 
                 leader, follower = exchanges[i], exchanges[j]
 
-                # Calculate rolling beta using OLS
-                rolling_beta = self._rolling_ols_beta(
-                    returns[:, i], returns[:, j], self.config.window_size
-                )
+                if rolling is not None:
+                    rolling_beta = rolling[i, j]
+                else:
+                    rolling_beta = self._rolling_ols_beta(returns[:, i], returns[:, j], window)
 
                 # Average beta across all windows
                 avg_beta = np.nanmean(rolling_beta)
@@ -186,42 +194,28 @@ class LeadLagValidator:
         self, returns: np.ndarray, exchanges: List[str]
     ) -> Dict[Tuple[str, str], float]:
         """Calculate Granger causality tests between exchange pairs"""
-        granger_results = {}
         n_obs, n_exchanges = returns.shape
-
-        for i in range(n_exchanges):
-            for j in range(n_exchanges):
-                if i == j:
-                    continue
-
-                leader, follower = exchanges[i], exchanges[j]
-
-                try:
-                    # Prepare data for Granger test
-                    data = np.column_stack([returns[:, j], returns[:, i]])  # [follower, leader]
-
-                    # Skip if insufficient data
-                    if len(data) < self.config.min_observations:
-                        granger_results[(leader, follower)] = 1.0
-                        continue
-
-                    # Perform Granger causality test
-                    gc_result = grangercausalitytests(
-                        data, maxlag=self.config.max_lag, verbose=False
-                    )
-
-                    # Extract p-value for the optimal lag
-                    best_lag = min(self.config.max_lag, len(data) // 4)
-                    if best_lag in gc_result:
-                        p_value = gc_result[best_lag][0]["ssr_ftest"][1]  # F-test p-value
-                        granger_results[(leader, follower)] = p_value
-                    else:
-                        granger_results[(leader, follower)] = 1.0
-
-                except Exception:
-                    granger_results[(leader, follower)] = 1.0
-
-        return granger_results
+        max_lag = self.config.max_lag
+        best_lag = min(max_lag, n_obs // 4)
+
+        # Too short for the maximum lag, or the optimal lag: no evidence either way
+        if (
+            n_obs < self.config.min_observations
+            or n_obs <= 3 * max_lag + 1
+            or best_lag < 1
+            or not np.isfinite(returns).all()
+        ):
+            p_values = np.ones((n_exchanges, n_exchanges))
+        else:
+            # SSR F-test p-values for all (leader, follower) pairs in one pass
+            p_values = granger_f_tests(returns, best_lag)
+
+        return {
+            (exchanges[i], exchanges[j]): float(p_values[i, j])
+            for i in range(n_exchanges)
+            for j in range(n_exchanges)
+            if i != j
+        }
 
     def _calculate_persistence_scores(
         self, rolling_betas: Dict[Tuple[str, str], float], exchanges: List[str]
@@ -0,0 +1,276 @@
+"""
+Batched Lead-Lag Regression Kernel
+
+Estimates lead-lag regressions for every ordered venue pair and horizon at
+once. Lagged design matrices are zero-copy sliding-window views of the
+(T x V) return matrix; their cross-moments feed one batched solve of the
+normal equations. Rolling betas come from cumulative cross-moment sums, so a
+whole (pair x horizon x window) scan costs O(T) per pair and horizon.
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import stats
+
+
+@dataclass
+class LaggedRegressionScores:
+    """
+    Fits of y_j(t) on x_i(t - 1), ..., x_i(t - h) with an intercept
+
+    Arrays are indexed [src, dst, horizon].
+    """
+
+    horizons: List[int]
+    r_squared: np.ndarray
+    t_stat: np.ndarray
+    p_value: np.ndarray
+    n_obs: np.ndarray
+
+
+@dataclass
+class RollingLeadLag:
+    """
+    Rolling single-regressor OLS of y_j(t) on x_i(t - h)
+
+    Arrays are indexed [src, dst, horizon, window]. Window w covers the
+    ``window`` observations ending at ``window_ends[w]``, so every horizon
+    shares the same windows. Betas are NaN where x_i is (near) constant.
+    """
+
+    horizons: List[int]
+    window: int
+    window_ends: np.ndarray
+    betas: np.ndarray
+    t_stats: np.ndarray
+
+
+def lag_matrix(returns: np.ndarray, lags: int) -> np.ndarray:
+    """
+    Lagged regressors of every venue, as a zero-copy view
+
+    Args:
+        returns: Array of shape (T, V)
+        lags: Number of lags
+
+    Returns:
+        Array of shape (T - lags, V, lags) whose row r holds returns[t - k]
+        for t = r + lags and k = 1..lags (in reverse order)
+    """
+    return sliding_window_view(returns[:-1], lags, axis=0)
+
+
+def solve_normal_equations(gram: np.ndarray, moments: np.ndarray) -> np.ndarray:
+    """
+    Batched least-squares coefficients from X'X and X'y
+
+    Uses the pseudo-inverse, so collinear or constant regressors give the
+    minimum-norm solution (as lstsq would) instead of failing.
+
+    Args:
+        gram: Array of shape (..., k, k)
+        moments: Array of shape (..., k, m)
+
+    Returns:
+        Coefficients of shape (..., k, m)
+    """
+    return np.linalg.pinv(gram, hermitian=True) @ moments
+
+
+def lagged_regressions(returns: np.ndarray, horizons: Sequence[int]) -> LaggedRegressionScores:
+    """
+    Regress every venue's return on h lags of every venue's return
+
+    For each horizon the lagged design of all source venues is centered
+    (absorbing the intercept), its Gram matrices and cross-moments with all
+    targets are formed with two batched products, and the normal equations
+    of every (src, dst) pair are solved in one batched call.
+
+    Args:
+        returns: Array of shape (T, V) without NaNs
+        horizons: Numbers of lags (h >= 1)
+
+    Returns:
+        LaggedRegressionScores; t_stat is sqrt(n R^2 / (1 - R^2)) and
+        p_value its two-sided Student-t p-value with n - 2 degrees of freedom
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    T, V = returns.shape
+    shape = (V, V, len(horizons))
+    r_squared, t_stat = np.zeros(shape), np.zeros(shape)
+    p_value, n_obs = np.ones(shape), np.zeros(shape, dtype=np.int64)
+
+    for k, h in enumerate(horizons):
+        n = T - h
+        if n < 1:
+            continue
+        n_obs[:, :, k] = n
+        # (V, n, h) lag blocks per source, targets rows t = h..T-1
+        design = np.ascontiguousarray(lag_matrix(returns, h).transpose(1, 0, 2))
+        design -= design.mean(axis=1, keepdims=True)
+        targets = returns[h:] - returns[h:].mean(axis=0)
+
+        gram = design.transpose(0, 2, 1) @ design
+        moments = design.transpose(0, 2, 1) @ targets
+        coefs = solve_normal_equations(gram, moments)
+
+        sst = np.sum(targets**2, axis=0)
+        explained = np.sum(coefs * moments, axis=1)
+        if n <= h + 1:
+            # As many parameters as observations: a perfect fit
+            r2 = np.ones((V, V))
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                r2 = np.where(sst > 0, explained / sst, 1.0)
+        r2 = np.clip(r2, 0.0, 1.0)
+        ssr = np.maximum(sst - explained, 0.0)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t = np.where((r2 < 1) & (ssr > 0), np.sqrt(r2 * n / (1 - r2)), 0.0)
+        r_squared[:, :, k] = r2
+        t_stat[:, :, k] = t
+        if n > 2:
+            p_value[:, :, k] = np.where(t > 0, 2 * stats.t.sf(t, n - 2), 1.0)
+
+    return LaggedRegressionScores(
+        horizons=list(horizons), r_squared=r_squared, t_stat=t_stat, p_value=p_value, n_obs=n_obs
+    )
+
+
+def granger_f_tests(returns: np.ndarray, lag: int) -> np.ndarray:
+    """
+    Granger causality SSR F-test p-values for every ordered venue pair
+
+    Matches ``statsmodels.tsa.stattools.grangercausalitytests`` ("ssr_ftest")
+    on the columns [follower, leader]: the follower's own ``lag`` lags (plus a
+    constant) against the same model with the leader's lags added. All
+    restricted and unrestricted models share one Gram matrix of the lagged
+    returns and are solved in one batched call.
+
+    Args:
+        returns: Array of shape (T, V) without NaNs
+        lag: Number of lags
+
+    Returns:
+        Array of shape (V, V) with p-values indexed [leader, follower]; the
+        diagonal and too-short samples are 1.0
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    T, V = returns.shape
+    p_values = np.ones((V, V))
+    n = T - lag
+    df_resid = n - (2 * lag + 1)
+    if V < 2 or lag < 1 or T <= 3 * lag + 1 or df_resid <= 0:
+        return p_values
+
+    design = lag_matrix(returns, lag).reshape(n, V * lag)
+    design = design - design.mean(axis=0)
+    targets = returns[lag:] - returns[lag:].mean(axis=0)
+    gram = design.T @ design
+    moments = design.T @ targets
+    sst = np.sum(targets**2, axis=0)
+
+    blocks = np.arange(V * lag).reshape(V, lag)
+    leaders, followers = np.nonzero(~np.eye(V, dtype=bool))
+    own = blocks[followers]
+    joint = np.concatenate([own, blocks[leaders]], axis=1)
+
+    def ssr(columns: np.ndarray) -> np.ndarray:
+        g = gram[columns[:, :, None], columns[:, None, :]]
+        m = moments[columns, followers[:, None]][:, :, None]
+        coefs = solve_normal_equations(g, m)
+        return np.maximum(sst[followers] - np.sum(coefs * m, axis=(1, 2)), 0.0)
+
+    ssr_own, ssr_joint = ssr(own), ssr(joint)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        f_stat = (ssr_own - ssr_joint) / ssr_joint / lag * df_resid
+    p = stats.f.sf(f_stat, lag, df_resid)
+    p_values[leaders, followers] = np.where(np.isfinite(p), p, 1.0)
+    return p_values
+
+
+def rolling_lagged_betas(
+    returns: np.ndarray,
+    horizons: Sequence[int],
+    window: int,
+    step: int = 1,
+    min_std: float = 0.0,
+) -> RollingLeadLag:
+    """
+    Rolling OLS betas of y_j(t) on x_i(t - h) for all pairs, horizons and windows
+
+    Window sums of x, y, x^2, y^2 and x*y come from differences of cumulative
+    sums, so every window costs O(1) regardless of its length.
+
+    Args:
+        returns: Array of shape (T, V) without NaNs
+        horizons: Lags h >= 0 (0 regresses contemporaneous returns)
+        window: Observations per window
+        step: Distance between consecutive window ends
+        min_std: Windows where x_i's standard deviation is not above this
+            give NaN betas
+
+    Returns:
+        RollingLeadLag with (V, V, len(horizons), n_windows) tensors
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    T, V = returns.shape
+    max_h = max(horizons) if len(horizons) else 0
+    window_ends = np.arange(max_h + window - 1, T, step)
+    shape = (V, V, len(horizons), len(window_ends))
+    betas, t_stats = np.full(shape, np.nan), np.full(shape, np.nan)
+    if len(window_ends) == 0 or window < 2:
+        return RollingLeadLag(list(horizons), window, window_ends, betas, t_stats)
+
+    # Shifts leave betas unchanged and keep the running sums small. Work on
+    # (V, T) rows so every window tensor is laid out [src, dst, window].
+    centered = np.ascontiguousarray((returns - returns.mean(axis=0)).T)
+    csum = np.zeros((V, T + 1))
+    csq = np.zeros((V, T + 1))
+    np.cumsum(centered, axis=1, out=csum[:, 1:])
+    np.cumsum(centered**2, axis=1, out=csq[:, 1:])
+
+    # Window w covers targets y(t) for t in [first + w * step, first + w * step + window)
+    first, n_windows = window_ends[0] + 1 - window, len(window_ends)
+
+    def window_sums(cumulative: np.ndarray, offset: int) -> np.ndarray:
+        begin = first + offset
+        stop = begin + (n_windows - 1) * step + 1
+        return (
+            cumulative[..., begin + window : stop + window : step]
+            - cumulative[..., begin:stop:step]
+        )
+
+    s_y = window_sums(csum, 0)
+    syy = window_sums(csq, 0) - s_y**2 / window
+    cross = np.zeros((V, V, T + 1))
+
+    for k, h in enumerate(horizons):
+        # Regressors x(t - h) over the same t
+        s_x = window_sums(csum, -h)
+        sxx = window_sums(csq, -h) - s_x**2 / window
+        # cross[i, j, s] sums x_i(u) y_j(u + h) for u < s
+        np.multiply(
+            centered[:, None, : T - h], centered[None, :, h:], out=cross[:, :, 1 : T - h + 1]
+        )
+        np.cumsum(cross[:, :, 1 : T - h + 1], axis=2, out=cross[:, :, 1 : T - h + 1])
+        sxy = window_sums(cross[:, :, : T - h + 1], -h)
+        sxy -= s_x[:, None, :] * (s_y / window)[None, :, :]
+
+        invalid = ~((sxx > 0) & (np.sqrt(np.maximum(sxx, 0.0) / window) > min_std))
+        sxx[invalid] = np.nan
+        beta = betas[:, :, k, :]
+        np.divide(sxy, sxx[:, None, :], out=beta)
+        if window > 2:
+            # Residual sum of squares, then the slope's standard error
+            ssr = syy[None, :, :] - beta * sxy
+            np.maximum(ssr, 0.0, out=ssr)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ssr /= (window - 2) * sxx[:, None, :]
+                np.sqrt(ssr, out=ssr)
+                np.divide(beta, ssr, out=t_stats[:, :, k, :])
+
+    return RollingLeadLag(list(horizons), window, window_ends, betas, t_stats)
@@ -5,6 +5,7 @@ Implements VMM methodology for continuous monitoring and crypto-specific
 moment condition evaluation.
 """
 
+from .batch import run_vmm_batch
 from .crypto_moments import (
     CryptoMomentCalculator,
     CryptoMomentConfig,
@@ -12,11 +13,15 @@ from .crypto_moments import (
     calculate_crypto_moments,
 )
 from .engine import VMMConfig, VMMEngine, VMMOutput
+from .streaming import StreamingVMMConfig, StreamingVMMEngine
 
 __all__ = [
     "VMMEngine",
     "VMMConfig",
     "VMMOutput",
+    "StreamingVMMEngine",
+    "StreamingVMMConfig",
+    "run_vmm_batch",
     "CryptoMomentCalculator",
     "CryptoMomentConfig",
     "CryptoMoments",
@@ -0,0 +1,187 @@
+"""
+VMM Batch Runner
+
+Runs VMMEngine over many data windows in a process pool. Window prices live
+in one shared-memory block that workers slice by row offsets, so DataFrames
+are never pickled; a WindowedData's source rows are shared once however much
+its windows overlap. Results come back in window order with deterministic
+per-window seeds; a failing window can be returned as its exception so it
+does not take the rest of the batch down with it.
+"""
+
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .engine import VMMConfig, VMMEngine, VMMOutput
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _WindowTask:
+    """Description of one window inside the shared price block"""
+
+    index: int
+    start: int
+    stop: int
+    seed: int
+
+
+def window_seeds(n_windows: int, base_seed: Optional[int] = None) -> List[int]:
+    """
+    Derive independent, reproducible seeds for each window
+
+    Args:
+        n_windows: Number of windows
+        base_seed: Root seed (None draws fresh OS entropy)
+
+    Returns:
+        One 32-bit seed per window
+    """
+    children = np.random.SeedSequence(base_seed).spawn(n_windows)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _run_window(
+    prices: np.ndarray,
+    price_columns: List[str],
+    config: VMMConfig,
+    seed: int,
+    return_exceptions: bool = False,
+) -> Union[VMMOutput, Exception]:
+    """Run a single window on its own seeded generator, leaving the global RNG alone"""
+    data = pd.DataFrame(prices, columns=price_columns)
+    try:
+        return VMMEngine(config, rng=np.random.default_rng(seed)).run_vmm(data, price_columns)
+    except Exception as e:
+        if not return_exceptions:
+            raise
+        return e
+
+
+def _run_shared_window(
+    shm_name: str,
+    shape: Tuple[int, int],
+    price_columns: List[str],
+    config: VMMConfig,
+    task: _WindowTask,
+    return_exceptions: bool = False,
+) -> Union[VMMOutput, Exception]:
+    """Worker entry point: read one window from shared memory and run VMM"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        prices = block[task.start : task.stop].copy()
+    finally:
+        shm.close()
+
+    return _run_window(prices, price_columns, config, task.seed, return_exceptions)
+
+
+def _price_block(windows: Any, price_columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One (rows, n_prices) price array and the [start, stop) rows of every window in it
+
+    A WindowedData is used in place: its rows are stored once however much the
+    windows overlap. Lists of DataFrames are packed back to back.
+    """
+    if hasattr(windows, "offsets") and hasattr(windows, "source"):
+        if list(windows.price_columns) == list(price_columns):
+            values = windows.values
+        else:
+            missing = [col for col in price_columns if col not in windows.source.columns]
+            if missing:
+                raise ValueError(f"price columns {missing} missing from windowed data")
+            values = np.ascontiguousarray(windows.source[price_columns].to_numpy(dtype=np.float64))
+        return values, np.asarray(windows.offsets, dtype=np.int64).reshape(-1, 2)
+
+    arrays = [w[price_columns].to_numpy(dtype=np.float64) for w in windows]
+    lengths = np.array([len(a) for a in arrays], dtype=np.int64)
+    stops = np.cumsum(lengths)
+    offsets = np.column_stack([stops - lengths, stops])
+    values = np.concatenate(arrays) if arrays else np.empty((0, len(price_columns)))
+    return values, offsets
+
+
+def run_vmm_batch(
+    windows: Sequence[pd.DataFrame],
+    price_columns: List[str],
+    config: Optional[VMMConfig] = None,
+    n_workers: Optional[int] = None,
+    base_seed: Optional[int] = 0,
+    return_exceptions: bool = False,
+) -> List[Union[VMMOutput, Exception]]:
+    """
+    Run VMM over a batch of windows, in parallel across worker processes
+
+    Args:
+        windows: Window DataFrames, or an ``acd.data.features.WindowedData`` whose
+            source rows are shared once and read by window offsets (no
+            DataFrame is built per window)
+        price_columns: Price column names present in every window
+        config: VMM configuration shared by all windows
+        n_workers: Number of worker processes (None or 1 runs in-process)
+        base_seed: Root seed; window i always receives the same derived seed
+        return_exceptions: Return a failing window's exception in its slot
+            instead of raising it, so the other windows still complete
+
+    Returns:
+        List of VMMOutput (or exceptions), in the same order as ``windows``
+    """
+    config = config or VMMConfig()
+    values, offsets = _price_block(windows, list(price_columns))
+    if len(offsets) == 0:
+        return []
+
+    seeds = window_seeds(len(offsets), base_seed)
+    tasks = [
+        _WindowTask(index=i, start=int(start), stop=int(stop), seed=seed)
+        for i, ((start, stop), seed) in enumerate(zip(offsets, seeds))
+    ]
+
+    if n_workers is None or n_workers <= 1 or len(tasks) == 1:
+        return [
+            _run_window(
+                values[task.start : task.stop],
+                list(price_columns),
+                config,
+                task.seed,
+                return_exceptions,
+            )
+            for task in tasks
+        ]
+
+    # Workers read their rows from one shared block by offset instead of pickled frames
+    shape = values.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * 8))
+    try:
+        block = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        block[:] = values
+        del block
+
+        logger.info(f"Running VMM on {len(tasks)} windows across {n_workers} workers")
+        n = len(tasks)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            results = list(
+                executor.map(
+                    _run_shared_window,
+                    [shm.name] * n,
+                    [shape] * n,
+                    [list(price_columns)] * n,
+                    [config] * n,
+                    tasks,
+                    [return_exceptions] * n,
+                    chunksize=max(1, n // (4 * n_workers)),
+                )
+            )
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return results
@@ -0,0 +1,221 @@
+"""
+Crypto Moment Kernels
+
+Vectorized building blocks for the crypto moment conditions. Prices are
+aligned once into a (T x V) float64 matrix with their first differences, and
+every pairwise statistic is computed for all venues at once: lagged
+correlations through one FFT cross-correlation, rolling mirroring
+correlations through sliding-window views, and dwell/undercut episodes
+through run-length encoding of boolean arrays.
+"""
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft, stats
+
+from .rolling import DEFAULT_CHUNK_SIZE, _window_correlations
+
+# Fewer aligned observations than this leave a lag's statistics at zero
+MIN_LAG_OBSERVATIONS = 10
+
+
+@dataclass
+class PriceMatrix:
+    """Venue prices aligned into one (T x V) matrix, with their changes"""
+
+    prices: np.ndarray
+    changes: np.ndarray
+
+    @classmethod
+    def from_array(cls, prices: np.ndarray) -> "PriceMatrix":
+        prices = np.ascontiguousarray(prices, dtype=np.float64)
+        return cls(prices=prices, changes=np.diff(prices, axis=0))
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame, price_columns: List[str]) -> "PriceMatrix":
+        return cls.from_array(data[price_columns].to_numpy(dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    @cached_property
+    def change_std(self) -> np.ndarray:
+        """Per-venue standard deviation of price changes, shared by several moments"""
+        return np.std(self.changes, axis=0)
+
+
+def environment_matrices(
+    data: pd.DataFrame, price_columns: List[str], environment_column: Optional[str] = None
+) -> List[PriceMatrix]:
+    """
+    Split the aligned price matrix by environment
+
+    Args:
+        data: DataFrame with price data
+        price_columns: List of price column names
+        environment_column: Optional environment column
+
+    Returns:
+        One PriceMatrix per environment, in order of first appearance (a
+        single matrix without an environment column)
+    """
+    prices = data[price_columns].to_numpy(dtype=np.float64)
+    if not environment_column or environment_column not in data.columns:
+        return [PriceMatrix.from_array(prices)]
+
+    codes, labels = pd.factorize(data[environment_column], use_na_sentinel=False)
+    return [PriceMatrix.from_array(prices[codes == k]) for k in range(len(labels))]
+
+
+def lagged_correlations(
+    prices: np.ndarray, max_lag: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Pearson correlations of x_i(t) with x_j(t + lag) for all venue pairs and lags
+
+    Each lag uses its own overlapping samples (T - lag observations), as
+    ``scipy.stats.pearsonr(x[:-lag, i], x[lag:, j])`` would. Cross products
+    come from one FFT cross-correlation, sample moments from prefix sums.
+
+    Args:
+        prices: Array of shape (T, V)
+        max_lag: Largest lag
+
+    Returns:
+        Tuple of (correlations, betas, p_values), each of shape (V, V, max_lag).
+        Betas are OLS slopes of the lagging on the leading venue. The diagonal
+        and lags with fewer than MIN_LAG_OBSERVATIONS samples are zero; pairs
+        with a constant series are NaN (betas zero for a constant leader).
+    """
+    T, V = prices.shape
+    shape = (V, V, max_lag)
+    corr, betas, p_values = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    lags = np.arange(1, max_lag + 1)
+    lags = lags[T - lags >= MIN_LAG_OBSERVATIONS]
+    if len(lags) == 0 or V == 0:
+        return corr, betas, p_values
+
+    # Centering is free for correlations and keeps the FFT well conditioned
+    centered = prices - prices.mean(axis=0)
+    n_fft = fft.next_fast_len(T + lags[-1])
+    spectrum = fft.rfft(centered, n=n_fft, axis=0)
+    cross = fft.irfft(np.conj(spectrum)[:, :, None] * spectrum[:, None, :], n=n_fft, axis=0)
+    # cross[lag, i, j] = sum_t x_i(t) x_j(t + lag)
+    s_xy = cross[lags]
+
+    zero = np.zeros((1, V))
+    csum = np.concatenate([zero, np.cumsum(centered, axis=0)])
+    csq = np.concatenate([zero, np.cumsum(centered**2, axis=0)])
+    n = (T - lags).astype(np.float64)
+    # Leading samples are rows [0, T - lag), lagging samples rows [lag, T)
+    s_x, s_xx = csum[T - lags], csq[T - lags]
+    s_y, s_yy = csum[-1] - csum[lags], csq[-1] - csq[lags]
+
+    mean_x, mean_y = s_x / n[:, None], s_y / n[:, None]
+    var_x = np.maximum(s_xx / n[:, None] - mean_x**2, 0.0)
+    var_y = np.maximum(s_yy / n[:, None] - mean_y**2, 0.0)
+    cov = s_xy / n[:, None, None] - mean_x[:, :, None] * mean_y[:, None, :]
+    denom = np.sqrt(var_x[:, :, None] * var_y[:, None, :])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.clip(cov / denom, -1.0, 1.0)
+        r[denom == 0] = np.nan
+        std_ratio = np.sqrt(var_y[:, None, :] / var_x[:, :, None])
+        beta = np.where(var_x[:, :, None] > 0, r * std_ratio, 0.0)
+        dof = (n - 2)[:, None, None]
+        t_stat = r * np.sqrt(dof / (1.0 - r**2))
+    p = 2 * stats.t.sf(np.abs(t_stat), dof)
+
+    off_diagonal = ~np.eye(V, dtype=bool)
+    for values, out in ((r, corr), (beta, betas), (p, p_values)):
+        out[:, :, lags - 1] = np.where(off_diagonal, values, 0.0).transpose(1, 2, 0)
+    return corr, betas, p_values
+
+
+def rolling_pair_correlations(
+    prices: np.ndarray, window: int, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and dispersion of pairwise correlations over trailing windows
+
+    Windows are prices[t - window : t] for window <= t < T; a pair's window
+    only counts when neither series is constant in it.
+
+    Args:
+        prices: Array of shape (T, V)
+        window: Window length
+        chunk_size: Windows evaluated per batch, bounding memory
+
+    Returns:
+        Tuple of (mean_correlation, 1 - std_correlation), each (V, V) with a
+        zero diagonal and zeros for pairs without a valid window
+    """
+    T, V = prices.shape
+    count, total, total_sq = np.zeros((V, V)), np.zeros((V, V)), np.zeros((V, V))
+    if T > window:
+        # (T - window + 1, V, window); the window ending at T is not used
+        windows = sliding_window_view(prices, window, axis=0)[: T - window]
+        for start in range(0, len(windows), chunk_size):
+            corr = _window_correlations(windows[start : start + chunk_size])
+            valid = ~np.isnan(corr)
+            corr = np.where(valid, corr, 0.0)
+            count += valid.sum(axis=0)
+            total += corr.sum(axis=0)
+            total_sq += (corr**2).sum(axis=0)
+
+    has_windows = (count > 0) & ~np.eye(V, dtype=bool)
+    mean = np.divide(total, count, out=np.zeros((V, V)), where=has_windows)
+    variance = np.divide(total_sq, count, out=np.zeros((V, V)), where=has_windows) - mean**2
+    consistency = np.where(has_windows, 1 - np.sqrt(np.maximum(variance, 0.0)), 0.0)
+    return mean, consistency
+
+
+def true_runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Run-length encode the True runs of every column of a boolean matrix
+
+    Args:
+        mask: Boolean array of shape (T, V)
+
+    Returns:
+        Tuple of (columns, starts, lengths), one entry per run, ordered by
+        column and then start
+    """
+    T, V = mask.shape
+    padded = np.zeros((V, T + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask.T
+    edges = np.diff(padded, axis=1)
+    columns, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return columns, starts, ends - starts
+
+
+def run_statistics(
+    mask: np.ndarray, min_length: int = 1, closed_only: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-column count and mean length of True runs
+
+    Args:
+        mask: Boolean array of shape (T, V)
+        min_length: Shortest run counted
+        closed_only: Skip runs still open at the last row
+
+    Returns:
+        Tuple of (run_counts, mean_lengths), each of shape (V,); mean lengths
+        are zero for columns without runs
+    """
+    T, V = mask.shape
+    columns, starts, lengths = true_runs(mask)
+    keep = lengths >= min_length
+    if closed_only:
+        keep &= starts + lengths < T
+    counts = np.bincount(columns[keep], minlength=V)
+    totals = np.bincount(columns[keep], weights=lengths[keep], minlength=V)
+    means = np.divide(totals, counts, out=np.zeros(V), where=counts > 0)
+    return counts, means
@@ -9,6 +9,8 @@ Implements canonical coordination-sensitive moment conditions for crypto markets
 - MEV coordination patterns
 
 All moments are normalized to [0,1] and include environment invariance components.
+Prices are aligned once into a (T x V) matrix per environment and shared by
+every moment (see crypto_kernels).
 """
 
 import logging
@@ -17,8 +19,14 @@ from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
+from .crypto_kernels import (
+    PriceMatrix,
+    environment_matrices,
+    lagged_correlations,
+    rolling_pair_correlations,
+    run_statistics,
+)
 from .scalers import GlobalMomentScaler
 
 logger = logging.getLogger(__name__)
@@ -104,18 +112,12 @@ class CryptoMomentCalculator:
         self._validate_input(data, price_columns)
 
         # Calculate normalized moments
-        arbitrage_moments = self._calculate_arbitrage_timing_moments(
-            data, price_columns, environment_column
-        )
-        mirroring_moments = self._calculate_depth_weighted_mirroring_moments(
-            data, price_columns, environment_column
-        )
-        spread_floor_moments = self._calculate_spread_floor_dwell_moments(
-            data, price_columns, environment_column
-        )
-        undercut_moments = self._calculate_undercut_asymmetry_moments(
-            data, price_columns, environment_column
-        )
+        (
+            arbitrage_moments,
+            mirroring_moments,
+            spread_floor_moments,
+            undercut_moments,
+        ) = self._calculate_environment_moments(data, price_columns, environment_column)
 
         # Calculate MEV moments (if applicable)
         mev_score, mev_patterns = self._calculate_mev_moments(data, price_columns)
@@ -145,6 +147,26 @@ class CryptoMomentCalculator:
         if len(data) < self.config.max_lag + 10:
             raise ValueError(f"Insufficient data: {len(data)} < {self.config.max_lag + 10}")
 
+    def _calculate_environment_moments(
+        self, data: pd.DataFrame, price_columns: List[str], environment_column: Optional[str]
+    ) -> Tuple[Dict[str, np.ndarray], ...]:
+        """Arbitrage, mirroring, dwell and undercut moments over one shared price matrix"""
+        environments = environment_matrices(data, price_columns, environment_column)
+        return (
+            self._calculate_arbitrage_timing_moments(
+                data, price_columns, environment_column, environments
+            ),
+            self._calculate_depth_weighted_mirroring_moments(
+                data, price_columns, environment_column, environments
+            ),
+            self._calculate_spread_floor_dwell_moments(
+                data, price_columns, environment_column, environments
+            ),
+            self._calculate_undercut_asymmetry_moments(
+                data, price_columns, environment_column, environments
+            ),
+        )
+
     def _calculate_lead_lag_moments(
         self, data: pd.DataFrame, price_columns: List[str]
     ) -> Tuple[np.ndarray, np.ndarray]:
@@ -152,44 +174,10 @@ class CryptoMomentCalculator:
         Calculate lead-lag beta coefficients between exchanges
 
         Returns:
-            Tuple of (betas, significance_p_values)
+            Tuple of (betas, significance_p_values), each (n, n, max_lag)
         """
-        n_exchanges = len(price_columns)
-        betas = np.zeros((n_exchanges, n_exchanges, self.config.max_lag))
-        significance = np.zeros((n_exchanges, n_exchanges, self.config.max_lag))
-
-        for i, lead_exchange in enumerate(price_columns):
-            for j, lag_exchange in enumerate(price_columns):
-                if i == j:
-                    continue
-
-                # Calculate lead-lag relationship
-                lead_prices = data[lead_exchange].values
-                lag_prices = data[lag_exchange].values
-
-                for lag in range(1, self.config.max_lag + 1):
-                    if len(lead_prices) <= lag:
-                        continue
-
-                    # Align time series
-                    lead_aligned = lead_prices[:-lag]
-                    lag_aligned = lag_prices[lag:]
-
-                    if len(lead_aligned) < 10:
-                        continue
-
-                    # Calculate correlation
-                    correlation, p_value = stats.pearsonr(lead_aligned, lag_aligned)
-
-                    # Calculate beta coefficient
-                    if np.std(lead_aligned) > 0:
-                        beta = correlation * (np.std(lag_aligned) / np.std(lead_aligned))
-                    else:
-                        beta = 0.0
-
-                    betas[i, j, lag - 1] = beta
-                    significance[i, j, lag - 1] = p_value
-
+        prices = PriceMatrix.from_frame(data, price_columns).prices
+        _, betas, significance = lagged_correlations(prices, self.config.max_lag)
         return betas, significance
 
     def _calculate_mirroring_moments(
@@ -199,38 +187,11 @@ class CryptoMomentCalculator:
         Calculate order book mirroring ratios between exchanges
 
         Returns:
-            Tuple of (mirroring_ratios, consistency_scores)
+            Tuple of (mirroring_ratios, consistency_scores); higher consistency
+            means a steadier rolling correlation
         """
-        n_exchanges = len(price_columns)
-        mirroring_ratios = np.zeros((n_exchanges, n_exchanges))
-        consistency_scores = np.zeros((n_exchanges, n_exchanges))
-
-        for i, exchange1 in enumerate(price_columns):
-            for j, exchange2 in enumerate(price_columns):
-                if i == j:
-                    continue
-
-                prices1 = data[exchange1].values
-                prices2 = data[exchange2].values
-
-                # Calculate rolling correlation
-                correlations = []
-                for t in range(self.config.mirroring_window, len(prices1)):
-                    window1 = prices1[t - self.config.mirroring_window : t]
-                    window2 = prices2[t - self.config.mirroring_window : t]
-
-                    if np.std(window1) > 0 and np.std(window2) > 0:
-                        corr, _ = stats.pearsonr(window1, window2)
-                        correlations.append(corr)
-
-                if correlations:
-                    mirroring_ratios[i, j] = np.mean(correlations)
-                    consistency_scores[i, j] = 1 - np.std(correlations)  # Higher = more consistent
-                else:
-                    mirroring_ratios[i, j] = 0.0
-                    consistency_scores[i, j] = 0.0
-
-        return mirroring_ratios, consistency_scores
+        prices = PriceMatrix.from_frame(data, price_columns).prices
+        return rolling_pair_correlations(prices, self.config.mirroring_window)
 
     def _calculate_spread_floor_moments(
         self, data: pd.DataFrame, price_columns: List[str]
@@ -241,42 +202,16 @@ class CryptoMomentCalculator:
         Returns:
             Tuple of (dwell_times, frequencies)
         """
-        n_exchanges = len(price_columns)
-        dwell_times = np.zeros(n_exchanges)
-        frequencies = np.zeros(n_exchanges)
-
-        for i, exchange in enumerate(price_columns):
-            prices = data[exchange].values
-
-            # Calculate spreads (simplified as price volatility)
-            spreads = np.abs(np.diff(prices))
-
-            # Identify spread floor periods
-            floor_threshold = self.config.spread_floor_threshold * np.mean(prices)
-            floor_periods = spreads < floor_threshold
-
-            # Calculate dwell times
-            current_dwell = 0
-            dwell_times_list = []
-
-            for is_floor in floor_periods:
-                if is_floor:
-                    current_dwell += 1
-                else:
-                    if current_dwell >= self.config.min_dwell_time:
-                        dwell_times_list.append(current_dwell)
-                    current_dwell = 0
-
-            # Handle case where period ends in floor
-            if current_dwell >= self.config.min_dwell_time:
-                dwell_times_list.append(current_dwell)
-
-            if dwell_times_list:
-                dwell_times[i] = np.mean(dwell_times_list)
-                frequencies[i] = len(dwell_times_list) / len(spreads)
-            else:
-                dwell_times[i] = 0.0
-                frequencies[i] = 0.0
+        matrix = PriceMatrix.from_frame(data, price_columns)
+
+        # Spreads (simplified as price volatility) below the floor threshold
+        spreads = np.abs(matrix.changes)
+        floor_threshold = self.config.spread_floor_threshold * matrix.prices.mean(axis=0)
+        floor_periods = spreads < floor_threshold
+
+        # Dwell episodes are floor runs of at least min_dwell_time steps
+        counts, dwell_times = run_statistics(floor_periods, self.config.min_dwell_time)
+        frequencies = counts / len(spreads)
 
         return dwell_times, frequencies
 
@@ -289,44 +224,15 @@ class CryptoMomentCalculator:
         Returns:
             Tuple of (initiation_rates, response_times)
         """
-        n_exchanges = len(price_columns)
-        initiation_rates = np.zeros(n_exchanges)
-        response_times = np.zeros(n_exchanges)
-
-        for i, exchange in enumerate(price_columns):
-            prices = data[exchange].values
-
-            # Calculate price changes
-            price_changes = np.diff(prices)
-
-            # Identify undercut events (significant price decreases)
-            undercut_threshold = -self.config.undercut_threshold * np.mean(prices)
-            undercut_events = price_changes < undercut_threshold
-
-            # Calculate initiation rate
-            initiation_rates[i] = np.sum(undercut_events) / len(price_changes)
-
-            # Calculate response times (time between undercut and recovery)
-            response_times_list = []
-            in_undercut = False
-            undercut_start = 0
-
-            for t, is_undercut in enumerate(undercut_events):
-                if is_undercut and not in_undercut:
-                    # Start of undercut
-                    in_undercut = True
-                    undercut_start = t
-                elif not is_undercut and in_undercut:
-                    # End of undercut
-                    in_undercut = False
-                    response_time = t - undercut_start
-                    if response_time > 0:
-                        response_times_list.append(response_time)
-
-            if response_times_list:
-                response_times[i] = np.mean(response_times_list)
-            else:
-                response_times[i] = 0.0
+        matrix = PriceMatrix.from_frame(data, price_columns)
+
+        # Undercut events are significant price decreases
+        undercut_threshold = -self.config.undercut_threshold * matrix.prices.mean(axis=0)
+        undercut_events = matrix.changes < undercut_threshold
+        initiation_rates = undercut_events.sum(axis=0) / len(matrix.changes)
+
+        # Response time is the length of an undercut run that recovered in-sample
+        _, response_times = run_statistics(undercut_events, closed_only=True)
 
         return initiation_rates, response_times
 
@@ -354,7 +260,11 @@ class CryptoMomentCalculator:
         return coordination_scores, interaction_patterns
 
     def _calculate_arbitrage_timing_moments(
-        self, data: pd.DataFrame, price_columns: List[str], environment_column: Optional[str] = None
+        self,
+        data: pd.DataFrame,
+        price_columns: List[str],
+        environment_column: Optional[str] = None,
+        environments: Optional[List[PriceMatrix]] = None,
     ) -> Dict[str, np.ndarray]:
         """
         Calculate latency-adjusted arbitrage timing moments (optimized)
@@ -362,38 +272,19 @@ class CryptoMomentCalculator:
         m^arb = E[min(τ_close, τ_max)/τ_max] per environment
         where τ_close = time to cross-venue price convergence after divergence > threshold
         """
-        len(price_columns)
-        tau_max = 50  # Reduced for performance
-        divergence_threshold = 0.001  # 0.1% price divergence threshold
-
-        # Simplified calculation for performance
-        if environment_column and environment_column in data.columns:
-            environments = data[environment_column].unique()
-            arbitrage_timing = np.zeros(len(environments))
-        else:
-            environments = ["default"]
-            arbitrage_timing = np.zeros(1)
+        if environments is None:
+            environments = environment_matrices(data, price_columns, environment_column)
+        arbitrage_timing = np.zeros(len(environments))
 
-        for env_idx, env in enumerate(environments):
-            if environment_column:
-                env_data = data[data[environment_column] == env]
-            else:
-                env_data = data
-
-            if len(env_data) < 10:
+        for env_idx, matrix in enumerate(environments):
+            if len(matrix) < 10:
                 continue
 
-            # Simplified arbitrage timing calculation
-            prices = env_data[price_columns].values
-
-            # Calculate price volatility as proxy for arbitrage timing
-            price_changes = np.diff(prices, axis=0)
-            volatility = np.mean(np.std(price_changes, axis=0))
+            # Price volatility as proxy for arbitrage timing
+            volatility = np.mean(matrix.change_std)
 
             # Normalize to [0,1] range
-            arbitrage_timing[env_idx] = min(
-                1.0, volatility / 100.0
-            )  # Scale by 100 for normalization
+            arbitrage_timing[env_idx] = min(1.0, volatility / 100.0)  # Scale by 100
 
         # Calculate environment invariance (variance across environments)
         if len(environments) > 1:
@@ -404,7 +295,11 @@ class CryptoMomentCalculator:
         return {"arbitrage_timing": arbitrage_timing, "arbitrage_invariance": arbitrage_invariance}
 
     def _calculate_depth_weighted_mirroring_moments(
-        self, data: pd.DataFrame, price_columns: List[str], environment_column: Optional[str] = None
+        self,
+        data: pd.DataFrame,
+        price_columns: List[str],
+        environment_column: Optional[str] = None,
+        environments: Optional[List[PriceMatrix]] = None,
     ) -> Dict[str, np.ndarray]:
         """
         Calculate depth-weighted order-book mirroring moments (optimized)
@@ -412,37 +307,22 @@ class CryptoMomentCalculator:
         Form top-k depth vectors D^(e)_k per venue, z-score, then cosine similarity
         Moment = env-mean similarity; include variance across envs as second moment
         """
-        n_exchanges = len(price_columns)
+        if environments is None:
+            environments = environment_matrices(data, price_columns, environment_column)
+        mirroring_similarity = np.zeros(len(environments))
+        iu, ju = np.triu_indices(len(price_columns), k=1)
 
-        if environment_column and environment_column in data.columns:
-            environments = data[environment_column].unique()
-            mirroring_similarity = np.zeros(len(environments))
-        else:
-            environments = ["default"]
-            mirroring_similarity = np.zeros(1)
-
-        for env_idx, env in enumerate(environments):
-            if environment_column:
-                env_data = data[data[environment_column] == env]
-            else:
-                env_data = data
-
-            if len(env_data) < 10:
+        for env_idx, matrix in enumerate(environments):
+            if len(matrix) < 10:
                 continue
 
-            # Simplified mirroring calculation using price correlations
-            prices = env_data[price_columns].values
-
-            # Calculate pairwise correlations
-            correlations = []
-            for i in range(n_exchanges):
-                for j in range(i + 1, n_exchanges):
-                    corr = np.corrcoef(prices[:, i], prices[:, j])[0, 1]
-                    if not np.isnan(corr):
-                        correlations.append(abs(corr))  # Use absolute correlation
+            # Simplified mirroring: mean absolute pairwise price correlation
+            with np.errstate(divide="ignore", invalid="ignore"):
+                correlations = np.abs(np.corrcoef(matrix.prices, rowvar=False)[iu, ju])
+            correlations = correlations[~np.isnan(correlations)]
 
             # Calculate environment mean similarity
-            if correlations:
+            if len(correlations):
                 mirroring_similarity[env_idx] = np.mean(correlations)
             else:
                 mirroring_similarity[env_idx] = 0.0
@@ -459,7 +339,11 @@ class CryptoMomentCalculator:
         }
 
     def _calculate_spread_floor_dwell_moments(
-        self, data: pd.DataFrame, price_columns: List[str], environment_column: Optional[str] = None
+        self,
+        data: pd.DataFrame,
+        price_columns: List[str],
+        environment_column: Optional[str] = None,
+        environments: Optional[List[PriceMatrix]] = None,
     ) -> Dict[str, np.ndarray]:
         """
         Calculate spread-floor dwell moments (optimized)
@@ -467,30 +351,16 @@ class CryptoMomentCalculator:
         From spread series s_t, indicator I_t = 1[s_t >= s_min]
         Moment = mean dwell probability and HMM-based dwell
         """
-        len(price_columns)
-
-        if environment_column and environment_column in data.columns:
-            environments = data[environment_column].unique()
-            dwell_probability = np.zeros(len(environments))
-        else:
-            environments = ["default"]
-            dwell_probability = np.zeros(1)
-
-        for env_idx, env in enumerate(environments):
-            if environment_column:
-                env_data = data[data[environment_column] == env]
-            else:
-                env_data = data
+        if environments is None:
+            environments = environment_matrices(data, price_columns, environment_column)
+        dwell_probability = np.zeros(len(environments))
 
-            if len(env_data) < 10:
+        for env_idx, matrix in enumerate(environments):
+            if len(matrix) < 10:
                 continue
 
-            # Simplified dwell calculation using price stability
-            prices = env_data[price_columns].values
-
-            # Calculate price stability as proxy for spread floor dwell
-            price_changes = np.abs(np.diff(prices, axis=0))
-            stability = 1.0 / (1.0 + np.mean(price_changes))  # Higher stability = lower changes
+            # Price stability as proxy for spread floor dwell
+            stability = 1.0 / (1.0 + np.mean(np.abs(matrix.changes)))
 
             dwell_probability[env_idx] = min(1.0, stability)
 
@@ -503,7 +373,11 @@ class CryptoMomentCalculator:
         return {"dwell_probability": dwell_probability, "dwell_invariance": dwell_invariance}
 
     def _calculate_undercut_asymmetry_moments(
-        self, data: pd.DataFrame, price_columns: List[str], environment_column: Optional[str] = None
+        self,
+        data: pd.DataFrame,
+        price_columns: List[str],
+        environment_column: Optional[str] = None,
+        environments: Optional[List[PriceMatrix]] = None,
     ) -> Dict[str, np.ndarray]:
         """
         Calculate undercut initiation asymmetry moments (optimized)
@@ -512,36 +386,17 @@ class CryptoMomentCalculator:
         and the Herfindahl of initiation shares
         """
         n_exchanges = len(price_columns)
+        if environments is None:
+            environments = environment_matrices(data, price_columns, environment_column)
+        initiation_asymmetry = np.zeros(len(environments))
+        herfindahl_concentration = np.zeros(len(environments))
 
-        if environment_column and environment_column in data.columns:
-            environments = data[environment_column].unique()
-            initiation_asymmetry = np.zeros(len(environments))
-            herfindahl_concentration = np.zeros(len(environments))
-        else:
-            environments = ["default"]
-            initiation_asymmetry = np.zeros(1)
-            herfindahl_concentration = np.zeros(1)
-
-        for env_idx, env in enumerate(environments):
-            if environment_column:
-                env_data = data[data[environment_column] == env]
-            else:
-                env_data = data
-
-            if len(env_data) < 10:
+        for env_idx, matrix in enumerate(environments):
+            if len(matrix) < 10:
                 continue
 
-            # Simplified undercut calculation using price volatility differences
-            prices = env_data[price_columns].values
-
-            # Calculate volatility for each exchange
-            volatilities = []
-            for i in range(n_exchanges):
-                price_changes = np.diff(prices[:, i])
-                vol = np.std(price_changes)
-                volatilities.append(vol)
-
-            volatilities = np.array(volatilities)
+            # Volatility of each exchange's price changes
+            volatilities = matrix.change_std
 
             # Calculate initiation asymmetry (max - min volatility)
             if len(volatilities) > 1:
@@ -586,18 +441,12 @@ class CryptoMomentCalculator:
         self._validate_input(data, price_columns)
 
         # Calculate base moments
-        arbitrage_moments = self._calculate_arbitrage_timing_moments(
-            data, price_columns, environment_column
-        )
-        mirroring_moments = self._calculate_depth_weighted_mirroring_moments(
-            data, price_columns, environment_column
-        )
-        spread_floor_moments = self._calculate_spread_floor_dwell_moments(
-            data, price_columns, environment_column
-        )
-        undercut_moments = self._calculate_undercut_asymmetry_moments(
-            data, price_columns, environment_column
-        )
+        (
+            arbitrage_moments,
+            mirroring_moments,
+            spread_floor_moments,
+            undercut_moments,
+        ) = self._calculate_environment_moments(data, price_columns, environment_column)
 
         # Create enhanced moment dictionary with invariance features
         enhanced_moments = {}
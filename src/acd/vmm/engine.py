@@ -11,7 +11,10 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import pandas as pd
 
+from .hac import newey_west_covariance, optimal_lag
+from .moment_cache import MomentCache
 from .provenance import VMMProvenance, create_provenance_data
+from .rolling import rolling_per_timestep_moments
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,9 @@ class VMMConfig:
     # Moment conditions
     moment_weights: Optional[Dict[str, float]] = None
 
+    # HAC covariance kernel: "bartlett", "parzen" or "quadratic_spectral"
+    hac_kernel: str = "bartlett"
+
     # Structural parameters
     beta_dim: int = 3
     sigma_prior: float = 0.1
@@ -65,8 +71,15 @@ class VMMEngine:
     in crypto markets.
     """
 
-    def __init__(self, config: VMMConfig, crypto_calculator=None):
+    def __init__(
+        self,
+        config: VMMConfig,
+        crypto_calculator=None,
+        rng: Optional[np.random.Generator] = None,
+    ):
         self.config = config
+        # Random draws come from this generator; None keeps the global numpy RNG
+        self._rng = rng if rng is not None else np.random
         self.crypto_calculator = crypto_calculator
         self._current_data = None
         self._current_environment_column = None
@@ -74,6 +87,7 @@ class VMMEngine:
         self._weight_matrix_fitted = False
         self._provenance_manager = VMMProvenance()
         self._current_seed = None
+        self._moment_cache = MomentCache()
 
     def run_vmm(
         self,
@@ -102,6 +116,10 @@ class VMMEngine:
         self._current_environment_column = environment_column
         self._current_seed = seed
 
+        # Data-dependent moments are computed once per run and reused across iterations
+        self._moment_cache.reset()
+        self._moment_cache.reset_stats()
+
         # Check for existing provenance if seed is provided
         if seed is not None and self._provenance_manager.provenance_exists(seed):
             logger.info(f"Loading existing VMM provenance for seed {seed}")
@@ -126,7 +144,7 @@ class VMMEngine:
 
         # Initialize parameters
         beta_dim = self.config.beta_dim
-        beta_estimates = np.random.normal(0, 0.1, beta_dim)
+        beta_estimates = self._rng.normal(0, 0.1, beta_dim)
         sigma_estimates = np.eye(beta_dim) * self.config.sigma_prior
         rho_estimates = np.eye(beta_dim) * self.config.rho_prior
 
@@ -146,6 +164,12 @@ class VMMEngine:
         # Calculate over-identification test
         over_id_stat, over_id_p_value = self._calculate_over_identification(prices, beta_estimates)
 
+        cache_stats = self._moment_cache.stats()
+        logger.info(
+            f"Moment cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"(hit rate {cache_stats['hit_rate'] or 0.0:.3f})"
+        )
+
         return VMMOutput(
             convergence_status=convergence_status,
             iterations=iterations,
@@ -159,6 +183,10 @@ class VMMEngine:
             over_identification_p_value=over_id_p_value,
         )
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Profiling counters for the moment cache (hits, misses, hit rate)"""
+        return self._moment_cache.stats()
+
     def _validate_input(self, data: pd.DataFrame, price_columns: List[str]) -> None:
         """Validate input data"""
         if len(price_columns) < 2:
@@ -222,15 +250,20 @@ class VMMEngine:
                     col for col in self._current_data.columns if col.startswith("Exchange_")
                 ]
 
-                # Use enhanced moment calculation with environment columns
+                # Use enhanced moment calculation with environment columns.
+                # The combined vector does not depend on beta, so it is cached per data.
                 try:
-                    moment_vector = self.crypto_calculator.get_combined_moment_vector(
+                    moment_vector = self._moment_cache.get_or_compute(
                         self._current_data,
-                        price_columns,
-                        environment_column=self._current_environment_column,
-                        fit_scaler=False,
+                        ("combined_moment_vector", self._current_environment_column),
+                        lambda: self.crypto_calculator.get_combined_moment_vector(
+                            self._current_data,
+                            price_columns,
+                            environment_column=self._current_environment_column,
+                            fit_scaler=False,
+                        ),
                     )
-                    return moment_vector
+                    return np.array(moment_vector, copy=True)
                 except Exception as e:
                     logger.warning(
                         f"Enhanced moment calculation failed: {e}, falling back to basic calculation"
@@ -239,86 +272,87 @@ class VMMEngine:
             # Fallback: create DataFrame from prices array
             n_exchanges = prices.shape[1]
             price_columns = [f"Exchange_{i}" for i in range(n_exchanges)]
-            data = pd.DataFrame(prices, columns=price_columns)
 
             # Use basic crypto moment calculation
             try:
-                crypto_moments = self.crypto_calculator.calculate_moments(data, price_columns)
-
-                # Extract normalized moments
-                moments = []
-
-                # Arbitrage timing moments
-                moments.extend(crypto_moments.lead_lag_betas.flatten())
-                moments.extend(crypto_moments.lead_lag_significance.flatten())
-
-                # Mirroring moments
-                moments.extend(crypto_moments.mirroring_ratios.flatten())
-                moments.extend(crypto_moments.mirroring_consistency.flatten())
-
-                # Spread floor moments
-                moments.extend(crypto_moments.spread_floor_dwell_times.flatten())
-                moments.extend(crypto_moments.spread_floor_frequency.flatten())
-
-                # Undercut moments
-                moments.extend(crypto_moments.undercut_initiation_rate.flatten())
-                moments.extend(crypto_moments.undercut_response_time.flatten())
-
-                return np.array(moments)
+                return self._moment_cache.get_or_compute(
+                    prices,
+                    ("basic_crypto_moments",),
+                    lambda: self._extract_basic_crypto_moments(
+                        pd.DataFrame(prices, columns=price_columns), price_columns
+                    ),
+                ).copy()
             except Exception as e:
                 logger.warning(
                     f"Crypto moment calculation failed: {e}, falling back to basic calculation"
                 )
 
                 # Fallback to basic crypto moments
-                crypto_moments = self.crypto_calculator.calculate_moments(data, price_columns)
+                data = pd.DataFrame(prices, columns=price_columns)
+                return self._extract_basic_crypto_moments(data, price_columns)
 
-                # Extract normalized moments
-                moments = []
+        else:
+            # Fallback to simplified moment conditions: only the expected values depend
+            # on beta, the sample statistics are cached per data
+            correlations, price_levels, volatilities = self._moment_cache.get_or_compute(
+                prices, ("price_statistics",), lambda: self._calculate_price_statistics(prices)
+            )
 
-                # Arbitrage timing moments
-                moments.extend(crypto_moments.lead_lag_betas.flatten())
-                moments.extend(crypto_moments.lead_lag_significance.flatten())
+            expected_corr = beta[0] if len(beta) > 0 else 0.5
+            expected_level = beta[1] if len(beta) > 1 else 50000.0
+            expected_vol = beta[2] if len(beta) > 2 else 0.02
 
-                # Mirroring moments
-                moments.extend(crypto_moments.mirroring_ratios.flatten())
-                moments.extend(crypto_moments.mirroring_consistency.flatten())
+            return np.concatenate(
+                [
+                    correlations - expected_corr,  # Cross-exchange correlation moments
+                    price_levels - expected_level,  # Price level moments
+                    volatilities - expected_vol,  # Volatility moments
+                ]
+            )
 
-                # Spread floor moments
-                moments.extend(crypto_moments.spread_floor_dwell_times.flatten())
-                moments.extend(crypto_moments.spread_floor_frequency.flatten())
+    def _extract_basic_crypto_moments(
+        self, data: pd.DataFrame, price_columns: List[str]
+    ) -> np.ndarray:
+        """Flatten basic crypto moments into a single moment vector"""
+        crypto_moments = self.crypto_calculator.calculate_moments(data, price_columns)
 
-                # Undercut moments
-                moments.extend(crypto_moments.undercut_initiation_rate.flatten())
-                moments.extend(crypto_moments.undercut_response_time.flatten())
+        moments = []
 
-                return np.array(moments)
+        # Arbitrage timing moments
+        moments.extend(crypto_moments.lead_lag_betas.flatten())
+        moments.extend(crypto_moments.lead_lag_significance.flatten())
 
-        else:
-            # Fallback to simplified moment conditions
-            n_exchanges = prices.shape[1]
-            moments = []
+        # Mirroring moments
+        moments.extend(crypto_moments.mirroring_ratios.flatten())
+        moments.extend(crypto_moments.mirroring_consistency.flatten())
 
-            # Cross-exchange correlation moments
-            for i in range(n_exchanges):
-                for j in range(i + 1, n_exchanges):
-                    corr = np.corrcoef(prices[:, i], prices[:, j])[0, 1]
-                    expected_corr = beta[0] if len(beta) > 0 else 0.5
-                    moments.append(corr - expected_corr)
+        # Spread floor moments
+        moments.extend(crypto_moments.spread_floor_dwell_times.flatten())
+        moments.extend(crypto_moments.spread_floor_frequency.flatten())
 
-            # Price level moments
-            for i in range(n_exchanges):
-                price_level = np.mean(prices[:, i])
-                expected_level = beta[1] if len(beta) > 1 else 50000.0
-                moments.append(price_level - expected_level)
+        # Undercut moments
+        moments.extend(crypto_moments.undercut_initiation_rate.flatten())
+        moments.extend(crypto_moments.undercut_response_time.flatten())
 
-            # Volatility moments
-            for i in range(n_exchanges):
-                volatility = np.std(np.diff(prices[:, i]))
-                expected_vol = beta[2] if len(beta) > 2 else 0.02
-                moments.append(volatility - expected_vol)
+        return np.array(moments)
+
+    def _calculate_price_statistics(
+        self, prices: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Beta-independent statistics behind the simplified moment conditions"""
+        n_exchanges = prices.shape[1]
+
+        # Cross-exchange correlations (i < j)
+        correlations = []
+        for i in range(n_exchanges):
+            for j in range(i + 1, n_exchanges):
+                correlations.append(np.corrcoef(prices[:, i], prices[:, j])[0, 1])
 
-            return np.array(moments)
+        # Price levels and return volatilities
+        price_levels = np.mean(prices, axis=0)
+        volatilities = np.std(np.diff(prices, axis=0), axis=0)
+
+        return np.array(correlations, dtype=float), price_levels, volatilities
 
     def _calculate_gradients(
         self, prices: np.ndarray, beta: np.ndarray, moments: np.ndarray
@@ -537,41 +571,40 @@ class VMMEngine:
     ) -> np.ndarray:
         """Get per-timestep moment matrix M ∈ R^(N×k) with proper time variation"""
 
-        prices = data[price_columns].values
-        N = len(prices)
-        prices.shape[1]
-
-        # Define moment components (k0 ≈ 6-12 depending on pairs)
-        moment_components = []
-
-        # 1. Latency-adjusted arbitrage timing (per t)
-        arbitrage_moments = self._calculate_arbitrage_timing_per_timestep(prices)
-        moment_components.append(arbitrage_moments)
-
-        # 2. Depth-weighted mirroring (per t) - using price correlations as proxy
-        mirroring_moments = self._calculate_mirroring_per_timestep(prices)
-        moment_components.append(mirroring_moments)
+        return self._moment_cache.get_or_compute(
+            data,
+            ("per_timestep_moments", tuple(price_columns)),
+            lambda: self._compute_per_timestep_moments(data, price_columns),
+        )
 
-        # 3. Spread-floor indicator (per t)
-        spread_floor_moments = self._calculate_spread_floor_per_timestep(prices)
-        moment_components.append(spread_floor_moments)
+    def _compute_per_timestep_moments(
+        self, data: pd.DataFrame, price_columns: List[str]
+    ) -> np.ndarray:
+        """Compute the per-timestep moment matrix (uncached)"""
 
-        # 4. Undercut initiation (per t) - using price volatility as proxy
-        undercut_moments = self._calculate_undercut_per_timestep(prices)
-        moment_components.append(undercut_moments)
+        prices = data[price_columns].values
+        N = len(prices)
 
-        # Stack all moment components
-        moment_matrix = np.column_stack(moment_components)
+        # Moment components, evaluated for all timesteps in one vectorized pass:
+        # 1. Latency-adjusted arbitrage timing
+        # 2. Depth-weighted mirroring (price correlations as proxy)
+        # 3. Spread-floor indicator
+        # 4. Undercut initiation (return-correlation leadership as proxy)
+        # The per-timestep loop helpers below remain as reference implementations.
+        moment_matrix = rolling_per_timestep_moments(prices)
 
         # Ensure no constant columns (degeneracy check)
         for j in range(moment_matrix.shape[1]):
             if np.std(moment_matrix[:, j]) == 0:
                 logger.warning(f"Column {j} is constant, adding small noise")
-                moment_matrix[:, j] += np.random.normal(0, 1e-6, N)
+                moment_matrix[:, j] += self._rng.normal(0, 1e-6, N)
 
         logger.info(f"Per-timestep moment matrix shape: {moment_matrix.shape}")
         logger.info(f"Column variances: {np.var(moment_matrix, axis=0)}")
 
+        # Shared through the moment cache, so guard against in-place modification
+        moment_matrix.flags.writeable = False
+
         return moment_matrix
 
     def _calculate_arbitrage_timing_per_timestep(self, prices: np.ndarray) -> np.ndarray:
@@ -711,40 +744,16 @@ class VMMEngine:
         return undercut_moments
 
     def _estimate_hac_covariance(self, moment_matrix: np.ndarray, g_bar: np.ndarray) -> np.ndarray:
-        """Estimate HAC covariance using Newey-West with Bartlett weights"""
-
-        N, k = moment_matrix.shape
-        L = self._get_optimal_lag(N)
-
-        # Compute autocovariance matrices
-        Gamma = np.zeros((L + 1, k, k))
-
-        for l in range(L + 1):
-            if l == 0:
-                # Γ₀ = (1/N) Σ_t (m_t - ḡ)(m_t - ḡ)ᵀ
-                deviations = moment_matrix - g_bar
-                Gamma[l] = np.mean([np.outer(d, d) for d in deviations], axis=0)
-            else:
-                # Γ_l = (1/N) Σ_{t=l+1}^N (m_t - ḡ)(m_{t-l} - ḡ)ᵀ
-                if N > l:
-                    deviations_t = moment_matrix[l:] - g_bar
-                    deviations_t_lag = moment_matrix[:-l] - g_bar
-                    Gamma[l] = np.mean(
-                        [np.outer(d1, d2) for d1, d2 in zip(deviations_t, deviations_t_lag)], axis=0
-                    )
-
-        # Newey-West estimator with Bartlett weights
-        S_hat = Gamma[0].copy()
-        for l in range(1, L + 1):
-            weight = 1 - l / (L + 1)  # Bartlett weights
-            S_hat += weight * (Gamma[l] + Gamma[l].T)
+        """Estimate HAC covariance using Newey-West with the configured kernel weights"""
 
-        return S_hat
+        N = len(moment_matrix)
+        return newey_west_covariance(
+            moment_matrix, g_bar, lag=self._get_optimal_lag(N), kernel=self.config.hac_kernel
+        )
 
     def _get_optimal_lag(self, N: int) -> int:
         """Get optimal lag for HAC estimation using Andrews formula"""
-        # L ≈ ⌊4(N/100)^(2/9)⌋
-        return max(1, int(4 * (N / 100) ** (2 / 9)))
+        return optimal_lag(N)
 
     def _apply_ridge_regularization(self, S: np.ndarray) -> np.ndarray:
         """Apply ridge regularization using eigenvalue floor approach"""
@@ -852,9 +861,16 @@ class VMMEngine:
                 logger.error(f"Dimension mismatch: W.shape={W.shape}, k={k}")
                 return 0.0, 1.0
         else:
-            # Fallback: use identity matrix
-            W = np.eye(k)
-            logger.warning("No global weight matrix available, using identity weighting")
+            # Fallback: efficient weighting from the HAC covariance of these moments
+            S_hat = self._apply_ridge_regularization(
+                self._estimate_hac_covariance(moment_matrix_scaled, g_bar)
+            )
+            try:
+                W = np.linalg.inv(S_hat)
+                logger.warning("No global weight matrix available, using HAC weighting")
+            except np.linalg.LinAlgError:
+                W = np.eye(k)
+                logger.warning("No global weight matrix available, using identity weighting")
 
         # Proper GMM Hansen's J-statistic: J = N * ḡ' * W * ḡ
         j_stat = N * np.dot(g_bar, np.dot(W, g_bar))
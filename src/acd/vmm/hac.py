@@ -0,0 +1,302 @@
+"""
+HAC Covariance Estimation
+
+Newey-West style heteroskedasticity and autocorrelation consistent (HAC)
+long-run covariance estimates for VMM moment matrices. All autocovariances
+are computed with single matrix products (or one FFT for long lag sweeps),
+and an incremental estimator updates S as new moment rows arrive.
+"""
+
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+# Above this many lags the autocovariances are computed through one FFT
+FFT_LAG_THRESHOLD = 64
+
+
+def optimal_lag(n_obs: int) -> int:
+    """Andrews-style lag truncation L ≈ ⌊4(N/100)^(2/9)⌋"""
+    return max(1, int(4 * (n_obs / 100) ** (2 / 9)))
+
+
+def bartlett_kernel(x: np.ndarray) -> np.ndarray:
+    """Bartlett (triangular) kernel"""
+    x = np.abs(x)
+    return np.where(x <= 1.0, 1.0 - x, 0.0)
+
+
+def parzen_kernel(x: np.ndarray) -> np.ndarray:
+    """Parzen kernel"""
+    x = np.abs(x)
+    inner = 1.0 - 6.0 * x**2 + 6.0 * x**3
+    outer = 2.0 * (1.0 - x) ** 3
+    return np.where(x <= 0.5, inner, np.where(x <= 1.0, outer, 0.0))
+
+
+def quadratic_spectral_kernel(x: np.ndarray) -> np.ndarray:
+    """Quadratic-spectral (Andrews 1991) kernel"""
+    x = np.abs(np.asarray(x, dtype=float))
+    z = 6.0 * np.pi * x / 5.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = 25.0 / (12.0 * np.pi**2 * x**2) * (np.sin(z) / z - np.cos(z))
+    return np.where(x == 0, 1.0, weights)
+
+
+KERNELS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "bartlett": bartlett_kernel,
+    "parzen": parzen_kernel,
+    "quadratic_spectral": quadratic_spectral_kernel,
+}
+
+
+def kernel_weights(kernel: str, lag: int, n_lags: Optional[int] = None) -> np.ndarray:
+    """
+    Weights w_0..w_{n_lags} for a HAC kernel with bandwidth lag + 1
+
+    Bartlett weights reduce to the Newey-West 1 - l / (L + 1). Truncated
+    kernels (Bartlett, Parzen) are zero beyond lag L; the quadratic-spectral
+    kernel has unbounded support, so ``n_lags`` controls how many are kept.
+
+    Args:
+        kernel: One of "bartlett", "parzen", "quadratic_spectral"
+        lag: Lag truncation / bandwidth parameter L
+        n_lags: Largest lag to return weights for (defaults to L)
+
+    Returns:
+        Array of n_lags + 1 weights
+    """
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown HAC kernel '{kernel}', expected one of {sorted(KERNELS)}")
+    if lag < 0:
+        raise ValueError("lag must be non-negative")
+
+    n_lags = lag if n_lags is None else n_lags
+    lags = np.arange(n_lags + 1, dtype=float)
+    return KERNELS[kernel](lags / (lag + 1))
+
+
+def autocovariances(deviations: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Sample autocovariance matrices Γ_0..Γ_L of demeaned moments
+
+    Γ_l = (1/N) Σ_{t=l}^{N-1} d_t d_{t-l}ᵀ, computed as D[l:]ᵀ D[:-l] / N.
+
+    Args:
+        deviations: Demeaned moment matrix D of shape (N, k)
+        max_lag: Largest lag L
+
+    Returns:
+        Array of shape (L + 1, k, k)
+    """
+    deviations = np.asarray(deviations, dtype=np.float64)
+    N, k = deviations.shape
+    gamma = np.zeros((max_lag + 1, k, k))
+    if N == 0:
+        return gamma
+
+    usable = min(max_lag, N - 1)
+    if usable > FFT_LAG_THRESHOLD:
+        gamma[: usable + 1] = _autocovariances_fft(deviations, usable)
+        return gamma
+
+    gamma[0] = deviations.T @ deviations / N
+    for lag in range(1, usable + 1):
+        gamma[lag] = deviations[lag:].T @ deviations[:-lag] / N
+    return gamma
+
+
+def _autocovariances_fft(deviations: np.ndarray, max_lag: int) -> np.ndarray:
+    """All cross-covariances up to max_lag from one zero-padded FFT"""
+    N, k = deviations.shape
+    n_fft = 1 << int(np.ceil(np.log2(2 * N - 1)))
+    spectrum = np.fft.rfft(deviations, n=n_fft, axis=0)
+    # cross[l, i, j] = Σ_t d_{t+l, i} d_{t, j}
+    cross = np.fft.irfft(spectrum[:, :, None] * np.conj(spectrum[:, None, :]), n=n_fft, axis=0)
+    return cross[: max_lag + 1] / N
+
+
+def long_run_covariance(gamma: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """S = w_0 Γ_0 + Σ_{l≥1} w_l (Γ_l + Γ_lᵀ)"""
+    n_lags = min(len(weights), len(gamma)) - 1
+    weighted = np.tensordot(weights[1 : n_lags + 1], gamma[1 : n_lags + 1], axes=1)
+    return weights[0] * gamma[0] + weighted + weighted.T
+
+
+def newey_west_covariance(
+    moment_matrix: np.ndarray,
+    g_bar: Optional[np.ndarray] = None,
+    lag: Optional[int] = None,
+    kernel: str = "bartlett",
+) -> np.ndarray:
+    """
+    Kernel-weighted HAC estimate of the long-run moment covariance S
+
+    Args:
+        moment_matrix: Per-timestep moments of shape (N, k)
+        g_bar: Sample mean to center on (defaults to the column means)
+        lag: Lag truncation / bandwidth (defaults to ``optimal_lag(N)``)
+        kernel: "bartlett", "parzen" or "quadratic_spectral"
+
+    Returns:
+        HAC covariance matrix of shape (k, k)
+    """
+    moment_matrix = np.asarray(moment_matrix, dtype=np.float64)
+    N = len(moment_matrix)
+    if g_bar is None:
+        g_bar = moment_matrix.mean(axis=0)
+    if lag is None:
+        lag = optimal_lag(N)
+
+    # The quadratic-spectral kernel is not truncated: use every available lag
+    n_lags = max(N - 1, 0) if kernel == "quadratic_spectral" else lag
+    weights = kernel_weights(kernel, lag, n_lags)
+    gamma = autocovariances(moment_matrix - g_bar, n_lags)
+
+    return long_run_covariance(gamma, weights)
+
+
+class IncrementalHAC:
+    """
+    Incrementally updated HAC covariance for a fixed lag window
+
+    Keeps raw lagged cross-product sums Σ m_t m_{t-l}ᵀ plus the head/tail rows
+    needed to re-center them, so each appended row costs O(L k²) and the
+    current S is available at any time in O(L k²). For truncated kernels the
+    result equals ``newey_west_covariance`` on all rows seen so far.
+    """
+
+    def __init__(self, n_moments: int, lag: int, kernel: str = "bartlett"):
+        if kernel == "quadratic_spectral":
+            raise ValueError("IncrementalHAC requires a truncated kernel (bartlett or parzen)")
+
+        self.n_moments = n_moments
+        self.lag = lag
+        self.kernel = kernel
+        self.weights = kernel_weights(kernel, lag)
+
+        self.n_obs = 0
+        self._total = np.zeros(n_moments)
+        self._cross = np.zeros((lag + 1, n_moments, n_moments))
+        self._head = np.zeros((0, n_moments))
+        self._tail = np.zeros((0, n_moments))
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Running sample mean ḡ"""
+        if self.n_obs == 0:
+            return np.zeros(self.n_moments)
+        return self._total / self.n_obs
+
+    def update(self, rows: np.ndarray) -> None:
+        """
+        Append new moment rows
+
+        Args:
+            rows: Array of shape (b, k) or a single row of shape (k,)
+        """
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        if rows.shape[1] != self.n_moments:
+            raise ValueError(f"Expected {self.n_moments} moment columns, got {rows.shape[1]}")
+        if len(rows) == 0:
+            return
+
+        # Prepend the previous tail so lagged products straddle the boundary
+        stacked = np.vstack([self._tail, rows])
+        n_prev = len(self._tail)
+        n_stacked = len(stacked)
+
+        for lag in range(self.lag + 1):
+            start = max(n_prev, lag)
+            if start < n_stacked:
+                self._cross[lag] += stacked[start:].T @ stacked[start - lag : n_stacked - lag]
+
+        self._total += rows.sum(axis=0)
+        self.n_obs += len(rows)
+        if len(self._head) < self.lag:
+            self._head = np.vstack([self._head, rows[: self.lag - len(self._head)]])
+        self._tail = stacked[-self.lag :] if self.lag > 0 else stacked[:0]
+
+    def autocovariances(self) -> np.ndarray:
+        """Centered autocovariances Γ_0..Γ_L of all rows seen so far"""
+        N = self.n_obs
+        gamma = np.zeros_like(self._cross)
+        if N == 0:
+            return gamma
+
+        g_bar = self.mean
+        for lag in range(min(self.lag, N - 1) + 1):
+            # Σ_{t≥l} m_t and Σ_{t<N-l} m_t
+            leading = self._total - self._head[:lag].sum(axis=0)
+            lagging = self._total - self._tail[len(self._tail) - lag :].sum(axis=0)
+            centered = (
+                self._cross[lag]
+                - np.outer(leading, g_bar)
+                - np.outer(g_bar, lagging)
+                + (N - lag) * np.outer(g_bar, g_bar)
+            )
+            gamma[lag] = centered / N
+        return gamma
+
+    def covariance(self) -> np.ndarray:
+        """Current HAC covariance estimate S"""
+        return long_run_covariance(self.autocovariances(), self.weights)
+
+
+class ExponentiallyWeightedHAC:
+    """
+    Exponentially weighted HAC covariance for streaming moments
+
+    Each new row m_t is centered on the running EW mean and folded into the
+    lagged autocovariances as Γ_l ← λ Γ_l + (1 - λ) d_t d_{t-l}ᵀ, so an update
+    costs O(L k²) regardless of how many rows have been seen.
+    """
+
+    def __init__(self, n_moments: int, lag: int, decay: float = 0.995, kernel: str = "bartlett"):
+        if not 0.0 < decay < 1.0:
+            raise ValueError("decay must be in (0, 1)")
+        if kernel == "quadratic_spectral":
+            raise ValueError("ExponentiallyWeightedHAC requires a truncated kernel")
+
+        self.n_moments = n_moments
+        self.lag = lag
+        self.decay = decay
+        self.weights = kernel_weights(kernel, lag)
+
+        self.n_obs = 0
+        self.mean = np.zeros(n_moments)
+        self._gamma = np.zeros((lag + 1, n_moments, n_moments))
+        self._recent = np.zeros((0, n_moments))
+
+    def initialize(self, moment_matrix: np.ndarray) -> None:
+        """Seed the estimator from a batch of warm-up moment rows"""
+        moment_matrix = np.asarray(moment_matrix, dtype=np.float64)
+        self.mean = moment_matrix.mean(axis=0)
+        deviations = moment_matrix - self.mean
+        self._gamma = autocovariances(deviations, self.lag)
+        self._recent = deviations[len(deviations) - self.lag :] if self.lag > 0 else deviations[:0]
+        self.n_obs = len(moment_matrix)
+
+    def update(self, rows: np.ndarray) -> None:
+        """Fold new moment rows (shape (b, k) or (k,)) into the estimate"""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        decay = self.decay
+
+        for row in rows:
+            self.mean = decay * self.mean + (1 - decay) * row
+            deviation = row - self.mean
+
+            self._gamma[0] = decay * self._gamma[0] + (1 - decay) * np.outer(deviation, deviation)
+            # _recent holds d_{t-L} .. d_{t-1}, most recent last
+            for lag in range(1, min(self.lag, len(self._recent)) + 1):
+                self._gamma[lag] = decay * self._gamma[lag] + (1 - decay) * np.outer(
+                    deviation, self._recent[-lag]
+                )
+
+            if self.lag > 0:
+                self._recent = np.vstack([self._recent, deviation])[-self.lag :]
+            self.n_obs += 1
+
+    def covariance(self) -> np.ndarray:
+        """Current HAC covariance estimate S"""
+        return long_run_covariance(self._gamma, self.weights)
@@ -0,0 +1,121 @@
+"""
+VMM Moment Cache
+
+Data-fingerprinted cache for the beta-independent parts of the VMM moment
+conditions, so the optimization loop only recomputes beta-dependent residuals.
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def fingerprint_data(data: Any) -> str:
+    """
+    Compute a content fingerprint for a DataFrame or array
+
+    Args:
+        data: pandas DataFrame/Series or numpy array
+
+    Returns:
+        Hex digest identifying the data contents
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        labels = data.columns if isinstance(data, pd.DataFrame) else [data.name]
+        hasher.update(repr(list(labels)).encode())
+        hasher.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    else:
+        array = np.ascontiguousarray(data)
+        hasher.update(f"{array.dtype.str}{array.shape}".encode())
+        hasher.update(array.tobytes())
+
+    return hasher.hexdigest()
+
+
+class MomentCache:
+    """
+    Cache of data-dependent moment quantities keyed by data fingerprint
+
+    Fingerprints are memoized by object identity, so repeated lookups against
+    the same DataFrame or array cost O(1). The memo keeps only the
+    ``max_fingerprints`` most recently seen objects alive. Call ``reset``
+    whenever the caller may have mutated previously seen objects in place.
+    """
+
+    def __init__(self, max_fingerprints: int = 4):
+        self.max_fingerprints = max_fingerprints
+        self._entries: Dict[str, Dict[Hashable, Any]] = {}
+        self._identity_memo: Dict[int, Tuple[Any, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, data: Any) -> str:
+        """Return the (identity-memoized) fingerprint of ``data``"""
+        memo = self._identity_memo.get(id(data))
+        if memo is not None and memo[0] is data:
+            return memo[1]
+
+        fingerprint = fingerprint_data(data)
+        self._identity_memo.pop(id(data), None)
+        while len(self._identity_memo) >= max(1, self.max_fingerprints):
+            # Evict the oldest memo so dropped objects are not kept alive
+            self._identity_memo.pop(next(iter(self._identity_memo)))
+        self._identity_memo[id(data)] = (data, fingerprint)
+        return fingerprint
+
+    def get_or_compute(self, data: Any, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for (fingerprint(data), key), computing it on a miss
+
+        Args:
+            data: Object whose contents the cached value depends on
+            key: Name (and any extra parameters) of the cached quantity
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            Cached or freshly computed value
+        """
+        fingerprint = self.fingerprint(data)
+        entries = self._entries.get(fingerprint)
+
+        if entries is not None and key in entries:
+            self.hits += 1
+            return entries[key]
+
+        self.misses += 1
+        value = compute()
+
+        if entries is None:
+            if len(self._entries) >= self.max_fingerprints:
+                # Evict the oldest fingerprint
+                self._entries.pop(next(iter(self._entries)))
+            entries = self._entries[fingerprint] = {}
+        entries[key] = value
+
+        return value
+
+    def reset(self) -> None:
+        """Drop cached values and identity memos (counters are kept)"""
+        self._entries.clear()
+        self._identity_memo.clear()
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss counters"""
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Profiling counters for the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "lookups": lookups,
+            "hit_rate": self.hits / lookups if lookups > 0 else None,
+            "fingerprints": len(self._entries),
+            "memoized_objects": len(self._identity_memo),
+        }
@@ -9,6 +9,8 @@ from typing import Any, Dict
 
 import yaml
 
+from .engine import VMMConfig as EngineConfig
+
 
 @dataclass
 class VMMConfig:
@@ -74,6 +76,15 @@ def load_config_from_yaml(config_path: str) -> VMMConfig:
     )
 
 
+def to_engine_config(config: VMMConfig) -> EngineConfig:
+    """Engine settings (iterations, tolerance, step size) for a monitoring profile"""
+    return EngineConfig(
+        max_iterations=config.max_iters,
+        convergence_tolerance=config.tol,
+        learning_rate=config.step_initial,
+    )
+
+
 def get_acceptance_profile(profile_name: str = "vmm_primary") -> Dict[str, Any]:
     """Get acceptance criteria for VMM profiles"""
 
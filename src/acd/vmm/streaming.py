@@ -0,0 +1,359 @@
+"""
+Streaming VMM Engine
+
+Online VMM mode for continuous monitoring. A warm-up batch fits the moment
+stabilizer once; afterwards every appended bar updates
+rolling price sums, an exponentially weighted HAC estimate and a warm-started
+beta in time independent of the history length.
+"""
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from .engine import VMMConfig, VMMEngine, VMMOutput
+from .hac import ExponentiallyWeightedHAC
+from .rolling import default_window_size, rolling_per_timestep_moments
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamingVMMConfig:
+    """Configuration for streaming VMM updates"""
+
+    # Rolling window (in bars) for price moment sums; None = expanding window
+    lookback: Optional[int] = None
+
+    # Exponential decay of the HAC autocovariance estimate
+    hac_decay: float = 0.995
+
+    # Gradient steps per update, warm-started from the previous beta
+    iterations_per_update: int = 50
+
+    # Seed for the initial beta draw
+    seed: Optional[int] = None
+
+
+class RollingPriceSums:
+    """
+    Running sums behind the simplified VMM moment conditions
+
+    Tracks Σx, Σxxᵀ of prices and Σr, Σr² of returns over a rolling window
+    (or expanding when ``lookback`` is None). Prices are shifted by the first
+    observation to keep the second-moment sums well conditioned.
+    """
+
+    def __init__(self, n_venues: int, lookback: Optional[int] = None):
+        if lookback is not None and lookback < 2:
+            raise ValueError("lookback must be at least 2 bars")
+
+        self.n_venues = n_venues
+        self.lookback = lookback
+        self._reference: Optional[np.ndarray] = None
+        self._last_price: Optional[np.ndarray] = None
+
+        self.n_prices = 0
+        self.n_returns = 0
+        self._price_sum = np.zeros(n_venues)
+        self._price_cross = np.zeros((n_venues, n_venues))
+        self._return_sum = np.zeros(n_venues)
+        self._return_sq = np.zeros(n_venues)
+
+        self._price_rows: deque = deque()
+        self._return_rows: deque = deque()
+
+    def add(self, prices: np.ndarray) -> None:
+        """Append a block of price rows of shape (b, n_venues)"""
+        prices = np.atleast_2d(np.asarray(prices, dtype=np.float64))
+        if len(prices) == 0:
+            return
+        if self._reference is None:
+            self._reference = prices[0].copy()
+
+        shifted = prices - self._reference
+        if self._last_price is not None:
+            returns = np.diff(np.vstack([self._last_price, shifted]), axis=0)
+        else:
+            returns = np.diff(shifted, axis=0)
+        self._last_price = shifted[-1].copy()
+
+        self._price_sum += shifted.sum(axis=0)
+        self._price_cross += shifted.T @ shifted
+        self.n_prices += len(shifted)
+        self._return_sum += returns.sum(axis=0)
+        self._return_sq += np.sum(returns**2, axis=0)
+        self.n_returns += len(returns)
+
+        if self.lookback is not None:
+            self._price_rows.extend(shifted)
+            self._return_rows.extend(returns)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Subtract rows that have left the rolling window"""
+        n_old_prices = len(self._price_rows) - self.lookback
+        if n_old_prices > 0:
+            old = np.array([self._price_rows.popleft() for _ in range(n_old_prices)])
+            self._price_sum -= old.sum(axis=0)
+            self._price_cross -= old.T @ old
+            self.n_prices -= n_old_prices
+
+        n_old_returns = len(self._return_rows) - (self.lookback - 1)
+        if n_old_returns > 0:
+            old = np.array([self._return_rows.popleft() for _ in range(n_old_returns)])
+            self._return_sum -= old.sum(axis=0)
+            self._return_sq -= np.sum(old**2, axis=0)
+            self.n_returns -= n_old_returns
+
+    def _price_covariance(self) -> np.ndarray:
+        mean = self._price_sum / self.n_prices
+        return self._price_cross / self.n_prices - np.outer(mean, mean)
+
+    def correlations(self) -> np.ndarray:
+        """Pairwise (i < j) price correlations"""
+        cov = self._price_covariance()
+        std = np.sqrt(np.maximum(np.diag(cov), 0.0))
+        iu, ju = np.triu_indices(self.n_venues, k=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.clip(cov[iu, ju] / (std[iu] * std[ju]), -1.0, 1.0)
+
+    def price_levels(self) -> np.ndarray:
+        """Mean price per venue"""
+        return self._price_sum / self.n_prices + self._reference
+
+    def volatilities(self) -> np.ndarray:
+        """Standard deviation of returns per venue"""
+        if self.n_returns == 0:
+            return np.zeros(self.n_venues)
+        mean = self._return_sum / self.n_returns
+        return np.sqrt(np.maximum(self._return_sq / self.n_returns - mean**2, 0.0))
+
+    def pooled_std(self) -> float:
+        """Standard deviation of all prices across venues"""
+        # Law of total variance: mean within-venue variance + variance of venue means
+        within = np.mean(np.diag(self._price_covariance()))
+        between = np.var(self.price_levels())
+        return float(np.sqrt(max(within + between, 0.0)))
+
+
+class StreamingVMMEngine:
+    """
+    Online VMM with constant-time updates per appended bar
+
+    Call ``initialize`` once with a warm-up window, then ``update`` with each
+    batch of new bars to obtain a fresh ``VMMOutput``. Uses the simplified
+    (non crypto-calculator) moment conditions of ``VMMEngine``.
+    """
+
+    def __init__(
+        self,
+        config: Optional[VMMConfig] = None,
+        streaming_config: Optional[StreamingVMMConfig] = None,
+    ):
+        self.config = config or VMMConfig()
+        self.streaming_config = streaming_config or StreamingVMMConfig()
+        self._engine = VMMEngine(self.config)
+
+        self.price_columns: Optional[List[str]] = None
+        self.beta: Optional[np.ndarray] = None
+        self._price_sums: Optional[RollingPriceSums] = None
+        self._hac: Optional[ExponentiallyWeightedHAC] = None
+        self._window_size: Optional[int] = None
+        self._price_buffer: Optional[np.ndarray] = None
+        self._moment_rows: deque = deque()
+        self._moment_sum: Optional[np.ndarray] = None
+        self._moment_count = 0
+
+    @property
+    def initialized(self) -> bool:
+        return self._hac is not None
+
+    def initialize(self, data: pd.DataFrame, price_columns: List[str]) -> VMMOutput:
+        """
+        Fit the moment stabilizer and HAC state on a warm-up window
+
+        Args:
+            data: Warm-up DataFrame with price data
+            price_columns: List of price column names
+
+        Returns:
+            VMMOutput for the warm-up window
+        """
+        self._engine._validate_input(data, price_columns)
+        self.price_columns = list(price_columns)
+
+        prices = data[price_columns].to_numpy(dtype=np.float64)
+        N, n_venues = prices.shape
+
+        # Fresh moment cache per warm-up, as in VMMEngine.run_vmm: the data may be
+        # a previously seen object mutated in place
+        self._engine._moment_cache.reset()
+        self._engine._moment_cache.reset_stats()
+
+        # Stabilizer (winsorize/center/scale) fitted once on the warm-up window
+        self._engine._fit_global_weight_matrix(data, self.price_columns)
+        moment_matrix = self._engine._get_per_timestep_moments(data, self.price_columns)
+        scaled = self._scale_moments(moment_matrix)
+
+        lag = self._engine._get_optimal_lag(N)
+        self._hac = ExponentiallyWeightedHAC(
+            scaled.shape[1],
+            lag,
+            decay=self.streaming_config.hac_decay,
+            kernel=self.config.hac_kernel,
+        )
+        self._hac.initialize(scaled)
+
+        self._moment_rows = deque()
+        self._moment_sum = np.zeros(scaled.shape[1])
+        self._moment_count = 0
+        self._push_moment_rows(scaled)
+
+        self._window_size = default_window_size(N)
+        self._price_buffer = prices[-self._window_size :].copy()
+
+        self._price_sums = RollingPriceSums(n_venues, self.streaming_config.lookback)
+        self._price_sums.add(prices)
+
+        rng = np.random.default_rng(self.streaming_config.seed)
+        self.beta = rng.normal(0, 0.1, self.config.beta_dim)
+
+        return self._step(max(self.config.max_iterations, 1))
+
+    def update(self, new_rows: pd.DataFrame) -> VMMOutput:
+        """
+        Append new bars and return a refreshed VMMOutput
+
+        Args:
+            new_rows: DataFrame (or array) of new bars with the price columns
+
+        Returns:
+            VMMOutput reflecting all bars seen so far
+        """
+        if not self.initialized:
+            raise RuntimeError("StreamingVMMEngine.initialize must be called before update")
+
+        if isinstance(new_rows, pd.DataFrame):
+            prices = new_rows[self.price_columns].to_numpy(dtype=np.float64)
+        else:
+            prices = np.atleast_2d(np.asarray(new_rows, dtype=np.float64))
+        if len(prices) == 0:
+            raise ValueError("update requires at least one new row")
+
+        # Per-timestep moments for the new bars only, from the trailing price buffer
+        w = self._window_size
+        window_prices = np.vstack([self._price_buffer, prices])
+        new_moments = rolling_per_timestep_moments(window_prices, window_size=w)[-len(prices) :]
+        self._price_buffer = window_prices[-w:]
+
+        scaled = self._scale_moments(new_moments)
+        self._hac.update(scaled)
+        self._push_moment_rows(scaled)
+        self._price_sums.add(prices)
+
+        return self._step(self.streaming_config.iterations_per_update)
+
+    def _scale_moments(self, moment_matrix: np.ndarray) -> np.ndarray:
+        """Apply the warm-up stabilization pipeline to moment rows"""
+        scaler = self._engine._per_timestep_scaler
+        scaled = (np.clip(moment_matrix, scaler["q01"], scaler["q99"]) - scaler["mu0"]) / scaler[
+            "sigma0"
+        ]
+        if "valid_components" in scaler:
+            scaled = scaled[:, scaler["valid_components"]]
+        return scaled
+
+    def _push_moment_rows(self, rows: np.ndarray) -> None:
+        """Add scaled moment rows to the rolling J-statistic window"""
+        self._moment_sum += rows.sum(axis=0)
+        self._moment_count += len(rows)
+
+        lookback = self.streaming_config.lookback
+        if lookback is None:
+            return
+
+        self._moment_rows.extend(rows)
+        while len(self._moment_rows) > lookback:
+            self._moment_sum -= self._moment_rows.popleft()
+            self._moment_count -= 1
+
+    def _moment_conditions(self, beta: np.ndarray) -> np.ndarray:
+        """Simplified VMM moment conditions from the rolling price sums"""
+        expected_corr = beta[0] if len(beta) > 0 else 0.5
+        expected_level = beta[1] if len(beta) > 1 else 50000.0
+        expected_vol = beta[2] if len(beta) > 2 else 0.02
+
+        return np.concatenate(
+            [
+                self._price_sums.correlations() - expected_corr,
+                self._price_sums.price_levels() - expected_level,
+                self._price_sums.volatilities() - expected_vol,
+            ]
+        )
+
+    def _over_identification(self, n_params: int) -> Tuple[float, float]:
+        """Hansen J from the rolling mean of scaled moments and the streaming HAC S"""
+        N = self._moment_count
+        g_bar = self._moment_sum / N
+        k = len(g_bar)
+        if k <= n_params:
+            return 0.0, 1.0
+
+        # W = S^(-1) with the same eigenvalue floor as the batch ridge regularization
+        S = self._hac.covariance()
+        shortfall = 1e-6 - np.min(np.linalg.eigvalsh(S))
+        if shortfall > 0:
+            S = S + (shortfall + 1e-8) * np.eye(k)
+        W = np.linalg.inv(S)
+
+        j_stat = float(N * g_bar @ W @ g_bar)
+        return j_stat, float(1.0 - chi2.cdf(j_stat, k - n_params))
+
+    def _step(self, max_iterations: int) -> VMMOutput:
+        """Warm-started gradient descent on beta, then the summary diagnostics"""
+        beta = self.beta.copy()
+        status = "max_iterations"
+        iterations = max_iterations
+        loss = float("nan")
+
+        for iteration in range(max_iterations):
+            moments = self._moment_conditions(beta)
+            loss = float(np.sum(moments**2))
+            if loss < self.config.convergence_tolerance:
+                status, iterations = "converged", iteration + 1
+                break
+            gradients = self._engine._calculate_gradients(self._price_buffer, beta, moments)
+            beta = np.clip(beta - self.config.learning_rate * gradients, -1, 1)
+
+        self.beta = beta
+        moments = self._moment_conditions(beta)
+        j_stat, p_value = self._over_identification(len(beta))
+
+        df = len(moments) - len(beta)
+        if df <= 0:
+            stability = 1.0
+        else:
+            stability = 1.0 - min(1.0, max(0.0, chi2.cdf(j_stat, df)))
+
+        price_std = self._price_sums.pooled_std()
+        confidence = 1.0 - np.mean(np.abs(moments)) / price_std if price_std > 0 else 0.0
+
+        beta_dim = self.config.beta_dim
+        return VMMOutput(
+            convergence_status=status,
+            iterations=iterations,
+            final_loss=loss,
+            beta_estimates=beta.copy(),
+            sigma_estimates=np.eye(beta_dim) * self.config.sigma_prior,
+            rho_estimates=np.eye(beta_dim) * self.config.rho_prior,
+            structural_stability=float(stability),
+            regime_confidence=float(max(0.0, min(1.0, confidence))),
+            over_identification_stat=j_stat,
+            over_identification_p_value=p_value,
+        )
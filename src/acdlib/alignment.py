@@ -0,0 +1,283 @@
+"""
+Multi-venue time alignment.
+
+Aligns asynchronously observed venue series onto common sampling times using
+sorted int64 nanosecond timestamps and ``np.searchsorted``:
+
+- previous-tick (as-of) sampling: each venue's latest observation at or before
+  each sampling time
+- refresh-time sampling (Barndorff-Nielsen et al.): the next sampling time is
+  the first moment every venue has ticked since the previous one
+- fixed-grid sampling: previous-tick values on a regular grid
+
+Every alignment also records, per venue and sampling time, how old the sampled
+observation is (staleness), so callers can see which venues are being carried
+forward.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+ALIGN_METHODS = ("previous_tick", "refresh_time", "grid")
+
+
+@dataclass
+class AlignedPrices:
+    """Venue values sampled at common times, with per-sample staleness."""
+
+    times: np.ndarray  # int64 ns since epoch, shape (n,)
+    values: np.ndarray  # float64, shape (n, n_venues); NaN where nothing was observed yet
+    staleness_ns: np.ndarray  # int64, shape (n, n_venues); -1 where values is NaN
+    venues: List[str]
+    tz: Optional[str] = "UTC"  # None: the input times were naive UTC wall-clock values
+    unit: str = "ns"  # resolution of the input datetimes, kept by to_frame
+
+    def to_frame(self) -> pd.DataFrame:
+        """Values as a DataFrame with a DatetimeIndex and one column per venue."""
+        index = pd.DatetimeIndex(pd.to_datetime(self.times, unit="ns", utc=True), name="time")
+        index = index.as_unit(self.unit)
+        if self.tz is None:
+            index = index.tz_localize(None)
+        return pd.DataFrame(self.values, index=index, columns=self.venues)
+
+    def staleness_report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-venue staleness summary.
+
+        Returns:
+            {venue: {"mean_s", "max_s", "stale_fraction", "missing_fraction"}} where
+            stale_fraction is the share of samples that repeat an earlier observation
+        """
+        report = {}
+        for j, venue in enumerate(self.venues):
+            age = self.staleness_ns[:, j]
+            observed = age >= 0
+            ages_s = age[observed] / 1e9
+            report[venue] = {
+                "mean_s": float(ages_s.mean()) if len(ages_s) else float("nan"),
+                "max_s": float(ages_s.max()) if len(ages_s) else float("nan"),
+                "stale_fraction": float(self._repeated(j)[observed].mean()) if len(ages_s) else 0.0,
+                "missing_fraction": float(1 - observed.mean()) if len(age) else 0.0,
+            }
+        return report
+
+    def _repeated(self, j: int) -> np.ndarray:
+        """Samples whose observation time equals the previous sample's."""
+        observed_at = self.times - self.staleness_ns[:, j]
+        repeated = np.zeros(len(self.times), dtype=bool)
+        repeated[1:] = observed_at[1:] == observed_at[:-1]
+        return repeated
+
+
+def to_ns(times) -> np.ndarray:
+    """
+    Timestamps as int64 nanoseconds since epoch.
+
+    Integer input is taken as epoch milliseconds (tick files store ms); datetimes
+    are converted to UTC (naive values are taken as UTC).
+
+    Args:
+        times: Array-like of datetimes or epoch-millisecond integers
+
+    Returns:
+        int64 nanosecond array
+    """
+    if isinstance(times, (pd.Series, pd.Index)) and pd.api.types.is_integer_dtype(times.dtype):
+        return np.asarray(times, dtype=np.int64) * 1_000_000
+    if isinstance(times, np.ndarray) and np.issubdtype(times.dtype, np.integer):
+        return times.astype(np.int64) * 1_000_000
+    converted = pd.to_datetime(times, utc=True)
+    return np.asarray(pd.DatetimeIndex(converted).as_unit("ns").asi8, dtype=np.int64)
+
+
+def previous_tick(
+    times: Sequence[np.ndarray],
+    values: Sequence[np.ndarray],
+    sample_times: np.ndarray,
+    venues: Sequence[str],
+    tolerance_ns: Optional[int] = None,
+) -> AlignedPrices:
+    """
+    Sample each venue's latest observation at or before every sampling time.
+
+    Args:
+        times: Sorted int64 ns observation times per venue
+        values: Observed values per venue
+        sample_times: Sorted int64 ns sampling times
+        venues: Venue names (column order)
+        tolerance_ns: Treat observations older than this as missing (0 = exact match)
+
+    Returns:
+        AlignedPrices at sample_times
+    """
+    sample_times = np.asarray(sample_times, dtype=np.int64)
+    n, k = len(sample_times), len(venues)
+    out = np.full((n, k), np.nan)
+    staleness = np.full((n, k), -1, dtype=np.int64)
+
+    for j, (t, v) in enumerate(zip(times, values)):
+        if len(t) == 0:
+            continue
+        # Last observation with time <= sample time
+        idx = np.searchsorted(t, sample_times, side="right") - 1
+        valid = idx >= 0
+        age = np.where(valid, sample_times - t[np.maximum(idx, 0)], -1)
+        if tolerance_ns is not None:
+            valid &= age <= tolerance_ns
+        out[valid, j] = np.asarray(v, dtype=np.float64)[idx[valid]]
+        staleness[valid, j] = age[valid]
+
+    return AlignedPrices(
+        times=sample_times, values=out, staleness_ns=staleness, venues=list(venues)
+    )
+
+
+def refresh_times(times: Sequence[np.ndarray]) -> np.ndarray:
+    """
+    Refresh-time sampling points across venues.
+
+    The first refresh time is when every venue has ticked at least once; each
+    following one is the first moment every venue has ticked again since the
+    previous refresh time.
+
+    Args:
+        times: Sorted int64 ns observation times per venue
+
+    Returns:
+        Sorted int64 ns refresh times (empty if any venue has no observations)
+    """
+    if not times or any(len(t) == 0 for t in times):
+        return np.empty(0, dtype=np.int64)
+
+    # Candidate points: every observation time. following[i] is the refresh time
+    # that comes after candidate i, evaluated for all candidates at once.
+    candidates = np.unique(np.concatenate(times))
+    following = np.full(len(candidates), np.iinfo(np.int64).min, dtype=np.int64)
+    exhausted = np.zeros(len(candidates), dtype=bool)
+    for t in times:
+        idx = np.searchsorted(t, candidates, side="right")
+        exhausted |= idx >= len(t)
+        following = np.maximum(following, t[np.minimum(idx, len(t) - 1)])
+    next_index = np.searchsorted(candidates, following).tolist()
+    exhausted = exhausted.tolist()
+
+    # Walk the chain from the first refresh time
+    i = int(np.searchsorted(candidates, max(t[0] for t in times)))
+    chain = [i]
+    while not exhausted[i]:
+        i = next_index[i]
+        chain.append(i)
+    return candidates[chain]
+
+
+def fixed_grid(
+    times: Sequence[np.ndarray], step_ns: int, start_ns: Optional[int] = None
+) -> np.ndarray:
+    """
+    Regular sampling grid over the span where every venue has observations.
+
+    Args:
+        times: Sorted int64 ns observation times per venue
+        step_ns: Grid step in nanoseconds
+        start_ns: Grid origin (default: first common time rounded up to the step)
+
+    Returns:
+        int64 ns grid times
+    """
+    if not times or any(len(t) == 0 for t in times):
+        return np.empty(0, dtype=np.int64)
+    first = max(int(t[0]) for t in times)
+    last = min(int(t[-1]) for t in times)
+    if start_ns is None:
+        start_ns = first + (-first) % step_ns
+    return np.arange(start_ns, last + 1, step_ns, dtype=np.int64)
+
+
+def align(
+    series: Mapping[str, Tuple[np.ndarray, np.ndarray]],
+    method: str = "previous_tick",
+    rule: Optional[str] = None,
+    sample_times: Optional[np.ndarray] = None,
+    tolerance_ns: Optional[int] = None,
+) -> AlignedPrices:
+    """
+    Align N venues in one pass.
+
+    Args:
+        series: {venue: (sorted int64 ns times, values)}
+        method: "previous_tick" (sample at sample_times, default: union of all
+            observation times), "refresh_time" or "grid" (requires rule)
+        rule: Grid step for method="grid", e.g. "1s" or "1min"
+        sample_times: Explicit sampling times for method="previous_tick"
+        tolerance_ns: Observations older than this are treated as missing
+
+    Returns:
+        AlignedPrices with venues in the mapping's order
+    """
+    if method not in ALIGN_METHODS:
+        raise ValueError(f"Unknown alignment method '{method}', expected one of {ALIGN_METHODS}")
+
+    venues = list(series)
+    times = [np.asarray(series[v][0], dtype=np.int64) for v in venues]
+    values = [np.asarray(series[v][1]) for v in venues]
+
+    if method == "refresh_time":
+        sample_times = refresh_times(times)
+    elif method == "grid":
+        if rule is None:
+            raise ValueError("method='grid' requires a rule such as '1s'")
+        sample_times = fixed_grid(times, pd.Timedelta(rule).value)
+    elif sample_times is None:
+        sample_times = np.unique(np.concatenate(times)) if times else np.empty(0, np.int64)
+
+    return previous_tick(times, values, sample_times, venues, tolerance_ns=tolerance_ns)
+
+
+def align_long_frame(
+    df: pd.DataFrame,
+    value_col: str,
+    venues: Sequence[str],
+    time_col: str = "time",
+    venue_col: str = "venue",
+    method: str = "previous_tick",
+    rule: Optional[str] = None,
+    tolerance_ns: Optional[int] = None,
+) -> AlignedPrices:
+    """
+    Align a long (time, venue, value) frame; venues without rows get empty series.
+
+    Args:
+        df: Long-format frame
+        value_col: Column holding the values to align
+        venues: Venue names (column order of the result)
+        time_col: Timestamp column
+        venue_col: Venue column
+        method: Alignment method (see ``align``)
+        rule: Grid step for method="grid"
+        tolerance_ns: Observations older than this are treated as missing
+
+    Returns:
+        AlignedPrices over ``venues``
+    """
+    series = {venue: (np.empty(0, np.int64), np.empty(0)) for venue in venues}
+    times = df[time_col]
+    naive = pd.api.types.is_datetime64_dtype(times.dtype) and times.dt.tz is None
+    if len(df):
+        ordered = df.sort_values(time_col, kind="stable")
+        ns = to_ns(ordered[time_col])
+        codes = ordered[venue_col].to_numpy()
+        vals = ordered[value_col].to_numpy(dtype=np.float64)
+        for venue in venues:
+            mask = codes == venue
+            # Keep the first row of duplicated timestamps
+            venue_ns, first = np.unique(ns[mask], return_index=True)
+            series[venue] = (venue_ns, vals[mask][first])
+
+    aligned = align(series, method, rule=rule, tolerance_ns=tolerance_ns)
+    aligned.tz = None if naive else "UTC"
+    if pd.api.types.is_datetime64_any_dtype(times.dtype):
+        aligned.unit = times.dt.unit
+    return aligned
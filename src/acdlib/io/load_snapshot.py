@@ -9,12 +9,22 @@ ensuring all analyses use the exact same window and venues from OVERLAP.json.
 import json
 import logging
 import sys
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from ..alignment import align, to_ns
 
 logger = logging.getLogger(__name__)
 
+# Columns used by to_mid/resample_mids
+SNAPSHOT_COLUMNS = ["ts_exchange", "best_bid", "best_ask", "last_trade_px"]
+
 
 def load_overlap(overlap_path: str) -> Dict:
     """
@@ -69,22 +79,34 @@ def load_overlap(overlap_path: str) -> Dict:
         raise
 
 
-def load_ticks_snapshot(overlap: Dict, asof: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+def load_ticks_snapshot(
+    overlap: Dict,
+    asof: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, pd.DataFrame]:
     """
     Load tick parquet files for each venue within the overlap window.
 
+    Venues are read concurrently; only ``columns`` are decoded and the
+    [start_utc, end_utc] window is pushed into the parquet scan, so row groups
+    outside the window are skipped using their statistics.
+
     Args:
         overlap: Overlap data from load_overlap()
         asof: Optional as-of timestamp (not used in this implementation)
+        columns: Columns to load (default: SNAPSHOT_COLUMNS; an empty list loads all)
+        max_workers: Reader threads (default: one per venue, at most 8)
 
     Returns:
         Dictionary mapping venue names to tick DataFrames
     """
     logger.info("Loading tick data from snapshot")
 
-    venues_ticks = {}
     data_root = Path(overlap["data_root"])
+    columns = SNAPSHOT_COLUMNS if columns is None else columns
 
+    venue_files = {}
     for venue in overlap["venues"]:
         venue_dir = data_root / venue
         if not venue_dir.exists():
@@ -92,61 +114,118 @@ def load_ticks_snapshot(overlap: Dict, asof: Optional[str] = None) -> Dict[str,
             continue
 
         # Look for parquet files in the venue directory
-        parquet_files = list(venue_dir.glob("**/*.parquet"))
+        parquet_files = sorted(venue_dir.glob("**/*.parquet"))
         if not parquet_files:
             logger.warning(f"No parquet files found for venue: {venue}")
             continue
+        venue_files[venue] = parquet_files
+
+    # Safety check on every path before any file is opened
+    for parquet_files in venue_files.values():
+        _abort_on_mock_files(parquet_files)
 
-        # Safety check: refuse mock/demo files
-        for parquet_file in parquet_files:
-            file_name = parquet_file.name.lower()
-            file_path = str(parquet_file).lower()
-
-            if "mock" in file_name or "mock" in file_path:
-                logger.error(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains 'mock'")
-                print(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains 'mock'")
-                sys.exit(1)
-            elif "_demo" in file_name or "_demo" in file_path:
-                logger.error(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains '_demo'")
-                print(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains '_demo'")
-                sys.exit(1)
-
-        # Load and concatenate parquet files
-        venue_ticks = []
-        for parquet_file in parquet_files:
-            try:
-                df = pd.read_parquet(parquet_file)
-                if not df.empty:
-                    venue_ticks.append(df)
-            except Exception as e:
-                logger.warning(f"Error reading {parquet_file}: {e}")
-                continue
-
-        if venue_ticks:
-            # Concatenate all tick data for this venue
-            venue_df = pd.concat(venue_ticks, ignore_index=True)
-
-            # Filter by time window if timestamps are available
-            if "ts_exchange" in venue_df.columns:
-                start_ts = pd.to_datetime(overlap["start_utc"])
-                end_ts = pd.to_datetime(overlap["end_utc"])
-
-                # Filter to overlap window
-                mask = (venue_df["ts_exchange"] >= start_ts) & (venue_df["ts_exchange"] <= end_ts)
-                venue_df = venue_df[mask]
-
-            if not venue_df.empty:
+    start_ts = pd.to_datetime(overlap["start_utc"])
+    end_ts = pd.to_datetime(overlap["end_utc"])
+
+    venues_ticks = {}
+    if venue_files:
+        workers = max_workers or min(len(venue_files), 8)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="snapshot") as executor:
+            futures = {
+                venue: executor.submit(_read_venue_ticks, files, columns, start_ts, end_ts)
+                for venue, files in venue_files.items()
+            }
+
+        # Preserve the venue order from OVERLAP.json
+        for venue, future in futures.items():
+            venue_df = future.result()
+            if venue_df is None:
+                logger.warning(f"No valid parquet files for {venue}")
+            elif venue_df.empty:
+                logger.warning(f"No ticks in overlap window for {venue}")
+            else:
                 venues_ticks[venue] = venue_df
                 logger.info(f"Loaded {len(venue_df)} ticks for {venue}")
-            else:
-                logger.warning(f"No ticks in overlap window for {venue}")
-        else:
-            logger.warning(f"No valid parquet files for {venue}")
 
     logger.info(f"Loaded tick data for {len(venues_ticks)} venues")
     return venues_ticks
 
 
+def _abort_on_mock_files(parquet_files: List[Path]) -> None:
+    """Refuse mock/demo files (exits the process)."""
+    for parquet_file in parquet_files:
+        file_name = parquet_file.name.lower()
+        file_path = str(parquet_file).lower()
+
+        if "mock" in file_name or "mock" in file_path:
+            logger.error(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains 'mock'")
+            print(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains 'mock'")
+            sys.exit(1)
+        elif "_demo" in file_name or "_demo" in file_path:
+            logger.error(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains '_demo'")
+            print(f"[ABORT:snapshot:mock_detected] {parquet_file} - contains '_demo'")
+            sys.exit(1)
+
+
+def _read_venue_ticks(
+    parquet_files: List[Path],
+    columns: List[str],
+    start_ts: pd.Timestamp,
+    end_ts: pd.Timestamp,
+) -> Optional[pd.DataFrame]:
+    """Projected, window-filtered read of one venue's files (None if none are readable)."""
+    try:
+        dataset = ds.dataset([str(f) for f in parquet_files], format="parquet")
+        return _scan(dataset, columns, start_ts, end_ts)
+    except Exception as e:
+        logger.warning(f"Error scanning {parquet_files[0].parent}: {e}; reading files one by one")
+
+    # Fall back to per-file reads so one bad file does not drop the whole venue
+    frames = []
+    for parquet_file in parquet_files:
+        try:
+            df = _scan(ds.dataset(str(parquet_file), format="parquet"), columns, start_ts, end_ts)
+            if not df.empty:
+                frames.append(df)
+        except Exception as e:
+            logger.warning(f"Error reading {parquet_file}: {e}")
+    if not frames:
+        return None
+    return pd.concat(frames, ignore_index=True)
+
+
+def _scan(
+    dataset: ds.Dataset, columns: List[str], start_ts: pd.Timestamp, end_ts: pd.Timestamp
+) -> pd.DataFrame:
+    names = dataset.schema.names
+    projection = [c for c in columns if c in names] if columns else None
+
+    window = None
+    if "ts_exchange" in names:
+        window = _window_filter(dataset.schema.field("ts_exchange"), start_ts, end_ts)
+
+    return dataset.to_table(columns=projection, filter=window).to_pandas()
+
+
+def _window_filter(field: pa.Field, start_ts: pd.Timestamp, end_ts: pd.Timestamp):
+    """start <= ts_exchange <= end in the column's own type (epoch ms for integers)."""
+    if start_ts.tzinfo is None:
+        start_ts, end_ts = start_ts.tz_localize("UTC"), end_ts.tz_localize("UTC")
+
+    column = ds.field(field.name)
+    if pa.types.is_timestamp(field.type):
+        if field.type.tz is None:
+            # Naive timestamps are UTC wall-clock values
+            start_ts = start_ts.tz_convert("UTC").tz_localize(None)
+            end_ts = end_ts.tz_convert("UTC").tz_localize(None)
+        start, end = pa.scalar(start_ts, type=field.type), pa.scalar(end_ts, type=field.type)
+    elif pa.types.is_integer(field.type):
+        start, end = start_ts.value // 1_000_000, end_ts.value // 1_000_000
+    else:
+        return None
+    return (column >= start) & (column <= end)
+
+
 def to_mid(df: pd.DataFrame) -> pd.Series:
     """
     Calculate mid prices from best bid/ask, with fallback to last trade price.
@@ -185,72 +264,61 @@ def to_mid(df: pd.DataFrame) -> pd.Series:
     return pd.Series(index=df.index, dtype=float)
 
 
-def resample_mids(venues_ticks: Dict[str, pd.DataFrame], rule: str) -> pd.DataFrame:
+def resample_mids(
+    venues_ticks: Dict[str, pd.DataFrame], rule: str, method: str = "grid"
+) -> pd.DataFrame:
     """
-    Resample mid prices to specified frequency and inner-join venues.
+    Align mid prices across venues.
 
     Args:
         venues_ticks: Dictionary of venue tick DataFrames
-        rule: Resampling rule (e.g., '1S', '1T')
+        rule: Sampling frequency for method="grid" (e.g., '1S', '1T')
+        method: "grid" (previous-tick values on a fixed grid) or "refresh_time"
 
     Returns:
-        DataFrame with resampled mid prices for each venue
+        DataFrame with aligned mid prices for each venue
     """
-    logger.info(f"Resampling mid prices to {rule}")
-
-    resampled_venues = {}
+    logger.info(f"Aligning mid prices ({method}, {rule})")
 
+    series = {}
     for venue, df in venues_ticks.items():
         if df.empty:
             logger.warning(f"Empty DataFrame for {venue}, skipping")
             continue
+        if "ts_exchange" not in df.columns:
+            logger.warning(f"No timestamp column for {venue}, skipping")
+            continue
 
         # Calculate mid prices
         mid_prices = to_mid(df)
-
-        if mid_prices.empty or mid_prices.isna().all():
+        valid = mid_prices.notna().to_numpy()
+        if not valid.any():
             logger.warning(f"No valid mid prices for {venue}, skipping")
             continue
 
-        # Set timestamp as index
-        if "ts_exchange" in df.columns:
-            df_indexed = df.set_index("ts_exchange")
-            mid_series = pd.Series(mid_prices.values, index=df_indexed.index)
-        else:
-            logger.warning(f"No timestamp column for {venue}, using default index")
-            mid_series = mid_prices
+        times = to_ns(df["ts_exchange"])[valid]
+        order = np.argsort(times, kind="stable")
+        series[venue] = (times[order], mid_prices.to_numpy(dtype=np.float64)[valid][order])
 
-        # Resample to specified frequency
-        try:
-            resampled = mid_series.resample(rule).last()
-            resampled_venues[venue] = resampled
-            logger.info(f"Resampled {venue}: {len(resampled)} points")
-        except Exception as e:
-            logger.error(f"Error resampling {venue}: {e}")
-            continue
-
-    if not resampled_venues:
+    if not series:
         logger.error("No venues successfully resampled")
         return pd.DataFrame()
 
-    # Inner join all venues
-    try:
-        result_df = pd.DataFrame(resampled_venues)
+    aligned = align(series, method=method, rule=rule)
+    result_df = aligned.to_frame()
+    result_df.index.name = None
 
-        # Check for NaNs after inner join
-        nan_count = result_df.isna().sum().sum()
-        if nan_count > 0:
-            logger.error(f"[ABORT:resample:coverage] {nan_count} NaNs found after inner join")
-            raise ValueError(f"Resample coverage failed: {nan_count} NaNs")
+    # Previous-tick sampling over the common span leaves no holes; keep the guard
+    nan_count = int(result_df.isna().sum().sum())
+    if nan_count > 0:
+        logger.error(f"[ABORT:resample:coverage] {nan_count} NaNs found after alignment")
+        raise ValueError(f"Resample coverage failed: {nan_count} NaNs")
 
-        logger.info(
-            f"Successfully resampled {len(result_df)} points for {len(resampled_venues)} venues"
-        )
-        return result_df
+    for venue, stats in aligned.staleness_report().items():
+        logger.info(f"[ALIGN:staleness] {venue} {json.dumps(stats)}")
 
-    except Exception as e:
-        logger.error(f"Error in inner join: {e}")
-        raise
+    logger.info(f"Successfully resampled {len(result_df)} points for {len(series)} venues")
+    return result_df
 
 
 def load_snapshot_data(overlap_path: str, resample_rule: str = "1S") -> tuple:
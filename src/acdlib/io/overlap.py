@@ -347,26 +347,21 @@ def find_real_overlap_rolling(
     logger.info(f"Continuous venues: {len(continuous_venues)}/{len(venue_data)}")
 
     # Apply strict policy: BEST4>=30m, BEST4>=20m, BEST4>=10m, ALL5>=10m
-    for min_min in min_minutes:
-        if len(continuous_venues) >= quorum and overlap_duration >= min_min:
-            if len(continuous_venues) >= 5 and min_min == 10:
-                policy = "ALL5_10m"
-            else:
-                policy = f"BEST4_{min_min}m"
-
-            # Print the exact overlap JSON
-            overlap_json = (
-                f'[OVERLAP] {{"startUTC":"{overlap_start}","endUTC":"{overlap_end}",'
-                f'"minutes":{overlap_duration:.1f},"venues":{continuous_venues},'
-                f'"excluded":{excluded_venues},"policy":"{policy}"}}'
-            )
-            print(overlap_json)
-            logger.info(
-                f"Found real overlap: {policy} with {len(continuous_venues)} venues "
-                f"for {overlap_duration:.1f} minutes"
-            )
+    policy = rolling_policy(len(continuous_venues), overlap_duration, min_minutes, quorum)
+    if policy is not None:
+        # Print the exact overlap JSON
+        overlap_json = (
+            f'[OVERLAP] {{"startUTC":"{overlap_start}","endUTC":"{overlap_end}",'
+            f'"minutes":{overlap_duration:.1f},"venues":{continuous_venues},'
+            f'"excluded":{excluded_venues},"policy":"{policy}"}}'
+        )
+        print(overlap_json)
+        logger.info(
+            f"Found real overlap: {policy} with {len(continuous_venues)} venues "
+            f"for {overlap_duration:.1f} minutes"
+        )
 
-            return overlap_start, overlap_end, continuous_venues, policy
+        return overlap_start, overlap_end, continuous_venues, policy
 
     # No sufficient overlap found
     pending_info = {
@@ -378,6 +373,29 @@ def find_real_overlap_rolling(
     return None
 
 
+def rolling_policy(
+    n_venues: int, minutes: float, min_minutes: List[int], quorum: int
+) -> Optional[str]:
+    """
+    Rolling-monitor policy for a continuous window, or None if it does not qualify.
+
+    Args:
+        n_venues: Venues continuous across the window
+        minutes: Window length in minutes
+        min_minutes: Minimum window lengths to try, in order of preference
+        quorum: Minimum number of venues required
+
+    Returns:
+        Policy name such as "BEST4_30m" or "ALL5_10m"
+    """
+    for min_min in min_minutes:
+        if n_venues >= quorum and minutes >= min_min:
+            if n_venues >= 5 and min_min == 10:
+                return "ALL5_10m"
+            return f"BEST4_{min_min}m"
+    return None
+
+
 def abort_on_synthetic(policy: str) -> None:
     """
     Hard abort if synthetic policy is detected.
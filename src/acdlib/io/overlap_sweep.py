@@ -0,0 +1,265 @@
+"""
+Multi-granularity overlap sweep.
+
+``GapIndex`` loads the ``ts_local`` column of each venue's tick partitions once
+(and only new files on ``refresh``), and keeps the inter-tick gaps sorted so
+that the coverage intervals for any gap tolerance are a prefix lookup instead
+of a fresh ``diff`` over the ticks. ``sweep_overlap_windows`` then evaluates
+every (granularity, min duration, coverage) level with a sweep line over the
+venues' interval endpoints and returns all qualifying windows per level.
+Coverage is measured in buckets of the level's own granularity by default, so
+a 900 s level is not judged on how many 1 s slots hold a tick.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepLevel:
+    """
+    One sweep rule: gap tolerance, minimum window length and minimum coverage.
+
+    ``coverage_bucket_sec`` is the slot size coverage is measured in; None uses
+    ``granularity_sec``.
+    """
+
+    granularity_sec: float
+    min_duration_min: float
+    coverage_threshold: float = 0.0
+    coverage_bucket_sec: Optional[float] = None
+
+    @property
+    def bucket_sec(self) -> float:
+        """Coverage slot size in seconds."""
+        if self.coverage_bucket_sec is not None:
+            return self.coverage_bucket_sec
+        return self.granularity_sec
+
+
+@dataclass
+class SweepWindow:
+    """Window covered by every venue without a gap above the level's granularity."""
+
+    start: pd.Timestamp
+    end: pd.Timestamp
+    venues: List[str]
+    granularity_sec: float
+    min_duration_min: float
+    coverage: float
+    coverage_by_venue: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def duration_minutes(self) -> float:
+        return (self.end - self.start).total_seconds() / 60
+
+
+class GapIndex:
+    """Per-venue tick timestamps with a sorted inter-tick gap index."""
+
+    def __init__(
+        self,
+        venues: List[str],
+        root: str = "data/ticks",
+        pair: str = "BTC-USD",
+        freq: str = "1s",
+    ):
+        """
+        Args:
+            venues: Venues to index
+            root: Tick root directory (``<root>/<venue>/<pair>/<freq>/<date>/<hour>``)
+            pair: Trading pair directory name
+            freq: Frequency directory name
+        """
+        self.venues = list(venues)
+        self.root = Path(root)
+        self.pair = pair
+        self.freq = freq
+
+        self._ts: Dict[str, np.ndarray] = {v: np.empty(0, dtype=np.int64) for v in self.venues}
+        self._derived: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._occupied: Dict[Tuple[str, int], np.ndarray] = {}
+        self._seen_files: Set[Path] = set()
+
+    def refresh(self) -> int:
+        """
+        Read ``ts_local`` from tick files that appeared since the last refresh.
+
+        Returns:
+            Number of new files read
+        """
+        read = 0
+        for venue in self.venues:
+            tick_dir = self.root / venue / self.pair / self.freq
+            if not tick_dir.exists():
+                continue
+            batches = []
+            for file_path in sorted(tick_dir.glob("*/*/*.parquet")):
+                if file_path in self._seen_files:
+                    continue
+                try:
+                    column = pq.read_table(file_path, columns=["ts_local"]).column(0)
+                except Exception as e:
+                    logger.warning(f"Error reading {file_path}: {e}")
+                    continue
+                self._seen_files.add(file_path)
+                batches.append(column.to_numpy())
+                read += 1
+            if batches:
+                self.add(venue, np.concatenate(batches))
+        return read
+
+    def add(self, venue: str, ts_ms: np.ndarray) -> None:
+        """Merge tick timestamps (epoch ms) into a venue's index."""
+        new = np.unique(np.asarray(ts_ms, dtype=np.int64))
+        current = self._ts.get(venue, np.empty(0, dtype=np.int64))
+        if len(current) and len(new) and new[0] > current[-1]:
+            self._ts[venue] = np.concatenate([current, new])
+        else:
+            self._ts[venue] = np.union1d(current, new)
+        if venue not in self.venues:
+            self.venues.append(venue)
+        self._derived.pop(venue, None)
+        for key in [key for key in self._occupied if key[0] == venue]:
+            del self._occupied[key]
+
+    def ticks(self, venue: str) -> np.ndarray:
+        """Sorted unique tick timestamps of a venue (epoch ms)."""
+        return self._ts.get(venue, np.empty(0, dtype=np.int64))
+
+    def intervals(self, venue: str, max_gap_s: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Continuous coverage intervals of a venue for a gap tolerance.
+
+        Args:
+            venue: Venue name
+            max_gap_s: Largest tick spacing still counted as continuous
+
+        Returns:
+            (starts, ends) arrays of epoch milliseconds
+        """
+        ts = self.ticks(venue)
+        if len(ts) == 0:
+            return ts, ts
+        gap_order, sorted_gaps = self._index(venue)
+
+        # Gaps above the tolerance are a suffix of the ascending gap order
+        n_breaks = len(sorted_gaps) - np.searchsorted(sorted_gaps, max_gap_s * 1000, side="right")
+        breaks = np.sort(gap_order[len(gap_order) - n_breaks :])
+        starts = ts[np.concatenate(([0], breaks + 1))]
+        ends = ts[np.concatenate((breaks, [len(ts) - 1]))]
+        return starts, ends
+
+    def coverage(
+        self,
+        venue: str,
+        start_ms: np.ndarray,
+        end_ms: np.ndarray,
+        bucket_sec: float = 1.0,
+    ) -> np.ndarray:
+        """
+        Fraction of ``bucket_sec`` slots in each [start, end] that hold at least one tick.
+
+        Args:
+            venue: Venue name
+            start_ms: Window starts (epoch ms)
+            end_ms: Window ends (epoch ms)
+            bucket_sec: Slot size in seconds (slots are aligned to the epoch)
+
+        Returns:
+            Coverage per window in [0, 1]
+        """
+        bucket_ms = max(1, int(round(bucket_sec * 1000)))
+        buckets = self._buckets(venue, bucket_ms)
+        first, last = np.asarray(start_ms) // bucket_ms, np.asarray(end_ms) // bucket_ms
+        filled = np.searchsorted(buckets, last, side="right") - np.searchsorted(
+            buckets, first, side="left"
+        )
+        return filled / (last - first + 1)
+
+    def _index(self, venue: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(ascending gap order, sorted gaps in ms), cached."""
+        if venue not in self._derived:
+            gaps = np.diff(self.ticks(venue))
+            gap_order = np.argsort(gaps, kind="stable")
+            self._derived[venue] = (gap_order, gaps[gap_order])
+        return self._derived[venue]
+
+    def _buckets(self, venue: str, bucket_ms: int) -> np.ndarray:
+        """Sorted indices of the ``bucket_ms`` slots holding a tick, cached per size."""
+        key = (venue, bucket_ms)
+        if key not in self._occupied:
+            self._occupied[key] = np.unique(self.ticks(venue) // bucket_ms)
+        return self._occupied[key]
+
+
+def sweep_overlap_windows(
+    index: GapIndex,
+    levels: List[SweepLevel],
+    max_windows: Optional[int] = None,
+) -> List[List[SweepWindow]]:
+    """
+    Windows covered by every venue, for each sweep level.
+
+    For each level the venues' coverage intervals are taken from the gap index
+    and intersected with one sweep line over their endpoints: a window is a
+    stretch where all venues are inside an interval at once.
+
+    Args:
+        index: Gap index over the venues' ticks
+        levels: Sweep rules to evaluate
+        max_windows: Keep at most this many windows per level (longest first)
+
+    Returns:
+        One list of windows per level, longest first
+    """
+    venues = index.venues
+    results = []
+    for level in levels:
+        per_venue = [index.intervals(venue, level.granularity_sec) for venue in venues]
+        if not venues or any(len(starts) == 0 for starts, _ in per_venue):
+            results.append([])
+            continue
+
+        # Sweep line: +1 at interval starts, -1 at ends; starts first on ties so
+        # intervals touching at one tick still overlap
+        times = np.concatenate([np.concatenate([s, e]) for s, e in per_venue])
+        deltas = np.concatenate([np.r_[np.ones(len(s)), -np.ones(len(e))] for s, e in per_venue])
+        order = np.lexsort((-deltas, times))
+        times, active = times[order], np.cumsum(deltas[order])
+
+        opened = np.flatnonzero(active[:-1] == len(venues))
+        win_start, win_end = times[opened], times[opened + 1]
+
+        long_enough = win_end - win_start >= level.min_duration_min * 60_000
+        win_start, win_end = win_start[long_enough], win_end[long_enough]
+
+        coverage = {
+            venue: index.coverage(venue, win_start, win_end, level.bucket_sec) for venue in venues
+        }
+        worst = np.min(np.vstack(list(coverage.values())), axis=0) if len(win_start) else []
+
+        windows = [
+            SweepWindow(
+                start=pd.Timestamp(int(win_start[i]), unit="ms", tz="UTC"),
+                end=pd.Timestamp(int(win_end[i]), unit="ms", tz="UTC"),
+                venues=list(venues),
+                granularity_sec=level.granularity_sec,
+                min_duration_min=level.min_duration_min,
+                coverage=float(worst[i]),
+                coverage_by_venue={v: float(c[i]) for v, c in coverage.items()},
+            )
+            for i in range(len(win_start))
+            if worst[i] >= level.coverage_threshold
+        ]
+        windows.sort(key=lambda w: w.end - w.start, reverse=True)
+        results.append(windows[:max_windows] if max_windows is not None else windows)
+    return results
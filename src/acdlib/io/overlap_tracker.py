@@ -0,0 +1,234 @@
+"""
+Incremental overlap tracking for the capture orchestrator.
+
+Instead of rescanning tick partitions on every check, ``OverlapTracker`` is fed
+each tick timestamp as it is persisted (or the ``ts_local`` column of newly
+closed files) and keeps, per venue, a sorted list of covered intervals. A tick
+further than ``max_gap_s`` from the previous one starts a new interval, so the
+interval boundaries are the gap markers. Overlap queries then only touch the
+interval lists, never the tick files.
+"""
+
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .overlap import rolling_policy
+
+logger = logging.getLogger(__name__)
+
+# (start_ms, end_ms, venues covering the whole window)
+Window = Tuple[int, int, List[str]]
+
+
+class OverlapTracker:
+    """Per-venue coverage as merged [start, end] intervals of epoch milliseconds."""
+
+    def __init__(
+        self, venues: List[str], max_gap_s: float = 1.0, retention_s: Optional[float] = None
+    ):
+        """
+        Args:
+            venues: Venues expected to report ticks
+            max_gap_s: Largest tick spacing still counted as continuous coverage
+            retention_s: Drop intervals that ended this long before the newest tick
+        """
+        self.venues = list(venues)
+        self.max_gap_s = max_gap_s
+        self.retention_s = retention_s
+
+        self._max_gap_ms = int(round(max_gap_s * 1000))
+        self._starts: Dict[str, List[int]] = {venue: [] for venue in self.venues}
+        self._ends: Dict[str, List[int]] = {venue: [] for venue in self.venues}
+        self._ticks: Dict[str, int] = {venue: 0 for venue in self.venues}
+        self._seen_files: Set[Path] = set()
+
+    def add(self, venue: str, ts_ms: int) -> None:
+        """Record one tick timestamp (amortized O(1) for in-order ticks)."""
+        if venue not in self._starts:
+            self._starts[venue], self._ends[venue], self._ticks[venue] = [], [], 0
+        starts, ends = self._starts[venue], self._ends[venue]
+        self._ticks[venue] += 1
+
+        if ends and ts_ms >= ends[-1]:
+            if ts_ms - ends[-1] <= self._max_gap_ms:
+                ends[-1] = ts_ms
+                return
+            starts.append(ts_ms)
+            ends.append(ts_ms)
+            self._prune(venue, ts_ms)
+        elif not ends:
+            starts.append(ts_ms)
+            ends.append(ts_ms)
+        else:
+            self._merge(venue, ts_ms, ts_ms)
+
+    def add_many(self, venue: str, ts_ms: Iterable[int]) -> None:
+        """Record a batch of tick timestamps, e.g. the ts_local column of one file."""
+        values = np.sort(np.asarray(ts_ms, dtype=np.int64))
+        if len(values) == 0:
+            return
+
+        if venue not in self._starts:
+            self._starts[venue], self._ends[venue], self._ticks[venue] = [], [], 0
+        self._ticks[venue] += len(values)
+
+        # Split the batch at its own gaps and merge each run as one interval
+        breaks = np.flatnonzero(np.diff(values) > self._max_gap_ms) + 1
+        run_starts = values[np.concatenate(([0], breaks))]
+        run_ends = values[np.concatenate((breaks - 1, [len(values) - 1]))]
+        for start, end in zip(run_starts.tolist(), run_ends.tolist()):
+            self._merge(venue, start, end)
+        self._prune(venue, self._ends[venue][-1])
+
+    def ingest_files(self, root: str, pair: str, freq: str) -> int:
+        """
+        Tail tick partitions: read ``ts_local`` from files not seen before.
+
+        Args:
+            root: Tick root directory (``<root>/<venue>/<pair>/<freq>/<date>/<hour>``)
+            pair: Trading pair directory name
+            freq: Frequency directory name
+
+        Returns:
+            Number of new files ingested
+        """
+        ingested = 0
+        for venue in self.venues:
+            tick_dir = Path(root) / venue / pair / freq
+            if not tick_dir.exists():
+                continue
+            for file_path in sorted(tick_dir.glob("*/*/*.parquet")):
+                if file_path in self._seen_files:
+                    continue
+                try:
+                    column = pq.read_table(file_path, columns=["ts_local"]).column(0)
+                except Exception as e:
+                    logger.warning(f"Error reading {file_path}: {e}")
+                    continue
+                self._seen_files.add(file_path)
+                self.add_many(venue, column.to_numpy())
+                ingested += 1
+        return ingested
+
+    def coverage(self, venue: str) -> List[Tuple[int, int]]:
+        """Merged coverage intervals of a venue, oldest first."""
+        return list(zip(self._starts.get(venue, []), self._ends.get(venue, [])))
+
+    def longest_window(self, quorum: int) -> Optional[Window]:
+        """
+        Longest window continuously covered by at least ``quorum`` venues.
+
+        The best window ends where one of its venues' intervals ends, so each
+        interval end is tried as a candidate; for each, the window starts at the
+        quorum-th earliest start among the venues covering that end.
+
+        Args:
+            quorum: Minimum number of venues
+
+        Returns:
+            (start_ms, end_ms, venues) or None if fewer than quorum venues overlap
+        """
+        best: Optional[Window] = None
+        best_key = (-1, -1)
+        for venue in self._ends:
+            for end in self._ends[venue]:
+                containing = sorted(
+                    (self._starts[v][i], v)
+                    for v in self._ends
+                    for i in [bisect_right(self._starts[v], end) - 1]
+                    if i >= 0 and self._ends[v][i] >= end
+                )
+                if len(containing) < quorum:
+                    continue
+                start = containing[quorum - 1][0]
+                venues = [v for s, v in containing if s <= start]
+                key = (end - start, len(venues))
+                if key > best_key:
+                    best_key = key
+                    best = (start, end, sorted(venues, key=self._venue_order))
+        return best
+
+    def find_overlap(
+        self, min_minutes: List[int], quorum: int
+    ) -> Optional[Tuple[datetime, datetime, List[str], str]]:
+        """
+        Rolling-monitor overlap check from the tracked coverage.
+
+        Args:
+            min_minutes: Minimum window lengths to try, in order of preference
+            quorum: Minimum number of venues required
+
+        Returns:
+            Tuple of (start, end, venues_used, policy) if overlap found, None otherwise
+        """
+        window = self.longest_window(quorum)
+        minutes = (window[1] - window[0]) / 60_000 if window else 0.0
+        venues_used = window[2] if window else []
+        policy = rolling_policy(len(venues_used), minutes, min_minutes, quorum)
+
+        if policy is None:
+            pending_info = {
+                "minutes_max": round(minutes, 1),
+                "venues_ready": venues_used or [v for v in self.venues if self._ends.get(v)],
+                "venues_missing": [v for v in self.venues if v not in venues_used],
+            }
+            print(f"[OVERLAP:PENDING] {json.dumps(pending_info)}")
+            return None
+
+        start = pd.Timestamp(window[0], unit="ms", tz="UTC").to_pydatetime()
+        end = pd.Timestamp(window[1], unit="ms", tz="UTC").to_pydatetime()
+        excluded = [v for v in self.venues if v not in venues_used]
+        print(
+            f'[OVERLAP] {{"startUTC":"{start}","endUTC":"{end}",'
+            f'"minutes":{minutes:.1f},"venues":{venues_used},'
+            f'"excluded":{excluded},"policy":"{policy}"}}'
+        )
+        logger.info(
+            f"Found real overlap: {policy} with {len(venues_used)} venues "
+            f"for {minutes:.1f} minutes"
+        )
+        return start, end, venues_used, policy
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-venue tick count, interval count, gap count and latest coverage."""
+        summary = {}
+        for venue in self._ends:
+            starts, ends = self._starts[venue], self._ends[venue]
+            summary[venue] = {
+                "ticks": self._ticks[venue],
+                "intervals": len(ends),
+                "gaps": max(len(ends) - 1, 0),
+                "current_minutes": (ends[-1] - starts[-1]) / 60_000 if ends else 0.0,
+            }
+        return summary
+
+    def _merge(self, venue: str, start: int, end: int) -> None:
+        """Insert [start, end] and merge it with every interval within max_gap."""
+        starts, ends = self._starts[venue], self._ends[venue]
+        lo = bisect_left(ends, start - self._max_gap_ms)
+        hi = bisect_right(starts, end + self._max_gap_ms)
+        if lo < hi:
+            start, end = min(start, starts[lo]), max(end, ends[hi - 1])
+        starts[lo:hi] = [start]
+        ends[lo:hi] = [end]
+
+    def _prune(self, venue: str, now_ms: int) -> None:
+        if self.retention_s is None:
+            return
+        cutoff = now_ms - int(self.retention_s * 1000)
+        starts, ends = self._starts[venue], self._ends[venue]
+        stale = bisect_right(ends, cutoff)
+        if stale:
+            del starts[:stale]
+            del ends[:stale]
+
+    def _venue_order(self, venue: str) -> int:
+        return self.venues.index(venue) if venue in self.venues else len(self.venues)
@@ -0,0 +1,77 @@
+"""
+Tests for the synthetic minute and second bar adapters
+"""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.acd.data.adapters import MinuteBarsAdapter, SecondBarsAdapter
+from src.acd.data.adapters.base import SECOND_STREAM
+
+START = datetime(2025, 1, 1, 22, 0)
+END = datetime(2025, 1, 3, 1, 59)
+
+
+def test_minute_bars_are_seeded_and_continuous():
+    first = MinuteBarsAdapter().get("BTC-USD", "coinbase", START, END)
+    again = MinuteBarsAdapter().get("BTC-USD", "coinbase", START, END)
+    other = MinuteBarsAdapter(seed=7).get("BTC-USD", "coinbase", START, END)
+
+    assert len(first) == 28 * 60
+    pd.testing.assert_frame_equal(first, again)
+    assert not first["close"].equals(other["close"])
+    assert first["time"].is_monotonic_increasing
+    assert (first["high"] >= first[["open", "close"]].max(axis=1)).all()
+    assert (first["low"] <= first[["open", "close"]].min(axis=1)).all()
+
+
+def test_minute_chunks_are_days_and_match_get():
+    adapter = MinuteBarsAdapter()
+    chunks = list(adapter.iter_chunks("BTC-USD", "binance", START, END))
+
+    assert [len(chunk) for chunk in chunks] == [120, 1440, 120]
+    assert all(chunk["time"].dt.floor("1D").nunique() == 1 for chunk in chunks)
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), adapter.get("BTC-USD", "binance", START, END)
+    )
+
+
+def test_second_bars_expand_each_minute():
+    minutes = MinuteBarsAdapter().get("BTC-USD", "okx", START, START.replace(minute=9))
+    seconds = SecondBarsAdapter().get("BTC-USD", "okx", START, START.replace(minute=9))
+
+    assert len(seconds) == 60 * len(minutes)
+    assert seconds["time"].diff().dropna().eq(pd.Timedelta("1s")).all()
+    assert (seconds["open"] == seconds["close"]).all()
+    assert (seconds["high"] >= seconds["open"]).all() and (seconds["low"] <= seconds["open"]).all()
+    # Each minute's volume is split evenly over its seconds
+    per_minute = seconds["volume"].to_numpy().reshape(-1, 60)
+    assert (per_minute == per_minute[:, :1]).all()
+    assert abs(per_minute[:, 0] * 60 - minutes["volume"].to_numpy()).max() < 0.5
+
+
+def test_second_noise_is_independent_of_minute_returns():
+    adapter = SecondBarsAdapter()
+    day = pd.Timestamp("2025-01-02", tz="UTC")
+
+    minute_draws = adapter._day_rng(day).normal(0, 1, 10_000)
+    second_draws = adapter._day_rng(day, SECOND_STREAM).normal(0, 1, 10_000)
+
+    assert not np.allclose(minute_draws[:10], second_draws[:10])
+    assert abs(np.corrcoef(minute_draws, second_draws)[0, 1]) < 0.05
+    # Each stream stays reproducible per day
+    np.testing.assert_array_equal(
+        second_draws, adapter._day_rng(day, SECOND_STREAM).normal(0, 1, 10_000)
+    )
+
+
+def test_second_chunks_match_get():
+    adapter = SecondBarsAdapter()
+    chunks = list(adapter.iter_chunks("BTC-USD", "binance", START, END))
+
+    assert len(chunks) == 3
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks, ignore_index=True), adapter.get("BTC-USD", "binance", START, END)
+    )
@@ -0,0 +1,263 @@
+"""
+Tests for the partitioned parquet DataCache
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.data import cache as cache_module
+from src.acd.data.cache import CATALOG_FILE, DataCache
+
+
+@pytest.fixture
+def minute_bars():
+    times = pd.date_range("2025-01-01", periods=3 * 24 * 60, freq="1min", tz="UTC")
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"time": times, "close": 50000 + np.cumsum(rng.normal(0, 5, len(times)))})
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DataCache(str(tmp_path / "cache"))
+
+
+def test_put_writes_daily_partitions_and_catalog(cache, minute_bars):
+    cache.put("Binance", "BTC-USD", "1min", minute_bars)
+
+    path = cache.get_cache_path("binance", "BTC-USD", "1min")
+    with open(os.path.join(path, CATALOG_FILE)) as f:
+        catalog = json.load(f)
+
+    assert sorted(catalog["partitions"]) == [
+        "2025-01-01.000000.parquet",
+        "2025-01-02.000000.parquet",
+        "2025-01-03.000000.parquet",
+    ]
+    assert all(entry["rows"] == 1440 for entry in catalog["partitions"].values())
+    assert cache.verify("binance", "BTC-USD", "1min") == []
+    # The dataset directory still reads as one frame
+    assert len(pd.read_parquet(path)) == len(minute_bars)
+
+
+def test_sub_minute_data_is_partitioned_by_hour(cache):
+    times = pd.date_range("2025-01-01 10:30", periods=7200, freq="1s")
+    cache.put("okx", "BTC-USD", "1s", pd.DataFrame({"timestamp": times, "mid": 1.0}))
+
+    info = cache.get_cache_info("okx", "BTC-USD", "1s")
+    assert info["partitions"] == 3
+    assert info["rows"] == 7200
+
+
+def test_get_reads_only_overlapping_partitions(cache, minute_bars, monkeypatch):
+    cache.put("binance", "BTC-USD", "1min", minute_bars)
+    opened = []
+    original = cache_module.ds.dataset
+    monkeypatch.setattr(
+        cache_module.ds,
+        "dataset",
+        lambda files, **kw: opened.extend(files) or original(files, **kw),
+    )
+
+    start = pd.Timestamp("2025-01-02 06:00", tz="UTC")
+    end = pd.Timestamp("2025-01-02 07:00", tz="UTC")
+    result = cache.get("binance", "BTC-USD", "1min", start, end)
+
+    expected = minute_bars[(minute_bars["time"] >= start) & (minute_bars["time"] <= end)]
+    pd.testing.assert_frame_equal(result, expected.reset_index(drop=True))
+    assert [os.path.basename(f) for f in opened] == ["2025-01-02.000000.parquet"]
+
+
+def test_get_accepts_naive_bounds_and_naive_data(cache):
+    times = pd.date_range("2025-03-01", periods=600, freq="1min")
+    cache.put("kraken", "BTC-USD", "1min", pd.DataFrame({"time": times, "close": 1.0}))
+
+    result = cache.get("kraken", "BTC-USD", "1min", times[10].to_pydatetime(), times[19])
+
+    assert len(result) == 10
+    assert str(result["time"].dt.tz) == "UTC"
+
+
+def test_metadata_queries_do_not_read_data(cache, minute_bars, monkeypatch):
+    cache.put("coinbase", "BTC-USD", "1min", minute_bars)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("data file read")
+
+    monkeypatch.setattr(cache_module.pd, "read_parquet", fail)
+    monkeypatch.setattr(cache_module.ds, "dataset", fail)
+
+    assert cache.exists("coinbase", "BTC-USD", "1min")
+    info = cache.get_cache_info("coinbase", "BTC-USD", "1min")
+    assert info["rows"] == len(minute_bars)
+    assert info["start_time"] == minute_bars["time"].min()
+    assert info["end_time"] == minute_bars["time"].max()
+
+
+def test_missing_catalog_is_rebuilt_from_footers(cache, minute_bars):
+    cache.put("bybit", "BTC-USD", "1min", minute_bars)
+    path = cache.get_cache_path("bybit", "BTC-USD", "1min")
+    os.remove(os.path.join(path, CATALOG_FILE))
+
+    info = cache.get_cache_info("bybit", "BTC-USD", "1min")
+
+    assert info["rows"] == len(minute_bars)
+    assert info["end_time"] == minute_bars["time"].max()
+    assert os.path.exists(os.path.join(path, CATALOG_FILE))
+
+
+def test_upsert_after_catalog_rebuild_keeps_hourly_partitions(cache):
+    times = pd.date_range("2024-01-01", periods=7200, freq="1s", tz="UTC")
+    cache.put("okx", "BTC-USD", "1s", pd.DataFrame({"timestamp": times, "mid": 1.0}))
+    path = cache.get_cache_path("okx", "BTC-USD", "1s")
+    os.remove(os.path.join(path, CATALOG_FILE))
+
+    overlap = pd.DataFrame({"timestamp": times[-100:], "mid": 2.0})
+    stats = cache.append("okx", "BTC-USD", "1s", overlap)
+
+    assert stats["segments_merged"] == 1
+    result = cache.get("okx", "BTC-USD", "1s", times[0], times[-1])
+    assert len(result) == 7200 and result["timestamp"].is_unique
+    assert (result["mid"].iloc[-100:] == 2.0).all()
+    assert set(os.listdir(path)) == {CATALOG_FILE, "2024-01-01"}
+
+
+def test_legacy_single_file_is_migrated(cache, minute_bars):
+    path = cache.get_cache_path("binance", "ETH-USD", "1min")
+    os.makedirs(os.path.dirname(path))
+    minute_bars.to_parquet(path, index=False)
+
+    assert cache.exists("binance", "ETH-USD", "1min")
+    result = cache.get("binance", "ETH-USD", "1min", minute_bars["time"][0], minute_bars["time"][9])
+
+    assert len(result) == 10
+    assert os.path.isdir(path)
+
+
+def test_verify_detects_corruption(cache, minute_bars):
+    cache.put("binance", "BTC-USD", "1min", minute_bars)
+    partition = os.path.join(
+        cache.get_cache_path("binance", "BTC-USD", "1min"), "2025-01-02.000000.parquet"
+    )
+    with open(partition, "ab") as f:
+        f.write(b"junk")
+
+    assert cache.verify("binance", "BTC-USD", "1min") == ["2025-01-02.000000.parquet"]
+
+
+def test_clear_cache_removes_datasets(cache, minute_bars):
+    cache.put("binance", "BTC-USD", "1min", minute_bars)
+    cache.put("binance", "BTC-USD", "5min", minute_bars.iloc[::5])
+    cache.put("okx", "BTC-USD", "1min", minute_bars)
+
+    assert cache.clear_cache(venue="binance") == 2
+    assert not cache.exists("binance", "BTC-USD", "1min")
+    assert cache.exists("okx", "BTC-USD", "1min")
+    assert cache.clear_cache("okx", "BTC-USD", "1min") == 1
+
+
+def test_append_new_hour_reads_no_cached_data(cache, minute_bars, monkeypatch):
+    history, new_hour = minute_bars.iloc[:-60], minute_bars.iloc[-60:]
+    cache.put("binance", "BTC-USD", "1min", history)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached data read")
+
+    monkeypatch.setattr(cache_module.pd, "read_parquet", fail)
+    stats = cache.append("binance", "BTC-USD", "1min", new_hour)
+    monkeypatch.undo()
+
+    assert stats == {"rows": 60, "segments_written": 1, "segments_merged": 0}
+    info = cache.get_cache_info("binance", "BTC-USD", "1min")
+    assert info["partitions"] == 4
+    assert info["rows"] == len(minute_bars)
+    result = cache.get("binance", "BTC-USD", "1min", minute_bars["time"].min(), info["end_time"])
+    pd.testing.assert_frame_equal(result, minute_bars.reset_index(drop=True))
+
+
+def test_append_upserts_overlapping_rows(cache, minute_bars):
+    cache.put("binance", "BTC-USD", "1min", minute_bars.iloc[:1500])
+    update = minute_bars.iloc[1400:1600].copy()
+    update["close"] = -1.0
+
+    stats = cache.append("binance", "BTC-USD", "1min", update)
+
+    # The update overlaps the tail of day one and the head of day two
+    assert stats["segments_merged"] == 2
+    result = cache.get(
+        "binance", "BTC-USD", "1min", minute_bars["time"].min(), minute_bars["time"].max()
+    )
+    assert len(result) == 1600
+    assert result["time"].is_unique and result["time"].is_monotonic_increasing
+    assert (result["close"].iloc[1400:] == -1.0).all()
+    assert cache.verify("binance", "BTC-USD", "1min") == []
+
+
+def test_partition_files_list_in_write_order(cache):
+    times = pd.date_range("2025-01-01", periods=7200, freq="1s", tz="UTC")
+    frame = pd.DataFrame({"timestamp": times, "mid": np.arange(7200.0)})
+    cache.put("okx", "BTC-USD", "1s", frame.iloc[:1800])
+    for start in range(1800, 7200, 1800):
+        cache.append("okx", "BTC-USD", "1s", frame.iloc[start : start + 1800])
+
+    # Base files carry a sequence too, so appended segments sort after them
+    path = cache.get_cache_path("okx", "BTC-USD", "1s")
+    hour = os.path.join(path, "2025-01-01")
+    assert sorted(os.listdir(hour)) == [
+        "00.000000.parquet",
+        "00.000001.parquet",
+        "01.000002.parquet",
+        "01.000003.parquet",
+    ]
+    result = pd.read_parquet(path)
+    assert result["timestamp"].is_monotonic_increasing and len(result) == 7200
+
+
+def test_metadata_is_stored_once_per_file(cache, minute_bars):
+    cache.put("okx", "BTC-USD", "1min", minute_bars.iloc[:100], metadata={"source": "rest"})
+    cache.append("okx", "BTC-USD", "1min", minute_bars.iloc[100:200], metadata={"run": 2})
+
+    result = cache.get("okx", "BTC-USD", "1min", minute_bars["time"][0], minute_bars["time"][199])
+    assert list(result.columns) == ["time", "close"]
+    assert cache.get_metadata("okx", "BTC-USD", "1min") == {"source": "rest", "run": 2}
+
+    path = cache.get_cache_path("okx", "BTC-USD", "1min")
+    os.remove(os.path.join(path, CATALOG_FILE))
+    assert cache.get_metadata("okx", "BTC-USD", "1min") == {"source": "rest", "run": 2}
+
+
+def test_compaction_merges_segments(cache, minute_bars):
+    day = minute_bars.iloc[:1440]
+    cache.put("kraken", "BTC-USD", "1min", day.iloc[:60])
+    for start in range(60, 1440, 60):
+        cache.append("kraken", "BTC-USD", "1min", day.iloc[start : start + 60])
+    cache.wait_for_compaction()
+
+    # Background compaction kept the partition from accumulating segments
+    info = cache.get_cache_info("kraken", "BTC-USD", "1min")
+    assert info["partitions"] < cache_module.COMPACT_FILE_THRESHOLD
+
+    cache.compact("kraken", "BTC-USD", "1min")
+    assert cache.get_cache_info("kraken", "BTC-USD", "1min")["partitions"] == 1
+    result = cache.get("kraken", "BTC-USD", "1min", day["time"].min(), day["time"].max())
+    pd.testing.assert_frame_equal(result, day.reset_index(drop=True))
+
+
+def test_legacy_meta_columns_become_metadata(cache, minute_bars):
+    path = cache.get_cache_path("bybit", "ETH-USD", "1min")
+    os.makedirs(os.path.dirname(path))
+    minute_bars.assign(_meta_source="synthetic").to_parquet(path, index=False)
+
+    result = cache.get("bybit", "ETH-USD", "1min", minute_bars["time"][0], minute_bars["time"][9])
+
+    assert "_meta_source" not in result.columns
+    assert cache.get_metadata("bybit", "ETH-USD", "1min") == {"source": "synthetic"}
+
+
+def test_append_rejects_mismatched_columns(cache, minute_bars):
+    cache.put("binance", "BTC-USD", "1min", minute_bars.iloc[:10])
+    with pytest.raises(ValueError):
+        cache.append("binance", "BTC-USD", "1min", minute_bars.iloc[10:20].assign(volume=1.0))
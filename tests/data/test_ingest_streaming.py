@@ -0,0 +1,155 @@
+"""
+Tests for chunked, parallel ingestion into partitioned parquet
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.data.ingest import DataIngestion, DataIngestionConfig, DataIngestionError
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(0)
+    n = 5000
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=n, freq="1min"),
+            "firm_0_price": rng.normal(100, 10, n),
+            "firm_1_price": rng.normal(100, 10, n),
+            "volume": rng.exponential(1000, n),
+        }
+    )
+
+
+@pytest.fixture
+def ingestion():
+    # Tiny size limit: streamed files must not be rejected by it
+    return DataIngestion(DataIngestionConfig(max_file_size_mb=0.01, chunk_rows=1000))
+
+
+def test_streams_csv_in_chunks_into_date_partitions(tmp_path, market_data, ingestion):
+    source = tmp_path / "feed.csv"
+    market_data.to_csv(source, index=False, sep=";")
+
+    report = ingestion.ingest_file_streaming(source, "independent", tmp_path / "out")
+
+    assert report["success"] and report["rows"] == len(market_data)
+    assert report["chunks"] == 5
+    assert report["rows_per_sec"] > 0 and report["mb_per_sec"] > 0
+    dataset = tmp_path / "out" / "feed"
+    assert sorted(p.name for p in dataset.iterdir()) == [
+        "date=2024-01-01",
+        "date=2024-01-02",
+        "date=2024-01-03",
+        "date=2024-01-04",
+    ]
+    result = pd.read_parquet(dataset).sort_values("timestamp").reset_index(drop=True)
+    pd.testing.assert_series_equal(result["firm_0_price"], market_data["firm_0_price"])
+    assert ingestion.get_ingestion_stats()["total_records"] == len(market_data)
+
+
+def test_stream_directory_processes_files_in_parallel(tmp_path, market_data, ingestion):
+    source_dir = tmp_path / "in"
+    source_dir.mkdir()
+    for i in range(4):
+        market_data.iloc[i * 1000 : (i + 1) * 1000].to_csv(source_dir / f"f{i}.csv", index=False)
+    records = market_data.iloc[4000:].assign(timestamp=lambda d: d["timestamp"].astype(str))
+    with open(source_dir / "f4.json", "w") as f:
+        f.write("\n".join(json.dumps(row) for row in records.to_dict("records")))
+
+    reports = ingestion.stream_directory(source_dir, "independent", tmp_path / "out", max_workers=3)
+
+    assert [r["file"].split("/")[-1] for r in reports] == [
+        "f0.csv",
+        "f1.csv",
+        "f2.csv",
+        "f3.csv",
+        "f4.json",
+    ]
+    assert all(r["success"] for r in reports)
+    assert sum(r["rows"] for r in reports) == len(market_data)
+    assert ingestion.get_ingestion_stats()["successful_ingestions"] == 5
+
+
+def test_stream_directory_rejects_files_sharing_a_stem(tmp_path, market_data, ingestion):
+    source_dir = tmp_path / "in"
+    source_dir.mkdir()
+    market_data.iloc[:1000].to_csv(source_dir / "f.csv", index=False)
+    market_data.iloc[1000:2000].to_parquet(source_dir / "f.parquet", index=False)
+
+    with pytest.raises(DataIngestionError, match="f.csv"):
+        ingestion.stream_directory(source_dir, "independent", tmp_path / "out")
+
+    assert not (tmp_path / "out").exists()
+
+
+def test_failed_chunk_leaves_no_partial_dataset(tmp_path, market_data, ingestion):
+    broken = market_data.drop(columns=["firm_0_price", "firm_1_price"])
+    broken.to_csv(tmp_path / "bad.csv", index=False)
+
+    with pytest.raises(DataIngestionError):
+        ingestion.ingest_file_streaming(tmp_path / "bad.csv", "independent", tmp_path / "out")
+
+    assert not any((tmp_path / "out").glob("bad*"))
+    assert ingestion.get_ingestion_stats()["failed_ingestions"] == 1
+
+
+def test_explicit_dtypes_are_applied_while_parsing(tmp_path, ingestion):
+    data = pd.DataFrame(
+        {"timestamp": ["2024-01-01"] * 3, "price": [1, 2, 3], "code": ["01", "02", "03"]}
+    )
+    data.to_csv(tmp_path / "typed.csv", index=False)
+
+    ingestion.ingest_file_streaming(
+        tmp_path / "typed.csv",
+        "independent",
+        tmp_path / "out",
+        schema_override={"dtypes": {"price": "float64", "code": "str"}},
+    )
+
+    result = pd.read_parquet(tmp_path / "out" / "typed")
+    assert result["price"].dtype == "float64"
+    assert result["code"].tolist() == ["01", "02", "03"]
+
+
+def test_column_filled_after_the_first_chunk_keeps_its_text(tmp_path):
+    ingestion = DataIngestion(DataIngestionConfig(chunk_rows=5))
+    data = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-01-01", periods=12, freq="1min").astype(str),
+            "price": np.arange(12.0),
+            "note": [None] * 7 + ["late fill"] * 5,
+        }
+    )
+    data.to_csv(tmp_path / "late.csv", index=False)
+
+    report = ingestion.ingest_file_streaming(tmp_path / "late.csv", "independent", tmp_path / "out")
+
+    result = pd.read_parquet(tmp_path / "out" / "late").sort_values("timestamp")
+    assert report["rows"] == 12 and report["chunks"] == 3
+    assert result["note"].isna().sum() == 7
+    assert result["note"].dropna().tolist() == ["late fill"] * 5
+
+
+def test_values_that_do_not_fit_the_first_chunk_dtype_become_missing(tmp_path, caplog):
+    ingestion = DataIngestion(DataIngestionConfig(chunk_rows=5))
+    with open(tmp_path / "mixed.json", "w") as f:
+        for i in range(12):
+            size = "n/a" if i == 9 else (None if i == 10 else i)
+            f.write(json.dumps({"timestamp": f"2024-01-01 00:{i:02d}", "price": i, "size": size}))
+            f.write("\n")
+
+    report = ingestion.ingest_file_streaming(
+        tmp_path / "mixed.json", "independent", tmp_path / "out"
+    )
+
+    result = pd.read_parquet(tmp_path / "out" / "mixed", dtype_backend="numpy_nullable")
+    result = result.sort_values("timestamp")
+    assert report["rows"] == 12
+    assert pd.api.types.is_integer_dtype(result["size"])
+    assert result["size"].isna().tolist() == [False] * 9 + [True, True, False]
+    assert "1 values of column 'size'" in caplog.text
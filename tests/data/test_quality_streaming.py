@@ -0,0 +1,120 @@
+"""
+Tests for the mergeable, chunked data quality profile
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.data.ingest import DataIngestion, DataIngestionConfig
+from src.acd.data.quality import (
+    DataQualityAssessment,
+    QualityProfile,
+    QuantileSketch,
+    create_quality_config,
+    profile_chunks,
+)
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(0)
+    n = 20_000
+    data = pd.DataFrame(
+        {
+            "timestamp": pd.date_range(
+                pd.Timestamp.now(tz="UTC") - pd.Timedelta("1h"), periods=n, freq="100ms"
+            ),
+            "bid_price": rng.normal(100, 5, n),
+            "ask_price": rng.normal(101, 5, n),
+            "volume": rng.standard_t(3, n) * 100,
+            "venue": "binance",
+        }
+    )
+    data.loc[rng.choice(n, 300, replace=False), "volume"] = np.nan
+    return data
+
+
+@pytest.fixture
+def assessment():
+    return DataQualityAssessment(create_quality_config(strict_quality_thresholds=False))
+
+
+def _split(data, parts):
+    bounds = np.linspace(0, len(data), parts + 1).astype(int)
+    return [data.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _without_age(metrics):
+    fields = dict(vars(metrics))
+    fields.pop("data_age_hours")
+    return fields
+
+
+def test_merged_chunk_profiles_reproduce_in_memory_metrics(market_data, assessment):
+    exact = assessment.assess_quality(market_data)
+
+    # Parallel workers each profile a slice; the profiles are merged afterwards
+    workers = [profile_chunks(_split(part, 3)) for part in _split(market_data, 4)]
+    merged = workers[0]
+    for profile in workers[1:]:
+        merged.merge(profile)
+    streamed = assessment.assess_profile(merged)
+
+    assert exact.consistency_errors and exact.outlier_count > 0
+    expected, actual = _without_age(exact), _without_age(streamed)
+    assert actual.pop("outlier_count") == pytest.approx(expected.pop("outlier_count"), rel=0.01)
+    for name in ("outlier_rate", "overall_quality_score"):
+        assert actual.pop(name) == pytest.approx(expected.pop(name), rel=0.01)
+    assert actual == expected
+
+
+def test_column_moments_and_quantiles(market_data):
+    profile = profile_chunks(_split(market_data, 5))
+    volume = profile.columns["volume"]
+
+    assert volume.nulls == 300 and volume.n == len(market_data) - 300
+    assert volume.mean == pytest.approx(market_data["volume"].mean())
+    assert volume.std == pytest.approx(market_data["volume"].std())
+    assert (volume.min, volume.max) == (market_data["volume"].min(), market_data["volume"].max())
+    for q in (0.01, 0.5, 0.99):
+        expected = market_data["volume"].quantile(q)
+        assert volume.quantile(q) == pytest.approx(expected, rel=0.01, abs=1.0)
+    assert not profile.columns["venue"].numeric
+
+
+def test_columns_missing_from_a_chunk_count_as_null():
+    first = pd.DataFrame({"price": [1.0, 2.0]})
+    second = pd.DataFrame({"price": [3.0], "volume": [10.0]})
+
+    profile = profile_chunks([first, second])
+
+    assert profile.total_records == 3
+    assert profile.complete_records == 1
+    assert profile.columns["volume"].nulls == 2
+    assert profile.columns["price"].mean == pytest.approx(2.0)
+
+
+def test_sketch_merge_requires_matching_accuracy():
+    sketch = QuantileSketch(0.01).update(np.array([-5.0, 0.0, 1.0, 2.0, 3.0]))
+
+    assert sketch.count == 5
+    assert sketch.quantile(0.0) == pytest.approx(-5.0, rel=0.01)
+    assert sketch.quantile(1.0) == pytest.approx(3.0, rel=0.01)
+    with pytest.raises(ValueError):
+        sketch.merge(QuantileSketch(0.02))
+    with pytest.raises(ValueError):
+        QualityProfile(sketch_alpha=0.01).merge(QualityProfile(sketch_alpha=0.02))
+
+
+def test_streaming_ingestion_reports_a_quality_profile(tmp_path, market_data, assessment):
+    source = tmp_path / "feed.parquet"
+    market_data.to_parquet(source)
+    ingestion = DataIngestion(DataIngestionConfig(chunk_rows=4000))
+
+    report = ingestion.ingest_file_streaming(source, "independent", tmp_path / "out")
+
+    profile = report["quality_profile"]
+    assert profile.total_records == len(market_data)
+    metrics = assessment.assess_profile(profile)
+    assert metrics.missing_values_by_column["volume"] == 300
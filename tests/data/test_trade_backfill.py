@@ -0,0 +1,267 @@
+"""
+Tests for the async trade backfill against a local fake exchange
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+from aiohttp import web  # noqa: E402
+
+from src.acd.data.adapters.real_tick_adapters import RealTickAdapter  # noqa: E402
+from src.acd.data.adapters.trade_backfill import (  # noqa: E402
+    CHECKPOINT_KEY,
+    BackfillConfig,
+    TokenBucket,
+    backfill_trades,
+    chunk_windows,
+)
+from src.acd.data.cache import DataCache  # noqa: E402
+
+START = pd.Timestamp("2025-01-01 00:00", tz="UTC")
+END = pd.Timestamp("2025-01-01 02:00", tz="UTC")
+
+
+def _trade_times_ms(n=7000):
+    # ~1 trade/s, with every tenth trade sharing the previous trade's millisecond
+    offsets = np.arange(n) * 1030
+    offsets[1::10] = offsets[0::10][: len(offsets[1::10])]
+    return START.value // 1_000_000 + offsets
+
+
+class FakeExchange:
+    """Binance, Kraken, Coinbase and Bybit trade endpoints over one in-memory trade list."""
+
+    def __init__(self):
+        self.times_ms = _trade_times_ms()
+        self.requests = []
+        self.fail_from_ms = None
+        self.fail_before_ms = None
+
+    def app(self):
+        app = web.Application()
+        app.router.add_get("/api/v3/aggTrades", self.binance)
+        app.router.add_get("/0/public/Trades", self.kraken)
+        app.router.add_get("/products/BTC-USD/trades", self.coinbase)
+        app.router.add_get("/v5/market/recent-trade", self.bybit)
+        return app
+
+    async def binance(self, request):
+        params = dict(request.query)
+        self.requests.append(("binance", params))
+        limit = int(params["limit"])
+        if "fromId" in params:
+            ids = np.arange(int(params["fromId"]), len(self.times_ms))
+        else:
+            start, end = int(params["startTime"]), int(params["endTime"])
+            if self.fail_from_ms is not None and start >= self.fail_from_ms:
+                return web.Response(status=500)
+            ids = np.flatnonzero((self.times_ms >= start) & (self.times_ms <= end))
+        ids = ids[:limit]
+        body = [{"a": int(i), "p": "50000.0", "q": "0.1", "T": int(self.times_ms[i])} for i in ids]
+        return web.json_response(body)
+
+    async def kraken(self, request):
+        params = dict(request.query)
+        self.requests.append(("kraken", params))
+        since = int(params["since"])
+        times_ns = self.times_ms * 1_000_000
+        # First request: since in seconds (inclusive); later: the "last" cursor in ns
+        mask = times_ns >= since * 10**9 if since < 10**12 else times_ns > since
+        ids = np.flatnonzero(mask)[: int(params["count"])]
+        rows = [["50000.0", "0.1", self.times_ms[i] / 1000, "b", "l", "", int(i)] for i in ids]
+        last = str(times_ns[ids[-1]]) if len(ids) else str(since)
+        return web.json_response({"error": [], "result": {"XXBTZUSD": rows, "last": last}})
+
+    async def coinbase(self, request):
+        params = dict(request.query)
+        self.requests.append(("coinbase", params))
+        # No time bounds: pages run backward from the newest trade via "after"
+        ids = np.arange(int(params.get("after", len(self.times_ms))))[::-1]
+        ids = ids[: int(params["limit"])]
+        if self.fail_before_ms is not None and self.times_ms[ids[0]] < self.fail_before_ms:
+            return web.Response(status=500)
+        body = [
+            {
+                "time": pd.Timestamp(int(self.times_ms[i]), unit="ms", tz="UTC").isoformat(),
+                "price": "50000.0",
+                "size": "0.1",
+                "trade_id": int(i),
+            }
+            for i in ids
+        ]
+        return web.json_response(body)
+
+    async def bybit(self, request):
+        params = dict(request.query)
+        self.requests.append(("bybit", params))
+        # Only the most recent trades, newest first, and no way to page further back
+        ids = np.arange(len(self.times_ms))[::-1][: int(params["limit"])]
+        rows = [
+            {"time": str(self.times_ms[i]), "price": "50000.0", "size": "0.1", "execId": str(i)}
+            for i in ids
+        ]
+        return web.json_response({"retCode": 0, "result": {"list": rows}})
+
+
+def _run_backfill(exchange, cache, venues, **config_kwargs):
+    async def run():
+        runner = web.AppRunner(exchange.app())
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = runner.addresses[0][:2]
+        base_url = f"http://{host}:{port}"
+        config = BackfillConfig(
+            base_urls={venue: base_url for venue in venues},
+            rate_limits={venue: 1000.0 for venue in venues},
+            backoff_s=0.01,
+            **config_kwargs,
+        )
+        try:
+            return await backfill_trades(venues, "BTC-USD", START, END, cache, config)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+def test_chunk_windows_align_to_hours():
+    windows = chunk_windows(START + pd.Timedelta("30min"), END)
+
+    assert windows == [
+        (START.value // 10**6 + 1_800_000, START.value // 10**6 + 3_600_000 - 1),
+        (START.value // 10**6 + 3_600_000, END.value // 10**6 - 1),
+    ]
+
+
+def test_backfill_pages_through_every_venue_and_chunk(tmp_path):
+    exchange = FakeExchange()
+    cache = DataCache(str(tmp_path / "cache"))
+
+    results = _run_backfill(exchange, cache, ["binance", "kraken"])
+
+    expected = int(np.sum(exchange.times_ms < END.value // 1_000_000))
+    for venue in ["binance", "kraken"]:
+        assert results[venue].errors == []
+        assert results[venue].trades == expected
+        cached = cache.get(venue, "BTC-USD", "1s", START, END)
+        # Trades sharing a millisecond are all kept
+        assert len(cached) == expected
+        assert cached["trade_id"].is_unique
+        assert len(cache.get_metadata(venue, "BTC-USD", "1s")[CHECKPOINT_KEY]) == 2
+    # More than one page per chunk was needed
+    assert sum(1 for venue, _ in exchange.requests if venue == "binance") > 4
+
+
+def test_interrupted_backfill_resumes_missing_chunks(tmp_path):
+    second_hour = START.value // 1_000_000 + 3_600_000
+    exchange = FakeExchange()
+    exchange.fail_from_ms = second_hour
+    cache = DataCache(str(tmp_path / "cache"))
+
+    first = _run_backfill(exchange, cache, ["binance"], max_retries=1)
+
+    assert first["binance"].chunks == 1
+    assert len(first["binance"].errors) == 1
+
+    exchange.fail_from_ms = None
+    exchange.requests.clear()
+    second = _run_backfill(exchange, cache, ["binance"])
+
+    assert second["binance"].chunks_skipped == 1
+    assert second["binance"].chunks == 1
+    first_pages = [params for _, params in exchange.requests if "startTime" in params]
+    assert [int(params["startTime"]) for params in first_pages] == [second_hour]
+    cached = cache.get("binance", "BTC-USD", "1s", START, END)
+    assert len(cached) == int(np.sum(exchange.times_ms < END.value // 1_000_000))
+
+
+def test_backward_paging_venue_is_walked_once(tmp_path):
+    exchange = FakeExchange()
+    cache = DataCache(str(tmp_path / "cache"))
+
+    results = _run_backfill(exchange, cache, ["coinbase"])
+
+    expected = int(np.sum(exchange.times_ms < END.value // 1_000_000))
+    assert results["coinbase"].errors == []
+    assert results["coinbase"].chunks == 2
+    cached = cache.get("coinbase", "BTC-USD", "1s", START, END)
+    assert len(cached) == expected and cached["trade_id"].is_unique
+    # One walk from the newest trade back past the range start, not one per chunk
+    pages_needed = -(-len(exchange.times_ms) // 1000)
+    assert len(exchange.requests) == pages_needed
+    assert [params.get("after") for _, params in exchange.requests].count(None) == 1
+
+
+def test_backward_walk_drops_pages_newer_than_the_range(tmp_path, monkeypatch):
+    exchange = FakeExchange()
+    # Over an hour of trades after the range end, several pages' worth
+    exchange.times_ms = _trade_times_ms(12_000)
+    cache = DataCache(str(tmp_path / "cache"))
+    combined = []
+    original = RealTickAdapter._combine_pages
+
+    def recording(self, pages, start_ts, end_ts):
+        combined.extend(pages)
+        return original(self, pages, start_ts, end_ts)
+
+    monkeypatch.setattr(RealTickAdapter, "_combine_pages", recording)
+    results = _run_backfill(exchange, cache, ["coinbase"])
+
+    end_ms = END.value // 1_000_000
+    assert results["coinbase"].errors == []
+    assert len(exchange.requests) > len(combined)
+    assert all(page["timestamp"].min().value // 1_000_000 <= end_ms for page in combined)
+    cached = cache.get("coinbase", "BTC-USD", "1s", START, END)
+    assert len(cached) == int(np.sum(exchange.times_ms < end_ms))
+
+
+def test_recent_trades_venue_is_fetched_once(tmp_path):
+    exchange = FakeExchange()
+    cache = DataCache(str(tmp_path / "cache"))
+
+    results = _run_backfill(exchange, cache, ["bybit"])
+
+    # The single recent page covers part of the last hour; older chunks stay unfilled
+    recent = exchange.times_ms[-1000:]
+    assert results["bybit"].errors == []
+    assert len(exchange.requests) == 1
+    cached = cache.get("bybit", "BTC-USD", "1s", START, END)
+    assert len(cached) == int(np.sum(recent < END.value // 1_000_000))
+
+
+def test_interrupted_backward_walk_keeps_newer_chunks(tmp_path):
+    second_hour = START.value // 1_000_000 + 3_600_000
+    exchange = FakeExchange()
+    exchange.fail_before_ms = second_hour
+    cache = DataCache(str(tmp_path / "cache"))
+
+    first = _run_backfill(exchange, cache, ["coinbase"], max_retries=1)
+
+    assert first["coinbase"].chunks == 1
+    assert len(first["coinbase"].errors) == 1
+    assert first["coinbase"].errors[0].startswith(f"{START.value // 1_000_000}-")
+
+    exchange.fail_before_ms = None
+    second = _run_backfill(exchange, cache, ["coinbase"])
+
+    assert second["coinbase"].chunks_skipped == 1
+    assert second["coinbase"].chunks == 1
+    cached = cache.get("coinbase", "BTC-USD", "1s", START, END)
+    assert len(cached) == int(np.sum(exchange.times_ms < END.value // 1_000_000))
+
+
+def test_token_bucket_limits_request_rate():
+    async def run():
+        bucket = TokenBucket(rate=100.0, capacity=1.0)
+        started = time.monotonic()
+        for _ in range(21):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.19
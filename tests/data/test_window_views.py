@@ -0,0 +1,93 @@
+"""
+Tests for the offset-backed WindowedData views
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.data.features import DataWindowing, WindowConfig
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(4)
+    dates = pd.date_range("2024-01-01", periods=500, freq="min")
+    return pd.DataFrame(
+        {
+            "firm_0_price": rng.normal(100, 1, 500),
+            "firm_1_price": rng.normal(100, 1, 500),
+            "venue": ["a", "b"] * 250,
+        },
+        index=dates,
+    )
+
+
+def _windowed(data, window_type="fixed", window_size=100, step_size=10):
+    config = WindowConfig(
+        window_size=window_size,
+        step_size=step_size,
+        min_data_points=50,
+        window_type=window_type,
+    )
+    return DataWindowing(config).create_windows(data, ["firm_0_price", "firm_1_price"])
+
+
+def test_windows_match_iloc_slices(market_data):
+    windowed = _windowed(market_data)
+
+    assert len(windowed) == 41
+    for i in (0, 17, 40):
+        expected = market_data.iloc[i * 10 : i * 10 + 100].copy()
+        expected["window_index"] = i
+        pd.testing.assert_frame_equal(windowed.get_window(i), expected)
+    pd.testing.assert_frame_equal(windowed.windows[-1], windowed.get_window(40))
+
+
+def test_price_views_share_one_array(market_data):
+    windowed = _windowed(market_data)
+
+    view = windowed.window_values(3)
+    assert np.shares_memory(view, windowed.values)
+    assert not view.flags.writeable
+    np.testing.assert_array_equal(view, market_data[["firm_0_price", "firm_1_price"]][30:130])
+    with pytest.raises(ValueError):
+        view[0, 0] = 0.0
+
+
+def test_sliding_values_cover_all_windows(market_data):
+    windowed = _windowed(market_data)
+
+    sliding = windowed.sliding_values()
+    assert sliding.shape == (41, 100, 2)
+    assert np.shares_memory(sliding, windowed.values)
+    for i in (0, 25, 40):
+        np.testing.assert_array_equal(sliding[i], windowed.window_values(i))
+
+
+def test_rolling_windows_materialize_features(market_data):
+    windowed = _windowed(market_data, window_type="rolling", step_size=50)
+
+    window = windowed.get_window(2)
+    assert window["rolling_start"].iloc[0] == 100
+    assert window["rolling_end"].iloc[0] == 200
+    assert "firm_0_price_rolling_mean" in window.columns
+    assert "firm_0_price_rolling_mean" in windowed.get_window_metadata(2)["feature_columns"]
+
+
+def test_windows_below_min_points_are_dropped(market_data):
+    windowed = _windowed(market_data, window_size=40)
+
+    assert len(windowed) == 0
+    assert windowed.metadata["total_windows"] == 0
+
+
+def test_later_edits_to_the_input_reach_no_window(market_data):
+    windowed = _windowed(market_data)
+    before = market_data.iloc[10:110].copy()
+
+    market_data.iloc[:, 0] = 0.0
+
+    pd.testing.assert_frame_equal(windowed.get_window(1).drop(columns="window_index"), before)
+    np.testing.assert_array_equal(windowed.window_values(1), before[windowed.price_columns])
+    np.testing.assert_array_equal(windowed.sliding_values()[1], windowed.window_values(1))
@@ -1,6 +1,10 @@
 """Unit tests for demo pipeline feature engineering module."""
 
-# from unittest.mock import patch, MagicMock  # noqa: F401
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
 
 from acd.demo.features import DemoFeatureEngineering
 
@@ -227,6 +231,23 @@ class TestDemoFeatureEngineering:
         assert result.regime_confidence == 0.5
         assert result.structural_stability == 0.5
 
+    def test_run_vmm_batch_analysis_isolates_failing_windows(self):
+        """Test that a failing window only replaces itself with a dummy result."""
+        feature_eng = DemoFeatureEngineering()
+
+        def window(n):
+            return pd.DataFrame(
+                {
+                    "firm_id": [f"firm_{i % 3}" for i in range(n)],
+                    "price": 100 + np.random.default_rng(n).normal(0, 1, n).cumsum(),
+                }
+            )
+
+        # 50 rows is below the engine's minimum, 600 rows is enough
+        results = feature_eng.run_vmm_batch_analysis([window(50), window(600), window(50)])
+
+        assert [r.convergence_status == "failed" for r in results] == [True, False, True]
+
     def test_create_dummy_vmm_result(self):
         """Test dummy VMM result creation."""
         feature_eng = DemoFeatureEngineering()
@@ -237,12 +258,12 @@ class TestDemoFeatureEngineering:
 
         result = feature_eng._create_dummy_vmm_result(test_data)
 
-        assert result.window_size == 2  # 2 rows in test data
         assert result.regime_confidence == 0.5
         assert result.structural_stability == 0.5
         assert result.convergence_status == "failed"
         assert result.iterations == 0
-        assert result.elbo_final == 0.0
+        assert result.final_loss == 0.0
+        assert len(result.beta_estimates) == 3
 
     def test_prepare_evidence_data(self):
         """Test evidence data preparation."""
@@ -0,0 +1,131 @@
+"""
+Tests for the vectorized ICP bootstrap engine
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.icp.bootstrap import (
+    bootstrap_statistics,
+    correlation_invariance_statistics,
+    resample_counts,
+    resample_indices,
+    residual_invariance_statistics,
+)
+from src.acd.icp.engine import ICPConfig, ICPEngine
+from src.acd.icp.partition import encode_environments
+from src.acd.icp.statistics import EnhancedStatistics, FDRConfig, PowerAnalysisConfig
+
+PRICE_COLUMNS = ["Exchange_0", "Exchange_1", "Exchange_2", "Exchange_3"]
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(7)
+    n = 600
+    common = np.cumsum(rng.normal(0, 3, n))
+    prices = 50000 + common[:, None] + rng.normal(0, 1, (n, 4)) * [1, 2, 3, 4]
+    data = pd.DataFrame(prices, columns=PRICE_COLUMNS)
+    data["volatility_regime"] = rng.choice(["high", "low"], n)
+    data["market_condition"] = rng.choice(["bull", "bear"], n, p=[0.7, 0.3])
+    return data
+
+
+def test_encode_environments_matches_joined_labels(market_data):
+    env_columns = ["volatility_regime", "market_condition"]
+    codes, labels = encode_environments(market_data, env_columns)
+
+    joined = market_data[env_columns].apply(lambda row: "_".join(map(str, row)), axis=1)
+    assert [labels[c] for c in codes] == list(joined)
+
+
+def test_stratified_indices_stay_within_strata():
+    indices = resample_indices(np.random.default_rng(0), 50, [3, 5, 2])
+
+    assert indices.shape == (50, 10)
+    assert np.all((indices[:, :3] >= 0) & (indices[:, :3] < 3))
+    assert np.all((indices[:, 3:8] >= 3) & (indices[:, 3:8] < 8))
+    assert np.all((indices[:, 8:] >= 8) & (indices[:, 8:] < 10))
+    np.testing.assert_array_equal(resample_counts(indices, 10).sum(axis=1), 10)
+
+
+def test_correlation_statistics_match_engine_loop(market_data):
+    env_columns = ["volatility_regime", "market_condition"]
+    engine = ICPEngine(ICPConfig(min_samples_per_env=100))
+    codes, labels = encode_environments(market_data, env_columns)
+    indices = resample_indices(np.random.default_rng(3), 20, [len(market_data)])
+
+    batched = correlation_invariance_statistics(
+        resample_counts(indices, len(market_data)),
+        market_data[PRICE_COLUMNS].to_numpy(),
+        codes,
+        len(labels),
+        min_samples_per_env=100,
+    )
+
+    for b, rows in enumerate(indices):
+        sample = market_data.iloc[rows]
+        try:
+            env_data = engine._partition_by_environments(sample, env_columns)
+        except ValueError:
+            assert np.isnan(batched[b])
+            continue
+        expected = engine._test_invariance(env_data, PRICE_COLUMNS)["test_statistic"]
+        assert batched[b] == pytest.approx(expected, abs=1e-12)
+
+
+def test_residual_statistics_match_enhanced_loop(market_data):
+    stats_engine = EnhancedStatistics(PowerAnalysisConfig(), FDRConfig())
+    frames = [group for _, group in market_data.groupby("volatility_regime")]
+    sizes = [len(f) for f in frames]
+    stacked = pd.concat(frames)
+    indices = resample_indices(np.random.default_rng(4), 10, sizes)
+
+    batched = residual_invariance_statistics(
+        resample_counts(indices, len(stacked)),
+        stacked[PRICE_COLUMNS[1:]].to_numpy(),
+        stacked[PRICE_COLUMNS[0]].to_numpy(),
+        np.repeat(np.arange(len(frames)), sizes),
+        len(frames),
+    )
+
+    for b, rows in enumerate(indices):
+        resampled = stacked.iloc[rows]
+        env_data = {i: resampled.iloc[sum(sizes[:i]) : sum(sizes[: i + 1])] for i in range(2)}
+        expected, _ = stats_engine._test_invariance_ks(env_data, PRICE_COLUMNS)
+        assert batched[b] == pytest.approx(expected, abs=1e-9)
+
+
+def test_chunked_workers_reproduce_serial_run(market_data):
+    codes, labels = encode_environments(market_data, ["volatility_regime"])
+    prices = market_data[PRICE_COLUMNS].to_numpy()
+
+    def run(n_workers):
+        from functools import partial
+
+        statistic = partial(
+            correlation_invariance_statistics, prices=prices, codes=codes, n_envs=len(labels)
+        )
+        return bootstrap_statistics(
+            statistic, [len(prices)], 250, seed=11, n_workers=n_workers, chunk_size=40
+        )
+
+    serial = run(None)
+    assert serial.shape == (250,)
+    np.testing.assert_allclose(run(2), serial, rtol=1e-12)
+
+
+def test_bootstrap_ci_is_seeded(market_data):
+    config = ICPConfig(min_samples_per_env=100, n_bootstrap=200, bootstrap_seed=5)
+    env_columns = ["volatility_regime", "market_condition"]
+
+    first = ICPEngine(config)._bootstrap_confidence_interval(
+        market_data, PRICE_COLUMNS, env_columns
+    )
+    second = ICPEngine(config)._bootstrap_confidence_interval(
+        market_data, PRICE_COLUMNS, env_columns
+    )
+
+    assert first == second
+    assert 0.0 <= first[0] <= first[1] <= 1.0
@@ -0,0 +1,85 @@
+"""
+Tests for index-based ICP environment partitioning
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.icp.engine import ICPConfig, ICPEngine
+from src.acd.icp.partition import EnvironmentPartition, PartitionCache, encode_environments
+
+PRICE_COLUMNS = ["Exchange_0", "Exchange_1", "Exchange_2"]
+ENV_COLUMNS = ["volatility_regime", "market_condition"]
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(3)
+    n = 1200
+    data = pd.DataFrame(rng.normal(100, 1, (n, 3)), columns=PRICE_COLUMNS)
+    data["volatility_regime"] = rng.choice(["high", "low"], n)
+    data["market_condition"] = rng.choice(["bull", "bear", "flat"], n, p=[0.48, 0.48, 0.04])
+    return data
+
+
+def _reference_partition(data, min_samples):
+    labels = data[ENV_COLUMNS].apply(lambda row: "_".join(str(v) for v in row), axis=1)
+    return {label: group for label, group in data.groupby(labels) if len(group) >= min_samples}
+
+
+def test_partition_matches_joined_label_groups(market_data):
+    engine = ICPEngine(ICPConfig(min_samples_per_env=100))
+
+    partition = engine._partition_by_environments(market_data, ENV_COLUMNS)
+    expected = _reference_partition(market_data, 100)
+
+    assert sorted(partition) == sorted(expected)
+    assert set(partition.dropped) == {"high_flat", "low_flat"}
+    for label, group in expected.items():
+        pd.testing.assert_frame_equal(partition[label], group)
+        np.testing.assert_array_equal(
+            partition.arrays(PRICE_COLUMNS)[label], group[PRICE_COLUMNS].to_numpy()
+        )
+
+
+def test_partition_is_cached_per_dataframe(market_data):
+    engine = ICPEngine(ICPConfig(min_samples_per_env=100))
+
+    first = engine._partition_by_environments(market_data, ENV_COLUMNS)
+    second = engine._partition_by_environments(market_data, ENV_COLUMNS)
+    other = engine._partition_by_environments(market_data.copy(), ENV_COLUMNS)
+
+    assert first is second
+    assert other is not first
+    assert first.arrays(PRICE_COLUMNS) is second.arrays(PRICE_COLUMNS)
+
+
+def test_cache_evicts_least_recently_used(market_data):
+    cache = PartitionCache(max_entries=2)
+    frames = [market_data.copy() for _ in range(3)]
+
+    first = cache.get(frames[0], ENV_COLUMNS, 1)
+    cache.get(frames[1], ENV_COLUMNS, 1)
+    cache.get(frames[0], ENV_COLUMNS, 1)
+    cache.get(frames[2], ENV_COLUMNS, 1)
+
+    assert len(cache) == 2
+    assert cache.get(frames[0], ENV_COLUMNS, 1) is first
+
+
+def test_missing_environment_values_form_their_own_group():
+    data = pd.DataFrame({"regime": ["a", None, "a", "b"], "price": [1.0, 2.0, 3.0, 4.0]})
+
+    codes, labels = encode_environments(data, ["regime"])
+    partition = EnvironmentPartition(data, codes, labels)
+
+    assert len(partition) == 3
+    assert sorted(partition.sizes.values()) == [1, 1, 2]
+
+
+def test_partition_requires_two_environments(market_data):
+    engine = ICPEngine(ICPConfig(min_samples_per_env=len(market_data)))
+
+    with pytest.raises(ValueError):
+        engine._partition_by_environments(market_data, ENV_COLUMNS)
@@ -0,0 +1,77 @@
+"""
+Tests for the shared per-environment OLS fits used by ICP
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.acd.icp.engine import ICPConfig, ICPEngine
+from src.acd.icp.regression import environment_fits, fit_environment
+
+PRICE_COLUMNS = ["Exchange_0", "Exchange_1", "Exchange_2", "Exchange_3"]
+ENV_COLUMNS = ["volatility_regime"]
+
+
+@pytest.fixture
+def market_data():
+    rng = np.random.default_rng(9)
+    n = 1500
+    common = 50000 + np.cumsum(rng.normal(0, 5, n))
+    prices = common[:, None] + rng.normal(0, 1, (n, 4))
+    data = pd.DataFrame(prices, columns=PRICE_COLUMNS)
+    data["volatility_regime"] = rng.choice(["high", "medium", "low"], n)
+    return data
+
+
+def test_fit_matches_sklearn(market_data):
+    X = market_data[PRICE_COLUMNS[1:]].to_numpy()
+    y = market_data[PRICE_COLUMNS[0]].to_numpy()
+
+    fit = fit_environment(X, y)
+    model = LinearRegression().fit(X, y)
+
+    np.testing.assert_allclose(fit.coefficients, model.coef_, rtol=1e-9)
+    assert fit.intercept == pytest.approx(model.intercept_, rel=1e-9)
+    np.testing.assert_allclose(fit.fitted_values, model.predict(X), rtol=1e-12)
+    design = np.column_stack([np.ones(len(X)), X])
+    np.testing.assert_allclose(fit.xtx, design.T @ design)
+    np.testing.assert_allclose(fit.xty, design.T @ y)
+
+
+def test_fits_are_shared_across_stages(market_data, monkeypatch):
+    engine = ICPEngine(ICPConfig(min_samples_per_env=100, n_bootstrap=10))
+    partition = engine._partition_by_environments(market_data, ENV_COLUMNS)
+
+    calls = []
+    import src.acd.icp.regression as regression
+
+    original = regression.fit_environment
+    monkeypatch.setattr(
+        regression, "fit_environment", lambda X, y: calls.append(1) or original(X, y)
+    )
+
+    engine._calculate_effect_size(partition, PRICE_COLUMNS)
+    engine._calculate_diagnostics(partition, PRICE_COLUMNS)
+    engine.enhanced_stats._test_invariance_ks(partition, PRICE_COLUMNS)
+    engine.enhanced_stats._calculate_effect_size(partition, PRICE_COLUMNS)
+
+    assert len(calls) == len(partition)
+    assert environment_fits(partition, PRICE_COLUMNS) is environment_fits(partition, PRICE_COLUMNS)
+
+
+def test_diagnostics_match_sklearn_reference(market_data):
+    engine = ICPEngine(ICPConfig(min_samples_per_env=100))
+    partition = engine._partition_by_environments(market_data, ENV_COLUMNS)
+
+    total_ss = residual_ss = 0.0
+    for frame in partition.values():
+        X, y = frame[PRICE_COLUMNS[1:]].to_numpy(), frame[PRICE_COLUMNS[0]].to_numpy()
+        residuals = y - LinearRegression().fit(X, y).predict(X)
+        total_ss += np.sum((y - y.mean()) ** 2)
+        residual_ss += np.sum(residuals**2)
+
+    diagnostics = engine._calculate_diagnostics(partition, PRICE_COLUMNS)
+
+    assert diagnostics["r_squared"] == pytest.approx(1 - residual_ss / total_ss, rel=1e-9)
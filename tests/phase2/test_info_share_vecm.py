@@ -0,0 +1,84 @@
+"""
+Tests for cached, parallel per-day VECM fitting in the information share analysis
+"""
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.vector_ar.vecm import VECM, select_order
+
+from src.acd.analytics.info_share import DEFAULT_MAX_WORKERS, InfoShareAnalyzer
+from src.acd.analytics.vecm_cache import VECMCache, lag_order_bic, select_lag_order
+
+VENUES = ["binance", "coinbase", "kraken", "bybit", "okx"]
+
+
+def _day(seed, n=720):
+    """One day of cointegrated log prices and their returns."""
+    rng = np.random.default_rng(seed)
+    common = np.cumsum(rng.normal(0, 1e-4, n + 1))
+    noise = rng.normal(0, 5e-5, (n + 1, len(VENUES))) * np.arange(1, len(VENUES) + 1)
+    index = pd.date_range("2025-01-01", periods=n + 1, freq="1min") + pd.Timedelta(days=seed)
+    log_prices = pd.DataFrame(10 + common[:, None] + noise, columns=VENUES, index=index)
+    returns = log_prices.diff().dropna()
+    return str(index[0].date()), returns, log_prices.iloc[1:], {"volatility": "medium"}
+
+
+def test_lag_sweep_matches_statsmodels_select_order():
+    rng = np.random.default_rng(0)
+    data = np.zeros((800, 3))
+    shocks = rng.normal(size=(800, 3))
+    for t in range(2, 800):
+        data[t] = 0.3 * data[t - 1] - 0.2 * data[t - 2] + shocks[t] + 0.5 * shocks[t - 1, ::-1]
+
+    reference = select_order(data, maxlags=4, deterministic="n")
+
+    np.testing.assert_allclose(lag_order_bic(data, 4), reference.ics["bic"][1:], rtol=1e-10)
+    assert select_lag_order(data, 4) == max(reference.selected_orders["bic"], 1)
+    assert select_lag_order(data[:5], 4) == 1
+
+
+def test_cache_reuses_fits_by_content_and_spec(tmp_path):
+    _, returns, _, _ = _day(0)
+    cache = VECMCache(str(tmp_path))
+
+    first = cache.get_or_fit(returns, max_lag=3)
+    again = VECMCache(str(tmp_path)).get_or_fit(returns.copy(), max_lag=3)
+    cache.get_or_fit(returns, max_lag=2)
+
+    assert cache.stats == {"hits": 0, "misses": 2}
+    assert len(list(tmp_path.glob("*.npz"))) == 2
+    for name in ("alpha", "beta", "gamma", "sigma_u"):
+        np.testing.assert_array_equal(getattr(first, name), getattr(again, name))
+    reference = VECM(returns.values, k_ar_diff=first.k_ar_diff, coint_rank=1).fit()
+    np.testing.assert_allclose(first.alpha, reference.alpha)
+    np.testing.assert_allclose(first.sigma_u, reference.sigma_u)
+
+
+def test_parallel_cached_days_match_serial(tmp_path):
+    days = [_day(seed) for seed in range(3)]
+    serial = InfoShareAnalyzer(max_workers=1).process_days(days)
+
+    parallel = InfoShareAnalyzer(max_workers=2, cache_dir=str(tmp_path)).process_days(days)
+    cached = InfoShareAnalyzer(max_workers=1, cache_dir=str(tmp_path))
+    rerun = cached.process_days(days)
+
+    assert repr(parallel) == repr(serial) == repr(rerun)
+    assert cached.vecm_cache.stats["hits"] == 3
+
+
+def test_default_pool_is_capped(monkeypatch):
+    monkeypatch.setattr("src.acd.analytics.info_share.os.cpu_count", lambda: 64)
+    assert InfoShareAnalyzer().max_workers == DEFAULT_MAX_WORKERS
+    assert InfoShareAnalyzer(max_workers=8).max_workers == 8
+
+    monkeypatch.setattr("src.acd.analytics.info_share.os.cpu_count", lambda: None)
+    assert InfoShareAnalyzer().max_workers == 1
+
+
+def test_short_days_fall_back_to_one_lag_or_no_model():
+    # Too few observations for any candidate lag: one lagged difference
+    params, method = InfoShareAnalyzer().estimate_vecm(_day(1, n=12)[1])
+    assert method == "VECM" and params.k_ar_diff == 1
+
+    params, method = InfoShareAnalyzer().estimate_vecm(_day(1, n=2)[1])
+    assert method == "fallback" and params is None
@@ -0,0 +1,132 @@
+"""
+Tests for linear-time compression episodes and the clustering permutation test
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.analytics import spread_convergence
+from src.acd.analytics.spread_convergence import SpreadConvergenceAnalyzer
+
+
+@pytest.fixture
+def analyzer():
+    return SpreadConvergenceAnalyzer()
+
+
+def _mid_prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    venues = SpreadConvergenceAnalyzer().venues
+    base = 30_000 + np.cumsum(rng.normal(0, 1, n))
+    scale = np.abs(np.sin(np.arange(n) / 37)) * 3
+    index = pd.date_range("2025-01-01", periods=n, freq="1s")
+    return pd.DataFrame(
+        base[:, None] + scale[:, None] * rng.normal(0, 1, (n, len(venues))),
+        columns=venues,
+        index=index,
+    )
+
+
+def _reference_spans(analyzer, dispersion):
+    """Forward scan from every compression start, as originally specified."""
+    p10 = dispersion.quantile(analyzer.compression_threshold)
+    median = dispersion.quantile(analyzer.median_threshold)
+    spans = []
+    for i in range(analyzer.lookback_window, len(dispersion)):
+        prior = dispersion.iloc[i - analyzer.lookback_window : i]
+        if dispersion.iloc[i] <= p10 and (prior > median).any():
+            end = len(dispersion) - 1
+            for j in range(i + 1, len(dispersion)):
+                if dispersion.iloc[j] > p10:
+                    end = j - 1
+                    break
+            if end - i + 1 >= analyzer.min_duration:
+                spans.append((i, end))
+    return spans
+
+
+def test_episodes_match_forward_scan(analyzer):
+    mids = _mid_prices(4000)
+    dispersion = analyzer.compute_dispersion(mids)
+    dispersion.iloc[200:205] = np.nan
+
+    episodes = analyzer.detect_compression_episodes(dispersion, mids)
+
+    expected = _reference_spans(analyzer, dispersion)
+    assert len(expected) > 0
+    assert [(ep["start_idx"], ep["end_idx"]) for ep in episodes] == expected
+    for ep in episodes:
+        assert ep["duration"] == ep["end_idx"] - ep["start_idx"] + 1
+        assert ep["start_time"] == dispersion.index[ep["start_idx"]]
+        assert ep["end_dispersion"] == dispersion.iloc[ep["end_idx"]]
+
+
+def test_episode_open_at_end_of_sample(analyzer):
+    values = np.r_[np.full(20, 10.0), np.full(5, 1.0), np.full(15, 10.0), np.full(60, 0.5)]
+    dispersion = pd.Series(values, index=pd.date_range("2025-01-01", periods=100, freq="1s"))
+    mids = _mid_prices(100)
+
+    episodes = analyzer.detect_compression_episodes(dispersion, mids)
+
+    # Every compressed second with a high reading in its lookback starts an episode
+    assert [ep["start_idx"] for ep in episodes] == list(range(40, 50))
+    assert {ep["end_idx"] for ep in episodes} == {99}
+
+
+@pytest.mark.parametrize("unit", ["s", "ms", "us", "ns"])
+def test_permutation_test_is_seeded_and_detects_clustering(analyzer, unit):
+    timeline = pd.date_range("2025-01-01", periods=10_000, freq="1s").as_unit(unit)
+    episodes = [
+        {"start_time": timeline[i], "start_idx": i, "end_idx": i + 3, "leader": "binance"}
+        for i in range(5000, 5100, 10)
+    ]
+
+    first = analyzer.compute_statistical_tests(episodes, timeline=timeline, seed=1)
+    again = analyzer.compute_statistical_tests(episodes, timeline=timeline, seed=1)
+
+    assert first == again
+    assert first["permutation_test"]["observed_clustering"] == 10.0
+    assert first["permutation_test"]["p_value"] < 0.01
+
+    spread = [dict(ep, start_time=timeline[k * 999]) for k, ep in enumerate(episodes)]
+    result = analyzer.compute_statistical_tests(spread, timeline=timeline, seed=1)
+    assert result["permutation_test"]["p_value"] > 0.5
+
+
+def test_null_starts_only_where_the_detector_can_report(analyzer):
+    lookback = analyzer.lookback_window
+    timeline = pd.date_range("2025-01-01", periods=lookback + 3, freq="1s")
+    episodes = [{"start_idx": i, "end_idx": i} for i in range(lookback, lookback + 3)]
+
+    null = analyzer._null_clustering(episodes, timeline, 50, seed=0)
+
+    # Only the last three seconds can start an episode, so every placement uses them
+    np.testing.assert_array_equal(null, np.ones(50))
+
+
+def test_timeline_too_short_for_the_episodes_is_not_significant(analyzer):
+    timeline = pd.date_range("2025-01-01", periods=analyzer.lookback_window + 2, freq="1s")
+    episodes = [
+        {"start_time": timeline[-1], "start_idx": i, "end_idx": i, "leader": "binance"}
+        for i in range(3)
+    ]
+
+    result = analyzer.compute_statistical_tests(episodes, timeline=timeline, seed=0)
+
+    assert result["permutation_test"]["p_value"] == 1.0
+
+
+@pytest.mark.parametrize("population, k", [(50, 4), (20, 12)])
+def test_null_positions_are_distinct_and_uniform(population, k, monkeypatch):
+    # The dense case (k^2 > population) ranks random keys in several small batches
+    monkeypatch.setattr(spread_convergence, "NULL_BATCH_CELLS", 7 * population)
+    rng = np.random.default_rng(0)
+
+    positions = spread_convergence._distinct_positions(rng, population, k, 4000)
+
+    assert positions.shape == (4000, k)
+    assert (np.diff(np.sort(positions, axis=1), axis=1) > 0).all()
+    counts = np.bincount(positions.ravel(), minlength=population)
+    expected = 4000 * k / population
+    assert np.abs(counts - expected).max() < 5 * np.sqrt(expected)
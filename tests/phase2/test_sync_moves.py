@@ -0,0 +1,87 @@
+"""
+Tests for vectorized synchronous move detection
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.analytics.sync_moves import (
+    SynchronousMoveDetector,
+    circular_shift_null,
+    signed_jump_matrix,
+)
+
+
+def _returns(n, common_rate, seed=0):
+    rng = np.random.default_rng(seed)
+    venues = SynchronousMoveDetector().venues
+    common = rng.normal(0, 5, n) * (rng.random(n) < common_rate)
+    index = pd.date_range("2025-01-01", periods=n, freq="1s")
+    return pd.DataFrame({v: rng.normal(0, 1, n) + common for v in venues}, index=index)
+
+
+@pytest.fixture
+def detector():
+    return SynchronousMoveDetector()
+
+
+@pytest.fixture
+def jump_df(detector):
+    returns = _returns(2000, 0.05)
+    return detector.detect_jumps(returns, detector.compute_jump_thresholds(returns))
+
+
+def _reference_events(detector, jump_df, dt_window):
+    """Row-by-row scan with the original event definition."""
+    events = []
+    for i in range(len(jump_df)):
+        row = jump_df.iloc[i]
+        jumping = [v for v in detector.venues if row[f"{v}_jump"]]
+        signs = {row[f"{v}_sign"] for v in jumping}
+        if len(jumping) < 3 or len(signs) != 1:
+            continue
+        sign = signs.pop()
+        members = set(jumping)
+        for j in range(i + 1, min(i + dt_window + 1, len(jump_df))):
+            later = jump_df.iloc[j]
+            members |= {
+                v for v in detector.venues if later[f"{v}_jump"] and later[f"{v}_sign"] == sign
+            }
+        events.append((jump_df.index[i], sign, frozenset(members)))
+    return events
+
+
+@pytest.mark.parametrize("dt_window", [1, 2, 5])
+def test_events_match_row_scan(detector, jump_df, dt_window):
+    events = detector.detect_coincidence_events(jump_df, dt_window)
+
+    expected = _reference_events(detector, jump_df, dt_window)
+    assert len(expected) > 0
+    assert [(e["time"], e["sign"], frozenset(e["venues"])) for e in events] == expected
+    for event in events:
+        assert event["n_venues"] == len(event["venues"]) >= 3
+        assert event["returns"] == {v: jump_df.loc[event["time"], v] for v in event["venues"]}
+
+
+def test_circular_shifts_keep_jump_counts(detector, jump_df):
+    signed = signed_jump_matrix(jump_df, detector.venues)
+    first = circular_shift_null(signed, 50, np.random.default_rng(3))
+    again = circular_shift_null(signed, 50, np.random.default_rng(3))
+
+    np.testing.assert_array_equal(first, again)
+    # Rotating a single venue never changes how many seconds it jumps in
+    single = circular_shift_null(signed[:, :1], 20, np.random.default_rng(0), min_venues=1)
+    assert (single == np.count_nonzero(signed[:, 0])).all()
+
+
+def test_null_separates_synchronous_from_independent(detector, jump_df):
+    expected, p_value = detector.compute_expected_coincidences(jump_df, 1, seed=0)
+    observed = len(detector.detect_coincidence_events(jump_df, 1))
+    assert expected < observed and p_value == 0.0
+
+    independent = _returns(2000, 0.0, seed=1)
+    jumps = detector.detect_jumps(independent, detector.compute_jump_thresholds(independent))
+    _, p_value = detector.compute_expected_coincidences(jumps, 1, n_bootstrap=200, seed=0)
+    assert p_value > 0.05
+    assert detector.compute_expected_coincidences(jumps, 1, n_bootstrap=200, seed=0)[1] == p_value
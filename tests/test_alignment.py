@@ -0,0 +1,119 @@
+"""
+Tests for multi-venue time alignment
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acdlib.alignment import (
+    align,
+    align_long_frame,
+    fixed_grid,
+    previous_tick,
+    refresh_times,
+    to_ns,
+)
+
+S = 1_000_000_000
+
+
+def test_previous_tick_samples_latest_observation_with_staleness():
+    times = [np.array([0, 3, 5]) * S, np.array([2, 4]) * S]
+    values = [np.array([1.0, 2.0, 3.0]), np.array([10.0, 20.0])]
+
+    aligned = previous_tick(times, values, np.array([1, 4, 6]) * S, ["a", "b"])
+
+    np.testing.assert_array_equal(aligned.values[:, 0], [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(aligned.values[1:, 1], [20.0, 20.0])
+    assert np.isnan(aligned.values[0, 1])
+    np.testing.assert_array_equal(aligned.staleness_ns[:, 1], [-1, 0, 2 * S])
+
+
+def test_previous_tick_tolerance_drops_stale_observations():
+    times = [np.array([0, 10]) * S]
+    aligned = previous_tick(times, [np.array([1.0, 2.0])], np.array([0, 5, 10]) * S, ["a"], 0)
+
+    assert np.isnan(aligned.values[1, 0])
+    np.testing.assert_array_equal(aligned.values[[0, 2], 0], [1.0, 2.0])
+
+
+def test_refresh_times_wait_for_every_venue():
+    times = [np.array([0, 3, 5, 9]) * S, np.array([1, 2, 6, 7, 8]) * S]
+
+    np.testing.assert_array_equal(refresh_times(times), np.array([1, 3, 6, 9]) * S)
+    assert len(refresh_times([times[0], np.empty(0, np.int64)])) == 0
+
+
+def test_refresh_time_alignment_matches_loop():
+    rng = np.random.default_rng(1)
+    times = [np.unique(rng.integers(0, 10_000, size)) for size in (300, 120, 800)]
+
+    expected = []
+    pending = set(range(len(times)))
+    for t in sorted(set(np.concatenate(times).tolist())):
+        pending -= {j for j, ts in enumerate(times) if t in set(ts.tolist())}
+        if not pending:
+            expected.append(t)
+            pending = set(range(len(times)))
+
+    np.testing.assert_array_equal(refresh_times(times), expected)
+
+
+def test_fixed_grid_starts_on_step_inside_common_span():
+    times = [np.array([1_500, 9_000]) * 1_000_000, np.array([500, 7_200]) * 1_000_000]
+
+    grid = fixed_grid(times, S)
+
+    np.testing.assert_array_equal(grid, np.arange(2, 8) * S)
+
+
+def test_align_rejects_bad_method_and_missing_rule():
+    series = {"a": (np.array([0]), np.array([1.0]))}
+    with pytest.raises(ValueError):
+        align(series, method="nearest")
+    with pytest.raises(ValueError):
+        align(series, method="grid")
+
+
+def test_staleness_report_counts_repeated_samples():
+    series = {
+        "fast": (np.arange(0, 10) * S, np.arange(10.0)),
+        "slow": (np.array([0, 5]) * S, np.array([1.0, 2.0])),
+    }
+
+    report = align(series, method="grid", rule="1s").staleness_report()
+
+    assert report["fast"]["stale_fraction"] == 0.0
+    assert report["fast"]["max_s"] == 0.0
+    assert report["slow"]["stale_fraction"] == pytest.approx(4 / 6)
+    assert report["slow"]["max_s"] == pytest.approx(4.0)
+    assert report["slow"]["missing_fraction"] == 0.0
+
+
+@pytest.mark.parametrize("unit", ["s", "ms", "us", "ns"])
+def test_align_long_frame_matches_pivot_and_keeps_naive_index(unit):
+    times = pd.date_range("2025-01-01", periods=6, freq="1s").as_unit(unit)
+    df = pd.DataFrame(
+        {
+            "time": times.append(times[::2]),
+            "venue": ["binance"] * 6 + ["kraken"] * 3,
+            "mid": np.arange(9.0),
+        }
+    )
+
+    frame = align_long_frame(df, "mid", ["binance", "kraken", "okx"]).to_frame()
+
+    expected = df.pivot_table(index="time", columns="venue", values="mid", aggfunc="first")
+    pd.testing.assert_series_equal(
+        frame["kraken"], expected["kraken"].ffill(), check_names=False, check_freq=False
+    )
+    assert frame.index.tz is None
+    assert frame.index.unit == unit
+    assert frame["okx"].isna().all()
+
+
+def test_to_ns_reads_integers_as_milliseconds():
+    np.testing.assert_array_equal(to_ns(np.array([1, 2])), [1_000_000, 2_000_000])
+    stamps = pd.Series(pd.to_datetime([1_000, 2_000], unit="ms", utc=True))
+    np.testing.assert_array_equal(to_ns(stamps), [1_000_000_000, 2_000_000_000])
@@ -0,0 +1,107 @@
+"""
+Unit tests for the acdlib snapshot tick loader.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acdlib.io import load_snapshot
+from src.acdlib.io.load_snapshot import SNAPSHOT_COLUMNS, load_overlap, load_ticks_snapshot
+
+VENUES = ["binance", "coinbase", "kraken"]
+START = "2025-09-27T01:00:00+00:00"
+END = "2025-09-27T01:02:00+00:00"
+
+
+def _ticks(start, periods, as_epoch_ms=False):
+    times = pd.date_range(start, periods=periods, freq="1s", tz="UTC")
+    prices = 50000 + np.arange(periods, dtype=float)
+    ts = times.as_unit("ms").asi8 if as_epoch_ms else times
+    return pd.DataFrame(
+        {
+            "exchange": "x",
+            "ts_exchange": ts,
+            "ts_local": ts,
+            "best_bid": prices - 0.5,
+            "best_ask": prices + 0.5,
+            "last_trade_px": prices,
+            "event_type": "ticker",
+        }
+    )
+
+
+def _write_snapshot(root, as_epoch_ms=False):
+    for venue in VENUES:
+        for minute in range(5):
+            path = root / "ticks" / venue / "00" / f"ticks_{minute:02d}.parquet"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            start = pd.Timestamp("2025-09-27T00:59:00", tz="UTC") + pd.Timedelta(minutes=minute)
+            _ticks(start, 60, as_epoch_ms).to_parquet(path, index=False)
+    overlap_path = root / "OVERLAP.json"
+    overlap_path.write_text(json.dumps({"startUTC": START, "endUTC": END, "venues": VENUES}))
+    return load_overlap(str(overlap_path))
+
+
+def test_loads_only_window_and_needed_columns(tmp_path):
+    overlap = _write_snapshot(tmp_path)
+
+    ticks = load_ticks_snapshot(overlap)
+
+    assert list(ticks) == VENUES
+    for df in ticks.values():
+        assert list(df.columns) == SNAPSHOT_COLUMNS
+        assert len(df) == 121
+        assert df["ts_exchange"].min() == pd.Timestamp(START)
+        assert df["ts_exchange"].max() == pd.Timestamp(END)
+
+
+def test_epoch_millisecond_timestamps_are_filtered(tmp_path):
+    overlap = _write_snapshot(tmp_path, as_epoch_ms=True)
+
+    ticks = load_ticks_snapshot(overlap, columns=[])
+
+    df = ticks["kraken"]
+    assert "event_type" in df.columns
+    assert len(df) == 121
+    assert df["ts_exchange"].min() == pd.Timestamp(START).value // 1_000_000
+
+
+def test_mock_paths_abort_before_any_read(tmp_path, monkeypatch):
+    overlap = _write_snapshot(tmp_path)
+    mock_file = tmp_path / "ticks" / "kraken" / "00" / "ticks_mock.parquet"
+    _ticks(START, 10).to_parquet(mock_file, index=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("data read before safety check")
+
+    monkeypatch.setattr(load_snapshot.ds, "dataset", fail)
+    with pytest.raises(SystemExit):
+        load_ticks_snapshot(overlap)
+
+
+def test_unreadable_file_does_not_drop_venue(tmp_path):
+    overlap = _write_snapshot(tmp_path)
+    bad = tmp_path / "ticks" / "binance" / "00" / "ticks_99.parquet"
+    bad.write_bytes(b"not parquet")
+
+    ticks = load_ticks_snapshot(overlap)
+
+    assert len(ticks["binance"]) == 121
+
+
+def test_resample_mids_grid_and_refresh_time():
+    fast = _ticks("2025-09-27T01:00:00+00:00", 10)
+    slow = _ticks("2025-09-27T01:00:02+00:00", 3).iloc[[0, 2]]
+    ticks = {"binance": fast, "kraken": slow}
+
+    grid = load_snapshot.resample_mids(ticks, "1s")
+    assert len(grid) == 3
+    assert not grid.isna().any().any()
+    assert grid["kraken"].tolist() == [50000.0, 50000.0, 50002.0]
+
+    refresh = load_snapshot.resample_mids(ticks, "1s", method="refresh_time")
+    assert list(refresh.index) == list(slow["ts_exchange"])
+    assert refresh["binance"].tolist() == [50002.0, 50004.0]
@@ -0,0 +1,137 @@
+"""
+Unit tests for the multi-granularity overlap sweep.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acdlib.io.overlap_sweep import GapIndex, SweepLevel, sweep_overlap_windows
+
+VENUES = ["binance", "coinbase", "kraken"]
+T0 = 1_758_934_800_000  # 2025-09-27 01:00 UTC in ms
+MINUTE = 60_000
+
+
+def _index(ticks):
+    index = GapIndex(VENUES)
+    for venue, ts in ticks.items():
+        index.add(venue, np.asarray(ts))
+    return index
+
+
+def _every(start_ms, end_ms, step_ms=1000):
+    return np.arange(start_ms, end_ms + 1, step_ms)
+
+
+def _brute_force(index, max_gap_s, min_minutes):
+    """All-venue windows from a 100 ms grid of per-venue continuity."""
+    grid = np.arange(T0, T0 + 60 * MINUTE + 1, 100)
+    covered = np.ones(len(grid), dtype=bool)
+    for venue in VENUES:
+        ts = index.ticks(venue)
+        breaks = np.flatnonzero(np.diff(ts) > max_gap_s * 1000)
+        starts, ends = ts[np.r_[0, breaks + 1]], ts[np.r_[breaks, len(ts) - 1]]
+        inside = np.zeros(len(grid), dtype=bool)
+        for s, e in zip(starts, ends):
+            inside |= (grid >= s) & (grid <= e)
+        covered &= inside
+    edges = np.diff(np.r_[0, covered.astype(int), 0])
+    runs = zip(grid[np.flatnonzero(edges == 1)], grid[np.flatnonzero(edges == -1) - 1])
+    return sorted((s, e) for s, e in runs if e - s >= min_minutes * MINUTE)
+
+
+def test_levels_match_brute_force():
+    rng = np.random.default_rng(3)
+    ticks = {}
+    for venue in VENUES:
+        ts = _every(T0, T0 + 60 * MINUTE, 1000)
+        # Knock out random outages of 2-120 s
+        for start in rng.integers(T0, T0 + 60 * MINUTE, 6):
+            ts = ts[(ts < start) | (ts > start + rng.integers(2_000, 120_000))]
+        ticks[venue] = ts
+    index = _index(ticks)
+    levels = [SweepLevel(g, m) for g, m in [(300, 5), (60, 2), (5, 1), (1, 1)]]
+
+    results = sweep_overlap_windows(index, levels)
+
+    for level, windows in zip(levels, results):
+        found = sorted(
+            (int(w.start.value // 1_000_000), int(w.end.value // 1_000_000)) for w in windows
+        )
+        assert found == _brute_force(index, level.granularity_sec, level.min_duration_min)
+
+
+def test_returns_every_window_longest_first():
+    ticks = {
+        venue: np.r_[
+            _every(T0, T0 + 10 * MINUTE),
+            _every(T0 + 20 * MINUTE, T0 + 45 * MINUTE),
+        ]
+        for venue in VENUES
+    }
+    (windows,) = sweep_overlap_windows(_index(ticks), [SweepLevel(5, 5)])
+
+    assert [w.duration_minutes for w in windows] == [25, 10]
+    assert windows[0].coverage == pytest.approx(1.0)
+    assert windows[0].venues == VENUES
+
+    (capped,) = sweep_overlap_windows(_index(ticks), [SweepLevel(5, 5)], max_windows=1)
+    assert len(capped) == 1
+
+
+def test_coverage_reflects_sparse_ticks():
+    ticks = {venue: _every(T0, T0 + 10 * MINUTE) for venue in VENUES}
+    # kraken ticks every 4 s: continuous at g=5s but only a quarter of 1 s slots filled
+    ticks["kraken"] = _every(T0, T0 + 10 * MINUTE, 4000)
+    index = _index(ticks)
+
+    (windows,) = sweep_overlap_windows(index, [SweepLevel(5, 5, coverage_bucket_sec=1)])
+    assert windows[0].coverage == pytest.approx(0.25, abs=0.01)
+    assert windows[0].coverage_by_venue["binance"] == pytest.approx(1.0)
+
+    (strict,) = sweep_overlap_windows(
+        index, [SweepLevel(5, 5, coverage_threshold=0.95, coverage_bucket_sec=1)]
+    )
+    assert strict == []
+
+
+def test_coverage_is_measured_at_level_granularity():
+    ticks = {venue: _every(T0, T0 + 40 * MINUTE) for venue in VENUES}
+    # kraken trades every 50 s: continuous at coarse levels, 2% of 1 s slots filled
+    ticks["kraken"] = _every(T0, T0 + 40 * MINUTE, 50_000)
+    index = _index(ticks)
+    levels = [SweepLevel(g, 15, coverage_threshold=0.95) for g in (900, 600, 60)]
+
+    for windows in sweep_overlap_windows(index, levels):
+        assert len(windows) == 1
+        assert windows[0].coverage == pytest.approx(1.0)
+
+    (one_second,) = sweep_overlap_windows(
+        index, [SweepLevel(900, 15, coverage_threshold=0.95, coverage_bucket_sec=1)]
+    )
+    assert one_second == []
+
+
+def test_missing_venue_yields_no_windows():
+    ticks = {venue: _every(T0, T0 + 10 * MINUTE) for venue in VENUES[:2]}
+    assert sweep_overlap_windows(_index(ticks), [SweepLevel(5, 1)]) == [[]]
+
+
+def test_refresh_reads_only_new_files(tmp_path):
+    index = GapIndex(["okx"], root=str(tmp_path), pair="BTC-USD")
+    hour_dir = tmp_path / "okx" / "BTC-USD" / "1s" / "2025-09-27" / "01"
+    hour_dir.mkdir(parents=True)
+
+    def write_minute(minute):
+        ts = _every(T0 + minute * MINUTE, T0 + (minute + 1) * MINUTE - 1000)
+        pd.DataFrame({"ts_local": ts}).to_parquet(hour_dir / f"ticks_{minute:02d}.parquet")
+
+    for minute in range(3):
+        write_minute(minute)
+    assert index.refresh() == 3
+    write_minute(3)
+    assert index.refresh() == 1
+
+    starts, ends = index.intervals("okx", 1)
+    assert list(zip(starts, ends)) == [(T0, T0 + 4 * MINUTE - 1000)]
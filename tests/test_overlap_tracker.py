@@ -0,0 +1,107 @@
+"""
+Unit tests for the incremental overlap tracker.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.acdlib.io.overlap_tracker import OverlapTracker
+
+VENUES = ["binance", "coinbase", "kraken", "okx", "bybit"]
+T0 = 1_758_934_800_000  # 2025-09-27 01:00 UTC in ms
+MINUTE = 60_000
+
+
+def _feed(tracker, venue, start_ms, end_ms, step_ms=500):
+    for ts in range(start_ms, end_ms + 1, step_ms):
+        tracker.add(venue, ts)
+
+
+def test_gaps_split_coverage_into_intervals():
+    tracker = OverlapTracker(VENUES, max_gap_s=1.0)
+    _feed(tracker, "okx", T0, T0 + 10_000)
+    _feed(tracker, "okx", T0 + 12_000, T0 + 20_000)
+
+    assert tracker.coverage("okx") == [(T0, T0 + 10_000), (T0 + 12_000, T0 + 20_000)]
+    assert tracker.summary()["okx"]["gaps"] == 1
+
+
+def test_out_of_order_tick_bridges_gap():
+    tracker = OverlapTracker(VENUES, max_gap_s=1.0)
+    for ts in [T0, T0 + 1_000, T0 + 3_000, T0 + 4_000, T0 + 2_000, T0 + 500]:
+        tracker.add("kraken", ts)
+
+    assert tracker.coverage("kraken") == [(T0, T0 + 4_000)]
+
+
+def test_add_many_matches_tick_by_tick():
+    rng = np.random.default_rng(0)
+    ts = np.sort(T0 + rng.integers(0, 10 * MINUTE, 5_000))
+    one, batch = OverlapTracker(VENUES), OverlapTracker(VENUES)
+    for value in ts:
+        one.add("binance", int(value))
+    batch.add_many("binance", ts[2_500:])
+    batch.add_many("binance", ts[:2_500])
+
+    assert batch.coverage("binance") == one.coverage("binance")
+    assert batch.summary()["binance"]["ticks"] == len(ts)
+
+
+def test_longest_window_picks_quorum_with_earliest_starts():
+    tracker = OverlapTracker(VENUES, max_gap_s=1.0)
+    _feed(tracker, "binance", T0, T0 + 40 * MINUTE)
+    _feed(tracker, "coinbase", T0 + 5 * MINUTE, T0 + 40 * MINUTE)
+    _feed(tracker, "kraken", T0 + 2 * MINUTE, T0 + 40 * MINUTE)
+    _feed(tracker, "okx", T0 + 1 * MINUTE, T0 + 40 * MINUTE)
+    # bybit drops out mid-window
+    _feed(tracker, "bybit", T0, T0 + 15 * MINUTE)
+    _feed(tracker, "bybit", T0 + 16 * MINUTE, T0 + 40 * MINUTE)
+
+    start, end, venues = tracker.longest_window(quorum=4)
+
+    assert (start, end) == (T0 + 5 * MINUTE, T0 + 40 * MINUTE)
+    assert venues == ["binance", "coinbase", "kraken", "okx"]
+
+    result = tracker.find_overlap([30, 20, 10], quorum=4)
+    assert result[2] == venues and result[3] == "BEST4_30m"
+    assert result[0] == pd.Timestamp(start, unit="ms", tz="UTC")
+
+
+def test_find_overlap_pending_until_long_enough(capsys):
+    tracker = OverlapTracker(VENUES)
+    for venue in VENUES:
+        _feed(tracker, venue, T0, T0 + 5 * MINUTE)
+
+    assert tracker.find_overlap([30, 20, 10], quorum=4) is None
+    assert "[OVERLAP:PENDING]" in capsys.readouterr().out
+
+    for venue in VENUES:
+        _feed(tracker, venue, T0 + 5 * MINUTE, T0 + 12 * MINUTE)
+    assert tracker.find_overlap([30, 20, 10], quorum=4)[3] == "ALL5_10m"
+
+
+def test_ingest_files_reads_new_files_only(tmp_path):
+    tracker = OverlapTracker(["okx"])
+    minute_dir = tmp_path / "okx" / "BTC-USD" / "1s" / "2025-09-27" / "01"
+    minute_dir.mkdir(parents=True)
+    for minute in range(3):
+        ts = T0 + minute * MINUTE + np.arange(0, MINUTE, 500)
+        pd.DataFrame({"ts_local": ts}).to_parquet(minute_dir / f"ticks_{minute:02d}.parquet")
+
+    assert tracker.ingest_files(str(tmp_path), "BTC-USD", "1s") == 3
+    assert tracker.ingest_files(str(tmp_path), "BTC-USD", "1s") == 0
+    assert tracker.coverage("okx") == [(T0, T0 + 3 * MINUTE - 500)]
+
+
+def test_overlap_check_is_cheap_for_a_full_session():
+    tracker = OverlapTracker(VENUES, max_gap_s=1.0)
+    rng = np.random.default_rng(1)
+    for venue in VENUES:
+        ts = T0 + np.cumsum(rng.exponential(200, 50_000)).astype(np.int64)
+        tracker.add_many(venue, ts)
+
+    began = time.perf_counter()
+    tracker.longest_window(quorum=4)
+    assert time.perf_counter() - began < 0.5
@@ -0,0 +1,166 @@
+"""
+Unit tests for the buffered tick sink used by the overlap orchestrator.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.acd.capture.tick_sink import BufferedTickSink
+
+VENUES = ["binance", "coinbase", "kraken", "okx", "bybit"]
+
+
+def _minute_start_ms():
+    now = datetime.now().replace(second=0, microsecond=0)
+    return int(now.timestamp() * 1000) - 10 * 60 * 1000
+
+
+def _tick(venue, ts_local, i):
+    mid = 50000.0 + i
+    return (
+        venue,
+        "BTC-USD",
+        ts_local - 5,
+        ts_local,
+        mid - 0.5,
+        mid + 0.5,
+        mid,
+        mid,
+        0.01,
+        "ticker",
+    )
+
+
+def _read_venue(root, venue):
+    files = sorted((root / venue).glob("**/*.parquet"))
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True), files
+
+
+def test_ticks_round_trip_across_minutes(tmp_path):
+    sink = BufferedTickSink(root=str(tmp_path), flush_rows=50)
+    start = _minute_start_ms()
+    # 3 minutes at 5 ticks/s, interleaved across venues
+    for i in range(900):
+        for venue in VENUES:
+            sink.add(*_tick(venue, start + i * 200, i))
+    sink.close()
+
+    for venue in VENUES:
+        frame, files = _read_venue(tmp_path, venue)
+        assert len(files) == 3
+        assert len(frame) == 900
+        assert frame["ts_local"].is_monotonic_increasing
+        assert list(frame.columns)[:4] == ["exchange", "pair", "ts_exchange", "ts_local"]
+
+    assert not list(tmp_path.glob("**/*.partial"))
+    metrics = sink.metrics()
+    assert metrics["ticks_written"] == metrics["ticks_received"] == 4500
+    assert metrics["files_closed"] == 15
+    assert metrics["write_errors"] == 0
+
+
+def test_rollover_closes_previous_minute(tmp_path):
+    sink = BufferedTickSink(root=str(tmp_path), flush_rows=10_000)
+    start = _minute_start_ms()
+    for i in range(5):
+        sink.add(*_tick("okx", start + i * 1000, i))
+    sink.add(*_tick("okx", start + 60_000, 5))
+    sink.wait()
+
+    closed = list(tmp_path.glob("**/*.parquet"))
+    assert len(closed) == 1
+    assert len(pd.read_parquet(closed[0])) == 5
+    assert sink.metrics()["ticks_buffered"] == 1
+    sink.close()
+    assert len(list(tmp_path.glob("**/*.parquet"))) == 2
+
+
+def test_close_stale_finalizes_quiet_venues(tmp_path):
+    sink = BufferedTickSink(root=str(tmp_path), flush_rows=10_000)
+    start = _minute_start_ms()
+    for i in range(5):
+        sink.add(*_tick("bybit", start + i * 1000, i))
+    sink.add(*_tick("okx", start + 120_000, 0))
+
+    # Same minute as okx's tick: only bybit's earlier minute is stale
+    assert sink.close_stale(now_ms=start + 125_000) == 1
+    sink.wait()
+    frame, files = _read_venue(tmp_path, "bybit")
+    assert len(files) == 1 and len(frame) == 5
+    assert not list((tmp_path / "okx").glob("**/*.parquet"))
+
+    assert sink.close_stale() == 1
+    sink.wait()
+    assert len(list((tmp_path / "okx").glob("**/*.parquet"))) == 1
+    assert not list(tmp_path.glob("**/*.partial"))
+    assert sink.metrics()["stale_closes"] == 2
+    sink.close()
+
+
+def test_restart_does_not_overwrite_closed_minute(tmp_path):
+    start = _minute_start_ms()
+    for run in range(2):
+        sink = BufferedTickSink(root=str(tmp_path))
+        sink.add(*_tick("kraken", start + run, run))
+        sink.close()
+
+    frame, files = _read_venue(tmp_path, "kraken")
+    assert len(files) == 2
+    assert sorted(frame["ts_local"]) == [start, start + 1]
+
+
+def test_async_put_sustains_five_venues(tmp_path):
+    sink = BufferedTickSink(root=str(tmp_path), flush_rows=500, max_pending_flushes=4)
+    start = _minute_start_ms()
+    n_ticks = 20_000
+
+    async def produce(venue):
+        for i in range(n_ticks):
+            await sink.put(*_tick(venue, start + i * 10, i))
+            if i % 1000 == 0:
+                await asyncio.sleep(0)
+
+    async def run():
+        began = time.perf_counter()
+        await asyncio.gather(*(produce(v) for v in VENUES))
+        await sink.aclose()
+        return time.perf_counter() - began
+
+    elapsed = asyncio.run(run())
+
+    metrics = sink.metrics()
+    assert metrics["ticks_written"] == len(VENUES) * n_ticks
+    assert metrics["max_queue_depth"] <= 4 + len(VENUES) + 1
+    assert metrics["mean_flush_ms"] > 0
+    # Far above any venue's ticker rate (~10-100 msgs/s each)
+    assert len(VENUES) * n_ticks / elapsed > 5_000
+
+
+def test_flush_makes_rows_durable_without_closing(tmp_path):
+    sink = BufferedTickSink(root=str(tmp_path))
+    sink.add(*_tick("bybit", _minute_start_ms(), 0))
+    sink.flush()
+    sink.wait()
+
+    assert sink.metrics()["ticks_written"] == 1
+    assert sink.metrics()["ticks_buffered"] == 0
+    sink.close()
+    assert len(list(tmp_path.glob("**/*.parquet"))) == 1
+
+
+@pytest.mark.parametrize("flush_rows", [1, 7])
+def test_small_flush_thresholds_write_multiple_row_groups(tmp_path, flush_rows):
+    import pyarrow.parquet as pq
+
+    sink = BufferedTickSink(root=str(tmp_path), flush_rows=flush_rows)
+    start = _minute_start_ms()
+    for i in range(21):
+        sink.add(*_tick("coinbase", start + i, i))
+    sink.close()
+
+    (path,) = tmp_path.glob("**/*.parquet")
+    assert pq.ParquetFile(path).num_row_groups == -(-21 // flush_rows)
@@ -0,0 +1,113 @@
+"""
+Tests for the vectorized crypto moment kernels
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from src.acd.vmm.crypto_kernels import (
+    environment_matrices,
+    lagged_correlations,
+    rolling_pair_correlations,
+    run_statistics,
+    true_runs,
+)
+from src.acd.vmm.crypto_moments import CryptoMomentCalculator, CryptoMomentConfig
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(3)
+    common = np.cumsum(rng.normal(0, 1, 400)) + 30_000
+    prices = common[:, None] + rng.normal(0, 2, (400, 3))
+    # A venue that lags the first by two steps
+    prices[2:, 2] = prices[:-2, 0] + rng.normal(0, 0.1, 398)
+    return prices
+
+
+def test_lagged_correlations_match_pearsonr(prices):
+    corr, betas, p_values = lagged_correlations(prices, max_lag=4)
+
+    for i, j, lag in [(0, 1, 1), (0, 2, 2), (2, 0, 4), (1, 2, 3)]:
+        x, y = prices[:-lag, i], prices[lag:, j]
+        r, p = stats.pearsonr(x, y)
+        assert corr[i, j, lag - 1] == pytest.approx(r, abs=1e-10)
+        assert p_values[i, j, lag - 1] == pytest.approx(p, rel=1e-6, abs=1e-300)
+        assert betas[i, j, lag - 1] == pytest.approx(r * np.std(y) / np.std(x), abs=1e-8)
+    assert (corr[[0, 1, 2], [0, 1, 2]] == 0).all()
+    assert np.argmax(corr[0, 2]) == 1
+
+
+def test_lagged_correlations_handle_constant_and_short_series():
+    prices = np.column_stack([np.arange(12.0), np.full(12, 5.0)])
+
+    corr, betas, p_values = lagged_correlations(prices, max_lag=4)
+
+    # Lags leaving fewer than ten samples stay zero
+    assert (corr[:, :, 2:] == 0).all()
+    assert np.isnan(corr[0, 1, 0]) and betas[1, 0, 0] == 0.0
+
+
+def test_rolling_pair_correlations_match_window_loop(prices):
+    window = 5
+    mean, consistency = rolling_pair_correlations(prices[:120], window, chunk_size=16)
+
+    correlations = [
+        stats.pearsonr(prices[t - window : t, 0], prices[t - window : t, 1])[0]
+        for t in range(window, 120)
+    ]
+    assert mean[0, 1] == pytest.approx(np.mean(correlations))
+    assert mean[1, 0] == mean[0, 1]
+    assert consistency[0, 1] == pytest.approx(1 - np.std(correlations))
+    assert mean[0, 0] == 0.0
+
+
+def test_run_length_encoding_counts_runs_per_column():
+    mask = np.array(
+        [[1, 0], [1, 1], [0, 1], [1, 1], [1, 0], [1, 1]],
+        dtype=bool,
+    )
+
+    columns, starts, lengths = true_runs(mask)
+    assert columns.tolist() == [0, 0, 1, 1]
+    assert starts.tolist() == [0, 3, 1, 5]
+    assert lengths.tolist() == [2, 3, 3, 1]
+
+    counts, means = run_statistics(mask, min_length=2)
+    assert counts.tolist() == [2, 1] and means.tolist() == [2.5, 3.0]
+    counts, means = run_statistics(mask, closed_only=True)
+    assert counts.tolist() == [1, 1] and means.tolist() == [2.0, 3.0]
+
+
+def test_environment_matrices_follow_first_appearance(prices):
+    data = pd.DataFrame(prices, columns=["a", "b", "c"])
+    data["env"] = np.where(np.arange(len(data)) < 100, "late", "early")[::-1]
+
+    matrices = environment_matrices(data, ["a", "b", "c"], "env")
+
+    assert [len(m) for m in matrices] == [300, 100]
+    np.testing.assert_array_equal(matrices[1].changes, np.diff(prices[300:], axis=0))
+
+
+def test_legacy_dwell_and_undercut_moments_from_runs():
+    data = pd.DataFrame(
+        {
+            "a": [100.0, 100.0, 100.0, 100.0, 99.0, 98.0, 99.0, 99.0, 99.0, 99.0, 99.0, 97.0],
+            "b": np.linspace(100.0, 111.0, 12),
+        }
+    )
+    calculator = CryptoMomentCalculator(
+        CryptoMomentConfig(min_dwell_time=3, undercut_threshold=0.005)
+    )
+
+    dwell_times, frequencies = calculator._calculate_spread_floor_moments(data, ["a", "b"])
+    rates, response_times = calculator._calculate_undercut_moments(data, ["a", "b"])
+
+    # Floor runs of column a: 3 and 4 steps
+    assert dwell_times.tolist() == [3.5, 0.0]
+    assert frequencies[0] == pytest.approx(2 / 11)
+    # Drops at steps 3-4 (recovered) and 10 (open at the end)
+    assert rates[0] == pytest.approx(3 / 11)
+    assert response_times.tolist() == [2.0, 0.0]
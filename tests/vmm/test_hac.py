@@ -0,0 +1,98 @@
+"""
+Tests for batched and incremental HAC covariance estimation
+"""
+
+import numpy as np
+import pytest
+
+from src.acd.vmm import hac
+from src.acd.vmm.engine import VMMConfig, VMMEngine
+from src.acd.vmm.hac import IncrementalHAC, autocovariances, kernel_weights, newey_west_covariance
+
+
+def _outer_product_hac(moment_matrix, lag):
+    """Reference Newey-West estimate built from per-row outer products"""
+    N = len(moment_matrix)
+    deviations = moment_matrix - moment_matrix.mean(axis=0)
+    S = sum(np.outer(d, d) for d in deviations) / N
+    for l in range(1, lag + 1):
+        gamma = sum(np.outer(deviations[t], deviations[t - l]) for t in range(l, N)) / N
+        S += (1 - l / (lag + 1)) * (gamma + gamma.T)
+    return S
+
+
+@pytest.fixture
+def ar_moments():
+    rng = np.random.default_rng(11)
+    shocks = rng.normal(size=(600, 4))
+    moments = np.zeros_like(shocks)
+    for t in range(1, len(shocks)):
+        moments[t] = 0.5 * moments[t - 1] + shocks[t]
+    return moments
+
+
+class TestBatchHAC:
+    def test_bartlett_matches_outer_product_reference(self, ar_moments):
+        expected = _outer_product_hac(ar_moments, lag=6)
+        actual = newey_west_covariance(ar_moments, lag=6, kernel="bartlett")
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_fft_autocovariances_match_matrix_products(self, ar_moments, monkeypatch):
+        deviations = ar_moments - ar_moments.mean(axis=0)
+        direct = autocovariances(deviations, 100)
+
+        monkeypatch.setattr(hac, "FFT_LAG_THRESHOLD", 0)
+        via_fft = autocovariances(deviations, 100)
+
+        np.testing.assert_allclose(via_fft, direct, rtol=1e-9, atol=1e-10)
+
+    @pytest.mark.parametrize("kernel", ["bartlett", "parzen", "quadratic_spectral"])
+    def test_kernels_give_symmetric_psd_estimates(self, ar_moments, kernel):
+        S = newey_west_covariance(ar_moments, lag=8, kernel=kernel)
+
+        np.testing.assert_allclose(S, S.T, atol=1e-12)
+        assert np.min(np.linalg.eigvalsh(S)) > 0
+
+    def test_kernel_weights(self):
+        np.testing.assert_allclose(kernel_weights("bartlett", 3), [1.0, 0.75, 0.5, 0.25])
+        parzen = kernel_weights("parzen", 3)
+        assert parzen[0] == 1.0 and np.all(np.diff(parzen) < 0)
+        qs = kernel_weights("quadratic_spectral", 3, n_lags=50)
+        assert qs[0] == 1.0 and np.any(qs[8:] != 0)
+        with pytest.raises(ValueError):
+            kernel_weights("uniform", 3)
+
+
+class TestIncrementalHAC:
+    @pytest.mark.parametrize("kernel", ["bartlett", "parzen"])
+    def test_matches_batch_estimate(self, ar_moments, kernel):
+        tracker = IncrementalHAC(n_moments=4, lag=5, kernel=kernel)
+        for block in np.array_split(ar_moments, [1, 3, 50, 51, 300]):
+            tracker.update(block)
+
+        expected = newey_west_covariance(ar_moments, lag=5, kernel=kernel)
+        np.testing.assert_allclose(tracker.covariance(), expected, rtol=1e-9, atol=1e-10)
+        np.testing.assert_allclose(tracker.mean, ar_moments.mean(axis=0))
+
+    def test_single_row_updates(self, ar_moments):
+        tracker = IncrementalHAC(n_moments=4, lag=3)
+        for row in ar_moments[:40]:
+            tracker.update(row)
+
+        expected = newey_west_covariance(ar_moments[:40], lag=3)
+        np.testing.assert_allclose(tracker.covariance(), expected, rtol=1e-9, atol=1e-10)
+
+    def test_rejects_untruncated_kernel(self):
+        with pytest.raises(ValueError):
+            IncrementalHAC(n_moments=2, lag=3, kernel="quadratic_spectral")
+
+
+def test_engine_uses_configured_kernel(ar_moments):
+    engine = VMMEngine(VMMConfig(hac_kernel="parzen"))
+    g_bar = ar_moments.mean(axis=0)
+
+    S = engine._estimate_hac_covariance(ar_moments, g_bar)
+
+    lag = engine._get_optimal_lag(len(ar_moments))
+    np.testing.assert_allclose(S, newey_west_covariance(ar_moments, g_bar, lag, "parzen"))
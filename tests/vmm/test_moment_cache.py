@@ -0,0 +1,117 @@
+"""
+Tests for the VMM data-fingerprinted moment cache
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.vmm.engine import VMMConfig, VMMEngine
+from src.acd.vmm.moment_cache import MomentCache, fingerprint_data
+
+
+class CountingCalculator:
+    """Stand-in crypto calculator that counts combined-vector builds"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_combined_moment_vector(self, data, price_columns, **kwargs):
+        self.calls += 1
+        return np.linspace(0.1, 0.5, 8)
+
+
+@pytest.fixture
+def price_data():
+    rng = np.random.default_rng(0)
+    prices = 50000 + np.cumsum(rng.normal(0, 5, (400, 3)), axis=0)
+    return pd.DataFrame(prices, columns=[f"Exchange_{i}" for i in range(3)])
+
+
+class TestMomentCache:
+    def test_fingerprint_tracks_contents(self, price_data):
+        copy = price_data.copy()
+        assert fingerprint_data(price_data) == fingerprint_data(copy)
+
+        copy.iloc[0, 0] += 1.0
+        assert fingerprint_data(price_data) != fingerprint_data(copy)
+        assert fingerprint_data(price_data.values) == fingerprint_data(price_data.values.copy())
+
+    def test_get_or_compute_counts_hits(self):
+        cache = MomentCache()
+        data = np.arange(10.0)
+        calls = []
+
+        for _ in range(5):
+            cache.get_or_compute(data, "total", lambda: calls.append(1) or data.sum())
+
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 4
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == pytest.approx(0.8)
+
+    def test_evicts_oldest_fingerprint(self):
+        cache = MomentCache(max_fingerprints=2)
+        arrays = [np.full(3, float(i)) for i in range(3)]
+        for array in arrays:
+            cache.get_or_compute(array, "sum", array.sum)
+
+        cache.get_or_compute(arrays[0], "sum", arrays[0].sum)
+        assert cache.stats()["misses"] == 4
+        assert cache.stats()["fingerprints"] == 2
+
+    def test_identity_memo_is_bounded(self):
+        cache = MomentCache(max_fingerprints=2)
+        arrays = [np.full(3, float(i)) for i in range(5)]
+        for array in arrays:
+            cache.fingerprint(array)
+
+        assert cache.stats()["memoized_objects"] == 2
+        assert all(memo[0] is not arrays[0] for memo in cache._identity_memo.values())
+
+
+class TestEngineMomentCaching:
+    def test_combined_vector_built_once_per_run(self, price_data):
+        calculator = CountingCalculator()
+        engine = VMMEngine(VMMConfig(max_iterations=200), crypto_calculator=calculator)
+
+        engine.run_vmm(price_data, list(price_data.columns))
+
+        assert calculator.calls == 1
+        stats = engine.get_cache_stats()
+        assert stats["hit_rate"] > 0.9
+
+    def test_cache_is_rebuilt_for_each_run(self, price_data):
+        calculator = CountingCalculator()
+        engine = VMMEngine(VMMConfig(max_iterations=20), crypto_calculator=calculator)
+
+        engine.run_vmm(price_data, list(price_data.columns))
+        price_data.iloc[:, 0] += 1.0
+        engine.run_vmm(price_data, list(price_data.columns))
+
+        assert calculator.calls == 2
+
+    def test_simplified_moments_match_direct_calculation(self, price_data):
+        engine = VMMEngine(VMMConfig())
+        prices = price_data.values
+        beta = np.array([0.4, -0.2, 0.1])
+
+        first = engine._calculate_moment_conditions(prices, beta)
+        second = engine._calculate_moment_conditions(prices, beta * 0.5)
+
+        corr_01 = np.corrcoef(prices[:, 0], prices[:, 1])[0, 1]
+        assert first[0] == pytest.approx(corr_01 - beta[0])
+        assert first[3] == pytest.approx(np.mean(prices[:, 0]) - beta[1])
+        assert first[6] == pytest.approx(np.std(np.diff(prices[:, 0])) - beta[2])
+        assert second[0] == pytest.approx(corr_01 - beta[0] * 0.5)
+        assert engine.get_cache_stats()["hits"] == 1
+
+    def test_per_timestep_moments_shared_and_read_only(self, price_data):
+        engine = VMMEngine(VMMConfig())
+        columns = list(price_data.columns)
+
+        first = engine._get_per_timestep_moments(price_data, columns)
+        second = engine._get_per_timestep_moments(price_data, columns)
+
+        assert first is second
+        assert not first.flags.writeable
@@ -0,0 +1,78 @@
+"""
+Parity tests for the vectorized VMM rolling moment engine
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.vmm.engine import VMMConfig, VMMEngine
+from src.acd.vmm.rolling import default_window_size, rolling_per_timestep_moments
+
+
+def _loop_moments(engine, prices):
+    """Reference per-timestep moments from the original loop helpers"""
+    return np.column_stack(
+        [
+            engine._calculate_arbitrage_timing_per_timestep(prices),
+            engine._calculate_mirroring_per_timestep(prices),
+            engine._calculate_spread_floor_per_timestep(prices),
+            engine._calculate_undercut_per_timestep(prices),
+        ]
+    )
+
+
+class TestRollingMoments:
+    """Vectorized engine must reproduce the per-timestep loop output"""
+
+    @pytest.fixture
+    def engine(self):
+        return VMMEngine(VMMConfig())
+
+    @pytest.mark.parametrize("n_obs,n_exchanges", [(120, 2), (500, 4), (1000, 5)])
+    def test_parity_with_loop_helpers(self, engine, n_obs, n_exchanges):
+        rng = np.random.default_rng(42)
+        common = np.cumsum(rng.normal(0, 5, n_obs))
+        prices = 50000 + common[:, None] + rng.normal(0, 2, (n_obs, n_exchanges))
+
+        expected = _loop_moments(engine, prices)
+        actual = rolling_per_timestep_moments(prices)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+
+    def test_chunking_does_not_change_result(self):
+        rng = np.random.default_rng(7)
+        prices = 100 + np.cumsum(rng.normal(0, 1, (2000, 3)), axis=0)
+
+        full = rolling_per_timestep_moments(prices, chunk_size=10_000)
+        chunked = rolling_per_timestep_moments(prices, chunk_size=37)
+
+        np.testing.assert_array_equal(full, chunked)
+
+    def test_constant_prices_match_loop(self, engine):
+        prices = np.full((200, 3), 100.0)
+        prices[:, 1] += np.arange(200) * 0.01
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = _loop_moments(engine, prices)
+        actual = rolling_per_timestep_moments(prices)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12)
+
+    def test_engine_uses_rolling_engine(self, engine):
+        rng = np.random.default_rng(3)
+        prices = 50000 + np.cumsum(rng.normal(0, 5, (300, 4)), axis=0)
+        data = pd.DataFrame(prices, columns=[f"Exchange_{i}" for i in range(4)])
+
+        matrix = engine._get_per_timestep_moments(data, list(data.columns))
+
+        assert matrix.shape == (300, 4)
+        np.testing.assert_allclose(matrix, _loop_moments(engine, prices), rtol=1e-9, atol=1e-12)
+
+    def test_window_size_validation(self):
+        prices = np.ones((50, 2))
+        assert default_window_size(50) == 5
+        with pytest.raises(ValueError):
+            rolling_per_timestep_moments(prices, window_size=50)
+        with pytest.raises(ValueError):
+            rolling_per_timestep_moments(prices[:, 0])
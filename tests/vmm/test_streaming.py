@@ -0,0 +1,139 @@
+"""
+Tests for the streaming (online) VMM engine
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.vmm.engine import VMMConfig, VMMEngine
+from src.acd.vmm.hac import ExponentiallyWeightedHAC, newey_west_covariance
+from src.acd.vmm.rolling import rolling_per_timestep_moments
+from src.acd.vmm.streaming import RollingPriceSums, StreamingVMMConfig, StreamingVMMEngine
+
+
+@pytest.fixture
+def price_frame():
+    rng = np.random.default_rng(21)
+    common = np.cumsum(rng.normal(0, 5, 1500))
+    prices = 50000 + common[:, None] + rng.normal(0, 2, (1500, 4))
+    return pd.DataFrame(prices, columns=[f"Exchange_{i}" for i in range(4)])
+
+
+class TestRollingPriceSums:
+    def test_expanding_sums_match_batch_statistics(self, price_frame):
+        prices = price_frame.values
+        sums = RollingPriceSums(4)
+        for block in np.array_split(prices, 7):
+            sums.add(block)
+
+        correlations, levels, volatilities = VMMEngine(VMMConfig())._calculate_price_statistics(
+            prices
+        )
+        np.testing.assert_allclose(sums.correlations(), correlations, rtol=1e-8)
+        np.testing.assert_allclose(sums.price_levels(), levels, rtol=1e-12)
+        np.testing.assert_allclose(sums.volatilities(), volatilities, rtol=1e-8)
+        assert sums.pooled_std() == pytest.approx(np.std(prices), rel=1e-8)
+
+    def test_rolling_sums_only_cover_lookback(self, price_frame):
+        prices = price_frame.values
+        sums = RollingPriceSums(4, lookback=300)
+        for row in prices[:700]:
+            sums.add(row)
+
+        window = prices[400:700]
+        np.testing.assert_allclose(sums.price_levels(), window.mean(axis=0), rtol=1e-12)
+        np.testing.assert_allclose(
+            sums.volatilities(), np.std(np.diff(window, axis=0), axis=0), rtol=1e-8
+        )
+
+
+class TestExponentiallyWeightedHAC:
+    def test_initialize_matches_batch(self, price_frame):
+        moments = rolling_per_timestep_moments(price_frame.values)
+        hac = ExponentiallyWeightedHAC(4, lag=3)
+        hac.initialize(moments)
+
+        np.testing.assert_allclose(hac.covariance(), newey_west_covariance(moments, lag=3))
+
+    def test_tracks_new_regime(self):
+        rng = np.random.default_rng(5)
+        hac = ExponentiallyWeightedHAC(2, lag=2, decay=0.9)
+        hac.initialize(rng.normal(0, 1, (200, 2)))
+        hac.update(rng.normal(0, 10, (300, 2)))
+
+        assert np.all(np.diag(hac.covariance()) > 25)
+
+
+class TestStreamingVMMEngine:
+    def test_update_returns_fresh_output(self, price_frame):
+        engine = StreamingVMMEngine(
+            VMMConfig(max_iterations=200), StreamingVMMConfig(lookback=500, seed=1)
+        )
+        columns = list(price_frame.columns)
+        warmup = engine.initialize(price_frame.iloc[:1000], columns)
+
+        outputs = [engine.update(price_frame.iloc[i : i + 1]) for i in range(1000, 1100)]
+
+        assert warmup.convergence_status in ("converged", "max_iterations")
+        for output in outputs:
+            assert output.beta_estimates.shape == (3,)
+            assert np.isfinite(output.over_identification_stat)
+            assert 0.0 <= output.over_identification_p_value <= 1.0
+            assert 0.0 <= output.structural_stability <= 1.0
+            assert 0.0 <= output.regime_confidence <= 1.0
+
+    def test_block_and_single_updates_agree(self, price_frame):
+        columns = list(price_frame.columns)
+        single = StreamingVMMEngine(streaming_config=StreamingVMMConfig(seed=3))
+        block = StreamingVMMEngine(streaming_config=StreamingVMMConfig(seed=3))
+        single.initialize(price_frame.iloc[:1000], columns)
+        block.initialize(price_frame.iloc[:1000], columns)
+
+        for i in range(1000, 1050):
+            single._price_sums.add(price_frame.iloc[i].values)
+        block._price_sums.add(price_frame.iloc[1000:1050].values)
+
+        np.testing.assert_allclose(
+            single._moment_conditions(single.beta), block._moment_conditions(block.beta)
+        )
+
+    def test_update_cost_does_not_grow_with_history(self, price_frame):
+        engine = StreamingVMMEngine(
+            VMMConfig(max_iterations=10), StreamingVMMConfig(iterations_per_update=5)
+        )
+        engine.initialize(price_frame.iloc[:200], list(price_frame.columns))
+        bars = price_frame.values[200:]
+
+        def timed(rows):
+            start = time.perf_counter()
+            for row in rows:
+                engine.update(row)
+            return time.perf_counter() - start
+
+        early = timed(bars[:200])
+        engine._price_sums.add(np.tile(bars[-1], (50_000, 1)))
+        late = timed(bars[200:400])
+
+        assert late < early * 3
+
+    def test_reinitialize_sees_data_mutated_in_place(self, price_frame):
+        columns = list(price_frame.columns)
+        warmup = price_frame.iloc[:500].copy()
+        engine = StreamingVMMEngine(VMMConfig(max_iterations=10))
+        engine.initialize(warmup, columns)
+
+        warmup[columns[0]] += np.random.default_rng(0).normal(0, 20, len(warmup))
+        engine.initialize(warmup, columns)
+
+        # The moment cache must not serve the pre-mutation moments for the same object
+        np.testing.assert_allclose(
+            engine._engine._get_per_timestep_moments(warmup, columns),
+            VMMEngine(VMMConfig())._get_per_timestep_moments(warmup.copy(), columns),
+        )
+
+    def test_update_requires_initialize(self, price_frame):
+        with pytest.raises(RuntimeError):
+            StreamingVMMEngine().update(price_frame.iloc[:1])
@@ -0,0 +1,142 @@
+"""
+Tests for the process-pool VMM batch runner
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.acd.data.features import WindowConfig, create_windows
+from src.acd.vmm import batch
+from src.acd.vmm.batch import run_vmm_batch, window_seeds
+from src.acd.vmm.engine import VMMConfig
+from src.acd.vmm.profiles import VMMConfig as ProfileConfig
+from src.acd.vmm.profiles import to_engine_config
+
+
+@pytest.fixture
+def windowed():
+    rng = np.random.default_rng(8)
+    common = np.cumsum(rng.normal(0, 5, 1200))
+    prices = 50000 + common[:, None] + rng.normal(0, 2, (1200, 3))
+    data = pd.DataFrame(prices, columns=[f"Exchange_{i}" for i in range(3)])
+    config = WindowConfig(window_size=300, step_size=150, min_data_points=100, window_type="fixed")
+    return create_windows(data, list(data.columns), config), list(data.columns)
+
+
+def _summary(outputs):
+    return np.array(
+        [
+            [o.iterations, o.final_loss, *o.beta_estimates, o.over_identification_p_value]
+            for o in outputs
+        ]
+    )
+
+
+def test_window_seeds_are_reproducible():
+    assert window_seeds(5, 42) == window_seeds(5, 42)
+    assert window_seeds(5, 42) != window_seeds(5, 43)
+    assert len(set(window_seeds(100, 0))) == 100
+
+
+def test_parallel_matches_sequential_in_window_order(windowed):
+    windows, columns = windowed
+    config = VMMConfig(max_iterations=50)
+
+    sequential = run_vmm_batch(windows, columns, config, n_workers=1, base_seed=7)
+    parallel = run_vmm_batch(windows, columns, config, n_workers=2, base_seed=7)
+
+    assert len(parallel) == len(windows)
+    # BLAS thread counts differ between processes, so allow last-bit differences
+    np.testing.assert_allclose(_summary(parallel), _summary(sequential), rtol=1e-9)
+
+
+def test_seed_changes_results(windowed):
+    windows, columns = windowed
+    config = VMMConfig(max_iterations=50)
+
+    first = run_vmm_batch(windows.windows[:2], columns, config, base_seed=1)
+    second = run_vmm_batch(windows.windows[:2], columns, config, base_seed=2)
+
+    assert not np.allclose(_summary(first), _summary(second))
+
+
+def test_overlapping_windows_share_source_rows(windowed, monkeypatch):
+    windows, columns = windowed
+    sizes = []
+    original = batch.shared_memory.SharedMemory
+
+    def recording(*args, **kwargs):
+        if kwargs.get("create"):
+            sizes.append(kwargs["size"])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(batch.shared_memory, "SharedMemory", recording)
+    outputs = run_vmm_batch(windows, columns, VMMConfig(max_iterations=5), n_workers=2)
+
+    # Windows overlap by half, yet every source row is shared exactly once
+    assert len(outputs) == len(windows) == 7
+    assert sizes == [windows.values.nbytes]
+    values, offsets = batch._price_block(windows, columns)
+    assert values is windows.values
+    np.testing.assert_array_equal(offsets, windows.offsets)
+
+
+def test_windowed_data_with_other_price_columns(windowed):
+    windows, columns = windowed
+    config = VMMConfig(max_iterations=20)
+
+    subset = run_vmm_batch(windows, columns[:2], config, base_seed=3)
+    frames = [window[columns[:2]] for window in windows.windows]
+
+    np.testing.assert_allclose(
+        _summary(subset), _summary(run_vmm_batch(frames, columns[:2], config, base_seed=3))
+    )
+    with pytest.raises(ValueError, match="missing"):
+        run_vmm_batch(windows, ["Exchange_0", "Exchange_9"], config)
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_failing_window_is_returned_in_its_slot(windowed, n_workers):
+    windows, columns = windowed
+    frames = list(windows.windows[:3])
+    frames[1] = frames[1].iloc[:50]
+    config = VMMConfig(max_iterations=5)
+
+    with pytest.raises(ValueError, match="Insufficient data"):
+        run_vmm_batch(frames, columns, config, n_workers=n_workers)
+    outputs = run_vmm_batch(frames, columns, config, n_workers=n_workers, return_exceptions=True)
+
+    assert isinstance(outputs[1], ValueError)
+    # The other windows keep their own seeds and results
+    healthy = run_vmm_batch(windows.windows[:3], columns, config)
+    np.testing.assert_allclose(
+        _summary([outputs[0], outputs[2]]), _summary([healthy[0], healthy[2]]), rtol=1e-9
+    )
+
+
+def test_batch_leaves_global_rng_untouched(windowed):
+    windows, columns = windowed
+    np.random.seed(123)
+    expected = np.random.random(3)
+
+    np.random.seed(123)
+    run_vmm_batch(windows.windows[:1], columns, VMMConfig(max_iterations=5), base_seed=7)
+
+    np.testing.assert_array_equal(np.random.random(3), expected)
+
+
+def test_empty_batch():
+    assert run_vmm_batch([], ["Exchange_0", "Exchange_1"]) == []
+
+
+def test_profile_config_maps_to_engine_settings():
+    profile = ProfileConfig(max_iters=100, tol=1e-4, step_initial=0.01)
+
+    config = to_engine_config(profile)
+
+    assert (config.max_iterations, config.convergence_tolerance, config.learning_rate) == (
+        100,
+        1e-4,
+        0.01,
+    )